@@ -1,6 +1,6 @@
 import { rmSync, writeFileSync } from "node:fs";
 import { resolve } from "node:path";
-import { chunkTreeToIob, regexpChunkParse, type TaggedToken } from "../index";
+import { chunkTreeToIob, compileRegexpChunkParser, regexpChunkParse, type TaggedToken } from "../index";
 
 function median(values: number[]): number {
   const sorted = [...values].sort((a, b) => a - b);
@@ -42,6 +42,23 @@ function runNative(tagged: TaggedToken[], rounds: number) {
   return { iob, median_seconds: median(timings) };
 }
 
+function runBatch(tagged: TaggedToken[], rounds: number, sentenceSize = 9) {
+  const sentences: TaggedToken[][] = [];
+  for (let i = 0; i < tagged.length; i += sentenceSize) sentences.push(tagged.slice(i, i + sentenceSize));
+  const parser = compileRegexpChunkParser(grammar);
+  const timings: number[] = [];
+  let iob: string[] = [];
+  for (let i = 0; i < rounds; i += 1) {
+    const started = performance.now();
+    const batch = parser.parseBatch(sentences);
+    iob = Array.from(batch.labelIds, (labelId, idx) =>
+      labelId === 0xffff ? "O" : `${batch.begins[idx] ? "B" : "I"}-${batch.labels[labelId]}`,
+    );
+    timings.push((performance.now() - started) / 1000);
+  }
+  return { iob, sentence_count: sentences.length, median_seconds: median(timings) };
+}
+
 function runPython(tagged: TaggedToken[]) {
   const payload = {
     grammar,
@@ -70,6 +87,7 @@ function main() {
   const tagged = syntheticTagged(size);
 
   const native = runNative(tagged, rounds);
+  const batch = runBatch(tagged, rounds);
   const python = runPython(tagged);
 
   const parity = JSON.stringify(native.iob.slice(0, 400)) === JSON.stringify(python.iob.slice(0, 400));
@@ -79,9 +97,13 @@ function main() {
         tagged_size: size,
         rounds,
         parity_sample_400: parity,
+        parity_batch_sample_400: JSON.stringify(batch.iob.slice(0, 400)) === JSON.stringify(native.iob.slice(0, 400).map((row) => row[2])),
+        batch_sentence_count: batch.sentence_count,
         native_seconds_median: native.median_seconds,
+        batch_seconds_median: batch.median_seconds,
         python_seconds: python.total_seconds,
         speedup_vs_python: python.total_seconds / native.median_seconds,
+        batch_speedup_vs_python: python.total_seconds / batch.median_seconds,
       },
       null,
       2,
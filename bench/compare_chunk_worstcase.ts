@@ -0,0 +1,69 @@
+import { chunkTreeToIob, compileRegexpChunkParser, type TaggedToken } from "../index";
+
+const grammar = `
+NP: {<DT>?<JJ>*<NN.*>+}
+VP: {<VB.*>+<RB>*<IN>?}
+`;
+
+function median(values: number[]): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  const mid = Math.floor(sorted.length / 2);
+  return sorted.length % 2 === 0 ? (sorted[mid - 1]! + sorted[mid]!) / 2 : sorted[mid]!;
+}
+
+function repeatTags(tags: string[], size: number): TaggedToken[] {
+  const out: TaggedToken[] = [];
+  for (let i = 0; i < size; i += 1) {
+    const tag = tags[i % tags.length]!;
+    out.push({ token: tag.toLowerCase(), tag });
+  }
+  return out;
+}
+
+// Long quantified runs that never complete a match are the backtracking worst case:
+// every start position used to re-scan the rest of the run.
+function buildCases(size: number): Record<string, TaggedToken[]> {
+  const adjectives = repeatTags(["JJ"], size);
+  const verbs = repeatTags(["VBZ"], size - 1);
+  verbs.push({ token: "quickly", tag: "RB" });
+  return {
+    adjective_run_without_noun: adjectives,
+    adjective_run_then_noun: [...adjectives.slice(0, size - 1), { token: "dog", tag: "NN" }],
+    verb_run: verbs,
+    mixed: repeatTags(["DT", "JJ", "JJ", "NN", "VBZ", "RB", "IN"], size),
+  };
+}
+
+function time(run: () => string[], rounds: number) {
+  const timings: number[] = [];
+  let iob: string[] = [];
+  for (let i = 0; i < rounds; i += 1) {
+    const started = performance.now();
+    iob = run();
+    timings.push((performance.now() - started) / 1000);
+  }
+  return { iob, median_seconds: median(timings) };
+}
+
+function main() {
+  const size = Number(process.argv[2] ?? "100000");
+  const rounds = Number(process.argv[3] ?? "3");
+  const parser = compileRegexpChunkParser(grammar);
+  const results: Record<string, unknown> = {};
+
+  for (const [name, tagged] of Object.entries(buildCases(size))) {
+    const native = time(() => chunkTreeToIob(parser.parse(tagged)).map((row) => row.iob), rounds);
+    const js = time(() => chunkTreeToIob(parser.parse(tagged, { useNative: false })).map((row) => row.iob), rounds);
+    results[name] = {
+      parity: JSON.stringify(native.iob) === JSON.stringify(js.iob),
+      native_seconds_median: native.median_seconds,
+      js_seconds_median: js.median_seconds,
+      native_tokens_per_second: size / native.median_seconds,
+      speedup_vs_js: js.median_seconds / native.median_seconds,
+    };
+  }
+
+  console.log(JSON.stringify({ sentence_tokens: size, rounds, cases: results }, null, 2));
+}
+
+main();
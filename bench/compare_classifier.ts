@@ -48,6 +48,28 @@ function runNative(train: NaiveBayesExample[], test: NaiveBayesExample[], rounds
   };
 }
 
+function runPredict(train: NaiveBayesExample[], test: NaiveBayesExample[], rounds: number) {
+  const clf = trainNaiveBayesTextClassifier(train, { smoothing: 1.0 });
+  const texts = test.map((row) => row.text);
+  const singleTimings: number[] = [];
+  const batchTimings: number[] = [];
+  let single: string[] = [];
+  let batch: string[] = [];
+  for (let i = 0; i < rounds; i += 1) {
+    let started = performance.now();
+    single = texts.map((text) => clf.classify(text));
+    singleTimings.push((performance.now() - started) / 1000);
+    started = performance.now();
+    batch = clf.classifyBatch(texts);
+    batchTimings.push((performance.now() - started) / 1000);
+  }
+  return {
+    single_seconds_median: median(singleTimings),
+    batch_seconds_median: median(batchTimings),
+    parity: JSON.stringify(single) === JSON.stringify(batch),
+  };
+}
+
 function runPython(train: NaiveBayesExample[], test: NaiveBayesExample[], rounds: number) {
   const payloadPath = resolve(import.meta.dir, "datasets", "classifier_payload.json");
   writeFileSync(payloadPath, JSON.stringify({ train, test, rounds }), "utf8");
@@ -67,6 +89,20 @@ function runPython(train: NaiveBayesExample[], test: NaiveBayesExample[], rounds
   };
 }
 
+function runStreaming(train: NaiveBayesExample[], test: NaiveBayesExample[], batchSize = 200) {
+  const clf = trainNaiveBayesTextClassifier([], { smoothing: 1.0 });
+  const texts = test.slice(0, 50).map((row) => row.text);
+  const started = performance.now();
+  let iterations = 0;
+  for (let i = 0; i < train.length; i += batchSize) {
+    clf.train(train.slice(i, i + batchSize));
+    clf.classifyBatch(texts);
+    iterations += 1;
+  }
+  const seconds = (performance.now() - started) / 1000;
+  return { iterations, seconds, accuracy: clf.evaluate(test).accuracy };
+}
+
 function main() {
   const trainSize = Number(process.argv[2] ?? "2400");
   const testSize = Number(process.argv[3] ?? "600");
@@ -74,6 +110,8 @@ function main() {
   const { train, test } = generateDataset(trainSize, testSize);
 
   const native = runNative(train, test, rounds);
+  const predict = runPredict(train, test, rounds);
+  const streaming = runStreaming(train, test);
   const python = runPython(train, test, rounds);
   const predictionsEqual = JSON.stringify(native.predictions) === JSON.stringify(python.predictions);
 
@@ -90,6 +128,13 @@ function main() {
         native_seconds_median: native.median_seconds,
         python_seconds: python.total_seconds,
         speedup_vs_python: python.total_seconds / native.median_seconds,
+        predict_single_seconds_median: predict.single_seconds_median,
+        predict_batch_seconds_median: predict.batch_seconds_median,
+        predict_batch_parity: predict.parity,
+        batch_speedup_vs_single: predict.single_seconds_median / predict.batch_seconds_median,
+        streaming_iterations: streaming.iterations,
+        streaming_seconds: streaming.seconds,
+        streaming_accuracy: streaming.accuracy,
       },
       null,
       2,
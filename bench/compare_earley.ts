@@ -29,14 +29,14 @@ function generateCases(total = 2000): string[][] {
   return out;
 }
 
-function runNative(cases: string[][], rounds: number): { median_seconds: number; parsed: number } {
+function runNative(cases: string[][], rounds: number, useNative = true): { median_seconds: number; parsed: number } {
   const grammar = parseCfgGrammar(grammarText);
   const timings: number[] = [];
   let parsed = 0;
   for (let r = 0; r < rounds; r += 1) {
     const started = performance.now();
     parsed = 0;
-    for (const tokens of cases) parsed += earleyParse(tokens, grammar).length > 0 ? 1 : 0;
+    for (const tokens of cases) parsed += earleyParse(tokens, grammar, { useNative }).length > 0 ? 1 : 0;
     timings.push((performance.now() - started) / 1000);
   }
   return { median_seconds: median(timings), parsed };
@@ -67,6 +67,7 @@ function main() {
   const rounds = Number(process.argv[3] ?? "3");
   const cases = generateCases(total);
   const native = runNative(cases, rounds);
+  const js = runNative(cases, rounds, false);
   const python = runPython(cases);
   const parity = native.parsed === python.parsed;
   console.log(
@@ -78,6 +79,8 @@ function main() {
         parsed_python: python.parsed,
         parity,
         native_seconds_median: native.median_seconds,
+        js_seconds_median: js.median_seconds,
+        speedup_vs_js: js.median_seconds / native.median_seconds,
         python_seconds: python.total_seconds,
         speedup_vs_python: python.total_seconds / native.median_seconds,
       },
@@ -1,6 +1,6 @@
 import { mkdirSync, writeFileSync } from "node:fs";
 import { resolve } from "node:path";
-import { leftCornerParse, parseCfgGrammar, type ParseTree } from "../index";
+import { leftCornerParse, leftCornerParseBatch, parseCfgGrammar, type ParseTree } from "../index";
 
 const grammarText = `
 S -> NP VP
@@ -54,6 +54,23 @@ function runNative(cases: string[][], rounds: number) {
   };
 }
 
+function runBatch(cases: string[][], rounds: number) {
+  const grammar = parseCfgGrammar(grammarText);
+  const timings: number[] = [];
+  let first: ParseTree[] = [];
+  for (let i = 0; i < rounds; i += 1) {
+    const started = performance.now();
+    const batch = leftCornerParseBatch(cases, grammar);
+    timings.push((performance.now() - started) / 1000);
+    first = batch[0] ?? [];
+  }
+  return {
+    median_seconds: median(timings),
+    first_count: first.length,
+    first_tree: first[0] ? toBracket(first[0]) : null,
+  };
+}
+
 function runPython(cases: string[][], rounds: number) {
   const root = resolve(import.meta.dir, "..");
   const payload = JSON.stringify({
@@ -85,6 +102,7 @@ function main() {
   const rounds = Number(process.argv[3] ?? "3");
   const cases = buildCases(size);
   const native = runNative(cases, rounds);
+  const batch = runBatch(cases, rounds);
   const python = runPython(cases, rounds);
 
   console.log(
@@ -94,9 +112,12 @@ function main() {
         rounds,
         parity_first_count: native.first_count === python.parse_count,
         parity_first_tree: native.first_tree === (python.trees[0] ?? null),
+        parity_batch_first_tree: batch.first_tree === native.first_tree,
         native_seconds_median: native.median_seconds,
+        batch_seconds_median: batch.median_seconds,
         python_seconds: python.total_seconds,
         speedup_vs_python: python.total_seconds / native.median_seconds,
+        batch_speedup_vs_python: python.total_seconds / batch.median_seconds,
       },
       null,
       2,
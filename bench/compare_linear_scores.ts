@@ -1,6 +1,6 @@
 import { rmSync, writeFileSync } from "node:fs";
 import { resolve } from "node:path";
-import { linearScoresSparseIdsNative } from "../index";
+import { linearScoresSparseIdsFeatureMajorNative, linearScoresSparseIdsNative } from "../index";
 
 function median(values: number[]): number {
   const sorted = [...values].sort((a, b) => a - b);
@@ -77,15 +77,31 @@ function generateInput(docCount: number, featureCount: number, classCount: numbe
   return { docOffsets, featureIds, featureValues, classCount, featureCount, weights, bias };
 }
 
+function transposeWeights(weights: Float64Array, classCount: number, featureCount: number): Float64Array {
+  const out = new Float64Array(weights.length);
+  for (let c = 0; c < classCount; c += 1) {
+    for (let f = 0; f < featureCount; f += 1) out[f * classCount + c] = weights[c * featureCount + f]!;
+  }
+  return out;
+}
+
+function maxAbsDiff(left: Float64Array, right: Float64Array): number {
+  let out = 0;
+  for (let i = 0; i < left.length; i += 1) out = Math.max(out, Math.abs(left[i]! - right[i]!));
+  return out;
+}
+
 function runNative(
   input: ReturnType<typeof generateInput>,
   rounds: number,
+  layout: "class-major" | "feature-major" = "class-major",
 ): { medianSeconds: number; out: Float64Array; checksum: number } {
   const timings: number[] = [];
   let out = new Float64Array(0);
+  const featureMajor = layout === "feature-major" ? { ...input, weights: transposeWeights(input.weights, input.classCount, input.featureCount) } : null;
   for (let i = 0; i < rounds; i += 1) {
     const started = performance.now();
-    out = linearScoresSparseIdsNative(input);
+    out = featureMajor ? linearScoresSparseIdsFeatureMajorNative(featureMajor) : linearScoresSparseIdsNative(input);
     timings.push((performance.now() - started) / 1000);
   }
   return {
@@ -126,17 +142,19 @@ function main() {
   const classCount = Number(process.argv[4] ?? "6");
   const nnzPerDoc = Number(process.argv[5] ?? "40");
   const rounds = Number(process.argv[6] ?? "5");
+  const manyClassCount = Number(process.argv[7] ?? "128");
   const input = generateInput(docCount, featureCount, classCount, nnzPerDoc);
 
   const native = runNative(input, rounds);
+  const nativeFeatureMajor = runNative(input, rounds, "feature-major");
   const js = jsScores(input);
-  let maxAbsDiff = 0;
-  for (let i = 0; i < js.length; i += 1) {
-    const diff = Math.abs(js[i]! - native.out[i]!);
-    if (diff > maxAbsDiff) maxAbsDiff = diff;
-  }
   const py = runPython(input, rounds);
 
+  // Many labels: class-major strides `featureCount` apart per class, feature-major reads one row.
+  const many = generateInput(Math.max(1, Math.floor(docCount / 4)), featureCount, manyClassCount, nnzPerDoc);
+  const manyClassMajor = runNative(many, rounds);
+  const manyFeatureMajor = runNative(many, rounds, "feature-major");
+
   console.log(
     JSON.stringify(
       {
@@ -146,13 +164,23 @@ function main() {
         nnz_per_doc: nnzPerDoc,
         rounds,
         native_seconds_median: native.medianSeconds,
+        native_feature_major_seconds_median: nativeFeatureMajor.medianSeconds,
         python_seconds: py.total_seconds,
         speedup_vs_python: py.total_seconds / native.medianSeconds,
         percent_faster: (py.total_seconds / native.medianSeconds - 1) * 100,
         native_checksum: native.checksum,
         python_checksum: py.checksum,
         checksum_abs_delta: Math.abs(native.checksum - py.checksum),
-        max_abs_diff_vs_js: maxAbsDiff,
+        max_abs_diff_vs_js: maxAbsDiff(js, native.out),
+        feature_major_max_abs_diff_vs_js: maxAbsDiff(js, nativeFeatureMajor.out),
+        many_classes: {
+          doc_count: many.docOffsets.length - 1,
+          class_count: manyClassCount,
+          class_major_seconds_median: manyClassMajor.medianSeconds,
+          feature_major_seconds_median: manyFeatureMajor.medianSeconds,
+          speedup_feature_major_vs_class_major: manyClassMajor.medianSeconds / manyFeatureMajor.medianSeconds,
+          max_abs_diff: maxAbsDiff(manyClassMajor.out, manyFeatureMajor.out),
+        },
       },
       null,
       2,
@@ -31,7 +31,7 @@ function generateDataset(trainSize = 6000, testSize = 1200): { train: LinearMode
   return { train, test };
 }
 
-function benchLogistic(train: LinearModelExample[], test: LinearModelExample[], rounds: number, native: boolean) {
+function benchLogistic(train: LinearModelExample[], test: LinearModelExample[], rounds: number, native: boolean, solver: "batch" | "sgd" = "batch") {
   const times: number[] = [];
   let accuracy = 0;
   for (let i = 0; i < rounds; i += 1) {
@@ -42,6 +42,7 @@ function benchLogistic(train: LinearModelExample[], test: LinearModelExample[],
       l2: 1e-4,
       maxFeatures: 12000,
       useNativeScoring: native,
+      solver,
     });
     accuracy = model.evaluate(test).accuracy;
     times.push((performance.now() - started) / 1000);
@@ -49,7 +50,7 @@ function benchLogistic(train: LinearModelExample[], test: LinearModelExample[],
   return { median_seconds: median(times), accuracy };
 }
 
-function benchSvm(train: LinearModelExample[], test: LinearModelExample[], rounds: number, native: boolean) {
+function benchSvm(train: LinearModelExample[], test: LinearModelExample[], rounds: number, native: boolean, solver: "batch" | "sgd" = "batch") {
   const times: number[] = [];
   let accuracy = 0;
   for (let i = 0; i < rounds; i += 1) {
@@ -61,6 +62,7 @@ function benchSvm(train: LinearModelExample[], test: LinearModelExample[], round
       margin: 1,
       maxFeatures: 12000,
       useNativeScoring: native,
+      solver,
     });
     accuracy = model.evaluate(test).accuracy;
     times.push((performance.now() - started) / 1000);
@@ -78,6 +80,10 @@ function main() {
   const logJs = benchLogistic(train, test, rounds, false);
   const svmNative = benchSvm(train, test, rounds, true);
   const svmJs = benchSvm(train, test, rounds, false);
+  const logSgdNative = benchLogistic(train, test, rounds, true, "sgd");
+  const logSgdJs = benchLogistic(train, test, rounds, false, "sgd");
+  const svmSgdNative = benchSvm(train, test, rounds, true, "sgd");
+  const svmSgdJs = benchSvm(train, test, rounds, false, "sgd");
 
   console.log(
     JSON.stringify(
@@ -99,6 +105,16 @@ function main() {
           native_accuracy: svmNative.accuracy,
           js_accuracy: svmJs.accuracy,
         },
+        sgd: {
+          logistic_native_seconds_median: logSgdNative.median_seconds,
+          logistic_js_seconds_median: logSgdJs.median_seconds,
+          logistic_speedup_vs_batch_native: logNative.median_seconds / logSgdNative.median_seconds,
+          logistic_native_accuracy: logSgdNative.accuracy,
+          svm_native_seconds_median: svmSgdNative.median_seconds,
+          svm_js_seconds_median: svmSgdJs.median_seconds,
+          svm_speedup_vs_batch_native: svmNative.median_seconds / svmSgdNative.median_seconds,
+          svm_native_accuracy: svmSgdNative.accuracy,
+        },
       },
       null,
       2,
@@ -36,14 +36,18 @@ function buildCases(size = 700): string[][] {
   return out.slice(0, size);
 }
 
-function runNative(cases: string[][], rounds: number): { median_seconds: number; first: ProbabilisticParse | null } {
+function runNative(
+  cases: string[][],
+  rounds: number,
+  useNative = true,
+): { median_seconds: number; first: ProbabilisticParse | null } {
   const grammar = parsePcfgGrammar(grammarText);
   const timings: number[] = [];
   let first: ProbabilisticParse | null = null;
   for (let i = 0; i < rounds; i += 1) {
     const started = performance.now();
     for (const tokens of cases) {
-      const parsed = probabilisticChartParse(tokens, grammar);
+      const parsed = probabilisticChartParse(tokens, grammar, { useNative });
       if (!first && parsed) first = parsed;
     }
     timings.push((performance.now() - started) / 1000);
@@ -77,6 +81,7 @@ function main() {
   const rounds = Number(process.argv[3] ?? "3");
   const cases = buildCases(size);
   const native = runNative(cases, rounds);
+  const js = runNative(cases, rounds, false);
   const python = runPython(cases, rounds);
   const nativeTree = native.first ? toBracket(native.first.tree as never) : null;
   const parityTree = nativeTree === python.tree;
@@ -90,6 +95,8 @@ function main() {
         parity_tree: parityTree,
         parity_prob: parityProb,
         native_seconds_median: native.median_seconds,
+        js_seconds_median: js.median_seconds,
+        speedup_vs_js: js.median_seconds / native.median_seconds,
         python_seconds: python.total_seconds,
         speedup_vs_python: python.total_seconds / native.median_seconds,
       },
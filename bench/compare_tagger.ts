@@ -1,6 +1,6 @@
 import { readFileSync } from "node:fs";
 import { resolve } from "node:path";
-import { loadPerceptronTaggerModel, posTagPerceptronAscii, WasmNltk } from "../index";
+import { loadPerceptronTaggerModel, posTagPerceptronAscii, WasmNltk, type PerceptronWeightPrecision } from "../index";
 
 type PythonResult = {
   token_count: number;
@@ -14,10 +14,10 @@ function median(values: number[]): number {
   return sorted.length % 2 === 0 ? (sorted[mid - 1]! + sorted[mid]!) / 2 : sorted[mid]!;
 }
 
-function runNative(text: string, rounds: number) {
+function runNative(text: string, rounds: number, precision: PerceptronWeightPrecision = "f32") {
   const timings: number[] = [];
   let tags: Array<{ token: string; tag: string }> = [];
-  const model = loadPerceptronTaggerModel();
+  const model = loadPerceptronTaggerModel(undefined, { precision });
 
   for (let i = 0; i < rounds; i += 1) {
     const started = performance.now();
@@ -29,9 +29,21 @@ function runNative(text: string, rounds: number) {
     token_count: tags.length,
     tags,
     median_seconds: median(timings),
+    weight_bytes: model.quantized
+      ? model.quantized.values.byteLength + (model.quantized.precision === "int8" ? model.quantized.scales.byteLength : 0)
+      : model.weights.byteLength,
   };
 }
 
+function tagAgreement(left: Array<{ tag: string }>, right: Array<{ tag: string }>): number {
+  if (left.length === 0) return 1;
+  let same = 0;
+  for (let i = 0; i < left.length; i += 1) {
+    if (left[i]!.tag === right[i]?.tag) same += 1;
+  }
+  return same / left.length;
+}
+
 async function runWasm(text: string, rounds: number) {
   const timings: number[] = [];
   let tags: Array<{ token: string; tag: string }> = [];
@@ -80,6 +92,8 @@ async function main() {
   const absPath = resolve(import.meta.dir, "..", inputPath);
   const text = readFileSync(absPath, "utf8");
   const native = runNative(text, rounds);
+  const nativeF16 = runNative(text, rounds, "f16");
+  const nativeInt8 = runNative(text, rounds, "int8");
   const wasm = await runWasm(text, rounds);
   const python = runPython(inputPath);
 
@@ -99,6 +113,13 @@ async function main() {
         parity_wasm_sample_2000: parityWasm,
         native_seconds_median: native.median_seconds,
         wasm_seconds_median: wasm.median_seconds,
+        native_f16_seconds_median: nativeF16.median_seconds,
+        native_int8_seconds_median: nativeInt8.median_seconds,
+        f16_tag_agreement_vs_f32: tagAgreement(native.tags, nativeF16.tags),
+        int8_tag_agreement_vs_f32: tagAgreement(native.tags, nativeInt8.tags),
+        f32_weight_bytes: native.weight_bytes,
+        f16_weight_bytes: nativeF16.weight_bytes,
+        int8_weight_bytes: nativeInt8.weight_bytes,
         python_seconds: python.total_seconds,
         speedup_vs_python: python.total_seconds / native.median_seconds,
         wasm_speedup_vs_python: python.total_seconds / wasm.median_seconds,
@@ -10,15 +10,27 @@ export {
   countNormalizedTokensAscii,
   countNormalizedTokensAsciiScalar,
   NativeFreqDistStream,
+  osaDistanceIdsAsciiNative,
+  pcfgViterbiParseNative,
+  NativeWordNetLemmaSet,
   everygramsAsciiNative,
   normalizeTokensAsciiNative,
   sentenceTokenizePunktAsciiNative,
   evaluateLanguageModelIdsNative,
+  chunkIobIdsBatchNative,
   chunkIobIdsNative,
   cykRecognizeIdsNative,
+  earleyRecognizeIdsNative,
   naiveBayesLogScoresIdsNative,
+  naiveBayesSparseLogScoresBatchNative,
   linearScoresSparseIdsNative,
+  linearScoresSparseIdsFeatureMajorNative,
+  linearTrainSgdSparseNative,
+  hashNgramFeaturesBatchAsciiNative,
   perceptronPredictBatchNative,
+  perceptronPredictBatchQuantizedNative,
+  perceptronTagBatchAsciiNative,
+  perceptronTrainAveragedNative,
   posTagAsciiNative,
   skipgramsAsciiNative,
   ngramsAsciiNative,
@@ -35,6 +47,9 @@ export {
 
 export type { StreamBigramFreq, StreamConditionalFreq } from "./src/native";
 export type { NativeLmModelType } from "./src/native";
+export type { PerceptronFeatureTable, PerceptronQuantizedWeights, PerceptronTagBatchIds } from "./src/native";
+export type { EarleyTables, PcfgViterbiNodes, PcfgViterbiTables } from "./src/native";
+export type { LinearSgdLoss } from "./src/native";
 
 export {
   countNgramsAscii as countNgramsAsciiJs,
@@ -88,8 +103,8 @@ export {
 } from "./src/punkt";
 export type { PunktModelSerialized, PunktTrainingOptions } from "./src/punkt";
 export { normalizeTokens } from "./src/normalization";
-export { chunkTreeToIob, regexpChunkParse } from "./src/chunk";
-export type { ChunkElement, ChunkNode, IobRow, TaggedToken } from "./src/chunk";
+export { chunkTreeToIob, compileRegexpChunkParser, RegexpChunkParser, regexpChunkParse, regexpChunkParseBatch } from "./src/chunk";
+export type { ChunkElement, ChunkIobBatch, ChunkNode, IobRow, TaggedToken } from "./src/chunk";
 export { ConditionalFreqDist, FreqDist } from "./src/freqdist";
 export type { ConditionalFreqDistInput, FreqDistInput } from "./src/freqdist";
 export {
@@ -136,9 +151,18 @@ export { NgramLanguageModel, trainNgramLanguageModel } from "./src/lm";
 export type { LanguageModelType, NgramLanguageModelOptions } from "./src/lm";
 export {
   chartParse,
+  chartParseBatch,
+  chartParseForest,
+  CompiledCfg,
+  CompiledPcfg,
+  compileCfg,
+  compilePcfg,
   earleyParse,
+  earleyParseBatch,
   earleyRecognize,
   leftCornerParse,
+  leftCornerParseBatch,
+  ParseForest,
   parseCfgGrammar,
   parsePcfgGrammar,
   parseTextWithCfg,
@@ -147,7 +171,9 @@ export {
   parseTextWithPcfg,
   parseTextWithRecursiveDescent,
   probabilisticChartParse,
+  probabilisticChartParseBatch,
   recursiveDescentParse,
+  recursiveDescentParseBatch,
 } from "./src/parse";
 export type { CfgGrammar, CfgProduction, ParseTree, PcfgGrammar, PcfgProduction, ProbabilisticParse } from "./src/parse";
 export { featureChartParse, featureEarleyParse, parseFeatureCfgGrammar, parseTextWithFeatureCfg, parseTextWithFeatureEarley } from "./src/feature_parse";
@@ -165,8 +191,15 @@ export {
   PositiveNaiveBayesClassifier,
 } from "./src/classifier_compat";
 export type { FeatureSet, FeatureValue, LabeledFeatureset } from "./src/classifier_compat";
-export { flattenSparseBatch, TextFeatureVectorizer } from "./src/features";
-export type { SparseVector, VectorizerOptions, VectorizerSerialized } from "./src/features";
+export { flattenSparseBatch, StreamingVocabularyFitter, TextFeatureVectorizer } from "./src/features";
+export type {
+  SparseBatch,
+  SparseVector,
+  VectorizerOptions,
+  VectorizerSerialized,
+  VocabularyFitterOptions,
+  VocabularyFitterSerialized,
+} from "./src/features";
 export {
   loadDecisionTreeTextClassifier,
   DecisionTreeTextClassifier,
@@ -193,7 +226,7 @@ export {
   trainLinearSvmTextClassifier,
   trainLogisticTextClassifier,
 } from "./src/linear_models";
-export type { LinearModelExample, LinearSvmSerialized, LogisticSerialized } from "./src/linear_models";
+export type { LinearModelExample, LinearSolverOptions, LinearSvmSerialized, LogisticSerialized } from "./src/linear_models";
 export {
   loadPerceptronTextClassifier,
   PerceptronTextClassifier,
@@ -206,19 +239,43 @@ export {
   trainPositiveNaiveBayesTextClassifier,
 } from "./src/positive_naive_bayes";
 export type { PositiveNaiveBayesSerialized } from "./src/positive_naive_bayes";
-export { loadWordNet, loadWordNetExtended, loadWordNetMini, loadWordNetPacked, WordNet } from "./src/wordnet";
-export type { WordNetMiniPayload, WordNetPos, WordNetSynset } from "./src/wordnet";
+export {
+  loadWordNet,
+  loadWordNetExtended,
+  loadWordNetInformationContent,
+  loadWordNetMini,
+  loadWordNetPacked,
+  packWordNetIndexed,
+  validateWordNetPack,
+  WordNet,
+} from "./src/wordnet";
+export type {
+  WordNetIcSimilarity,
+  WordNetInformationContent,
+  WordNetMiniPayload,
+  WordNetPos,
+  WordNetSynset,
+} from "./src/wordnet";
 export { LancasterStemmer, RegexpStemmer, SnowballStemmer, WordNetLemmatizer } from "./src/stemmers";
+export type { WordNetLemmatizerOptions } from "./src/stemmers";
 export { confusionMatrix, corpusBleu, editDistance, sentenceBleu } from "./src/metrics";
 export type { BleuWeights, ConfusionMatrixResult, EditDistanceOptions } from "./src/metrics";
+export { buildFuzzyIndex, FuzzyIndex, loadFuzzyIndex } from "./src/fuzzy";
+export type { FuzzyIndexOptions, FuzzyMatch } from "./src/fuzzy";
 export { SentimentIntensityAnalyzer } from "./src/sentiment";
 export type { VaderOptions, VaderPolarity } from "./src/sentiment";
 export { WasmNltk } from "./src/wasm";
 export {
   loadPerceptronTaggerModel,
+  loadPerceptronTaggerModelPacked,
+  packPerceptronTaggerModel,
+  posTagBatch,
   posTagPerceptronAscii,
   preparePerceptronTaggerModel,
+  quantizePerceptronTaggerModel,
+  trainPerceptronTagger,
 } from "./src/perceptron_tagger";
+export type { PerceptronTagBatch, PerceptronTrainingOptions, PerceptronWeightPrecision } from "./src/perceptron_tagger";
 export {
   CFG,
   ChartParser,
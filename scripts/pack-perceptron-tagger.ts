@@ -0,0 +1,53 @@
+import { mkdirSync, writeFileSync } from "node:fs";
+import { dirname, resolve } from "node:path";
+import { loadPerceptronTaggerModel, loadPerceptronTaggerModelPacked, packPerceptronTaggerModel } from "../src/perceptron_tagger";
+
+function parseArgs(): { inJson: string; out: string } {
+  const args = process.argv.slice(2);
+  let inJson = "models/perceptron_tagger_ascii.json";
+  let out = "models/perceptron_tagger_ascii.bin";
+
+  for (let i = 0; i < args.length; i += 1) {
+    const arg = args[i]!;
+    if (arg === "--in") inJson = args[++i] ?? inJson;
+    else if (arg === "--out") out = args[++i] ?? out;
+  }
+  return { inJson, out };
+}
+
+function main() {
+  const args = parseArgs();
+  const source = resolve(args.inJson);
+  const target = resolve(args.out);
+  const model = loadPerceptronTaggerModel(source);
+  const packed = packPerceptronTaggerModel(model);
+
+  const roundTrip = loadPerceptronTaggerModelPacked(packed);
+  for (let i = 0; i < model.weights.length; i += 1) {
+    if (roundTrip.weights[i] !== model.weights[i]) throw new Error(`weight mismatch after packing at index ${i}`);
+  }
+  for (const [key, id] of Object.entries(model.featureIndex)) {
+    if (roundTrip.featureId!(key) !== id) throw new Error(`feature index mismatch after packing: ${key}`);
+  }
+
+  mkdirSync(dirname(target), { recursive: true });
+  writeFileSync(target, packed);
+  console.log(
+    JSON.stringify(
+      {
+        ok: true,
+        in: source,
+        out: target,
+        bytes: packed.length,
+        feature_count: model.featureCount,
+        tag_count: model.tagCount,
+      },
+      null,
+      2,
+    ),
+  );
+}
+
+if (import.meta.main) {
+  main();
+}
@@ -1,6 +1,7 @@
 import { createHash } from "node:crypto";
 import { mkdirSync, readFileSync, writeFileSync } from "node:fs";
 import { dirname, resolve } from "node:path";
+import { packWordNetIndexed } from "../src/wordnet";
 
 type Pos = "n" | "v" | "a" | "r";
 
@@ -29,8 +30,6 @@ export type WordNetPackManifest = {
   source: string;
 };
 
-const MAGIC = "BNWN1";
-
 function normalizeLemma(lemma: string): string {
   return lemma.toLowerCase().replace(/\s+/g, "_");
 }
@@ -192,14 +191,7 @@ export function loadPayload(dictDir?: string, inJson?: string): WordNetMiniPaylo
 }
 
 export function packPayload(payload: WordNetMiniPayload): Uint8Array {
-  const jsonBytes = new TextEncoder().encode(JSON.stringify(canonicalize(payload)));
-  const header = new Uint8Array(MAGIC.length + 4);
-  header.set(new TextEncoder().encode(MAGIC), 0);
-  new DataView(header.buffer).setUint32(MAGIC.length, jsonBytes.length, true);
-  const out = new Uint8Array(header.length + jsonBytes.length);
-  out.set(header, 0);
-  out.set(jsonBytes, header.length);
-  return out;
+  return packWordNetIndexed(canonicalize(payload));
 }
 
 function sha256Hex(data: Uint8Array): string {
@@ -9,6 +9,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
+import numpy as np
+
 TAGS = ["NN", "NNS", "VB", "VBD", "VBG", "JJ", "RB", "DT", "PRP", "IN", "CC", "CD", "NNP"]
 
 LEX = {
@@ -151,7 +153,7 @@ class AveragedPerceptron:
             self.weights[feat] = new_w
 
 
-def train(corpus: list[list[tuple[str, str]]], epochs: int) -> AveragedPerceptron:
+def train_reference(corpus: list[list[tuple[str, str]]], epochs: int) -> AveragedPerceptron:
     model = AveragedPerceptron(TAGS)
     for _ in range(epochs):
         random.shuffle(corpus)
@@ -165,7 +167,7 @@ def train(corpus: list[list[tuple[str, str]]], epochs: int) -> AveragedPerceptro
     return model
 
 
-def accuracy(model: AveragedPerceptron, corpus: list[list[tuple[str, str]]]) -> float:
+def accuracy_reference(model: AveragedPerceptron, corpus: list[list[tuple[str, str]]]) -> float:
     ok = 0
     total = 0
     for sent in corpus:
@@ -177,7 +179,114 @@ def accuracy(model: AveragedPerceptron, corpus: list[list[tuple[str, str]]]) ->
     return ok / max(1, total)
 
 
-def serialize(model: AveragedPerceptron, epochs: int, seed: int, train_sents: int, dev_sents: int, dev_acc: float) -> dict:
+@dataclass
+class EncodedSentence:
+    feature_ids: np.ndarray
+    gold: np.ndarray
+
+
+class DenseAveragedPerceptron:
+    """Same arithmetic as AveragedPerceptron over interned feature ids and a dense (features x tags) matrix."""
+
+    def __init__(self, classes: list[str]) -> None:
+        self.classes = classes
+        self.tag_index = {tag: i for i, tag in enumerate(classes)}
+        self.feature_index: dict[str, int] = {}
+        self.feature_keys: list[str] = []
+        self.weights = np.zeros((0, len(classes)), dtype=np.float64)
+        self.touched = np.zeros(0, dtype=bool)
+        self.i = 0
+
+    def intern(self, features: list[str], grow: bool) -> list[int]:
+        ids = []
+        for feat in features:
+            fid = self.feature_index.get(feat)
+            if fid is None:
+                if not grow:
+                    fid = -1
+                else:
+                    fid = len(self.feature_keys)
+                    self.feature_index[feat] = fid
+                    self.feature_keys.append(feat)
+            ids.append(fid)
+        return ids
+
+    def encode(self, corpus: list[list[tuple[str, str]]], grow: bool) -> list[EncodedSentence]:
+        encoded = []
+        for sent in corpus:
+            tokens = [w for w, _ in sent]
+            rows = [self.intern(feats(tokens, i), grow) for i in range(len(sent))]
+            encoded.append(
+                EncodedSentence(
+                    feature_ids=np.asarray(rows, dtype=np.int64).reshape(len(sent), -1),
+                    gold=np.asarray([self.tag_index[tag] for _, tag in sent], dtype=np.int64),
+                )
+            )
+        return encoded
+
+    def train(self, encoded: list[EncodedSentence], epochs: int) -> None:
+        shape = (len(self.feature_keys), len(self.classes))
+        weights = np.zeros(shape, dtype=np.float64)
+        totals = np.zeros(shape, dtype=np.float64)
+        stamps = np.zeros(shape, dtype=np.int64)
+        self.touched = np.zeros(shape[0], dtype=bool)
+
+        for _ in range(epochs):
+            random.shuffle(encoded)
+            for sent in encoded:
+                for row, truth in zip(sent.feature_ids, sent.gold.tolist()):
+                    guess = int(np.argmax(weights[row].sum(axis=0)))
+                    self.i += 1
+                    if guess == truth:
+                        continue
+                    self.touched[row] = True
+                    for cls, delta in ((truth, 1.0), (guess, -1.0)):
+                        totals[row, cls] += (self.i - stamps[row, cls]) * weights[row, cls]
+                        stamps[row, cls] = self.i
+                        weights[row, cls] += delta
+
+        averaged = (totals + (self.i - stamps) * weights) / max(1, self.i)
+        self.weights = np.where(np.abs(averaged) > 1e-6, averaged, 0.0)
+
+    def predict_many(self, feature_ids: np.ndarray) -> np.ndarray:
+        table = np.vstack([self.weights, np.zeros((1, len(self.classes)))])
+        scores = np.zeros((feature_ids.shape[0], len(self.classes)), dtype=np.float64)
+        for k in range(feature_ids.shape[1]):
+            scores += table[feature_ids[:, k]]
+        return np.argmax(scores, axis=1)
+
+
+def train(corpus: list[list[tuple[str, str]]], epochs: int) -> DenseAveragedPerceptron:
+    model = DenseAveragedPerceptron(TAGS)
+    encoded = model.encode(corpus, grow=True)
+    model.train(encoded, epochs)
+    return model
+
+
+def accuracy(model: DenseAveragedPerceptron, corpus: list[list[tuple[str, str]]]) -> float:
+    encoded = model.encode(corpus, grow=False)
+    if not encoded:
+        return 0.0
+    feature_ids = np.concatenate([sent.feature_ids for sent in encoded])
+    gold = np.concatenate([sent.gold for sent in encoded])
+    ok = int((model.predict_many(feature_ids) == gold).sum())
+    return ok / max(1, len(gold))
+
+
+def metadata(epochs: int, seed: int, train_sents: int, dev_sents: int, dev_acc: float) -> dict:
+    return {
+        "source": "synthetic_template_corpus_v1",
+        "epochs": epochs,
+        "seed": seed,
+        "train_sentences": train_sents,
+        "dev_sentences": dev_sents,
+        "dev_accuracy": round(dev_acc, 6),
+    }
+
+
+def serialize_reference(
+    model: AveragedPerceptron, epochs: int, seed: int, train_sents: int, dev_sents: int, dev_acc: float
+) -> dict:
     feature_keys = sorted(model.weights.keys())
     feature_index = {k: i for i, k in enumerate(feature_keys)}
     tag_index = {tag: i for i, tag in enumerate(model.classes)}
@@ -199,23 +308,50 @@ def serialize(model: AveragedPerceptron, epochs: int, seed: int, train_sents: in
         "tag_count": tag_count,
         "feature_index": feature_index,
         "weights": weights,
-        "metadata": {
-            "source": "synthetic_template_corpus_v1",
-            "epochs": epochs,
-            "seed": seed,
-            "train_sentences": train_sents,
-            "dev_sentences": dev_sents,
-            "dev_accuracy": round(dev_acc, 6),
-        },
+        "metadata": metadata(epochs, seed, train_sents, dev_sents, dev_acc),
+    }
+
+
+def serialize(
+    model: DenseAveragedPerceptron, epochs: int, seed: int, train_sents: int, dev_sents: int, dev_acc: float
+) -> dict:
+    touched = [fid for fid in range(len(model.feature_keys)) if model.touched[fid]]
+    touched.sort(key=lambda fid: model.feature_keys[fid])
+    feature_index = {model.feature_keys[fid]: i for i, fid in enumerate(touched)}
+    matrix = model.weights[np.asarray(touched, dtype=np.int64)] if touched else model.weights[:0]
+    weights = matrix.reshape(-1).tolist()
+    for i in np.flatnonzero(matrix.reshape(-1)).tolist():
+        weights[i] = round(weights[i], 6)
+
+    return {
+        "version": 1,
+        "type": "averaged_perceptron_token_classifier",
+        "tags": model.classes,
+        "feature_count": len(touched),
+        "tag_count": len(model.classes),
+        "feature_index": feature_index,
+        "weights": weights,
+        "metadata": metadata(epochs, seed, train_sents, dev_sents, dev_acc),
     }
 
 
+def write_payload(payload: dict, out: Path, f32_sidecar: bool) -> None:
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if f32_sidecar:
+        sidecar = out.with_suffix(".f32")
+        np.asarray(payload["weights"], dtype="<f4").tofile(sidecar)
+        payload = {**payload, "weights": [], "weights_file": sidecar.name}
+    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
 def main() -> None:
     p = argparse.ArgumentParser()
     p.add_argument("--out", type=Path, default=Path("models/perceptron_tagger_ascii.json"))
     p.add_argument("--sentences", type=int, default=6000)
     p.add_argument("--epochs", type=int, default=8)
     p.add_argument("--seed", type=int, default=1337)
+    p.add_argument("--f32-sidecar", action="store_true", help="write weights to <out>.f32 instead of the JSON body")
+    p.add_argument("--check-reference", action="store_true", help="also train the dict reference and require equal output")
     args = p.parse_args()
 
     corpus = build_corpus(args.sentences, args.seed)
@@ -223,12 +359,21 @@ def main() -> None:
     train_corpus = corpus[:split]
     dev_corpus = corpus[split:]
 
-    model = train(train_corpus, args.epochs)
+    shuffle_state = random.getstate()
+    model = train(list(train_corpus), args.epochs)
     dev_acc = accuracy(model, dev_corpus)
     payload = serialize(model, args.epochs, args.seed, len(train_corpus), len(dev_corpus), dev_acc)
 
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    if args.check_reference:
+        random.setstate(shuffle_state)
+        reference = train_reference(list(train_corpus), args.epochs)
+        expected = serialize_reference(
+            reference, args.epochs, args.seed, len(train_corpus), len(dev_corpus), accuracy_reference(reference, dev_corpus)
+        )
+        if json.dumps(payload) != json.dumps(expected):
+            raise SystemExit("dense trainer output differs from the reference trainer")
+
+    write_payload(payload, args.out, args.f32_sidecar)
     print(
         json.dumps(
             {
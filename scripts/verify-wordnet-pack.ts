@@ -1,10 +1,9 @@
 import { createHash } from "node:crypto";
 import { existsSync, readFileSync } from "node:fs";
 import { resolve } from "node:path";
+import { validateWordNetPack } from "../src/wordnet";
 import { loadPayload, packPayload, type WordNetPackManifest } from "./pack-wordnet";
 
-const MAGIC = "BNWN1";
-
 function sha256Hex(data: Uint8Array): string {
   const h = createHash("sha256");
   h.update(data);
@@ -33,15 +32,6 @@ function parseArgs(): {
   return { packed, manifest, dictDir, inJson };
 }
 
-function verifyHeader(bytes: Uint8Array): void {
-  const header = new TextDecoder().decode(bytes.slice(0, MAGIC.length));
-  if (header !== MAGIC) throw new Error(`invalid packed magic: expected ${MAGIC} got ${header}`);
-  const payloadLen = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength).getUint32(MAGIC.length, true);
-  if (payloadLen !== bytes.length - (MAGIC.length + 4)) {
-    throw new Error(`invalid packed payload length: expected ${payloadLen}, bytes=${bytes.length - (MAGIC.length + 4)}`);
-  }
-}
-
 function main() {
   const args = parseArgs();
   const packedPath = resolve(args.packed);
@@ -50,13 +40,16 @@ function main() {
   if (!existsSync(manifestPath)) throw new Error(`manifest file does not exist: ${manifestPath}`);
 
   const bytes = readFileSync(packedPath);
-  verifyHeader(bytes);
+  const layout = validateWordNetPack(bytes);
   const sha256 = sha256Hex(bytes);
   const manifest = JSON.parse(readFileSync(manifestPath, "utf8")) as WordNetPackManifest;
 
   if (manifest.algorithm !== "sha256") throw new Error(`unsupported manifest algorithm: ${manifest.algorithm}`);
   if (manifest.sha256 !== sha256) throw new Error(`sha256 mismatch: expected ${manifest.sha256}, got ${sha256}`);
   if (manifest.bytes !== bytes.length) throw new Error(`byte length mismatch: expected ${manifest.bytes}, got ${bytes.length}`);
+  if (manifest.synset_count !== layout.synsetCount) {
+    throw new Error(`synset count mismatch: expected ${manifest.synset_count}, got ${layout.synsetCount}`);
+  }
 
   const sourceDir = args.dictDir ?? (manifest.source && existsSync(manifest.source) ? manifest.source : undefined);
   const sourceJson = args.inJson;
@@ -80,6 +73,8 @@ function main() {
         packed: packedPath,
         manifest: manifestPath,
         sha256,
+        synset_count: layout.synsetCount,
+        lemma_count: layout.lemmaCount,
       },
       null,
       2,
@@ -1,4 +1,4 @@
-import { chunkIobIdsNative } from "./native";
+import { chunkIobIdsBatchNative, chunkIobIdsNative } from "./native";
 
 export type TaggedToken = {
   token: string;
@@ -19,9 +19,26 @@ type TagPattern = {
   max: number | null;
 };
 
+const OP_CHAR = 0;
+const OP_SPLIT = 1;
+const OP_JMP = 2;
+const OP_MATCH = 3;
+
+/**
+ * Thompson NFA for one rule: `OP_CHAR` consumes a token allowed by `atom[pc]`,
+ * `OP_SPLIT` prefers `x[pc]` over `y[pc]` (greedy quantifiers), `OP_JMP` goes to `x[pc]`.
+ */
+type ChunkProgram = {
+  ops: Uint8Array;
+  atom: Uint32Array;
+  x: Uint32Array;
+  y: Uint32Array;
+};
+
 type ChunkRule = {
   label: string;
   pattern: TagPattern[];
+  program: ChunkProgram;
 };
 
 function parseQuantifier(raw: string): { min: number; max: number | null } {
@@ -50,7 +67,45 @@ function parseRule(line: string): ChunkRule | null {
   const tags = [...body.matchAll(/<([^>]+)>([?*+]*)/g)].map((hit) => compilePattern(hit[1]!, hit[2] ?? ""));
   if (tags.length === 0) return null;
 
-  return { label, pattern: tags };
+  return { label, pattern: tags, program: compileProgram(tags) };
+}
+
+function compileProgram(pattern: TagPattern[]): ChunkProgram {
+  const ops: number[] = [];
+  const atom: number[] = [];
+  const x: number[] = [];
+  const y: number[] = [];
+  const emit = (op: number, atomIdx = 0, xTarget = 0, yTarget = 0): number => {
+    ops.push(op);
+    atom.push(atomIdx);
+    x.push(xTarget);
+    y.push(yTarget);
+    return ops.length - 1;
+  };
+
+  pattern.forEach((part, a) => {
+    for (let i = 0; i < part.min; i += 1) emit(OP_CHAR, a);
+    if (part.max === null) {
+      const loop = emit(OP_SPLIT, 0, ops.length + 1);
+      emit(OP_CHAR, a);
+      emit(OP_JMP, 0, loop);
+      y[loop] = ops.length;
+      return;
+    }
+    for (let i = part.min; i < part.max; i += 1) {
+      const at = ops.length;
+      emit(OP_SPLIT, 0, at + 1, at + 2);
+      emit(OP_CHAR, a);
+    }
+  });
+  emit(OP_MATCH);
+
+  return {
+    ops: Uint8Array.from(ops),
+    atom: Uint32Array.from(atom),
+    x: Uint32Array.from(x),
+    y: Uint32Array.from(y),
+  };
 }
 
 function parseGrammar(grammar: string): ChunkRule[] {
@@ -62,9 +117,9 @@ function parseGrammar(grammar: string): ChunkRule[] {
   return out;
 }
 
+const UNCHUNKED = 0xffff;
+
 type NativePlan = {
-  tagToId: Map<string, number>;
-  labelById: string[];
   ruleLabelIds: Uint16Array;
   ruleAtomOffsets: Uint32Array;
   ruleAtomCounts: Uint32Array;
@@ -75,99 +130,204 @@ type NativePlan = {
   atomMaxs: Uint8Array;
 };
 
-function compileNativePlan(tokens: TaggedToken[], rules: ChunkRule[]): NativePlan | null {
-  const tags = [...new Set(tokens.map((row) => row.tag))];
-  const tagToId = new Map<string, number>();
-  for (const tag of tags) tagToId.set(tag, tagToId.size);
+export type ChunkIobBatch = {
+  /** Sentence `s` covers tokens `sentenceOffsets[s]..sentenceOffsets[s + 1]`. */
+  sentenceOffsets: Uint32Array;
+  /** Index into `labels`, or 0xffff for tokens outside any chunk ("O"). */
+  labelIds: Uint16Array;
+  /** 1 on the first token of a chunk ("B-"), 0 otherwise. */
+  begins: Uint8Array;
+  labels: string[];
+};
 
-  const labelById: string[] = [];
-  const labelToId = new Map<string, number>();
-  const ruleLabelIds: number[] = [];
-  const ruleAtomOffsets: number[] = [];
-  const ruleAtomCounts: number[] = [];
+/**
+ * Regexp chunk grammar compiled once. Tags are interned into a global ID table where
+ * every tag matching the same set of rule atoms shares one ID, so the native plan only
+ * changes when a tag with a new atom signature appears.
+ */
+export class RegexpChunkParser {
+  readonly grammar: string;
+  readonly labels: string[] = [];
+  private readonly rules: ChunkRule[];
+  private readonly atoms: TagPattern[] = [];
+  private readonly ruleLabelIds: Uint16Array;
+  private readonly ruleAtomOffsets: Uint32Array;
+  private readonly ruleAtomCounts: Uint32Array;
+  private readonly tagIds = new Map<string, number>();
+  private readonly signatureIds = new Map<string, number>();
+  private readonly signatures: number[][] = [];
+  private plan: NativePlan | null = null;
+
+  constructor(grammar: string) {
+    this.grammar = grammar;
+    this.rules = parseGrammar(grammar);
+    const labelIds = new Map<string, number>();
+    const ruleLabelIds: number[] = [];
+    const ruleAtomOffsets: number[] = [];
+    for (const rule of this.rules) {
+      let labelId = labelIds.get(rule.label);
+      if (labelId === undefined) {
+        labelId = this.labels.length;
+        labelIds.set(rule.label, labelId);
+        this.labels.push(rule.label);
+      }
+      ruleLabelIds.push(labelId);
+      ruleAtomOffsets.push(this.atoms.length);
+      this.atoms.push(...rule.pattern);
+    }
+    this.ruleLabelIds = Uint16Array.from(ruleLabelIds);
+    this.ruleAtomOffsets = Uint32Array.from(ruleAtomOffsets);
+    this.ruleAtomCounts = Uint32Array.from(this.rules.map((rule) => rule.pattern.length));
+  }
 
-  const atomAllowedOffsets: number[] = [];
-  const atomAllowedLengths: number[] = [];
-  const atomAllowedFlat: number[] = [];
-  const atomMins: number[] = [];
-  const atomMaxs: number[] = [];
+  /** Tag ID shared by all tags with the same atom signature, or -1 when IDs are exhausted. */
+  private tagId(tag: string): number {
+    const cached = this.tagIds.get(tag);
+    if (cached !== undefined) return cached;
+    const matched: number[] = [];
+    for (let a = 0; a < this.atoms.length; a += 1) {
+      if (this.atoms[a]!.regex.test(tag)) matched.push(a);
+    }
+    const key = matched.join(",");
+    let id = this.signatureIds.get(key);
+    if (id === undefined) {
+      if (this.signatures.length >= UNCHUNKED) return -1;
+      id = this.signatures.length;
+      this.signatureIds.set(key, id);
+      this.signatures.push(matched);
+      this.plan = null;
+    }
+    this.tagIds.set(tag, id);
+    return id;
+  }
 
-  for (const rule of rules) {
-    const labelId = labelToId.get(rule.label) ?? (() => {
-      const id = labelById.length;
-      labelById.push(rule.label);
-      labelToId.set(rule.label, id);
-      return id;
-    })();
-    ruleLabelIds.push(labelId);
-    ruleAtomOffsets.push(atomMins.length);
-    ruleAtomCounts.push(rule.pattern.length);
-
-    for (const atom of rule.pattern) {
-      const allowed = tags
-        .filter((tag) => atom.regex.test(tag))
-        .map((tag) => tagToId.get(tag)!)
-        .sort((a, b) => a - b);
-      if (allowed.length === 0) return null;
-      atomAllowedOffsets.push(atomAllowedFlat.length);
-      atomAllowedLengths.push(allowed.length);
-      atomAllowedFlat.push(...allowed);
-      atomMins.push(atom.min);
-      atomMaxs.push(atom.max === null ? 255 : Math.min(255, atom.max));
+  private nativePlan(): NativePlan {
+    if (this.plan) return this.plan;
+    const allowed: number[][] = this.atoms.map(() => []);
+    for (let id = 0; id < this.signatures.length; id += 1) {
+      for (const atom of this.signatures[id]!) allowed[atom]!.push(id);
     }
+    const atomAllowedOffsets = new Uint32Array(this.atoms.length);
+    const atomAllowedLengths = new Uint32Array(this.atoms.length);
+    const flat: number[] = [];
+    for (let a = 0; a < this.atoms.length; a += 1) {
+      atomAllowedOffsets[a] = flat.length;
+      atomAllowedLengths[a] = allowed[a]!.length;
+      flat.push(...allowed[a]!);
+    }
+    this.plan = {
+      ruleLabelIds: this.ruleLabelIds,
+      ruleAtomOffsets: this.ruleAtomOffsets,
+      ruleAtomCounts: this.ruleAtomCounts,
+      atomAllowedOffsets,
+      atomAllowedLengths,
+      atomAllowedFlat: Uint16Array.from(flat),
+      atomMins: Uint8Array.from(this.atoms.map((atom) => atom.min)),
+      atomMaxs: Uint8Array.from(this.atoms.map((atom) => (atom.max === null ? 255 : Math.min(255, atom.max)))),
+    };
+    return this.plan;
   }
 
-  return {
-    tagToId,
-    labelById,
-    ruleLabelIds: Uint16Array.from(ruleLabelIds),
-    ruleAtomOffsets: Uint32Array.from(ruleAtomOffsets),
-    ruleAtomCounts: Uint32Array.from(ruleAtomCounts),
-    atomAllowedOffsets: Uint32Array.from(atomAllowedOffsets),
-    atomAllowedLengths: Uint32Array.from(atomAllowedLengths),
-    atomAllowedFlat: Uint16Array.from(atomAllowedFlat),
-    atomMins: Uint8Array.from(atomMins),
-    atomMaxs: Uint8Array.from(atomMaxs),
-  };
-}
+  private encodeTags(sentences: TaggedToken[][]): { tokenTagIds: Uint16Array; sentenceOffsets: Uint32Array } | null {
+    const sentenceOffsets = new Uint32Array(sentences.length + 1);
+    for (let s = 0; s < sentences.length; s += 1) sentenceOffsets[s + 1] = sentenceOffsets[s]! + sentences[s]!.length;
+    const tokenTagIds = new Uint16Array(sentenceOffsets[sentences.length]!);
+    let at = 0;
+    for (const tokens of sentences) {
+      for (const row of tokens) {
+        const id = this.tagId(row.tag);
+        if (id < 0) return null;
+        tokenTagIds[at] = id;
+        at += 1;
+      }
+    }
+    return { tokenTagIds, sentenceOffsets };
+  }
 
-function parseNative(tokens: TaggedToken[], rules: ChunkRule[]): ChunkElement[] | null {
-  if (tokens.length === 0) return [];
-  if (rules.length === 0) return tokens.map((row) => ({ token: row.token, tag: row.tag }));
-  const plan = compileNativePlan(tokens, rules);
-  if (!plan) return null;
-
-  const tokenTagIds = Uint16Array.from(tokens.map((row) => plan.tagToId.get(row.tag)!));
-  const nativeOut = chunkIobIdsNative({
-    tokenTagIds,
-    atomAllowedOffsets: plan.atomAllowedOffsets,
-    atomAllowedLengths: plan.atomAllowedLengths,
-    atomAllowedFlat: plan.atomAllowedFlat,
-    atomMins: plan.atomMins,
-    atomMaxs: plan.atomMaxs,
-    ruleAtomOffsets: plan.ruleAtomOffsets,
-    ruleAtomCounts: plan.ruleAtomCounts,
-    ruleLabelIds: plan.ruleLabelIds,
-  });
+  parse(tokens: TaggedToken[], options?: { useNative?: boolean }): ChunkElement[] {
+    if (tokens.length === 0) return [];
+    if (this.rules.length === 0) return tokens.map((row) => ({ token: row.token, tag: row.tag }));
+    if (options?.useNative === false) return chunkWithRules(tokens, this.rules);
+    const encoded = this.encodeTags([tokens]);
+    if (encoded) {
+      try {
+        const nativeOut = chunkIobIdsNative({ tokenTagIds: encoded.tokenTagIds, ...this.nativePlan() });
+        const tree = decodeChunks(tokens, nativeOut.labelIds, nativeOut.begins, this.labels);
+        if (tree) return tree;
+      } catch {
+        // Fall through to the JS matcher.
+      }
+    }
+    return chunkWithRules(tokens, this.rules);
+  }
+
+  /** Chunks all sentences in one native call and returns columnar IOB labels. */
+  parseBatch(sentences: TaggedToken[][], options?: { useNative?: boolean }): ChunkIobBatch {
+    if (options?.useNative === false) return this.parseBatchJs(sentences);
+    const encoded = this.encodeTags(sentences);
+    if (!encoded) return this.parseBatchJs(sentences);
+    const { tokenTagIds, sentenceOffsets } = encoded;
+    let out: { labelIds: Uint16Array; begins: Uint8Array };
+    if (this.rules.length === 0) {
+      out = { labelIds: new Uint16Array(tokenTagIds.length).fill(UNCHUNKED), begins: new Uint8Array(tokenTagIds.length) };
+    } else {
+      try {
+        out = chunkIobIdsBatchNative({ tokenTagIds, sentenceOffsets, ...this.nativePlan() });
+      } catch {
+        return this.parseBatchJs(sentences);
+      }
+    }
+    return { sentenceOffsets, labelIds: out.labelIds, begins: out.begins, labels: this.labels };
+  }
+
+  private parseBatchJs(sentences: TaggedToken[][]): ChunkIobBatch {
+    const sentenceOffsets = new Uint32Array(sentences.length + 1);
+    for (let s = 0; s < sentences.length; s += 1) sentenceOffsets[s + 1] = sentenceOffsets[s]! + sentences[s]!.length;
+    const labelIds = new Uint16Array(sentenceOffsets[sentences.length]!).fill(UNCHUNKED);
+    const begins = new Uint8Array(labelIds.length);
+    let at = 0;
+    for (const tokens of sentences) {
+      for (const node of chunkWithRules(tokens, this.rules)) {
+        if (isTaggedToken(node)) {
+          at += 1;
+          continue;
+        }
+        const labelId = this.labels.indexOf(node.label);
+        for (let i = 0; i < node.tokens.length; i += 1) {
+          labelIds[at] = labelId;
+          begins[at] = i === 0 ? 1 : 0;
+          at += 1;
+        }
+      }
+    }
+    return { sentenceOffsets, labelIds, begins, labels: this.labels };
+  }
+}
 
+function decodeChunks(
+  tokens: TaggedToken[],
+  labelIds: Uint16Array,
+  begins: Uint8Array,
+  labelById: string[],
+): ChunkElement[] | null {
   const out: ChunkElement[] = [];
   let i = 0;
   while (i < tokens.length) {
-    const labelId = nativeOut.labelIds[i]!;
-    if (labelId === 0xffff) {
+    const labelId = labelIds[i]!;
+    if (labelId === UNCHUNKED) {
       out.push(tokens[i]!);
       i += 1;
       continue;
     }
 
-    const label = plan.labelById[labelId];
+    const label = labelById[labelId];
     if (!label) return null;
     const chunkTokens: TaggedToken[] = [];
     let j = i;
     while (j < tokens.length) {
-      const lid = nativeOut.labelIds[j]!;
+      const lid = labelIds[j]!;
       if (lid !== labelId) break;
-      if (j > i && nativeOut.begins[j] === 1) break;
+      if (j > i && begins[j] === 1) break;
       chunkTokens.push(tokens[j]!);
       j += 1;
     }
@@ -190,69 +350,121 @@ function isTaggedToken(node: ChunkElement): node is TaggedToken {
   return (node as ChunkNode).kind !== "chunk";
 }
 
-function maxRepeat(nodes: ChunkElement[], start: number, regex: RegExp, hardMax: number | null): number {
-  let count = 0;
-  let idx = start;
-  while (idx < nodes.length) {
-    if (hardMax !== null && count >= hardMax) break;
-    const node = nodes[idx]!;
-    if (!isTaggedToken(node) || !regex.test(node.tag)) break;
-    idx += 1;
-    count += 1;
+/**
+ * Pike VM over a rule's NFA: threads are kept in priority order and one left-to-right
+ * pass finds the leftmost non-empty match that greedy backtracking would pick, so long
+ * quantified runs are not re-scanned from every start position.
+ */
+class RuleMatcher {
+  private readonly program: ChunkProgram;
+  private readonly pattern: TagPattern[];
+  private readonly marks: Uint32Array;
+  private readonly stack: Uint32Array;
+  private readonly tested: Int8Array;
+  private generation = 0;
+  private clist: number[] = [];
+  private nlist: number[] = [];
+
+  constructor(rule: ChunkRule) {
+    this.program = rule.program;
+    this.pattern = rule.pattern;
+    this.marks = new Uint32Array(rule.program.ops.length);
+    this.stack = new Uint32Array(2 * rule.program.ops.length + 1);
+    this.tested = new Int8Array(rule.pattern.length);
   }
-  return count;
-}
 
-function matchPattern(nodes: ChunkElement[], start: number, pattern: TagPattern[], pIdx = 0): number | null {
-  if (pIdx >= pattern.length) return start;
-  const part = pattern[pIdx]!;
-  const max = maxRepeat(nodes, start, part.regex, part.max);
-  for (let used = max; used >= part.min; used -= 1) {
-    const end = matchPattern(nodes, start + used, pattern, pIdx + 1);
-    if (end !== null) return end;
+  private nextGeneration(): number {
+    if (this.generation === 0xffffffff) {
+      this.marks.fill(0);
+      this.generation = 0;
+    }
+    this.generation += 1;
+    return this.generation;
   }
-  return null;
-}
 
-function applyRule(nodes: ChunkElement[], rule: ChunkRule): ChunkElement[] {
-  const out: ChunkElement[] = [];
-  let i = 0;
-  while (i < nodes.length) {
-    const node = nodes[i]!;
-    if (!isTaggedToken(node)) {
-      out.push(node);
-      i += 1;
-      continue;
-    }
-
-    const end = matchPattern(nodes, i, rule.pattern);
-    if (end === null || end <= i) {
-      out.push(node);
-      i += 1;
-      continue;
+  /** Appends (pc, start) pairs reachable from `pc0` through split/jmp, preferred branch first. */
+  private addThread(list: number[], generation: number, pc0: number, start: number): void {
+    const { ops, x, y } = this.program;
+    let top = 0;
+    this.stack[top++] = pc0;
+    while (top > 0) {
+      const pc = this.stack[--top]!;
+      if (this.marks[pc] === generation) continue;
+      this.marks[pc] = generation;
+      const op = ops[pc]!;
+      if (op === OP_JMP) {
+        this.stack[top++] = x[pc]!;
+      } else if (op === OP_SPLIT) {
+        this.stack[top++] = y[pc]!;
+        this.stack[top++] = x[pc]!;
+      } else {
+        list.push(pc, start);
+      }
     }
+  }
 
-    const span = nodes.slice(i, end);
-    if (span.some((item) => !isTaggedToken(item))) {
-      out.push(node);
-      i += 1;
-      continue;
+  search(nodes: ChunkElement[], pos: number): [number, number] | null {
+    const { ops, atom } = this.program;
+    const n = nodes.length;
+    let clist = this.clist;
+    let nlist = this.nlist;
+    clist.length = 0;
+    let cgen = this.nextGeneration();
+    let best: [number, number] | null = null;
+
+    for (let i = pos; ; i += 1) {
+      const node = i < n ? nodes[i]! : null;
+      const open = node !== null && isTaggedToken(node);
+      if (best === null && open) this.addThread(clist, cgen, 0, i);
+      if (clist.length === 0 && (best !== null || i >= n)) break;
+
+      const ngen = this.nextGeneration();
+      nlist.length = 0;
+      this.tested.fill(-1);
+      for (let t = 0; t < clist.length; t += 2) {
+        const pc = clist[t]!;
+        const start = clist[t + 1]!;
+        if (ops[pc] === OP_MATCH) {
+          if (i === start) continue;
+          // Lower-priority threads (later starts, shorter repeats) are cut.
+          best = [start, i];
+          break;
+        }
+        if (!open) continue;
+        const a = atom[pc]!;
+        if (this.tested[a] === -1) this.tested[a] = this.pattern[a]!.regex.test((node as TaggedToken).tag) ? 1 : 0;
+        if (this.tested[a] === 1) this.addThread(nlist, ngen, pc + 1, start);
+      }
+      [clist, nlist] = [nlist, clist];
+      cgen = ngen;
+      if (i >= n) break;
     }
+    this.clist = clist;
+    this.nlist = nlist;
+    return best;
+  }
+}
 
+function applyRule(nodes: ChunkElement[], rule: ChunkRule): ChunkElement[] {
+  const matcher = new RuleMatcher(rule);
+  const out: ChunkElement[] = [];
+  let pos = 0;
+  while (pos < nodes.length) {
+    const span = matcher.search(nodes, pos);
+    if (!span) break;
+    for (let i = pos; i < span[0]; i += 1) out.push(nodes[i]!);
     out.push({
       kind: "chunk",
       label: rule.label,
-      tokens: span as TaggedToken[],
+      tokens: nodes.slice(span[0], span[1]) as TaggedToken[],
     });
-    i = end;
+    pos = span[1];
   }
+  for (let i = pos; i < nodes.length; i += 1) out.push(nodes[i]!);
   return out;
 }
 
-export function regexpChunkParse(tokens: TaggedToken[], grammar: string): ChunkElement[] {
-  const rules = parseGrammar(grammar);
-  const nativeTree = parseNative(tokens, rules);
-  if (nativeTree) return nativeTree;
+function chunkWithRules(tokens: TaggedToken[], rules: ChunkRule[]): ChunkElement[] {
   let nodes: ChunkElement[] = tokens.map((item) => ({ token: item.token, tag: item.tag }));
   for (const rule of rules) {
     nodes = applyRule(nodes, rule);
@@ -260,6 +472,36 @@ export function regexpChunkParse(tokens: TaggedToken[], grammar: string): ChunkE
   return nodes;
 }
 
+const MAX_CACHED_PARSERS = 64;
+const cachedParsers = new Map<string, RegexpChunkParser>();
+
+export function compileRegexpChunkParser(grammar: string): RegexpChunkParser {
+  const cached = cachedParsers.get(grammar);
+  if (cached) return cached;
+  const parser = new RegexpChunkParser(grammar);
+  if (cachedParsers.size >= MAX_CACHED_PARSERS) cachedParsers.delete(cachedParsers.keys().next().value!);
+  cachedParsers.set(grammar, parser);
+  return parser;
+}
+
+export function regexpChunkParse(
+  tokens: TaggedToken[],
+  grammar: string | RegexpChunkParser,
+  options?: { useNative?: boolean },
+): ChunkElement[] {
+  const parser = typeof grammar === "string" ? compileRegexpChunkParser(grammar) : grammar;
+  return parser.parse(tokens, options);
+}
+
+export function regexpChunkParseBatch(
+  sentences: TaggedToken[][],
+  grammar: string | RegexpChunkParser,
+  options?: { useNative?: boolean },
+): ChunkIobBatch {
+  const parser = typeof grammar === "string" ? compileRegexpChunkParser(grammar) : grammar;
+  return parser.parseBatch(sentences, options);
+}
+
 export type IobRow = {
   token: string;
   tag: string;
@@ -1,4 +1,4 @@
-import { naiveBayesLogScoresIdsNative, tokenizeAsciiNative } from "./native";
+import { naiveBayesSparseLogScoresBatchNative, tokenizeAsciiNative } from "./native";
 
 export type NaiveBayesExample = {
   label: string;
@@ -30,16 +30,180 @@ type InternalState = {
   vocabulary: Set<string>;
 };
 
-type NativeNaiveBayesModel = {
-  labels: string[];
-  tokenToId: Map<string, number>;
-  vocabSize: number;
-  tokenCountsMatrix: Uint32Array;
-  labelDocCounts: Uint32Array;
-  labelTokenTotals: Uint32Array;
-  totalDocs: number;
-  smoothing: number;
-};
+function growUint32(values: Uint32Array, size: number): Uint32Array {
+  if (values.length >= size) return values;
+  const out = new Uint32Array(Math.max(size, values.length * 2, 16));
+  out.set(values);
+  return out;
+}
+
+function growFloat64(values: Float64Array, size: number): Float64Array {
+  if (values.length >= size) return values;
+  const out = new Float64Array(Math.max(size, values.length * 2, 16));
+  out.set(values);
+  return out;
+}
+
+/**
+ * Token-major sparse model: token `t` lists the labels it was seen with in
+ * `entryLabelIds`/`entryLogDeltas[tokenStarts[t]..tokenStarts[t] + tokenLengths[t]]`. A token
+ * adds `labelDefaultLogs[l]` (the zero-count log-likelihood) to every label plus its stored
+ * delta `log(count + a) - log(a)` to the labels it was seen with.
+ *
+ * Token and label IDs are append-only. A token that gains a label beyond its range capacity
+ * moves its range to the end of the entry arrays with doubled capacity, so training updates
+ * cost O(1) amortized per token occurrence; priors and default logs are refreshed lazily.
+ */
+class SparseNaiveBayesModel {
+  readonly labels: string[] = [];
+  readonly tokenToId = new Map<string, number>();
+  private readonly labelToId = new Map<string, number>();
+  private readonly logSmoothing: number;
+  private starts = new Uint32Array(16);
+  private lengths = new Uint32Array(16);
+  private capacities = new Uint32Array(16);
+  private entryLabels = new Uint32Array(16);
+  private entryDeltas = new Float64Array(16);
+  private entryCount = 0;
+  private priors = new Float64Array(0);
+  private defaults = new Float64Array(0);
+  private totalsDirty = true;
+
+  constructor(private readonly smoothing: number) {
+    this.logSmoothing = Math.log(smoothing);
+  }
+
+  static fromState(state: InternalState): SparseNaiveBayesModel {
+    const model = new SparseNaiveBayesModel(state.smoothing);
+    for (const label of state.labelDocCounts.keys()) model.labelId(label);
+    for (const token of state.vocabulary) model.tokenId(token);
+    const rows = model.labels.map((label) => state.tokenCountsByLabel.get(label) ?? new Map<string, number>());
+
+    // Size every token range exactly, then fill ranges in label order.
+    const vocabSize = model.tokenToId.size;
+    for (const row of rows) {
+      for (const token of row.keys()) {
+        const id = model.tokenToId.get(token);
+        if (id !== undefined) model.capacities[id] = model.capacities[id]! + 1;
+      }
+    }
+    let offset = 0;
+    for (let t = 0; t < vocabSize; t += 1) {
+      model.starts[t] = offset;
+      offset += model.capacities[t]!;
+    }
+    model.entryLabels = new Uint32Array(Math.max(16, offset));
+    model.entryDeltas = new Float64Array(Math.max(16, offset));
+    model.entryCount = offset;
+    for (let l = 0; l < rows.length; l += 1) {
+      for (const [token, count] of rows[l]!) {
+        const id = model.tokenToId.get(token);
+        if (id === undefined) continue;
+        const at = model.starts[id]! + model.lengths[id]!;
+        model.lengths[id] = model.lengths[id]! + 1;
+        model.entryLabels[at] = l;
+        model.entryDeltas[at] = Math.log(count + model.smoothing) - model.logSmoothing;
+      }
+    }
+    return model;
+  }
+
+  labelId(label: string): number {
+    let id = this.labelToId.get(label);
+    if (id === undefined) {
+      id = this.labels.length;
+      this.labels.push(label);
+      this.labelToId.set(label, id);
+      this.totalsDirty = true;
+    }
+    return id;
+  }
+
+  tokenId(token: string): number {
+    let id = this.tokenToId.get(token);
+    if (id === undefined) {
+      id = this.tokenToId.size;
+      this.tokenToId.set(token, id);
+      this.starts = growUint32(this.starts, id + 1);
+      this.lengths = growUint32(this.lengths, id + 1);
+      this.capacities = growUint32(this.capacities, id + 1);
+      this.totalsDirty = true;
+    }
+    return id;
+  }
+
+  setCount(tokenId: number, labelId: number, count: number): void {
+    const delta = Math.log(count + this.smoothing) - this.logSmoothing;
+    const start = this.starts[tokenId]!;
+    const length = this.lengths[tokenId]!;
+    for (let e = start; e < start + length; e += 1) {
+      if (this.entryLabels[e] === labelId) {
+        this.entryDeltas[e] = delta;
+        return;
+      }
+    }
+
+    let at = start + length;
+    if (length === this.capacities[tokenId]!) {
+      const capacity = Math.max(2, length * 2);
+      const moved = this.entryCount;
+      this.entryLabels = growUint32(this.entryLabels, moved + capacity);
+      this.entryDeltas = growFloat64(this.entryDeltas, moved + capacity);
+      this.entryLabels.copyWithin(moved, start, start + length);
+      this.entryDeltas.copyWithin(moved, start, start + length);
+      this.starts[tokenId] = moved;
+      this.capacities[tokenId] = capacity;
+      this.entryCount += capacity;
+      at = moved + length;
+    }
+    this.entryLabels[at] = labelId;
+    this.entryDeltas[at] = delta;
+    this.lengths[tokenId] = length + 1;
+  }
+
+  markTotalsDirty(): void {
+    this.totalsDirty = true;
+  }
+
+  /** Native scorer input; views stay valid until the next update. */
+  arrays(state: InternalState): {
+    tokenStarts: Uint32Array;
+    tokenLengths: Uint32Array;
+    entryLabelIds: Uint32Array;
+    entryLogDeltas: Float64Array;
+    labelPriorLogs: Float64Array;
+    labelDefaultLogs: Float64Array;
+  } {
+    if (this.totalsDirty) this.refreshTotals(state);
+    const vocabSize = this.tokenToId.size;
+    return {
+      tokenStarts: this.starts.subarray(0, vocabSize),
+      tokenLengths: this.lengths.subarray(0, vocabSize),
+      entryLabelIds: this.entryLabels.subarray(0, this.entryCount),
+      entryLogDeltas: this.entryDeltas.subarray(0, this.entryCount),
+      labelPriorLogs: this.priors,
+      labelDefaultLogs: this.defaults,
+    };
+  }
+
+  private refreshTotals(state: InternalState): void {
+    const labelCount = this.labels.length;
+    const vocabSize = Math.max(1, this.tokenToId.size);
+    const totalDocs = Math.max(1, state.totalDocs);
+    if (this.priors.length !== labelCount) {
+      this.priors = new Float64Array(labelCount);
+      this.defaults = new Float64Array(labelCount);
+    }
+    for (let l = 0; l < labelCount; l += 1) {
+      const label = this.labels[l]!;
+      const docCount = state.labelDocCounts.get(label) ?? 0;
+      const tokenTotal = state.labelTokenTotals.get(label) ?? 0;
+      this.priors[l] = Math.log((docCount + this.smoothing) / (totalDocs + this.smoothing * labelCount));
+      this.defaults[l] = this.logSmoothing - Math.log(tokenTotal + this.smoothing * vocabSize);
+    }
+    this.totalsDirty = false;
+  }
+}
 
 function ensureLabel(state: InternalState, label: string): void {
   if (!state.labelDocCounts.has(label)) {
@@ -53,9 +217,34 @@ function tokenize(text: string): string[] {
   return tokenizeAsciiNative(text);
 }
 
+function scoreBatchJs(
+  model: ReturnType<SparseNaiveBayesModel["arrays"]>,
+  docOffsets: Uint32Array,
+  docTokenIds: Uint32Array,
+): Float64Array {
+  const labelCount = model.labelPriorLogs.length;
+  const docCount = docOffsets.length - 1;
+  const out = new Float64Array(docCount * labelCount);
+  for (let d = 0; d < docCount; d += 1) {
+    const base = d * labelCount;
+    out.set(model.labelPriorLogs, base);
+    for (let i = docOffsets[d]!; i < docOffsets[d + 1]!; i += 1) {
+      const tok = docTokenIds[i]!;
+      const start = model.tokenStarts[tok]!;
+      const end = start + model.tokenLengths[tok]!;
+      for (let e = start; e < end; e += 1) {
+        out[base + model.entryLabelIds[e]!] += model.entryLogDeltas[e]!;
+      }
+    }
+    const known = docOffsets[d + 1]! - docOffsets[d]!;
+    for (let l = 0; l < labelCount; l += 1) out[base + l] += known * model.labelDefaultLogs[l]!;
+  }
+  return out;
+}
+
 export class NaiveBayesTextClassifier {
   private state: InternalState;
-  private nativeModel: NativeNaiveBayesModel | null = null;
+  private model: SparseNaiveBayesModel | null = null;
 
   constructor(options?: { smoothing?: number }) {
     this.state = {
@@ -95,26 +284,34 @@ export class NaiveBayesTextClassifier {
         local.set(String(tokenCounts[j]), Number(tokenCounts[j + 1]));
       }
     }
-    classifier.nativeModel = null;
+    classifier.model = null;
     return classifier;
   }
 
+  /**
+   * Adds examples to the counts. Once a model has been built, it is updated in place, so
+   * alternating small training batches with predictions costs time proportional to the batch.
+   */
   train(examples: NaiveBayesExample[]): this {
+    const model = this.model;
     for (const row of examples) {
       const label = row.label;
       ensureLabel(this.state, label);
       this.state.totalDocs += 1;
       this.state.labelDocCounts.set(label, (this.state.labelDocCounts.get(label) ?? 0) + 1);
+      const labelId = model ? model.labelId(label) : 0;
 
       const labelCounts = this.state.tokenCountsByLabel.get(label)!;
       const tokens = tokenize(row.text);
       for (const token of tokens) {
         this.state.vocabulary.add(token);
-        labelCounts.set(token, (labelCounts.get(token) ?? 0) + 1);
-        this.state.labelTokenTotals.set(label, (this.state.labelTokenTotals.get(label) ?? 0) + 1);
+        const count = (labelCounts.get(token) ?? 0) + 1;
+        labelCounts.set(token, count);
+        if (model) model.setCount(model.tokenId(token), labelId, count);
       }
+      this.state.labelTokenTotals.set(label, (this.state.labelTokenTotals.get(label) ?? 0) + tokens.length);
     }
-    this.nativeModel = null;
+    model?.markTotalsDirty();
     return this;
   }
 
@@ -129,105 +326,66 @@ export class NaiveBayesTextClassifier {
   }
 
   predict(text: string): NaiveBayesPrediction[] {
-    const labels = this.labels();
-    if (labels.length === 0) return [];
-    const tokens = tokenize(text);
-    if (tokens.length === 0) {
-      return labels
-        .map((label) => {
-          const docCount = this.state.labelDocCounts.get(label) ?? 0;
-          const totalDocs = Math.max(1, this.state.totalDocs);
-          const logProb = Math.log((docCount + this.state.smoothing) / (totalDocs + this.state.smoothing * labels.length));
-          return { label, logProb };
-        })
-        .sort((a, b) => b.logProb - a.logProb);
-    }
+    return this.predictBatch([text])[0]!;
+  }
 
-    try {
-      const nativeModel = this.buildNativeModel();
-      const docTokenIds = Uint32Array.from(
-        tokens
-          .map((token) => nativeModel.tokenToId.get(token))
-          .filter((id): id is number => id !== undefined && id >= 0),
-      );
-      const scores = naiveBayesLogScoresIdsNative({
-        docTokenIds,
-        vocabSize: nativeModel.vocabSize,
-        tokenCountsMatrix: nativeModel.tokenCountsMatrix,
-        labelDocCounts: nativeModel.labelDocCounts,
-        labelTokenTotals: nativeModel.labelTokenTotals,
-        totalDocs: nativeModel.totalDocs,
-        smoothing: nativeModel.smoothing,
-      });
-      return nativeModel.labels
-        .map((label, idx) => ({ label, logProb: scores[idx]! }))
-        .sort((a, b) => b.logProb - a.logProb);
-    } catch {
-      return this.predictJs(tokens, labels);
-    }
+  /** Tokenizes and scores every text in one native call; rows are ranked like `predict`. */
+  predictBatch(texts: string[]): NaiveBayesPrediction[][] {
+    if (this.state.labelDocCounts.size === 0) return texts.map(() => []);
+    const model = this.buildModel();
+    const scores = this.scoreBatch(model, texts);
+    const labelCount = model.labels.length;
+    return texts.map((_, d) =>
+      model.labels
+        .map((label, idx) => ({ label, logProb: scores[d * labelCount + idx]! }))
+        .sort((a, b) => b.logProb - a.logProb),
+    );
   }
 
-  private predictJs(tokens: string[], labels: string[]): NaiveBayesPrediction[] {
-    const smoothing = this.state.smoothing;
-    const vocabSize = Math.max(1, this.state.vocabulary.size);
-    const totalDocs = Math.max(1, this.state.totalDocs);
-    const scores: NaiveBayesPrediction[] = [];
-    for (const label of labels) {
-      const docCount = this.state.labelDocCounts.get(label) ?? 0;
-      const labelPrior = Math.log((docCount + smoothing) / (totalDocs + smoothing * labels.length));
-      const tokenCounts = this.state.tokenCountsByLabel.get(label)!;
-      const tokenTotal = this.state.labelTokenTotals.get(label) ?? 0;
-      const denom = tokenTotal + smoothing * vocabSize;
-      let logProb = labelPrior;
-      for (const token of tokens) {
-        const count = tokenCounts.get(token) ?? 0;
-        logProb += Math.log((count + smoothing) / denom);
+  classifyBatch(texts: string[]): string[] {
+    if (this.state.labelDocCounts.size === 0) throw new Error("classifier has no labels");
+    const model = this.buildModel();
+    const scores = this.scoreBatch(model, texts);
+    const labelCount = model.labels.length;
+    return texts.map((_, d) => {
+      let best = 0;
+      for (let l = 1; l < labelCount; l += 1) {
+        if (scores[d * labelCount + l]! > scores[d * labelCount + best]!) best = l;
       }
-      scores.push({ label, logProb });
-    }
-    return scores.sort((a, b) => b.logProb - a.logProb);
+      return model.labels[best]!;
+    });
   }
 
-  private buildNativeModel(): NativeNaiveBayesModel {
-    if (this.nativeModel) return this.nativeModel;
-    const labels = this.labels();
-    if (labels.length === 0) throw new Error("classifier has no labels");
-    const vocabulary = [...this.state.vocabulary].sort((a, b) => a.localeCompare(b));
-    const tokenToId = new Map(vocabulary.map((token, idx) => [token, idx]));
-    const vocabSize = Math.max(1, vocabulary.length);
-    const tokenCountsMatrix = new Uint32Array(labels.length * vocabSize);
-    const labelDocCounts = new Uint32Array(labels.length);
-    const labelTokenTotals = new Uint32Array(labels.length);
-
-    for (let l = 0; l < labels.length; l += 1) {
-      const label = labels[l]!;
-      const row = this.state.tokenCountsByLabel.get(label) ?? new Map<string, number>();
-      labelDocCounts[l] = this.state.labelDocCounts.get(label) ?? 0;
-      labelTokenTotals[l] = this.state.labelTokenTotals.get(label) ?? 0;
-      for (const [token, count] of row) {
-        const tokId = tokenToId.get(token);
-        if (tokId === undefined) continue;
-        tokenCountsMatrix[l * vocabSize + tokId] = count;
+  private scoreBatch(model: SparseNaiveBayesModel, texts: string[]): Float64Array {
+    const docOffsets = new Uint32Array(texts.length + 1);
+    const ids: number[] = [];
+    for (let d = 0; d < texts.length; d += 1) {
+      for (const token of tokenize(texts[d]!)) {
+        const id = model.tokenToId.get(token);
+        if (id !== undefined) ids.push(id);
       }
+      docOffsets[d + 1] = ids.length;
+    }
+    const docTokenIds = Uint32Array.from(ids);
+    const arrays = model.arrays(this.state);
+    try {
+      return naiveBayesSparseLogScoresBatchNative({ docOffsets, docTokenIds, ...arrays });
+    } catch {
+      return scoreBatchJs(arrays, docOffsets, docTokenIds);
     }
+  }
 
-    this.nativeModel = {
-      labels,
-      tokenToId,
-      vocabSize,
-      tokenCountsMatrix,
-      labelDocCounts,
-      labelTokenTotals,
-      totalDocs: this.state.totalDocs,
-      smoothing: this.state.smoothing,
-    };
-    return this.nativeModel;
+  private buildModel(): SparseNaiveBayesModel {
+    if (this.state.labelDocCounts.size === 0) throw new Error("classifier has no labels");
+    this.model ??= SparseNaiveBayesModel.fromState(this.state);
+    return this.model;
   }
 
   evaluate(examples: NaiveBayesExample[]): { accuracy: number; total: number; correct: number } {
     let correct = 0;
-    for (const row of examples) {
-      if (this.classify(row.text) === row.label) correct += 1;
+    const predicted = examples.length === 0 ? [] : this.classifyBatch(examples.map((row) => row.text));
+    for (let i = 0; i < examples.length; i += 1) {
+      if (predicted[i] === examples[i]!.label) correct += 1;
     }
     const total = examples.length;
     return {
@@ -20,22 +20,21 @@ export type FeatureCfgGrammar = {
   productions: FeatureProduction[];
 };
 
-type FeatureParseResult = {
-  tree: ParseTree;
-  next: number;
-  features: FeatureMap;
-  env: Map<string, string>;
-};
+type Bindings = ReadonlyMap<string, string>;
+
+const EMPTY_BINDINGS: Bindings = new Map<string, string>();
 
 function isVariable(value: string): boolean {
   return value.startsWith("?");
 }
 
-function cloneEnv(env: Map<string, string>): Map<string, string> {
-  return new Map(env);
+function bindVariable(env: Bindings, name: string, value: string): Bindings {
+  const next = new Map(env);
+  next.set(name, value);
+  return next;
 }
 
-function resolveValue(value: string, env: Map<string, string>): string {
+function resolveValue(value: string, env: Bindings): string {
   let current = value;
   let depth = 0;
   while (isVariable(current) && env.has(current) && depth < 32) {
@@ -47,34 +46,43 @@ function resolveValue(value: string, env: Map<string, string>): string {
   return current;
 }
 
-function unifyTerms(left: string, right: string, env: Map<string, string>): boolean {
+function unifyTerms(left: string, right: string, env: Bindings): Bindings | null {
   const l = resolveValue(left, env);
   const r = resolveValue(right, env);
-  if (isVariable(l) && isVariable(r)) {
-    if (l !== r) env.set(r, l);
-    return true;
-  }
-  if (isVariable(l)) {
-    env.set(l, r);
-    return true;
-  }
-  if (isVariable(r)) {
-    env.set(r, l);
-    return true;
-  }
-  return l === r;
+  if (isVariable(l) && isVariable(r)) return l === r ? env : bindVariable(env, r, l);
+  if (isVariable(l)) return bindVariable(env, l, r);
+  if (isVariable(r)) return bindVariable(env, r, l);
+  return l === r ? env : null;
 }
 
-function unifyConstraints(pattern: FeatureMap, constraints: FeatureMap, env: Map<string, string>): boolean {
+function unifyConstraints(pattern: FeatureMap, constraints: FeatureMap, env: Bindings): Bindings | null {
+  let out: Bindings | null = env;
   for (const [key, expected] of Object.entries(constraints)) {
     const p = pattern[key];
-    if (p === undefined) return false;
-    if (!unifyTerms(p, expected, env)) return false;
+    if (p === undefined) return null;
+    out = unifyTerms(p, expected, out);
+    if (!out) return null;
+  }
+  return out;
+}
+
+function bindingDelta(before: Bindings, after: Bindings): Array<[string, string]> {
+  if (before === after) return [];
+  const out: Array<[string, string]> = [];
+  for (const [name, value] of after) {
+    if (before.get(name) !== value) out.push([name, value]);
   }
-  return true;
+  return out;
 }
 
-function resolveFeatureMap(symbol: FeatureSymbol, env: Map<string, string>, constraints?: FeatureMap): FeatureMap {
+function applyDelta(env: Bindings, delta: Array<[string, string]>): Bindings {
+  if (delta.length === 0) return env;
+  const next = new Map(env);
+  for (const [name, value] of delta) next.set(name, value);
+  return next;
+}
+
+function resolveFeatureMap(symbol: FeatureSymbol, env: Bindings, constraints?: FeatureMap): FeatureMap {
   const out: FeatureMap = {};
   for (const [key, value] of Object.entries(symbol.features)) {
     out[key] = resolveValue(value, env);
@@ -166,6 +174,68 @@ export function parseFeatureCfgGrammar(grammarText: string, options?: { startSym
   return { startSymbol, productions };
 }
 
+type FeatureGrammarPlan = {
+  productions: FeatureProduction[];
+  productionCount: number;
+  rulesByBase: Map<string, FeatureProduction[]>;
+  variablesByBase: Map<string, string[]>;
+};
+
+const featurePlans = new WeakMap<FeatureCfgGrammar, FeatureGrammarPlan>();
+
+function buildFeaturePlan(grammar: FeatureCfgGrammar): FeatureGrammarPlan {
+  const cached = featurePlans.get(grammar);
+  if (cached && cached.productions === grammar.productions && cached.productionCount === grammar.productions.length) {
+    return cached;
+  }
+  const rulesByBase = new Map<string, FeatureProduction[]>();
+  for (const prod of grammar.productions) {
+    const rows = rulesByBase.get(prod.lhs.base) ?? [];
+    rows.push(prod);
+    rulesByBase.set(prod.lhs.base, rows);
+  }
+
+  // Variables are not renamed per production, so a sub-derivation depends on the bindings
+  // of every variable reachable from its symbol; those become part of the memo key.
+  const variablesByBase = new Map<string, string[]>();
+  for (const base of rulesByBase.keys()) {
+    const vars = new Set<string>();
+    const queue = [base];
+    const seen = new Set(queue);
+    for (let idx = 0; idx < queue.length; idx += 1) {
+      for (const prod of rulesByBase.get(queue[idx]!) ?? []) {
+        for (const sym of [prod.lhs, ...prod.rhs]) {
+          for (const value of Object.values(sym.features)) {
+            if (isVariable(value)) vars.add(value);
+          }
+          if (!sym.terminal && !seen.has(sym.base)) {
+            seen.add(sym.base);
+            queue.push(sym.base);
+          }
+        }
+      }
+    }
+    variablesByBase.set(base, [...vars].sort());
+  }
+
+  const plan = { productions: grammar.productions, productionCount: grammar.productions.length, rulesByBase, variablesByBase };
+  featurePlans.set(grammar, plan);
+  return plan;
+}
+
+type FeatureEdge = {
+  tree: ParseTree;
+  treeId: number;
+  next: number;
+  features: FeatureMap;
+  delta: Array<[string, string]>;
+};
+
+type FeatureMatch = {
+  edge: FeatureEdge;
+  env: Bindings;
+};
+
 export function featureChartParse(
   tokens: string[],
   grammar: FeatureCfgGrammar,
@@ -177,37 +247,47 @@ export function featureChartParse(
     typeof options.startSymbol === "string"
       ? parseSymbol(options.startSymbol)
       : (options.startSymbol ?? grammar.startSymbol);
+  const plan = buildFeaturePlan(grammar);
+
+  // Trees are hash-consed on (label, child IDs), so equal derivations share one object.
+  const treeIds = new Map<string, number>();
+  const treesById: ParseTree[] = [];
+  const internTree = (label: string, children: Array<ParseTree | string>, keys: string[]): number => {
+    const key = `${label}\u0001${keys.join("\u0002")}`;
+    let id = treeIds.get(key);
+    if (id === undefined) {
+      id = treesById.length;
+      treesById.push({ label, children });
+      treeIds.set(key, id);
+    }
+    return id;
+  };
 
-  const rulesByBase = new Map<string, FeatureProduction[]>();
-  for (const prod of grammar.productions) {
-    const rows = rulesByBase.get(prod.lhs.base) ?? [];
-    rows.push(prod);
-    rulesByBase.set(prod.lhs.base, rows);
-  }
+  const memo = new Map<string, FeatureEdge[]>();
+  const growing = new Map<string, FeatureEdge[]>();
+  const seedReads: Array<Set<string>> = [];
+  let depthCuts = 0;
+
+  const memoKey = (base: string, constraints: FeatureMap, index: number, env: Bindings): string => {
+    const parts = [base, String(index)];
+    for (const [key, value] of Object.entries(constraints)) parts.push(`${key}=${resolveValue(value, env)}`);
+    parts.push("");
+    for (const name of plan.variablesByBase.get(base) ?? []) parts.push(`${name}=${resolveValue(name, env)}`);
+    return parts.join("\u0001");
+  };
 
-  const recursionGuard = new Map<string, number>();
+  const withEnv = (edges: FeatureEdge[], env: Bindings): FeatureMatch[] =>
+    edges.map((edge) => ({ edge, env: applyDelta(env, edge.delta) }));
 
-  const parseNonterminal = (
-    base: string,
-    constraints: FeatureMap,
-    index: number,
-    env: Map<string, string>,
-    depth: number,
-  ): FeatureParseResult[] => {
-    if (depth > maxDepth) return [];
-    const key = `${base}@${index}`;
-    const seen = recursionGuard.get(key) ?? 0;
-    if (seen > 3) return [];
-    recursionGuard.set(key, seen + 1);
-
-    const out: FeatureParseResult[] = [];
+  const expand = (base: string, constraints: FeatureMap, index: number, env: Bindings, depth: number): FeatureEdge[] => {
+    const out: FeatureEdge[] = [];
     const dedupe = new Set<string>();
-    for (const prod of rulesByBase.get(base) ?? []) {
-      const env0 = cloneEnv(env);
-      if (!unifyConstraints(prod.lhs.features, constraints, env0)) continue;
+    for (const prod of plan.rulesByBase.get(base) ?? []) {
+      const env0 = unifyConstraints(prod.lhs.features, constraints, env);
+      if (!env0) continue;
 
-      type SeqState = { next: number; children: Array<ParseTree | string>; env: Map<string, string> };
-      let states: SeqState[] = [{ next: index, children: [], env: env0 }];
+      type SeqState = { next: number; children: Array<ParseTree | string>; keys: string[]; env: Bindings };
+      let states: SeqState[] = [{ next: index, children: [], keys: [], env: env0 }];
       for (const rhsSym of prod.rhs) {
         const nextStates: SeqState[] = [];
         for (const state of states) {
@@ -216,17 +296,18 @@ export function featureChartParse(
               nextStates.push({
                 next: state.next + 1,
                 children: [...state.children, rhsSym.base],
+                keys: [...state.keys, `'${rhsSym.base}`],
                 env: state.env,
               });
             }
             continue;
           }
 
-          const childResults = parseNonterminal(rhsSym.base, rhsSym.features, state.next, cloneEnv(state.env), depth + 1);
-          for (const child of childResults) {
+          for (const child of parseNonterminal(rhsSym.base, rhsSym.features, state.next, state.env, depth + 1)) {
             nextStates.push({
-              next: child.next,
-              children: [...state.children, child.tree],
+              next: child.edge.next,
+              children: [...state.children, child.edge.tree],
+              keys: [...state.keys, `#${child.edge.treeId}`],
               env: child.env,
             });
           }
@@ -240,30 +321,61 @@ export function featureChartParse(
 
       for (const state of states) {
         const features = resolveFeatureMap(prod.lhs, state.env, constraints);
-        const tree: ParseTree = {
-          label: featureLabel(base, features),
-          children: state.children,
-        };
-        const dkey = `${state.next}\u0001${JSON.stringify(tree)}`;
-        if (!dedupe.has(dkey)) {
-          dedupe.add(dkey);
-          out.push({
-            tree,
-            next: state.next,
-            features,
-            env: state.env,
-          });
-        }
+        const treeId = internTree(featureLabel(base, features), state.children, state.keys);
+        const dkey = `${state.next}\u0001${treeId}`;
+        if (dedupe.has(dkey)) continue;
+        dedupe.add(dkey);
+        out.push({ tree: treesById[treeId]!, treeId, next: state.next, features, delta: bindingDelta(env, state.env) });
       }
     }
-
-    recursionGuard.set(key, seen);
     return out.slice(0, maxTrees * 8);
   };
 
-  const parsed = parseNonterminal(start.base, start.features, 0, new Map<string, string>(), 0)
-    .filter((row) => row.next === tokens.length)
-    .map((row) => row.tree);
+  const parseNonterminal = (
+    base: string,
+    constraints: FeatureMap,
+    index: number,
+    env: Bindings,
+    depth: number,
+  ): FeatureMatch[] => {
+    if (depth > maxDepth) {
+      depthCuts += 1;
+      return [];
+    }
+    const key = memoKey(base, constraints, index, env);
+    const cached = memo.get(key);
+    if (cached) return withEnv(cached, env);
+    const seed = growing.get(key);
+    if (seed) {
+      seedReads[seedReads.length - 1]?.add(key);
+      return withEnv(seed, env);
+    }
+
+    // Left recursion: start from an empty seed and re-expand until the edge list stops growing.
+    growing.set(key, []);
+    const cutsBefore = depthCuts;
+    let edges: FeatureEdge[];
+    let reads: Set<string>;
+    for (;;) {
+      reads = new Set<string>();
+      seedReads.push(reads);
+      edges = expand(base, constraints, index, env, depth);
+      seedReads.pop();
+      if (!reads.has(key) || edges.length <= growing.get(key)!.length) break;
+      growing.set(key, edges);
+    }
+    growing.delete(key);
+    reads.delete(key);
+    const parent = seedReads[seedReads.length - 1];
+    if (parent) for (const read of reads) parent.add(read);
+    // Edges built from an unfinished seed or a depth cut are only valid for this call.
+    if (reads.size === 0 && depthCuts === cutsBefore) memo.set(key, edges);
+    return withEnv(edges, env);
+  };
+
+  const parsed = parseNonterminal(start.base, start.features, 0, EMPTY_BINDINGS, 0)
+    .filter((row) => row.edge.next === tokens.length)
+    .map((row) => row.edge.tree);
   return parsed.slice(0, maxTrees);
 }
 
@@ -1,8 +1,17 @@
+import { hashNgramFeaturesBatchAsciiNative } from "./native";
+
 export type SparseVector = {
   indices: Uint32Array;
   values: Float64Array;
 };
 
+/** Rows packed as CSR: row `d` owns `featureIds`/`featureValues[docOffsets[d]..docOffsets[d + 1]]`. */
+export type SparseBatch = {
+  docOffsets: Uint32Array;
+  featureIds: Uint32Array;
+  featureValues: Float64Array;
+};
+
 export type VectorizerSerialized = {
   version: number;
   ngramMin: number;
@@ -10,6 +19,11 @@ export type VectorizerSerialized = {
   binary: boolean;
   maxFeatures: number;
   vocabulary: string[];
+  hashDimension?: number;
+  signedHash?: boolean;
+  fitBudget?: number;
+  minDf?: number;
+  maxDf?: number;
 };
 
 export type VectorizerOptions = {
@@ -17,8 +31,42 @@ export type VectorizerOptions = {
   ngramMax?: number;
   binary?: boolean;
   maxFeatures?: number;
+  /** Hash n-grams into this many buckets instead of fitting a vocabulary. */
+  hashDimension?: number;
+  /** With `hashDimension`, give each n-gram a hash-derived +1/-1 sign so collisions tend to cancel. */
+  signedHash?: boolean;
+  /** Most n-grams tracked while fitting; beyond it counts are pruned Misra-Gries style. Default: unbounded. */
+  fitBudget?: number;
+  /** Drop features seen in fewer documents (a fraction of documents when below 1). */
+  minDf?: number;
+  /** Drop features seen in more documents (a fraction of documents when at most 1). */
+  maxDf?: number;
+};
+
+export type VocabularyFitterOptions = {
+  ngramMin?: number;
+  ngramMax?: number;
+  budget?: number;
+  minDf?: number;
+  maxDf?: number;
+};
+
+export type VocabularyFitterSerialized = {
+  version: number;
+  ngramMin: number;
+  ngramMax: number;
+  budget: number | null;
+  minDf: number;
+  maxDf: number;
+  documentCount: number;
+  errorBound: number;
+  features: Array<[string, number, number]>;
 };
 
+const MAX_HASH_DIMENSION = 2 ** 31;
+const FNV_OFFSET_32 = 0x811c9dc5;
+const FNV_PRIME_32 = 0x01000193;
+
 const TOKEN_RE = /[A-Za-z0-9']+/g;
 
 function tokenize(text: string): string[] {
@@ -38,18 +86,244 @@ function pushNgrams(tokens: string[], minN: number, maxN: number, out: string[])
   }
 }
 
+function tokenHash(token: string): number {
+  let hash = FNV_OFFSET_32;
+  for (let i = 0; i < token.length; i += 1) hash = Math.imul(hash ^ token.charCodeAt(i), FNV_PRIME_32);
+  return hash >>> 0;
+}
+
+// Mirrors `ngramHash` in zig/src/core/features.zig: FNV-1a over n and the token hashes, then the murmur3 finalizer.
+function ngramHash(tokenHashes: number[], start: number, n: number): number {
+  let hash = Math.imul(FNV_OFFSET_32 ^ n, FNV_PRIME_32);
+  for (let i = start; i < start + n; i += 1) hash = Math.imul(hash ^ tokenHashes[i]!, FNV_PRIME_32);
+  hash ^= hash >>> 16;
+  hash = Math.imul(hash, 0x85ebca6b);
+  hash ^= hash >>> 13;
+  hash = Math.imul(hash, 0xc2b2ae35);
+  hash ^= hash >>> 16;
+  return hash >>> 0;
+}
+
+class SparseBatchBuilder {
+  private readonly offsets: number[] = [0];
+  private readonly ids: number[] = [];
+  private readonly values: number[] = [];
+
+  /** Appends one row from an id -> value map, sorted by id; zero values are dropped. */
+  pushRow(row: Map<number, number>, binary: boolean): void {
+    const ids = [...row.keys()].sort((a, b) => a - b);
+    for (const id of ids) {
+      const value = row.get(id)!;
+      if (value === 0) continue;
+      this.ids.push(id);
+      this.values.push(binary ? Math.sign(value) : value);
+    }
+    this.offsets.push(this.ids.length);
+  }
+
+  finish(): SparseBatch {
+    return {
+      docOffsets: Uint32Array.from(this.offsets),
+      featureIds: Uint32Array.from(this.ids),
+      featureValues: Float64Array.from(this.values),
+    };
+  }
+}
+
+function encodeTexts(texts: string[]): { bytes: Uint8Array; docOffsets: Uint32Array } {
+  const encoder = new TextEncoder();
+  const docOffsets = new Uint32Array(texts.length + 1);
+  const bytes = new Uint8Array(texts.reduce((sum, text) => sum + text.length * 3, 0));
+  let cursor = 0;
+  for (let i = 0; i < texts.length; i += 1) {
+    docOffsets[i] = cursor;
+    cursor += encoder.encodeInto(texts[i]!, bytes.subarray(cursor)).written;
+  }
+  docOffsets[texts.length] = cursor;
+  return { bytes: bytes.subarray(0, cursor), docOffsets };
+}
+
+function batchRow(batch: SparseBatch, row: number): SparseVector {
+  const start = batch.docOffsets[row]!;
+  const end = batch.docOffsets[row + 1]!;
+  return { indices: batch.featureIds.subarray(start, end), values: batch.featureValues.subarray(start, end) };
+}
+
+function rankFeatures(counts: Map<string, number>, keep: (feature: string) => boolean, limit: number): string[] {
+  return [...counts.entries()]
+    .filter(([feature]) => keep(feature))
+    .sort((a, b) => b[1] - a[1] || a[0].localeCompare(b[0]))
+    .slice(0, limit)
+    .map(([feature]) => feature);
+}
+
+/**
+ * Streaming n-gram vocabulary fitter with a bounded memory budget. Counts are exact until more
+ * than `2 * budget` n-grams are tracked; then every count is reduced by the `(budget + 1)`-th
+ * largest one and non-positive entries are dropped (Misra-Gries), so any n-gram occurring more
+ * than `errorBound` times survives and every count is undercounted by at most `errorBound`.
+ * Fitters over different shards combine with `merge`, which applies the same pruning.
+ */
+export class StreamingVocabularyFitter {
+  readonly ngramMin: number;
+  readonly ngramMax: number;
+  readonly budget: number;
+  readonly minDf: number;
+  readonly maxDf: number;
+  private docs = 0;
+  private pruned = 0;
+  private readonly counts = new Map<string, number>();
+  private readonly docFreq: Map<string, number> | null;
+
+  constructor(options: VocabularyFitterOptions = {}) {
+    this.ngramMin = Math.max(1, Math.floor(options.ngramMin ?? 1));
+    this.ngramMax = Math.max(this.ngramMin, Math.floor(options.ngramMax ?? 1));
+    this.budget = Math.max(1, Math.floor(options.budget ?? Number.POSITIVE_INFINITY));
+    this.minDf = Math.max(0, options.minDf ?? 1);
+    this.maxDf = Math.max(0, options.maxDf ?? 1);
+    // The defaults (at least one document, at most all of them) never filter, so skip df tracking.
+    this.docFreq = (this.minDf > 0 && this.minDf !== 1) || this.maxDf !== 1 ? new Map() : null;
+  }
+
+  static fromJSON(payload: VocabularyFitterSerialized): StreamingVocabularyFitter {
+    if (payload.version !== 1) throw new Error(`unsupported vocabulary fitter version: ${payload.version}`);
+    const fitter = new StreamingVocabularyFitter({
+      ngramMin: payload.ngramMin,
+      ngramMax: payload.ngramMax,
+      budget: payload.budget ?? undefined,
+      minDf: payload.minDf,
+      maxDf: payload.maxDf,
+    });
+    fitter.docs = payload.documentCount;
+    fitter.pruned = payload.errorBound;
+    for (const [feature, count, df] of payload.features) {
+      fitter.counts.set(feature, count);
+      fitter.docFreq?.set(feature, df);
+    }
+    return fitter;
+  }
+
+  get documentCount(): number {
+    return this.docs;
+  }
+
+  /** Upper bound on how far any tracked count (and document frequency) may be undercounted. */
+  get errorBound(): number {
+    return this.pruned;
+  }
+
+  get trackedFeatures(): number {
+    return this.counts.size;
+  }
+
+  partialFit(texts: Iterable<string>): this {
+    const feats: string[] = [];
+    const seen = new Set<string>();
+    for (const text of texts) {
+      feats.length = 0;
+      pushNgrams(tokenize(text), this.ngramMin, this.ngramMax, feats);
+      for (const feat of feats) this.counts.set(feat, (this.counts.get(feat) ?? 0) + 1);
+      if (this.docFreq) {
+        seen.clear();
+        for (const feat of feats) {
+          if (seen.has(feat)) continue;
+          seen.add(feat);
+          this.docFreq.set(feat, (this.docFreq.get(feat) ?? 0) + 1);
+        }
+      }
+      this.docs += 1;
+      if (this.counts.size > 2 * this.budget) this.prune();
+    }
+    return this;
+  }
+
+  merge(other: StreamingVocabularyFitter): this {
+    if (other.ngramMin !== this.ngramMin || other.ngramMax !== this.ngramMax) {
+      throw new Error("cannot merge vocabulary fitters with different n-gram ranges");
+    }
+    if (other.minDf !== this.minDf || other.maxDf !== this.maxDf) {
+      throw new Error("cannot merge vocabulary fitters with different document-frequency thresholds");
+    }
+    for (const [feature, count] of other.counts) this.counts.set(feature, (this.counts.get(feature) ?? 0) + count);
+    if (this.docFreq) {
+      for (const [feature, df] of other.docFreq!) this.docFreq.set(feature, (this.docFreq.get(feature) ?? 0) + df);
+    }
+    this.docs += other.docs;
+    this.pruned += other.pruned;
+    if (this.counts.size > 2 * this.budget) this.prune();
+    return this;
+  }
+
+  /** The `maxFeatures` most frequent n-grams passing the document-frequency thresholds. */
+  finalize(maxFeatures: number): string[] {
+    const minDocs = this.minDf < 1 ? this.minDf * this.docs : this.minDf;
+    const maxDocs = this.maxDf <= 1 ? this.maxDf * this.docs : this.maxDf;
+    const docFreq = this.docFreq;
+    // Pruned features may have lost up to `errorBound` documents, so the minimum is checked
+    // against that upper estimate; both checks are exact until the first prune.
+    const keep = docFreq
+      ? (feature: string) => {
+          const df = docFreq.get(feature) ?? 0;
+          return df + this.pruned >= minDocs && df <= maxDocs;
+        }
+      : () => true;
+    return rankFeatures(this.counts, keep, Math.max(0, Math.floor(maxFeatures)));
+  }
+
+  toJSON(): VocabularyFitterSerialized {
+    return {
+      version: 1,
+      ngramMin: this.ngramMin,
+      ngramMax: this.ngramMax,
+      budget: Number.isFinite(this.budget) ? this.budget : null,
+      minDf: this.minDf,
+      maxDf: this.maxDf,
+      documentCount: this.docs,
+      errorBound: this.pruned,
+      features: [...this.counts.entries()].map(([feature, count]) => [feature, count, this.docFreq?.get(feature) ?? 0]),
+    };
+  }
+
+  private prune(): void {
+    const sorted = Float64Array.from(this.counts.values()).sort().reverse();
+    const threshold = sorted[this.budget] ?? 0;
+    if (threshold <= 0) return;
+    for (const [feature, count] of this.counts) {
+      if (count <= threshold) {
+        this.counts.delete(feature);
+        this.docFreq?.delete(feature);
+      } else {
+        this.counts.set(feature, count - threshold);
+      }
+    }
+    this.pruned += threshold;
+  }
+}
+
 export class TextFeatureVectorizer {
   readonly ngramMin: number;
   readonly ngramMax: number;
   readonly binary: boolean;
   readonly maxFeatures: number;
+  /** Number of hash buckets, or 0 when features come from a fitted vocabulary. */
+  readonly hashDimension: number;
+  readonly signedHash: boolean;
+  readonly fitBudget: number | undefined;
+  readonly minDf: number | undefined;
+  readonly maxDf: number | undefined;
   private readonly featureToId = new Map<string, number>();
+  private fitter: StreamingVocabularyFitter | null = null;
 
   constructor(options: VectorizerOptions = {}) {
     this.ngramMin = Math.max(1, Math.floor(options.ngramMin ?? 1));
     this.ngramMax = Math.max(this.ngramMin, Math.floor(options.ngramMax ?? 1));
     this.binary = options.binary ?? false;
     this.maxFeatures = Math.max(64, Math.floor(options.maxFeatures ?? 12000));
+    this.hashDimension = Math.min(MAX_HASH_DIMENSION, Math.max(0, Math.floor(options.hashDimension ?? 0)));
+    this.signedHash = this.hashDimension > 0 && (options.signedHash ?? false);
+    this.fitBudget = options.fitBudget;
+    this.minDf = options.minDf;
+    this.maxDf = options.maxDf;
   }
 
   static fromJSON(payload: VectorizerSerialized): TextFeatureVectorizer {
@@ -59,13 +333,18 @@ export class TextFeatureVectorizer {
       ngramMax: payload.ngramMax,
       binary: payload.binary,
       maxFeatures: payload.maxFeatures,
+      hashDimension: payload.hashDimension,
+      signedHash: payload.signedHash,
+      fitBudget: payload.fitBudget,
+      minDf: payload.minDf,
+      maxDf: payload.maxDf,
     });
     for (const feature of payload.vocabulary) vec.featureToId.set(feature, vec.featureToId.size);
     return vec;
   }
 
   get featureCount(): number {
-    return this.featureToId.size;
+    return this.hashDimension > 0 ? this.hashDimension : this.featureToId.size;
   }
 
   vocabulary(): string[] {
@@ -75,24 +354,50 @@ export class TextFeatureVectorizer {
   }
 
   fit(texts: string[]): this {
-    const counts = new Map<string, number>();
-    for (const text of texts) {
-      const tokens = tokenize(text);
-      const feats: string[] = [];
-      pushNgrams(tokens, this.ngramMin, this.ngramMax, feats);
-      for (const feat of feats) counts.set(feat, (counts.get(feat) ?? 0) + 1);
-    }
+    if (this.hashDimension > 0) return this;
+    this.fitter = null;
+    return this.partialFit(texts).finalize();
+  }
 
-    const ranked = [...counts.entries()]
-      .sort((a, b) => b[1] - a[1] || a[0].localeCompare(b[0]))
-      .slice(0, this.maxFeatures);
+  /** Adds texts to a pending streaming fit; call `finalize` to replace the vocabulary. */
+  partialFit(texts: Iterable<string>): this {
+    if (this.hashDimension > 0) return this;
+    this.pendingFitter().partialFit(texts);
+    return this;
+  }
 
+  /** Merges another vectorizer's pending fit (for example, one per shard) into this one. */
+  mergeFit(other: TextFeatureVectorizer): this {
+    if (other.hashDimension !== this.hashDimension || other.signedHash !== this.signedHash) {
+      throw new Error("cannot merge vectorizers with different hashing configurations");
+    }
+    if (this.hashDimension > 0) return this;
+    if (other.fitter) this.pendingFitter().merge(other.fitter);
+    return this;
+  }
+
+  finalize(): this {
+    if (this.hashDimension > 0) return this;
+    const vocabulary = this.pendingFitter().finalize(this.maxFeatures);
+    this.fitter = null;
     this.featureToId.clear();
-    for (const [feature] of ranked) this.featureToId.set(feature, this.featureToId.size);
+    for (const feature of vocabulary) this.featureToId.set(feature, this.featureToId.size);
     return this;
   }
 
+  private pendingFitter(): StreamingVocabularyFitter {
+    this.fitter ??= new StreamingVocabularyFitter({
+      ngramMin: this.ngramMin,
+      ngramMax: this.ngramMax,
+      budget: this.fitBudget,
+      minDf: this.minDf,
+      maxDf: this.maxDf,
+    });
+    return this.fitter;
+  }
+
   transform(text: string): SparseVector {
+    if (this.hashDimension > 0) return batchRow(this.transformBatch([text]), 0);
     const tokens = tokenize(text);
     const feats: string[] = [];
     pushNgrams(tokens, this.ngramMin, this.ngramMax, feats);
@@ -113,9 +418,65 @@ export class TextFeatureVectorizer {
   }
 
   transformMany(texts: string[]): SparseVector[] {
+    if (this.hashDimension > 0) {
+      const batch = this.transformBatch(texts);
+      return texts.map((_, row) => batchRow(batch, row));
+    }
     return texts.map((text) => this.transform(text));
   }
 
+  /**
+   * Vectorizes every text straight into one CSR batch (the layout `linearScoresSparseIdsNative`
+   * takes). In hashing mode the texts are tokenized and hashed in a single native call.
+   */
+  transformBatch(texts: string[], options: { useNative?: boolean } = {}): SparseBatch {
+    if (this.hashDimension > 0 && options.useNative !== false) {
+      try {
+        return hashNgramFeaturesBatchAsciiNative({
+          ...encodeTexts(texts),
+          ngramMin: this.ngramMin,
+          ngramMax: this.ngramMax,
+          dimension: this.hashDimension,
+          signed: this.signedHash,
+          binary: this.binary,
+        });
+      } catch {
+        // Fall through to the JS path.
+      }
+    }
+
+    const out = new SparseBatchBuilder();
+    const row = new Map<number, number>();
+    for (const text of texts) {
+      row.clear();
+      if (this.hashDimension > 0) this.hashRow(tokenize(text), row);
+      else this.vocabularyRow(tokenize(text), row);
+      out.pushRow(row, this.binary);
+    }
+    return out.finish();
+  }
+
+  private hashRow(tokens: string[], row: Map<number, number>): void {
+    const hashes = tokens.map(tokenHash);
+    for (let n = this.ngramMin; n <= this.ngramMax && n <= hashes.length; n += 1) {
+      for (let i = 0; i + n <= hashes.length; i += 1) {
+        const hash = ngramHash(hashes, i, n);
+        const id = (hash & 0x7fffffff) % this.hashDimension;
+        const sign = this.signedHash && hash >>> 31 !== 0 ? -1 : 1;
+        row.set(id, (row.get(id) ?? 0) + sign);
+      }
+    }
+  }
+
+  private vocabularyRow(tokens: string[], row: Map<number, number>): void {
+    const feats: string[] = [];
+    pushNgrams(tokens, this.ngramMin, this.ngramMax, feats);
+    for (const feat of feats) {
+      const id = this.featureToId.get(feat);
+      if (id !== undefined) row.set(id, (row.get(id) ?? 0) + 1);
+    }
+  }
+
   toJSON(): VectorizerSerialized {
     return {
       version: 1,
@@ -124,15 +485,15 @@ export class TextFeatureVectorizer {
       binary: this.binary,
       maxFeatures: this.maxFeatures,
       vocabulary: this.vocabulary(),
+      ...(this.hashDimension > 0 ? { hashDimension: this.hashDimension, signedHash: this.signedHash } : {}),
+      ...(this.fitBudget !== undefined ? { fitBudget: this.fitBudget } : {}),
+      ...(this.minDf !== undefined ? { minDf: this.minDf } : {}),
+      ...(this.maxDf !== undefined ? { maxDf: this.maxDf } : {}),
     };
   }
 }
 
-export function flattenSparseBatch(rows: SparseVector[]): {
-  docOffsets: Uint32Array;
-  featureIds: Uint32Array;
-  featureValues: Float64Array;
-} {
+export function flattenSparseBatch(rows: SparseVector[]): SparseBatch {
   const offsets = new Uint32Array(rows.length + 1);
   let total = 0;
   for (let i = 0; i < rows.length; i += 1) {
@@ -0,0 +1,360 @@
+import { readFileSync } from "node:fs";
+import { resolve } from "node:path";
+import { FreqDist } from "./freqdist";
+import { osaDistanceIdsAsciiNative } from "./native";
+import { WordNet, type WordNetPos } from "./wordnet";
+
+export type FuzzyIndexOptions = {
+  maxDistance?: number;
+  prefixLength?: number;
+  pos?: WordNetPos;
+};
+
+export type FuzzyMatch = {
+  term: string;
+  distance: number;
+  count: number;
+};
+
+type FuzzyIndexParts = {
+  maxDistance: number;
+  prefixLength: number;
+  counts: Float64Array;
+  termOffsets: Uint32Array;
+  termBytes: Uint8Array;
+  deleteOffsets: Uint32Array;
+  deleteBytes: Uint8Array;
+  postingOffsets: Uint32Array;
+  postings: Uint32Array;
+};
+
+// Binary layout (little-endian):
+//   header: magic "BNFZ1\0\0\0", u32 version, max_distance, prefix_length, term_count, term_bytes,
+//           delete_count, delete_bytes, posting_count
+//   counts f64[term_count], term offsets u32[term_count + 1], delete offsets u32[delete_count + 1],
+//   posting offsets u32[delete_count + 1], postings u32[posting_count], term bytes, delete bytes
+// Delete variants are sorted by UTF-8 bytes and searched in place.
+const FUZZY_MAGIC = "BNFZ1";
+const FUZZY_HEADER_BYTES = 40;
+const HOST_LITTLE_ENDIAN = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+function compareBytes(left: Uint8Array, right: Uint8Array): number {
+  const n = Math.min(left.length, right.length);
+  for (let i = 0; i < n; i += 1) {
+    if (left[i] !== right[i]) return left[i]! - right[i]!;
+  }
+  return left.length - right.length;
+}
+
+function deleteVariants(chars: string[], maxDistance: number): Set<string> {
+  const out = new Set<string>([chars.join("")]);
+  let frontier = [chars];
+  for (let depth = 0; depth < maxDistance; depth += 1) {
+    const next: string[][] = [];
+    for (const item of frontier) {
+      for (let i = 0; i < item.length; i += 1) {
+        const variant = [...item.slice(0, i), ...item.slice(i + 1)];
+        const key = variant.join("");
+        if (out.has(key)) continue;
+        out.add(key);
+        next.push(variant);
+      }
+    }
+    frontier = next;
+  }
+  return out;
+}
+
+function osaDistanceBounded(a: string[], b: string[], maxDistance: number): number {
+  const over = maxDistance + 1;
+  if (Math.abs(a.length - b.length) > maxDistance) return over;
+  let prev2 = new Array<number>(b.length + 1).fill(0);
+  let prev = Array.from({ length: b.length + 1 }, (_, j) => j);
+  let cur = new Array<number>(b.length + 1).fill(0);
+  for (let i = 1; i <= a.length; i += 1) {
+    cur[0] = i;
+    let rowMin = i;
+    for (let j = 1; j <= b.length; j += 1) {
+      let best = Math.min(prev[j - 1]! + (a[i - 1] === b[j - 1] ? 0 : 1), prev[j]! + 1, cur[j - 1]! + 1);
+      if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) best = Math.min(best, prev2[j - 2]! + 1);
+      cur[j] = best;
+      rowMin = Math.min(rowMin, best);
+    }
+    if (rowMin > maxDistance) return over;
+    [prev2, prev, cur] = [prev, cur, prev2];
+  }
+  return Math.min(prev[b.length]!, over);
+}
+
+function isAsciiBytes(bytes: Uint8Array): boolean {
+  for (const value of bytes) {
+    if (value >= 0x80) return false;
+  }
+  return true;
+}
+
+function u32Section(bytes: Uint8Array, start: number, length: number): Uint32Array {
+  const byteOffset = bytes.byteOffset + start;
+  if (HOST_LITTLE_ENDIAN && byteOffset % 4 === 0) return new Uint32Array(bytes.buffer, byteOffset, length);
+  const view = new DataView(bytes.buffer, byteOffset, length * 4);
+  return Uint32Array.from({ length }, (_, i) => view.getUint32(i * 4, true));
+}
+
+function f64Section(bytes: Uint8Array, start: number, length: number): Float64Array {
+  const byteOffset = bytes.byteOffset + start;
+  if (HOST_LITTLE_ENDIAN && byteOffset % 8 === 0) return new Float64Array(bytes.buffer, byteOffset, length);
+  const view = new DataView(bytes.buffer, byteOffset, length * 8);
+  return Float64Array.from({ length }, (_, i) => view.getFloat64(i * 8, true));
+}
+
+export class FuzzyIndex {
+  readonly maxDistance: number;
+  readonly prefixLength: number;
+  private readonly counts: Float64Array;
+  private readonly termOffsets: Uint32Array;
+  private readonly termBytes: Uint8Array;
+  private readonly deleteOffsets: Uint32Array;
+  private readonly deleteBytes: Uint8Array;
+  private readonly postingOffsets: Uint32Array;
+  private readonly postings: Uint32Array;
+  private readonly decoder = new TextDecoder();
+  private readonly encoder = new TextEncoder();
+
+  private constructor(parts: FuzzyIndexParts) {
+    this.maxDistance = parts.maxDistance;
+    this.prefixLength = parts.prefixLength;
+    this.counts = parts.counts;
+    this.termOffsets = parts.termOffsets;
+    this.termBytes = parts.termBytes;
+    this.deleteOffsets = parts.deleteOffsets;
+    this.deleteBytes = parts.deleteBytes;
+    this.postingOffsets = parts.postingOffsets;
+    this.postings = parts.postings;
+  }
+
+  static fromCounts(counts: Map<string, number>, options: FuzzyIndexOptions = {}): FuzzyIndex {
+    const maxDistance = Math.max(0, Math.floor(options.maxDistance ?? 2));
+    const prefixLength = Math.max(maxDistance + 1, Math.floor(options.prefixLength ?? 7));
+    const encoder = new TextEncoder();
+    const terms = [...counts.keys()];
+    const encodedTerms = terms.map((term) => encoder.encode(term));
+    const variants = new Map<string, number[]>();
+    terms.forEach((term, id) => {
+      for (const variant of deleteVariants(Array.from(term).slice(0, prefixLength), maxDistance)) {
+        const bucket = variants.get(variant);
+        if (bucket) bucket.push(id);
+        else variants.set(variant, [id]);
+      }
+    });
+    const keys = [...variants.keys()].map((key) => ({ key, bytes: encoder.encode(key) }));
+    keys.sort((a, b) => compareBytes(a.bytes, b.bytes));
+
+    const termOffsets = new Uint32Array(terms.length + 1);
+    encodedTerms.forEach((bytes, i) => (termOffsets[i + 1] = termOffsets[i]! + bytes.length));
+    const termBytes = new Uint8Array(termOffsets[terms.length]!);
+    encodedTerms.forEach((bytes, i) => termBytes.set(bytes, termOffsets[i]!));
+
+    const deleteOffsets = new Uint32Array(keys.length + 1);
+    const postingOffsets = new Uint32Array(keys.length + 1);
+    keys.forEach((entry, i) => {
+      deleteOffsets[i + 1] = deleteOffsets[i]! + entry.bytes.length;
+      postingOffsets[i + 1] = postingOffsets[i]! + variants.get(entry.key)!.length;
+    });
+    const deleteBytes = new Uint8Array(deleteOffsets[keys.length]!);
+    const postings = new Uint32Array(postingOffsets[keys.length]!);
+    keys.forEach((entry, i) => {
+      deleteBytes.set(entry.bytes, deleteOffsets[i]!);
+      postings.set(variants.get(entry.key)!, postingOffsets[i]!);
+    });
+
+    return new FuzzyIndex({
+      maxDistance,
+      prefixLength,
+      counts: Float64Array.from(terms, (term) => counts.get(term)!),
+      termOffsets,
+      termBytes,
+      deleteOffsets,
+      deleteBytes,
+      postingOffsets,
+      postings,
+    });
+  }
+
+  static fromBytes(bytes: Uint8Array): FuzzyIndex {
+    const magic = new TextDecoder().decode(bytes.subarray(0, FUZZY_MAGIC.length));
+    if (magic !== FUZZY_MAGIC || bytes.length < FUZZY_HEADER_BYTES) throw new Error("invalid fuzzy index payload");
+    const header = new DataView(bytes.buffer, bytes.byteOffset, FUZZY_HEADER_BYTES);
+    const field = (i: number) => header.getUint32(8 + i * 4, true);
+    const [termCount, termByteCount, deleteCount, deleteByteCount, postingCount] = [3, 4, 5, 6, 7].map(field) as [
+      number,
+      number,
+      number,
+      number,
+      number,
+    ];
+    const total =
+      FUZZY_HEADER_BYTES +
+      termCount * 8 +
+      (termCount + 1 + (deleteCount + 1) * 2 + postingCount) * 4 +
+      termByteCount +
+      deleteByteCount;
+    if (bytes.length < total) throw new Error("invalid fuzzy index length");
+
+    let cursor = FUZZY_HEADER_BYTES;
+    const counts = f64Section(bytes, cursor, termCount);
+    cursor += termCount * 8;
+    const u32 = (length: number) => {
+      const out = u32Section(bytes, cursor, length);
+      cursor += length * 4;
+      return out;
+    };
+    const termOffsets = u32(termCount + 1);
+    const deleteOffsets = u32(deleteCount + 1);
+    const postingOffsets = u32(deleteCount + 1);
+    const postings = u32(postingCount);
+    const termBytes = bytes.subarray(cursor, cursor + termByteCount);
+    cursor += termByteCount;
+    const deleteBytes = bytes.subarray(cursor, cursor + deleteByteCount);
+    if (termOffsets[termCount] !== termByteCount || deleteOffsets[deleteCount] !== deleteByteCount) {
+      throw new Error("invalid fuzzy index offsets");
+    }
+    if (postingOffsets[deleteCount] !== postingCount || postings.some((id) => id >= termCount)) {
+      throw new Error("invalid fuzzy index postings");
+    }
+    return new FuzzyIndex({
+      maxDistance: field(1),
+      prefixLength: field(2),
+      counts,
+      termOffsets,
+      termBytes,
+      deleteOffsets,
+      deleteBytes,
+      postingOffsets,
+      postings,
+    });
+  }
+
+  get size(): number {
+    return this.counts.length;
+  }
+
+  toBytes(): Uint8Array {
+    const termCount = this.counts.length;
+    const deleteCount = this.deleteOffsets.length - 1;
+    const total =
+      FUZZY_HEADER_BYTES +
+      termCount * 8 +
+      (termCount + 1 + (deleteCount + 1) * 2 + this.postings.length) * 4 +
+      this.termBytes.length +
+      this.deleteBytes.length;
+    const out = new Uint8Array(total);
+    const view = new DataView(out.buffer);
+    out.set(new TextEncoder().encode(FUZZY_MAGIC), 0);
+    [
+      1,
+      this.maxDistance,
+      this.prefixLength,
+      termCount,
+      this.termBytes.length,
+      deleteCount,
+      this.deleteBytes.length,
+      this.postings.length,
+    ].forEach((value, i) => view.setUint32(8 + i * 4, value, true));
+
+    let cursor = FUZZY_HEADER_BYTES;
+    for (const value of this.counts) {
+      view.setFloat64(cursor, value, true);
+      cursor += 8;
+    }
+    for (const section of [this.termOffsets, this.deleteOffsets, this.postingOffsets, this.postings]) {
+      for (const value of section) {
+        view.setUint32(cursor, value, true);
+        cursor += 4;
+      }
+    }
+    out.set(this.termBytes, cursor);
+    out.set(this.deleteBytes, cursor + this.termBytes.length);
+    return out;
+  }
+
+  termAt(id: number): string {
+    return this.decoder.decode(this.termBytes.subarray(this.termOffsets[id]!, this.termOffsets[id + 1]!));
+  }
+
+  private findDelete(query: Uint8Array): number {
+    let lo = 0;
+    let hi = this.deleteOffsets.length - 2;
+    while (lo <= hi) {
+      const mid = (lo + hi) >>> 1;
+      const cmp = compareBytes(this.deleteBytes.subarray(this.deleteOffsets[mid]!, this.deleteOffsets[mid + 1]!), query);
+      if (cmp === 0) return mid;
+      if (cmp < 0) lo = mid + 1;
+      else hi = mid - 1;
+    }
+    return -1;
+  }
+
+  lookup(word: string, maxDistance = this.maxDistance, topK = 10, options: { useNative?: boolean } = {}): FuzzyMatch[] {
+    const limit = Math.min(this.maxDistance, Math.max(0, Math.floor(maxDistance)));
+    const chars = Array.from(word);
+    const seen = new Set<number>();
+    const candidates: number[] = [];
+    for (const variant of deleteVariants(chars.slice(0, this.prefixLength), limit)) {
+      const row = this.findDelete(this.encoder.encode(variant));
+      if (row < 0) continue;
+      for (let i = this.postingOffsets[row]!; i < this.postingOffsets[row + 1]!; i += 1) {
+        const id = this.postings[i]!;
+        if (seen.has(id)) continue;
+        seen.add(id);
+        candidates.push(id);
+      }
+    }
+
+    const query = this.encoder.encode(word);
+    const useNative = (options.useNative ?? true) && isAsciiBytes(query);
+    const nativeIds: number[] = [];
+    const matches: Array<FuzzyMatch & { id: number }> = [];
+    const accept = (id: number, distance: number) => {
+      if (distance <= limit) matches.push({ id, term: this.termAt(id), distance, count: this.counts[id]! });
+    };
+    for (const id of candidates) {
+      const bytes = this.termBytes.subarray(this.termOffsets[id]!, this.termOffsets[id + 1]!);
+      if (useNative && isAsciiBytes(bytes)) nativeIds.push(id);
+      else accept(id, osaDistanceBounded(chars, Array.from(this.termAt(id)), limit));
+    }
+    if (nativeIds.length > 0) {
+      const ids = Uint32Array.from(nativeIds);
+      const distances = osaDistanceIdsAsciiNative(query, this.termBytes, this.termOffsets, ids, limit);
+      ids.forEach((id, i) => accept(id, distances[i]!));
+    }
+
+    matches.sort((a, b) => a.distance - b.distance || b.count - a.count || a.id - b.id);
+    return matches.slice(0, Math.max(0, Math.floor(topK))).map(({ term, distance, count }) => ({ term, distance, count }));
+  }
+}
+
+export function buildFuzzyIndex(
+  source: WordNet | FreqDist<string> | Map<string, number> | Iterable<string>,
+  options: FuzzyIndexOptions = {},
+): FuzzyIndex {
+  const counts = new Map<string, number>();
+  if (source instanceof WordNet) {
+    for (const lemma of source.lemmas(options.pos)) counts.set(lemma, 1);
+  } else if (source instanceof FreqDist || source instanceof Map) {
+    for (const [term, count] of source.entries()) counts.set(term, count);
+  } else {
+    for (const term of source) counts.set(term, (counts.get(term) ?? 0) + 1);
+  }
+  return FuzzyIndex.fromCounts(counts, options);
+}
+
+export function loadFuzzyIndex(path: string): FuzzyIndex {
+  const sourcePath = resolve(path);
+  let bytes: Uint8Array;
+  try {
+    bytes = Bun.mmap(sourcePath, { shared: false });
+  } catch {
+    bytes = readFileSync(sourcePath);
+  }
+  return FuzzyIndex.fromBytes(bytes);
+}
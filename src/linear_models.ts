@@ -1,15 +1,36 @@
-import { flattenSparseBatch, TextFeatureVectorizer, type SparseVector, type VectorizerSerialized } from "./features";
-import { linearScoresSparseIdsNative } from "./native";
+import { flattenSparseBatch, TextFeatureVectorizer, type SparseBatch, type SparseVector, type VectorizerSerialized } from "./features";
+import {
+  linearScoresSparseIdsFeatureMajorNative,
+  linearScoresSparseIdsNative,
+  linearTrainSgdSparseNative,
+  type LinearSgdLoss,
+} from "./native";
 
 export type LinearModelExample = { label: string; text: string };
 
+export type LinearSolverOptions = {
+  solver?: "batch" | "sgd";
+  batchSize?: number;
+  seed?: number;
+  validationFraction?: number;
+  patience?: number;
+};
+
+type ResolvedSolverOptions = {
+  solver: "batch" | "sgd";
+  batchSize: number;
+  seed: number;
+  validationFraction: number;
+  patience: number;
+};
+
 export type LogisticSerialized = {
   version: number;
   labels: string[];
   vectorizer: VectorizerSerialized;
   weights: number[];
   bias: number[];
-  options: { epochs: number; learningRate: number; l2: number; maxFeatures: number; useNativeScoring?: boolean };
+  options: { epochs: number; learningRate: number; l2: number; maxFeatures: number; useNativeScoring?: boolean } & LinearSolverOptions;
 };
 
 export type LinearSvmSerialized = {
@@ -18,7 +39,7 @@ export type LinearSvmSerialized = {
   vectorizer: VectorizerSerialized;
   weights: number[];
   bias: number[];
-  options: { epochs: number; learningRate: number; l2: number; margin: number; maxFeatures: number; useNativeScoring?: boolean };
+  options: { epochs: number; learningRate: number; l2: number; margin: number; maxFeatures: number; useNativeScoring?: boolean } & LinearSolverOptions;
 };
 
 function sigmoid(x: number): number {
@@ -63,18 +84,6 @@ function scoreRowJs(
   return out;
 }
 
-function scoreBatchNativeOrJs(
-  rows: SparseVector[],
-  classCount: number,
-  featureCount: number,
-  weights: Float64Array,
-  bias: Float64Array,
-  preferNative = true,
-): Float64Array {
-  const batch = flattenSparseBatch(rows);
-  return scoreBatchFlatNativeOrJs(rows, batch, classCount, featureCount, weights, bias, preferNative);
-}
-
 function scoreBatchFlatNativeOrJs(
   rows: SparseVector[],
   batch: { docOffsets: Uint32Array; featureIds: Uint32Array; featureValues: Float64Array },
@@ -112,20 +121,278 @@ function scoreBatchFlatNativeOrJs(
   }
 }
 
+// Class-major (`weights[c * featureCount + f]`, the training and serialized layout) to
+// feature-major (`[f * classCount + c]`), so scoring reads one contiguous row per non-zero.
+function transposeWeights(weights: Float64Array, classCount: number, featureCount: number): Float64Array {
+  const out = new Float64Array(classCount * featureCount);
+  for (let c = 0; c < classCount; c += 1) {
+    const rowBase = c * featureCount;
+    for (let f = 0; f < featureCount; f += 1) out[f * classCount + c] = weights[rowBase + f]!;
+  }
+  return out;
+}
+
+function scoreBatchFeatureMajorNativeOrJs(
+  batch: SparseBatch,
+  classCount: number,
+  featureCount: number,
+  weights: Float64Array,
+  bias: Float64Array,
+  preferNative = true,
+): Float64Array {
+  if (preferNative) {
+    try {
+      return linearScoresSparseIdsFeatureMajorNative({ ...batch, classCount, featureCount, weights, bias });
+    } catch {
+      // Fall through to the JS scorer.
+    }
+  }
+  const docs = batch.docOffsets.length - 1;
+  const out = new Float64Array(docs * classCount);
+  for (let d = 0; d < docs; d += 1) {
+    const outBase = d * classCount;
+    out.set(bias.subarray(0, classCount), outBase);
+    for (let i = batch.docOffsets[d]!; i < batch.docOffsets[d + 1]!; i += 1) {
+      const fid = batch.featureIds[i]!;
+      if (fid >= featureCount) continue;
+      const value = batch.featureValues[i]!;
+      const rowBase = fid * classCount;
+      for (let c = 0; c < classCount; c += 1) out[outBase + c] += weights[rowBase + c]! * value;
+    }
+  }
+  return out;
+}
+
+function resolveSolverOptions(options: LinearSolverOptions): ResolvedSolverOptions {
+  return {
+    solver: options.solver ?? "batch",
+    batchSize: Math.max(1, Math.floor(options.batchSize ?? 32)),
+    seed: Math.floor(options.seed ?? 42) >>> 0,
+    validationFraction: Math.min(0.5, Math.max(0, options.validationFraction ?? 0.1)),
+    patience: Math.max(0, Math.floor(options.patience ?? 3)),
+  };
+}
+
+type SgdTrainOptions = ResolvedSolverOptions & {
+  loss: LinearSgdLoss;
+  epochs: number;
+  learningRate: number;
+  l2: number;
+  margin: number;
+};
+
+// Same generator as the native kernel (`XorShift32` in linear.zig), so both shuffle identically.
+function xorshift32(seed: number): () => number {
+  let state = seed >>> 0 || 0x9e3779b9;
+  return () => {
+    state ^= state << 13;
+    state ^= state >>> 17;
+    state ^= state << 5;
+    state >>>= 0;
+    return state;
+  };
+}
+
+function shuffleInPlace(items: Uint32Array, next: () => number): void {
+  for (let i = items.length - 1; i > 0; i -= 1) {
+    const j = next() % (i + 1);
+    const tmp = items[i]!;
+    items[i] = items[j]!;
+    items[j] = tmp;
+  }
+}
+
+function softplus(x: number): number {
+  return x > 0 ? x + Math.log1p(Math.exp(-x)) : Math.log1p(Math.exp(x));
+}
+
+function sgdDirection(loss: LinearSgdLoss, score: number, isGold: boolean, margin: number): number {
+  if (loss === "logistic") return (isGold ? 1 : 0) - sigmoid(score);
+  const y = isGold ? 1 : -1;
+  return y * score < margin ? y : 0;
+}
+
+function sgdLoss(loss: LinearSgdLoss, score: number, isGold: boolean, margin: number): number {
+  if (loss === "logistic") return softplus(isGold ? -score : score);
+  return Math.max(0, margin - (isGold ? score : -score));
+}
+
+// JS port of `trainSgdSparse`: L2 decay is deferred per feature (weights of feature `f` include
+// the decay of every step before `lastStep[f]`), so each step only touches its batch's features.
+function trainSgdJs(
+  batch: SparseBatch,
+  labels: Uint32Array,
+  classCount: number,
+  featureCount: number,
+  weights: Float64Array,
+  bias: Float64Array,
+  options: SgdTrainOptions,
+  validationCount: number,
+): number {
+  const { docOffsets, featureIds, featureValues } = batch;
+  const docs = docOffsets.length - 1;
+  const next = xorshift32(options.seed);
+  const order = Uint32Array.from({ length: docs }, (_, idx) => idx);
+  shuffleInPlace(order, next);
+  const trainDocs = order.subarray(0, docs - validationCount);
+  const holdoutDocs = order.subarray(docs - validationCount);
+
+  const decay = Math.max(0, 1 - options.learningRate * options.l2);
+  let lastStep = new Float64Array(featureCount);
+  const catchUp = (fid: number, step: number): void => {
+    const lag = step - lastStep[fid]!;
+    if (lag <= 0) return;
+    if (decay !== 1) {
+      const scale = decay ** lag;
+      for (let c = 0; c < classCount; c += 1) weights[c * featureCount + fid] *= scale;
+    }
+    lastStep[fid] = step;
+  };
+  const scoreDoc = (doc: number, step: number, out: Float64Array): void => {
+    out.set(bias.subarray(0, classCount));
+    for (let i = docOffsets[doc]!; i < docOffsets[doc + 1]!; i += 1) {
+      const fid = featureIds[i]!;
+      if (fid >= featureCount) continue;
+      catchUp(fid, step);
+      const value = featureValues[i]!;
+      for (let c = 0; c < classCount; c += 1) out[c] += weights[c * featureCount + fid]! * value;
+    }
+  };
+
+  const batchScores = new Float64Array(options.batchSize * classCount);
+  const validate = holdoutDocs.length > 0;
+  // Start from the initial state so a run whose held-out loss is never finite restores that.
+  let bestWeights = weights.slice(0, classCount * featureCount);
+  let bestBias = bias.slice(0, classCount);
+  let bestLastStep = lastStep.slice();
+  let bestStep = 0;
+  let bestLoss = Infinity;
+  let stale = 0;
+
+  let step = 0;
+  let epochsRun = 0;
+  while (epochsRun < options.epochs) {
+    shuffleInPlace(trainDocs, next);
+    for (let start = 0; start < trainDocs.length; start += options.batchSize) {
+      const members = trainDocs.subarray(start, Math.min(start + options.batchSize, trainDocs.length));
+      for (let k = 0; k < members.length; k += 1) {
+        scoreDoc(members[k]!, step, batchScores.subarray(k * classCount, (k + 1) * classCount));
+      }
+      for (const doc of members) {
+        for (let i = docOffsets[doc]!; i < docOffsets[doc + 1]!; i += 1) {
+          if (featureIds[i]! < featureCount) catchUp(featureIds[i]!, step + 1);
+        }
+      }
+      const rate = options.learningRate / members.length;
+      for (let k = 0; k < members.length; k += 1) {
+        const doc = members[k]!;
+        const gold = labels[doc]!;
+        for (let c = 0; c < classCount; c += 1) {
+          const direction = sgdDirection(options.loss, batchScores[k * classCount + c]!, c === gold, options.margin);
+          if (direction === 0) continue;
+          const delta = rate * direction;
+          bias[c] += delta;
+          const base = c * featureCount;
+          for (let i = docOffsets[doc]!; i < docOffsets[doc + 1]!; i += 1) {
+            const fid = featureIds[i]!;
+            if (fid < featureCount) weights[base + fid] += delta * featureValues[i]!;
+          }
+        }
+      }
+      step += 1;
+    }
+    epochsRun += 1;
+
+    if (!validate) continue;
+    let holdoutLoss = 0;
+    const scores = batchScores.subarray(0, classCount);
+    for (const doc of holdoutDocs) {
+      scoreDoc(doc, step, scores);
+      for (let c = 0; c < classCount; c += 1) holdoutLoss += sgdLoss(options.loss, scores[c]!, c === labels[doc], options.margin);
+    }
+    if (holdoutLoss < bestLoss) {
+      bestLoss = holdoutLoss;
+      stale = 0;
+      bestWeights = weights.slice(0, classCount * featureCount);
+      bestBias = bias.slice(0, classCount);
+      bestLastStep = lastStep.slice();
+      bestStep = step;
+    } else {
+      stale += 1;
+      if (options.patience > 0 && stale >= options.patience) break;
+    }
+  }
+
+  if (validate) {
+    weights.set(bestWeights);
+    bias.set(bestBias);
+    lastStep = bestLastStep;
+    step = bestStep;
+  }
+  for (let fid = 0; fid < featureCount; fid += 1) catchUp(fid, step);
+  return epochsRun;
+}
+
+function trainSgdNativeOrJs(
+  batch: SparseBatch,
+  labels: Uint32Array,
+  classCount: number,
+  featureCount: number,
+  weights: Float64Array,
+  bias: Float64Array,
+  options: SgdTrainOptions,
+  preferNative = true,
+): number {
+  const docs = batch.docOffsets.length - 1;
+  const validationCount = docs < 2 ? 0 : Math.min(docs - 1, Math.floor(docs * options.validationFraction));
+  if (preferNative) {
+    // The kernel updates in place, so give it copies and only adopt them on success.
+    const nativeWeights = weights.slice();
+    const nativeBias = bias.slice();
+    try {
+      const epochs = linearTrainSgdSparseNative({
+        ...batch,
+        labels,
+        classCount,
+        featureCount,
+        weights: nativeWeights,
+        bias: nativeBias,
+        loss: options.loss,
+        epochs: options.epochs,
+        batchSize: options.batchSize,
+        learningRate: options.learningRate,
+        l2: options.l2,
+        margin: options.margin,
+        seed: options.seed,
+        validationCount,
+        patience: options.patience,
+      });
+      weights.set(nativeWeights);
+      bias.set(nativeBias);
+      return epochs;
+    } catch {
+      // Fall through to the JS trainer.
+    }
+  }
+  return trainSgdJs(batch, labels, classCount, featureCount, weights, bias, options, validationCount);
+}
+
 export class LogisticTextClassifier {
-  private readonly options: { epochs: number; learningRate: number; l2: number; maxFeatures: number; useNativeScoring: boolean };
+  private readonly options: { epochs: number; learningRate: number; l2: number; maxFeatures: number; useNativeScoring: boolean } & ResolvedSolverOptions;
   private readonly vectorizer: TextFeatureVectorizer;
   private labels: string[] = [];
   private weights = new Float64Array(0);
   private bias = new Float64Array(0);
+  private featureMajorWeights: Float64Array | null = null;
 
-  constructor(options: { epochs?: number; learningRate?: number; l2?: number; maxFeatures?: number; useNativeScoring?: boolean } = {}) {
+  constructor(options: { epochs?: number; learningRate?: number; l2?: number; maxFeatures?: number; useNativeScoring?: boolean } & LinearSolverOptions = {}) {
     this.options = {
       epochs: Math.max(1, Math.floor(options.epochs ?? 20)),
       learningRate: Math.max(1e-6, options.learningRate ?? 0.1),
       l2: Math.max(0, options.l2 ?? 1e-4),
       maxFeatures: Math.max(256, Math.floor(options.maxFeatures ?? 16000)),
       useNativeScoring: options.useNativeScoring ?? true,
+      ...resolveSolverOptions(options),
     };
     this.vectorizer = new TextFeatureVectorizer({ ngramMin: 1, ngramMax: 2, binary: false, maxFeatures: this.options.maxFeatures });
   }
@@ -142,15 +409,30 @@ export class LogisticTextClassifier {
 
   train(examples: LinearModelExample[]): this {
     if (examples.length === 0) throw new Error("Logistic training requires examples");
+    this.featureMajorWeights = null;
     this.labels = [...new Set(examples.map((x) => x.label))].sort((a, b) => a.localeCompare(b));
     this.vectorizer.fit(examples.map((x) => x.text));
-    const rows = this.vectorizer.transformMany(examples.map((x) => x.text));
     const labelToId = new Map(this.labels.map((label, idx) => [label, idx]));
 
     const classCount = this.labels.length;
     const featureCount = this.vectorizer.featureCount;
     this.weights = new Float64Array(classCount * featureCount);
     this.bias = new Float64Array(classCount);
+    if (this.options.solver === "sgd") {
+      trainSgdNativeOrJs(
+        this.vectorizer.transformBatch(examples.map((x) => x.text), { useNative: this.options.useNativeScoring }),
+        Uint32Array.from(examples, (x) => labelToId.get(x.label)!),
+        classCount,
+        featureCount,
+        this.weights,
+        this.bias,
+        { ...this.options, loss: "logistic", margin: 1 },
+        this.options.useNativeScoring,
+      );
+      return this;
+    }
+
+    const rows = this.vectorizer.transformMany(examples.map((x) => x.text));
 
     const gradW = new Float64Array(classCount * featureCount);
     const gradB = new Float64Array(classCount);
@@ -196,16 +478,23 @@ export class LogisticTextClassifier {
   }
 
   predict(text: string): Array<{ label: string; probability: number; score: number }> {
-    const row = this.vectorizer.transform(text);
     const classCount = this.labels.length;
     const featureCount = this.vectorizer.featureCount;
     if (classCount === 0 || featureCount === 0) return [];
-    const scores = scoreRowJs(row, classCount, featureCount, this.weights, this.bias);
+    const scores = this.scoreTexts([text]);
     const probs = Float64Array.from(scores, (s) => sigmoid(s));
     const out = this.labels.map((label, idx) => ({ label, probability: probs[idx]!, score: scores[idx]! }));
     return out.sort((a, b) => b.probability - a.probability);
   }
 
+  private scoreTexts(texts: string[]): Float64Array {
+    const classCount = this.labels.length;
+    const featureCount = this.vectorizer.featureCount;
+    this.featureMajorWeights ??= transposeWeights(this.weights, classCount, featureCount);
+    const batch = this.vectorizer.transformBatch(texts, { useNative: this.options.useNativeScoring });
+    return scoreBatchFeatureMajorNativeOrJs(batch, classCount, featureCount, this.featureMajorWeights, this.bias, this.options.useNativeScoring);
+  }
+
   classify(text: string): string {
     const out = this.predict(text);
     if (out.length === 0) throw new Error("Logistic classifier has no labels");
@@ -214,12 +503,10 @@ export class LogisticTextClassifier {
 
   classifyBatch(texts: string[]): string[] {
     if (texts.length === 0) return [];
-    const rows = this.vectorizer.transformMany(texts);
     const classCount = this.labels.length;
-    const featureCount = this.vectorizer.featureCount;
-    const scores = scoreBatchNativeOrJs(rows, classCount, featureCount, this.weights, this.bias, this.options.useNativeScoring);
+    const scores = this.scoreTexts(texts);
     const out: string[] = [];
-    for (let d = 0; d < rows.length; d += 1) {
+    for (let d = 0; d < texts.length; d += 1) {
       const slice = scores.subarray(d * classCount, (d + 1) * classCount);
       out.push(this.labels[argmax(slice)]!);
     }
@@ -246,13 +533,14 @@ export class LogisticTextClassifier {
 }
 
 export class LinearSvmTextClassifier {
-  private readonly options: { epochs: number; learningRate: number; l2: number; margin: number; maxFeatures: number; useNativeScoring: boolean };
+  private readonly options: { epochs: number; learningRate: number; l2: number; margin: number; maxFeatures: number; useNativeScoring: boolean } & ResolvedSolverOptions;
   private readonly vectorizer: TextFeatureVectorizer;
   private labels: string[] = [];
   private weights = new Float64Array(0);
   private bias = new Float64Array(0);
+  private featureMajorWeights: Float64Array | null = null;
 
-  constructor(options: { epochs?: number; learningRate?: number; l2?: number; margin?: number; maxFeatures?: number; useNativeScoring?: boolean } = {}) {
+  constructor(options: { epochs?: number; learningRate?: number; l2?: number; margin?: number; maxFeatures?: number; useNativeScoring?: boolean } & LinearSolverOptions = {}) {
     this.options = {
       epochs: Math.max(1, Math.floor(options.epochs ?? 20)),
       learningRate: Math.max(1e-6, options.learningRate ?? 0.05),
@@ -260,6 +548,7 @@ export class LinearSvmTextClassifier {
       margin: Math.max(0.1, options.margin ?? 1),
       maxFeatures: Math.max(256, Math.floor(options.maxFeatures ?? 16000)),
       useNativeScoring: options.useNativeScoring ?? true,
+      ...resolveSolverOptions(options),
     };
     this.vectorizer = new TextFeatureVectorizer({ ngramMin: 1, ngramMax: 2, binary: false, maxFeatures: this.options.maxFeatures });
   }
@@ -276,15 +565,30 @@ export class LinearSvmTextClassifier {
 
   train(examples: LinearModelExample[]): this {
     if (examples.length === 0) throw new Error("LinearSVM training requires examples");
+    this.featureMajorWeights = null;
     this.labels = [...new Set(examples.map((x) => x.label))].sort((a, b) => a.localeCompare(b));
     this.vectorizer.fit(examples.map((x) => x.text));
-    const rows = this.vectorizer.transformMany(examples.map((x) => x.text));
     const labelToId = new Map(this.labels.map((label, idx) => [label, idx]));
 
     const classCount = this.labels.length;
     const featureCount = this.vectorizer.featureCount;
     this.weights = new Float64Array(classCount * featureCount);
     this.bias = new Float64Array(classCount);
+    if (this.options.solver === "sgd") {
+      trainSgdNativeOrJs(
+        this.vectorizer.transformBatch(examples.map((x) => x.text), { useNative: this.options.useNativeScoring }),
+        Uint32Array.from(examples, (x) => labelToId.get(x.label)!),
+        classCount,
+        featureCount,
+        this.weights,
+        this.bias,
+        { ...this.options, loss: "hinge" },
+        this.options.useNativeScoring,
+      );
+      return this;
+    }
+
+    const rows = this.vectorizer.transformMany(examples.map((x) => x.text));
 
     const gradW = new Float64Array(classCount * featureCount);
     const gradB = new Float64Array(classCount);
@@ -331,16 +635,23 @@ export class LinearSvmTextClassifier {
   }
 
   predict(text: string): Array<{ label: string; score: number }> {
-    const row = this.vectorizer.transform(text);
     const classCount = this.labels.length;
     const featureCount = this.vectorizer.featureCount;
     if (classCount === 0 || featureCount === 0) return [];
-    const scores = scoreRowJs(row, classCount, featureCount, this.weights, this.bias);
+    const scores = this.scoreTexts([text]);
     return this.labels
       .map((label, idx) => ({ label, score: scores[idx]! }))
       .sort((a, b) => b.score - a.score);
   }
 
+  private scoreTexts(texts: string[]): Float64Array {
+    const classCount = this.labels.length;
+    const featureCount = this.vectorizer.featureCount;
+    this.featureMajorWeights ??= transposeWeights(this.weights, classCount, featureCount);
+    const batch = this.vectorizer.transformBatch(texts, { useNative: this.options.useNativeScoring });
+    return scoreBatchFeatureMajorNativeOrJs(batch, classCount, featureCount, this.featureMajorWeights, this.bias, this.options.useNativeScoring);
+  }
+
   classify(text: string): string {
     const out = this.predict(text);
     if (out.length === 0) throw new Error("LinearSVM classifier has no labels");
@@ -349,12 +660,10 @@ export class LinearSvmTextClassifier {
 
   classifyBatch(texts: string[]): string[] {
     if (texts.length === 0) return [];
-    const rows = this.vectorizer.transformMany(texts);
     const classCount = this.labels.length;
-    const featureCount = this.vectorizer.featureCount;
-    const scores = scoreBatchNativeOrJs(rows, classCount, featureCount, this.weights, this.bias, this.options.useNativeScoring);
+    const scores = this.scoreTexts(texts);
     const out: string[] = [];
-    for (let d = 0; d < rows.length; d += 1) {
+    for (let d = 0; d < texts.length; d += 1) {
       const slice = scores.subarray(d * classCount, (d + 1) * classCount);
       out.push(this.labels[argmax(slice)]!);
     }
@@ -382,14 +691,14 @@ export class LinearSvmTextClassifier {
 
 export function trainLogisticTextClassifier(
   examples: LinearModelExample[],
-  options: { epochs?: number; learningRate?: number; l2?: number; maxFeatures?: number; useNativeScoring?: boolean } = {},
+  options: { epochs?: number; learningRate?: number; l2?: number; maxFeatures?: number; useNativeScoring?: boolean } & LinearSolverOptions = {},
 ): LogisticTextClassifier {
   return new LogisticTextClassifier(options).train(examples);
 }
 
 export function trainLinearSvmTextClassifier(
   examples: LinearModelExample[],
-  options: { epochs?: number; learningRate?: number; l2?: number; margin?: number; maxFeatures?: number; useNativeScoring?: boolean } = {},
+  options: { epochs?: number; learningRate?: number; l2?: number; margin?: number; maxFeatures?: number; useNativeScoring?: boolean } & LinearSolverOptions = {},
 ): LinearSvmTextClassifier {
   return new LinearSvmTextClassifier(options).train(examples);
 }
@@ -151,6 +151,103 @@ const lib = dlopen(nativeLibPath, {
     args: ["ptr", "usize", "ptr", "usize", "ptr", "usize", "u32", "u32", "ptr", "usize"],
     returns: "void",
   },
+  bunnltk_perceptron_predict_batch_f16: {
+    args: ["ptr", "usize", "ptr", "usize", "ptr", "usize", "u32", "u32", "ptr", "usize"],
+    returns: "void",
+  },
+  bunnltk_perceptron_predict_batch_i8: {
+    args: ["ptr", "usize", "ptr", "usize", "ptr", "usize", "ptr", "usize", "u32", "u32", "ptr", "usize"],
+    returns: "void",
+  },
+  bunnltk_perceptron_train_averaged: {
+    args: ["ptr", "usize", "ptr", "usize", "ptr", "usize", "ptr", "usize", "u32", "u32", "u32", "u32", "ptr", "usize"],
+    returns: "void",
+  },
+  bunnltk_count_tokens_batch_ascii: {
+    args: ["ptr", "usize", "ptr", "usize"],
+    returns: "u64",
+  },
+  bunnltk_perceptron_tag_batch_ascii: {
+    args: [
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "u32",
+      "u32",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+    ],
+    returns: "u64",
+  },
+  bunnltk_perceptron_tag_batch_ascii_f16: {
+    args: [
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "u32",
+      "u32",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+    ],
+    returns: "u64",
+  },
+  bunnltk_perceptron_tag_batch_ascii_i8: {
+    args: [
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "u32",
+      "u32",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+    ],
+    returns: "u64",
+  },
+  bunnltk_hash_ngram_features_batch_ascii: {
+    args: ["ptr", "usize", "ptr", "usize", "u32", "u32", "u32", "u32", "u32", "ptr", "ptr", "ptr", "usize"],
+    returns: "u64",
+  },
   bunnltk_porter_stem_ascii: {
     args: ["ptr", "usize", "ptr", "usize"],
     returns: "u32",
@@ -159,6 +256,22 @@ const lib = dlopen(nativeLibPath, {
     args: ["ptr", "usize", "u32", "ptr", "usize"],
     returns: "u32",
   },
+  bunnltk_osa_distance_ids_ascii: {
+    args: ["ptr", "usize", "ptr", "usize", "ptr", "usize", "ptr", "usize", "u32", "ptr"],
+    returns: "void",
+  },
+  bunnltk_wordnet_lemma_set_new: {
+    args: ["ptr", "usize", "ptr", "ptr", "usize"],
+    returns: "u64",
+  },
+  bunnltk_wordnet_lemma_set_free: {
+    args: ["u64"],
+    returns: "void",
+  },
+  bunnltk_wordnet_morphy_batch_ascii: {
+    args: ["u64", "ptr", "usize", "ptr", "ptr", "usize", "ptr", "usize", "ptr"],
+    returns: "u64",
+  },
   bunnltk_lm_eval_ids: {
     args: [
       "ptr",
@@ -205,18 +318,106 @@ const lib = dlopen(nativeLibPath, {
     ],
     returns: "u64",
   },
+  bunnltk_chunk_iob_ids_batch: {
+    args: [
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "usize",
+    ],
+    returns: "u64",
+  },
   bunnltk_cyk_recognize_ids: {
-    args: ["ptr", "usize", "ptr", "ptr", "ptr", "usize", "ptr", "ptr", "usize", "u16"],
+    args: ["ptr", "usize", "usize", "ptr", "ptr", "ptr", "usize", "ptr", "ptr", "usize", "u16"],
     returns: "u32",
   },
+  bunnltk_earley_recognize_ids: {
+    args: ["ptr", "usize", "usize", "ptr", "ptr", "usize", "ptr", "ptr", "usize", "u32"],
+    returns: "u32",
+  },
+  bunnltk_pcfg_viterbi_parse: {
+    args: [
+      "usize",
+      "usize",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+      "u32",
+      "ptr",
+      "ptr",
+      "ptr",
+      "usize",
+      "ptr",
+    ],
+    returns: "u64",
+  },
   bunnltk_naive_bayes_log_scores_ids: {
     args: ["ptr", "usize", "u32", "ptr", "usize", "ptr", "ptr", "usize", "u32", "f64", "ptr", "usize"],
     returns: "void",
   },
+  bunnltk_naive_bayes_sparse_log_scores_batch: {
+    args: ["ptr", "usize", "ptr", "usize", "ptr", "ptr", "usize", "ptr", "ptr", "usize", "ptr", "ptr", "usize", "ptr", "usize"],
+    returns: "void",
+  },
   bunnltk_linear_scores_sparse_ids: {
     args: ["ptr", "usize", "ptr", "usize", "ptr", "usize", "u32", "u32", "ptr", "usize", "ptr", "usize", "ptr", "usize"],
     returns: "void",
   },
+  bunnltk_linear_scores_sparse_ids_feature_major: {
+    args: ["ptr", "usize", "ptr", "usize", "ptr", "usize", "u32", "u32", "ptr", "usize", "ptr", "usize", "ptr", "usize"],
+    returns: "void",
+  },
+  bunnltk_linear_train_sgd_sparse: {
+    args: [
+      "ptr",
+      "usize",
+      "ptr",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+      "u32",
+      "u32",
+      "u32",
+      "u32",
+      "u32",
+      "f64",
+      "f64",
+      "f64",
+      "u32",
+      "u32",
+      "u32",
+      "ptr",
+      "usize",
+      "ptr",
+      "usize",
+    ],
+    returns: "u32",
+  },
   bunnltk_freqdist_stream_new: {
     args: [],
     returns: "u64",
@@ -706,6 +907,300 @@ export function perceptronPredictBatchNative(
   return out;
 }
 
+export type PerceptronQuantizedWeights =
+  | { precision: "f16"; values: Uint16Array }
+  | { precision: "int8"; values: Int8Array; scales: Float32Array };
+
+export function perceptronPredictBatchQuantizedNative(
+  featureIds: Uint32Array,
+  tokenOffsets: Uint32Array,
+  weights: PerceptronQuantizedWeights,
+  modelFeatureCount: number,
+  tagCount: number,
+): Uint16Array {
+  if (tokenOffsets.length === 0) return new Uint16Array(0);
+  if (!Number.isInteger(modelFeatureCount) || modelFeatureCount <= 0) {
+    throw new Error("modelFeatureCount must be a positive integer");
+  }
+  if (!Number.isInteger(tagCount) || tagCount <= 0) {
+    throw new Error("tagCount must be a positive integer");
+  }
+
+  const tokenCount = tokenOffsets.length - 1;
+  const out = new Uint16Array(tokenCount);
+  if (weights.precision === "f16") {
+    lib.symbols.bunnltk_perceptron_predict_batch_f16(
+      ptr(featureIds),
+      featureIds.length,
+      ptr(tokenOffsets),
+      tokenOffsets.length,
+      ptr(weights.values),
+      weights.values.length,
+      modelFeatureCount,
+      tagCount,
+      ptr(out),
+      out.length,
+    );
+  } else {
+    lib.symbols.bunnltk_perceptron_predict_batch_i8(
+      ptr(featureIds),
+      featureIds.length,
+      ptr(tokenOffsets),
+      tokenOffsets.length,
+      ptr(weights.values),
+      weights.values.length,
+      ptr(weights.scales),
+      weights.scales.length,
+      modelFeatureCount,
+      tagCount,
+      ptr(out),
+      out.length,
+    );
+  }
+  assertNoNativeError("perceptronPredictBatchQuantizedNative");
+  return out;
+}
+
+export function perceptronTrainAveragedNative(input: {
+  featureIds: Uint32Array;
+  tokenOffsets: Uint32Array;
+  goldTagIds: Uint16Array;
+  sentenceOffsets: Uint32Array;
+  featureCount: number;
+  tagCount: number;
+  epochs: number;
+  seed: number;
+}): Float32Array {
+  if (!Number.isInteger(input.featureCount) || input.featureCount <= 0) {
+    throw new Error("featureCount must be a positive integer");
+  }
+  if (!Number.isInteger(input.tagCount) || input.tagCount <= 0) {
+    throw new Error("tagCount must be a positive integer");
+  }
+  if (input.goldTagIds.length === 0 || input.tokenOffsets.length !== input.goldTagIds.length + 1) {
+    throw new Error("tokenOffsets must have one more entry than goldTagIds");
+  }
+
+  const out = new Float32Array(input.featureCount * input.tagCount);
+  lib.symbols.bunnltk_perceptron_train_averaged(
+    ptr(input.featureIds),
+    input.featureIds.length,
+    ptr(input.tokenOffsets),
+    input.tokenOffsets.length,
+    ptr(input.goldTagIds),
+    input.goldTagIds.length,
+    ptr(input.sentenceOffsets),
+    input.sentenceOffsets.length,
+    input.featureCount,
+    input.tagCount,
+    input.epochs,
+    input.seed >>> 0,
+    ptr(out),
+    out.length,
+  );
+  assertNoNativeError("perceptronTrainAveragedNative");
+  return out;
+}
+
+export type PerceptronFeatureTable = {
+  strings: Uint8Array;
+  offsets: Uint32Array;
+  slots: Uint32Array;
+};
+
+export type PerceptronTagBatchIds = {
+  docOffsets: Uint32Array;
+  tokenStarts: Uint32Array;
+  tokenLengths: Uint32Array;
+  tagIds: Uint16Array;
+};
+
+export function perceptronTagBatchAsciiNative(input: {
+  bytes: Uint8Array;
+  docOffsets: Uint32Array;
+  featureTable: PerceptronFeatureTable;
+  weights: Float32Array | PerceptronQuantizedWeights;
+  modelFeatureCount: number;
+  tagCount: number;
+}): PerceptronTagBatchIds {
+  if (input.docOffsets.length === 0) {
+    throw new Error("docOffsets must include at least one offset");
+  }
+  if (!Number.isInteger(input.modelFeatureCount) || input.modelFeatureCount <= 0) {
+    throw new Error("modelFeatureCount must be a positive integer");
+  }
+  if (!Number.isInteger(input.tagCount) || input.tagCount <= 0) {
+    throw new Error("tagCount must be a positive integer");
+  }
+
+  const docCount = input.docOffsets.length - 1;
+  const docOffsets = new Uint32Array(docCount + 1);
+  if (input.bytes.length === 0) {
+    return { docOffsets, tokenStarts: new Uint32Array(0), tokenLengths: new Uint32Array(0), tagIds: new Uint16Array(0) };
+  }
+
+  const total = toNumber(
+    lib.symbols.bunnltk_count_tokens_batch_ascii(
+      ptr(input.bytes),
+      input.bytes.length,
+      ptr(input.docOffsets),
+      input.docOffsets.length,
+    ),
+  );
+  assertNoNativeError("perceptronTagBatchAsciiNative.count");
+
+  const capacity = Math.max(1, total);
+  const tokenStarts = new Uint32Array(capacity);
+  const tokenLengths = new Uint32Array(capacity);
+  const tagIds = new Uint16Array(capacity);
+  const { strings, offsets, slots } = input.featureTable;
+  const weights = input.weights;
+  let written: number;
+  if (weights instanceof Float32Array) {
+    written = toNumber(
+      lib.symbols.bunnltk_perceptron_tag_batch_ascii(
+        ptr(input.bytes),
+        input.bytes.length,
+        ptr(input.docOffsets),
+        input.docOffsets.length,
+        ptr(strings),
+        strings.length,
+        ptr(offsets),
+        offsets.length,
+        ptr(slots),
+        slots.length,
+        ptr(weights),
+        weights.length,
+        input.modelFeatureCount,
+        input.tagCount,
+        ptr(docOffsets),
+        docOffsets.length,
+        ptr(tokenStarts),
+        ptr(tokenLengths),
+        ptr(tagIds),
+        capacity,
+      ),
+    );
+  } else if (weights.precision === "f16") {
+    written = toNumber(
+      lib.symbols.bunnltk_perceptron_tag_batch_ascii_f16(
+        ptr(input.bytes),
+        input.bytes.length,
+        ptr(input.docOffsets),
+        input.docOffsets.length,
+        ptr(strings),
+        strings.length,
+        ptr(offsets),
+        offsets.length,
+        ptr(slots),
+        slots.length,
+        ptr(weights.values),
+        weights.values.length,
+        input.modelFeatureCount,
+        input.tagCount,
+        ptr(docOffsets),
+        docOffsets.length,
+        ptr(tokenStarts),
+        ptr(tokenLengths),
+        ptr(tagIds),
+        capacity,
+      ),
+    );
+  } else {
+    written = toNumber(
+      lib.symbols.bunnltk_perceptron_tag_batch_ascii_i8(
+        ptr(input.bytes),
+        input.bytes.length,
+        ptr(input.docOffsets),
+        input.docOffsets.length,
+        ptr(strings),
+        strings.length,
+        ptr(offsets),
+        offsets.length,
+        ptr(slots),
+        slots.length,
+        ptr(weights.values),
+        weights.values.length,
+        ptr(weights.scales),
+        weights.scales.length,
+        input.modelFeatureCount,
+        input.tagCount,
+        ptr(docOffsets),
+        docOffsets.length,
+        ptr(tokenStarts),
+        ptr(tokenLengths),
+        ptr(tagIds),
+        capacity,
+      ),
+    );
+  }
+  assertNoNativeError("perceptronTagBatchAsciiNative.fill");
+
+  return {
+    docOffsets,
+    tokenStarts: tokenStarts.subarray(0, written),
+    tokenLengths: tokenLengths.subarray(0, written),
+    tagIds: tagIds.subarray(0, written),
+  };
+}
+
+export function hashNgramFeaturesBatchAsciiNative(input: {
+  bytes: Uint8Array;
+  docOffsets: Uint32Array;
+  ngramMin: number;
+  ngramMax: number;
+  dimension: number;
+  signed?: boolean;
+  binary?: boolean;
+}): { docOffsets: Uint32Array; featureIds: Uint32Array; featureValues: Float64Array } {
+  if (input.docOffsets.length === 0) {
+    throw new Error("docOffsets must include at least one offset");
+  }
+  const docOffsets = new Uint32Array(input.docOffsets.length);
+  if (input.bytes.length === 0 || input.docOffsets.length < 2) {
+    return { docOffsets, featureIds: new Uint32Array(0), featureValues: new Float64Array(0) };
+  }
+
+  const tokens = toNumber(
+    lib.symbols.bunnltk_count_tokens_batch_ascii(
+      ptr(input.bytes),
+      input.bytes.length,
+      ptr(input.docOffsets),
+      input.docOffsets.length,
+    ),
+  );
+  assertNoNativeError("hashNgramFeaturesBatchAsciiNative.count");
+
+  // Every n-gram occurrence yields at most one entry.
+  const capacity = Math.max(1, tokens * Math.max(1, input.ngramMax - input.ngramMin + 1));
+  const featureIds = new Uint32Array(capacity);
+  const featureValues = new Float64Array(capacity);
+  const written = toNumber(
+    lib.symbols.bunnltk_hash_ngram_features_batch_ascii(
+      ptr(input.bytes),
+      input.bytes.length,
+      ptr(input.docOffsets),
+      input.docOffsets.length,
+      input.ngramMin,
+      input.ngramMax,
+      input.dimension,
+      input.signed ? 1 : 0,
+      input.binary ? 1 : 0,
+      ptr(docOffsets),
+      ptr(featureIds),
+      ptr(featureValues),
+      capacity,
+    ),
+  );
+  assertNoNativeError("hashNgramFeaturesBatchAsciiNative.fill");
+
+  return {
+    docOffsets,
+    featureIds: featureIds.subarray(0, written),
+    featureValues: featureValues.subarray(0, written),
+  };
+}
+
 export type PmiBigram = {
   leftHash: bigint;
   rightHash: bigint;
@@ -921,6 +1416,112 @@ export function wordnetMorphyAsciiNative(word: string, pos?: "n" | "v" | "a" | "
   return new TextDecoder().decode(out.subarray(0, written));
 }
 
+export function osaDistanceIdsAsciiNative(
+  query: Uint8Array,
+  termBytes: Uint8Array,
+  termOffsets: Uint32Array,
+  ids: Uint32Array,
+  maxDistance: number,
+): Uint32Array {
+  const out = new Uint32Array(Math.max(1, ids.length));
+  if (ids.length === 0) return out.subarray(0, 0);
+  const queryBuffer = query.length > 0 ? query : new Uint8Array(1);
+  const bytes = termBytes.length > 0 ? termBytes : new Uint8Array(1);
+  lib.symbols.bunnltk_osa_distance_ids_ascii(
+    ptr(queryBuffer),
+    query.length,
+    ptr(bytes),
+    termBytes.length,
+    ptr(termOffsets),
+    termOffsets.length - 1,
+    ptr(ids),
+    ids.length,
+    Math.max(0, Math.floor(maxDistance)),
+    ptr(out),
+  );
+  assertNoNativeError("osaDistanceIdsAsciiNative");
+  return out;
+}
+
+export class NativeWordNetLemmaSet {
+  private handle: bigint;
+  private disposed = false;
+
+  constructor(lemmas: string[], posMasks: Uint8Array) {
+    const encoder = new TextEncoder();
+    const encoded = lemmas.map((lemma) => encoder.encode(lemma));
+    const offsets = new Uint32Array(lemmas.length + 1);
+    for (let i = 0; i < encoded.length; i += 1) offsets[i + 1] = offsets[i]! + encoded[i]!.length;
+    const bytes = new Uint8Array(Math.max(1, offsets[lemmas.length]!));
+    for (let i = 0; i < encoded.length; i += 1) bytes.set(encoded[i]!, offsets[i]!);
+    const masks = new Uint8Array(Math.max(1, lemmas.length));
+    masks.set(posMasks.subarray(0, lemmas.length));
+
+    const rawHandle = lib.symbols.bunnltk_wordnet_lemma_set_new(
+      ptr(bytes),
+      offsets[lemmas.length]!,
+      ptr(offsets),
+      ptr(masks),
+      lemmas.length,
+    );
+    this.handle = BigInt(rawHandle);
+    assertNoNativeError("NativeWordNetLemmaSet.constructor");
+    if (this.handle === 0n) {
+      throw new Error("failed to allocate native wordnet lemma set");
+    }
+  }
+
+  private ensureOpen(): void {
+    if (this.disposed || this.handle === 0n) {
+      throw new Error("NativeWordNetLemmaSet is already disposed");
+    }
+  }
+
+  morphyBatch(words: string[], pos: Array<"n" | "v" | "a" | "r" | undefined>): Array<string | null> {
+    this.ensureOpen();
+    if (words.length === 0) return [];
+    const encoded = words.map((word) => toBuffer(word));
+    const offsets = new Uint32Array(words.length + 1);
+    for (let i = 0; i < encoded.length; i += 1) offsets[i + 1] = offsets[i]! + encoded[i]!.length;
+    const total = offsets[words.length]!;
+    const input = new Uint8Array(Math.max(1, total));
+    for (let i = 0; i < encoded.length; i += 1) input.set(encoded[i]!, offsets[i]!);
+    const posCodes = Uint32Array.from(pos, (value) => wordnetPosToCode(value));
+    const out = new Uint8Array(total + words.length);
+    const outOffsets = new Uint32Array(words.length + 1);
+
+    lib.symbols.bunnltk_wordnet_morphy_batch_ascii(
+      this.handle,
+      ptr(input),
+      total,
+      ptr(offsets),
+      ptr(posCodes),
+      words.length,
+      ptr(out),
+      out.length,
+      ptr(outOffsets),
+    );
+    assertNoNativeError("NativeWordNetLemmaSet.morphyBatch");
+
+    const decoder = new TextDecoder();
+    const lemmas: Array<string | null> = new Array(words.length);
+    for (let i = 0; i < words.length; i += 1) {
+      const start = outOffsets[i]!;
+      const end = outOffsets[i + 1]!;
+      lemmas[i] = end > start ? decoder.decode(out.subarray(start, end)) : null;
+    }
+    return lemmas;
+  }
+
+  dispose(): void {
+    if (this.disposed || this.handle === 0n) return;
+    lib.symbols.bunnltk_wordnet_lemma_set_free(this.handle);
+    assertNoNativeError("NativeWordNetLemmaSet.dispose");
+    this.disposed = true;
+    this.handle = 0n;
+  }
+}
+
 export type NativeLmModelType = "mle" | "lidstone" | "kneser_ney_interpolated";
 
 function nativeLmTypeCode(model: NativeLmModelType): number {
@@ -986,20 +1587,24 @@ export function chunkIobIdsNative(input: {
 }): { labelIds: Uint16Array; begins: Uint8Array } {
   const labelIds = new Uint16Array(input.tokenTagIds.length);
   const begins = new Uint8Array(input.tokenTagIds.length);
+  if (input.tokenTagIds.length === 0) return { labelIds, begins };
 
+  const u8 = new Uint8Array(1);
+  const u16 = new Uint16Array(1);
+  const u32 = new Uint32Array(1);
   lib.symbols.bunnltk_chunk_iob_ids(
     ptr(input.tokenTagIds),
     input.tokenTagIds.length,
-    ptr(input.atomAllowedOffsets),
-    ptr(input.atomAllowedLengths),
-    ptr(input.atomAllowedFlat),
+    ptr(input.atomAllowedOffsets.length > 0 ? input.atomAllowedOffsets : u32),
+    ptr(input.atomAllowedLengths.length > 0 ? input.atomAllowedLengths : u32),
+    ptr(input.atomAllowedFlat.length > 0 ? input.atomAllowedFlat : u16),
     input.atomAllowedFlat.length,
-    ptr(input.atomMins),
-    ptr(input.atomMaxs),
+    ptr(input.atomMins.length > 0 ? input.atomMins : u8),
+    ptr(input.atomMaxs.length > 0 ? input.atomMaxs : u8),
     input.atomMins.length,
-    ptr(input.ruleAtomOffsets),
-    ptr(input.ruleAtomCounts),
-    ptr(input.ruleLabelIds),
+    ptr(input.ruleAtomOffsets.length > 0 ? input.ruleAtomOffsets : u32),
+    ptr(input.ruleAtomCounts.length > 0 ? input.ruleAtomCounts : u32),
+    ptr(input.ruleLabelIds.length > 0 ? input.ruleLabelIds : u16),
     input.ruleLabelIds.length,
     ptr(labelIds),
     ptr(begins),
@@ -1010,8 +1615,54 @@ export function chunkIobIdsNative(input: {
   return { labelIds, begins };
 }
 
+export function chunkIobIdsBatchNative(input: {
+  tokenTagIds: Uint16Array;
+  sentenceOffsets: Uint32Array;
+  atomAllowedOffsets: Uint32Array;
+  atomAllowedLengths: Uint32Array;
+  atomAllowedFlat: Uint16Array;
+  atomMins: Uint8Array;
+  atomMaxs: Uint8Array;
+  ruleAtomOffsets: Uint32Array;
+  ruleAtomCounts: Uint32Array;
+  ruleLabelIds: Uint16Array;
+}): { labelIds: Uint16Array; begins: Uint8Array } {
+  const labelIds = new Uint16Array(input.tokenTagIds.length).fill(0xffff);
+  const begins = new Uint8Array(input.tokenTagIds.length);
+  if (input.tokenTagIds.length === 0) return { labelIds, begins };
+  if (input.sentenceOffsets.length === 0) throw new Error("sentenceOffsets must hold at least one offset");
+
+  const u8 = new Uint8Array(1);
+  const u16 = new Uint16Array(1);
+  const u32 = new Uint32Array(1);
+  lib.symbols.bunnltk_chunk_iob_ids_batch(
+    ptr(input.tokenTagIds),
+    input.tokenTagIds.length,
+    ptr(input.sentenceOffsets),
+    input.sentenceOffsets.length - 1,
+    ptr(input.atomAllowedOffsets.length > 0 ? input.atomAllowedOffsets : u32),
+    ptr(input.atomAllowedLengths.length > 0 ? input.atomAllowedLengths : u32),
+    ptr(input.atomAllowedFlat.length > 0 ? input.atomAllowedFlat : u16),
+    input.atomAllowedFlat.length,
+    ptr(input.atomMins.length > 0 ? input.atomMins : u8),
+    ptr(input.atomMaxs.length > 0 ? input.atomMaxs : u8),
+    input.atomMins.length,
+    ptr(input.ruleAtomOffsets.length > 0 ? input.ruleAtomOffsets : u32),
+    ptr(input.ruleAtomCounts.length > 0 ? input.ruleAtomCounts : u32),
+    ptr(input.ruleLabelIds.length > 0 ? input.ruleLabelIds : u16),
+    input.ruleLabelIds.length,
+    ptr(labelIds),
+    ptr(begins),
+    labelIds.length,
+  );
+  assertNoNativeError("chunkIobIdsBatchNative");
+
+  return { labelIds, begins };
+}
+
 export function cykRecognizeIdsNative(input: {
   tokenBits: BigUint64Array;
+  wordsPerToken?: number;
   binaryLeft: Uint16Array;
   binaryRight: Uint16Array;
   binaryParent: Uint16Array;
@@ -1019,9 +1670,14 @@ export function cykRecognizeIdsNative(input: {
   unaryParent: Uint16Array;
   startSymbol: number;
 }): boolean {
+  const wordsPerToken = input.wordsPerToken ?? 1;
+  if (!Number.isInteger(wordsPerToken) || wordsPerToken <= 0 || input.tokenBits.length % wordsPerToken !== 0) {
+    throw new Error("tokenBits length must be a multiple of wordsPerToken");
+  }
   const out = lib.symbols.bunnltk_cyk_recognize_ids(
     ptr(input.tokenBits),
-    input.tokenBits.length,
+    input.tokenBits.length / wordsPerToken,
+    wordsPerToken,
     ptr(input.binaryLeft),
     ptr(input.binaryRight),
     ptr(input.binaryParent),
@@ -1035,6 +1691,109 @@ export function cykRecognizeIdsNative(input: {
   return Number(out) === 1;
 }
 
+export type EarleyTables = {
+  nonterminalCount: number;
+  itemNext: Uint32Array;
+  itemLhs: Uint32Array;
+  predictOffsets: Uint32Array;
+  predictItems: Uint32Array;
+};
+
+export function earleyRecognizeIdsNative(input: {
+  tokenSymbols: Uint32Array;
+  grammar: EarleyTables;
+  startSymbol: number;
+}): boolean {
+  if (input.tokenSymbols.length === 0) return false;
+  const g = input.grammar;
+  const u32 = new Uint32Array(1);
+  const out = lib.symbols.bunnltk_earley_recognize_ids(
+    ptr(input.tokenSymbols),
+    input.tokenSymbols.length,
+    g.nonterminalCount,
+    ptr(g.itemNext.length > 0 ? g.itemNext : u32),
+    ptr(g.itemLhs.length > 0 ? g.itemLhs : u32),
+    g.itemNext.length,
+    ptr(g.predictOffsets),
+    ptr(g.predictItems.length > 0 ? g.predictItems : u32),
+    g.predictItems.length,
+    input.startSymbol,
+  );
+  assertNoNativeError("earleyRecognizeIdsNative");
+  return Number(out) === 1;
+}
+
+export type PcfgViterbiTables = {
+  symbolCount: number;
+  unaryChild: Uint32Array;
+  unaryParent: Uint32Array;
+  unaryLogProbs: Float64Array;
+  binaryLeft: Uint32Array;
+  binaryRight: Uint32Array;
+  binaryParent: Uint32Array;
+  binaryLogProbs: Float64Array;
+};
+
+export type PcfgViterbiNodes = {
+  logProb: number;
+  labels: Uint32Array;
+  kinds: Uint8Array;
+  starts: Uint32Array;
+};
+
+export function pcfgViterbiParseNative(input: {
+  lexicalOffsets: Uint32Array;
+  lexicalSymbols: Uint32Array;
+  lexicalLogProbs: Float64Array;
+  grammar: PcfgViterbiTables;
+  startSymbol: number;
+}): PcfgViterbiNodes | null {
+  const tokenCount = input.lexicalOffsets.length - 1;
+  if (tokenCount <= 0) return null;
+  const g = input.grammar;
+  const capacity = (2 * tokenCount - 1) * (g.symbolCount + 1);
+  const labels = new Uint32Array(capacity);
+  const kinds = new Uint8Array(capacity);
+  const starts = new Uint32Array(capacity);
+  const logProb = new Float64Array(1);
+  const nonEmpty = <T extends Uint32Array | Float64Array>(values: T, empty: T): T => (values.length > 0 ? values : empty);
+  const u32 = new Uint32Array(1);
+  const f64 = new Float64Array(1);
+  const count = toNumber(
+    lib.symbols.bunnltk_pcfg_viterbi_parse(
+      tokenCount,
+      g.symbolCount,
+      ptr(input.lexicalOffsets),
+      ptr(nonEmpty(input.lexicalSymbols, u32)),
+      ptr(nonEmpty(input.lexicalLogProbs, f64)),
+      input.lexicalSymbols.length,
+      ptr(nonEmpty(g.unaryChild, u32)),
+      ptr(nonEmpty(g.unaryParent, u32)),
+      ptr(nonEmpty(g.unaryLogProbs, f64)),
+      g.unaryChild.length,
+      ptr(nonEmpty(g.binaryLeft, u32)),
+      ptr(nonEmpty(g.binaryRight, u32)),
+      ptr(nonEmpty(g.binaryParent, u32)),
+      ptr(nonEmpty(g.binaryLogProbs, f64)),
+      g.binaryLeft.length,
+      input.startSymbol,
+      ptr(labels),
+      ptr(kinds),
+      ptr(starts),
+      capacity,
+      ptr(logProb),
+    ),
+  );
+  assertNoNativeError("pcfgViterbiParseNative");
+  if (count === 0) return null;
+  return {
+    logProb: logProb[0]!,
+    labels: labels.subarray(0, count),
+    kinds: kinds.subarray(0, count),
+    starts: starts.subarray(0, count),
+  };
+}
+
 export function naiveBayesLogScoresIdsNative(input: {
   docTokenIds: Uint32Array;
   vocabSize: number;
@@ -1064,6 +1823,46 @@ export function naiveBayesLogScoresIdsNative(input: {
   return out;
 }
 
+export function naiveBayesSparseLogScoresBatchNative(input: {
+  docOffsets: Uint32Array;
+  docTokenIds: Uint32Array;
+  tokenStarts: Uint32Array;
+  tokenLengths: Uint32Array;
+  entryLabelIds: Uint32Array;
+  entryLogDeltas: Float64Array;
+  labelPriorLogs: Float64Array;
+  labelDefaultLogs: Float64Array;
+}): Float64Array {
+  if (input.docOffsets.length === 0) throw new Error("docOffsets must hold at least one offset");
+  if (input.tokenLengths.length !== input.tokenStarts.length) throw new Error("tokenStarts and tokenLengths must have the same length");
+  const docCount = input.docOffsets.length - 1;
+  const labelCount = input.labelPriorLogs.length;
+  const out = new Float64Array(docCount * labelCount);
+  if (out.length === 0) return out;
+
+  const u32 = new Uint32Array(1);
+  const f64 = new Float64Array(1);
+  lib.symbols.bunnltk_naive_bayes_sparse_log_scores_batch(
+    ptr(input.docOffsets),
+    docCount,
+    ptr(input.docTokenIds.length > 0 ? input.docTokenIds : u32),
+    input.docTokenIds.length,
+    ptr(input.tokenStarts.length > 0 ? input.tokenStarts : u32),
+    ptr(input.tokenLengths.length > 0 ? input.tokenLengths : u32),
+    input.tokenStarts.length,
+    ptr(input.entryLabelIds.length > 0 ? input.entryLabelIds : u32),
+    ptr(input.entryLogDeltas.length > 0 ? input.entryLogDeltas : f64),
+    input.entryLabelIds.length,
+    ptr(input.labelPriorLogs),
+    ptr(input.labelDefaultLogs.length > 0 ? input.labelDefaultLogs : f64),
+    labelCount,
+    ptr(out),
+    out.length,
+  );
+  assertNoNativeError("naiveBayesSparseLogScoresBatchNative");
+  return out;
+}
+
 export function linearScoresSparseIdsNative(input: {
   docOffsets: Uint32Array;
   featureIds: Uint32Array;
@@ -1107,6 +1906,122 @@ export function linearScoresSparseIdsNative(input: {
   return out;
 }
 
+export function linearScoresSparseIdsFeatureMajorNative(input: {
+  docOffsets: Uint32Array;
+  featureIds: Uint32Array;
+  featureValues: Float64Array;
+  classCount: number;
+  featureCount: number;
+  weights: Float64Array;
+  bias: Float64Array;
+}): Float64Array {
+  if (input.classCount <= 0 || !Number.isInteger(input.classCount)) {
+    throw new Error("classCount must be a positive integer");
+  }
+  if (input.featureCount < 0 || !Number.isInteger(input.featureCount)) {
+    throw new Error("featureCount must be a non-negative integer");
+  }
+  if (input.docOffsets.length === 0) {
+    throw new Error("docOffsets must include at least one offset");
+  }
+  if (input.featureIds.length !== input.featureValues.length) {
+    throw new Error("featureIds and featureValues must have the same length");
+  }
+  const docCount = input.docOffsets.length - 1;
+  const out = new Float64Array(Math.max(1, docCount * input.classCount));
+  const featureIds = input.featureIds.length > 0 ? input.featureIds : new Uint32Array(1);
+  const featureValues = input.featureValues.length > 0 ? input.featureValues : new Float64Array(1);
+  const weights = input.weights.length > 0 ? input.weights : new Float64Array(1);
+  lib.symbols.bunnltk_linear_scores_sparse_ids_feature_major(
+    ptr(input.docOffsets),
+    input.docOffsets.length,
+    ptr(featureIds),
+    input.featureIds.length,
+    ptr(featureValues),
+    input.featureValues.length,
+    input.classCount,
+    input.featureCount,
+    ptr(weights),
+    input.weights.length,
+    ptr(input.bias),
+    input.bias.length,
+    ptr(out),
+    out.length,
+  );
+  assertNoNativeError("linearScoresSparseIdsFeatureMajorNative");
+  return out.subarray(0, docCount * input.classCount);
+}
+
+export type LinearSgdLoss = "logistic" | "hinge";
+
+export function linearTrainSgdSparseNative(input: {
+  docOffsets: Uint32Array;
+  featureIds: Uint32Array;
+  featureValues: Float64Array;
+  labels: Uint32Array;
+  classCount: number;
+  featureCount: number;
+  weights: Float64Array;
+  bias: Float64Array;
+  loss: LinearSgdLoss;
+  epochs: number;
+  batchSize: number;
+  learningRate: number;
+  l2: number;
+  margin?: number;
+  seed?: number;
+  validationCount?: number;
+  patience?: number;
+}): number {
+  if (input.classCount <= 0 || !Number.isInteger(input.classCount)) {
+    throw new Error("classCount must be a positive integer");
+  }
+  if (input.featureCount < 0 || !Number.isInteger(input.featureCount)) {
+    throw new Error("featureCount must be a non-negative integer");
+  }
+  if (input.docOffsets.length < 2) {
+    throw new Error("docOffsets must describe at least one document");
+  }
+  if (input.featureIds.length !== input.featureValues.length) {
+    throw new Error("featureIds and featureValues must have the same length");
+  }
+  if (input.labels.length !== input.docOffsets.length - 1) {
+    throw new Error("labels must hold one label per document");
+  }
+  if (input.weights.length < input.classCount * input.featureCount || input.bias.length < input.classCount) {
+    throw new Error("weights/bias are smaller than classCount x featureCount");
+  }
+  const featureIds = input.featureIds.length > 0 ? input.featureIds : new Uint32Array(1);
+  const featureValues = input.featureValues.length > 0 ? input.featureValues : new Float64Array(1);
+  const weights = input.weights.length > 0 ? input.weights : new Float64Array(1);
+  const epochs = lib.symbols.bunnltk_linear_train_sgd_sparse(
+    ptr(input.docOffsets),
+    input.docOffsets.length,
+    ptr(featureIds),
+    ptr(featureValues),
+    input.featureIds.length,
+    ptr(input.labels),
+    input.labels.length,
+    input.classCount,
+    input.featureCount,
+    input.loss === "hinge" ? 1 : 0,
+    input.epochs,
+    input.batchSize,
+    input.learningRate,
+    input.l2,
+    input.margin ?? 1,
+    (input.seed ?? 0) >>> 0,
+    input.validationCount ?? 0,
+    input.patience ?? 0,
+    ptr(weights),
+    input.weights.length,
+    ptr(input.bias),
+    input.bias.length,
+  );
+  assertNoNativeError("linearTrainSgdSparseNative");
+  return Number(epochs);
+}
+
 export function porterStemAsciiTokens(tokens: string[]): string[] {
   return tokens.map((token) => porterStemAscii(token));
 }
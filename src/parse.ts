@@ -1,4 +1,11 @@
-import { cykRecognizeIdsNative } from "./native";
+import {
+  cykRecognizeIdsNative,
+  earleyRecognizeIdsNative,
+  pcfgViterbiParseNative,
+  type EarleyTables,
+  type PcfgViterbiNodes,
+  type PcfgViterbiTables,
+} from "./native";
 import { wordTokenizeSubset } from "./tokenizers";
 
 export type CfgProduction = {
@@ -53,7 +60,8 @@ type CnfPcfgGrammar = {
 type CykPlan = {
   startSymbolId: number;
   symbolToId: Map<string, number>;
-  lexicalByTokenBits: Map<string, bigint>;
+  wordsPerToken: number;
+  lexicalByTokenBits: Map<string, BigUint64Array>;
   unaryChild: Uint16Array;
   unaryParent: Uint16Array;
   binaryLeft: Uint16Array;
@@ -149,17 +157,6 @@ function dedupePush(map: Map<string, string[]>, key: string, value: string): voi
   if (!list.includes(value)) list.push(value);
 }
 
-function dedupePushTree(map: Map<string, ParseTree[]>, key: string, value: ParseTree, maxTrees: number): void {
-  const list = map.get(key);
-  const encoded = JSON.stringify(value);
-  if (!list) {
-    map.set(key, [value]);
-    return;
-  }
-  if (list.length >= maxTrees) return;
-  if (!list.some((tree) => JSON.stringify(tree) === encoded)) list.push(value);
-}
-
 function parseCfgLine(line: string): { lhs: string; alternatives: string[][] } | null {
   const trimmed = line.trim();
   if (!trimmed || trimmed.startsWith("#")) return null;
@@ -396,21 +393,25 @@ function collectSymbols(cnf: CnfGrammar | CnfPcfgGrammar, startSymbol: string):
 function buildCykPlan(cnf: CfgGrammar | CnfGrammar | CnfPcfgGrammar, startSymbol: string): CykPlan | null {
   const cnfCore = "productions" in cnf ? buildCnf(cnf as CfgGrammar) : cnf;
   const symbols = collectSymbols(cnfCore, startSymbol);
-  if (symbols.length === 0 || symbols.length > 63) return null;
+  if (symbols.length === 0 || symbols.length > 0xffff) return null;
   const symbolToId = new Map<string, number>();
   for (const sym of symbols) symbolToId.set(sym, symbolToId.size);
   const startSymbolId = symbolToId.get(startSymbol);
   if (startSymbolId === undefined) return null;
 
-  const lexicalByTokenBits = new Map<string, bigint>();
+  const wordsPerToken = Math.ceil(symbols.length / 64);
+  const lexicalByTokenBits = new Map<string, BigUint64Array>();
   for (const [token, rows] of cnfCore.lexicalByToken) {
-    let bits = 0n;
+    const bits = new BigUint64Array(wordsPerToken);
+    let any = false;
     for (const row of rows) {
       const lhs = typeof row === "string" ? row : row.lhs;
       const id = symbolToId.get(lhs);
-      if (id !== undefined) bits |= 1n << BigInt(id);
+      if (id === undefined) continue;
+      bits[id >>> 6] = bits[id >>> 6]! | (1n << BigInt(id & 63));
+      any = true;
     }
-    lexicalByTokenBits.set(token, bits);
+    if (any) lexicalByTokenBits.set(token, bits);
   }
 
   const unaryChild: number[] = [];
@@ -448,6 +449,7 @@ function buildCykPlan(cnf: CfgGrammar | CnfGrammar | CnfPcfgGrammar, startSymbol
   return {
     startSymbolId,
     symbolToId,
+    wordsPerToken,
     lexicalByTokenBits,
     unaryChild: Uint16Array.from(unaryChild),
     unaryParent: Uint16Array.from(unaryParent),
@@ -457,18 +459,21 @@ function buildCykPlan(cnf: CfgGrammar | CnfGrammar | CnfPcfgGrammar, startSymbol
   };
 }
 
-function maybeNativeRecognize(tokens: string[], plan: CykPlan | null): boolean {
+function maybeNativeRecognize(tokens: string[], plan: CykPlan | null, buffer?: ChartBuffer<unknown>): boolean {
   if (tokens.length === 0) return false;
   if (!plan) return true;
-  const tokenBits = new BigUint64Array(tokens.length);
+  const words = plan.wordsPerToken;
+  const size = tokens.length * words;
+  const tokenBits = buffer ? buffer.tokenBits(size) : new BigUint64Array(size);
   for (let i = 0; i < tokens.length; i += 1) {
-    const bits = plan.lexicalByTokenBits.get(tokens[i]!) ?? 0n;
-    if (bits === 0n) return false;
-    tokenBits[i] = bits;
+    const bits = plan.lexicalByTokenBits.get(tokens[i]!);
+    if (!bits) return false;
+    tokenBits.set(bits, i * words);
   }
   try {
     return cykRecognizeIdsNative({
       tokenBits,
+      wordsPerToken: words,
       binaryLeft: plan.binaryLeft,
       binaryRight: plan.binaryRight,
       binaryParent: plan.binaryParent,
@@ -481,24 +486,6 @@ function maybeNativeRecognize(tokens: string[], plan: CykPlan | null): boolean {
   }
 }
 
-function applyUnaryClosure(cell: Map<string, ParseTree[]>, unaryByChild: Map<string, string[]>, maxTrees: number): void {
-  const queue = [...cell.keys()];
-  let idx = 0;
-  while (idx < queue.length) {
-    const child = queue[idx++]!;
-    const parents = unaryByChild.get(child) ?? [];
-    const childTrees = cell.get(child) ?? [];
-    for (const parent of parents) {
-      const before = cell.get(parent)?.length ?? 0;
-      for (const tree of childTrees) {
-        dedupePushTree(cell, parent, { label: parent, children: [tree] }, maxTrees);
-      }
-      const after = cell.get(parent)?.length ?? 0;
-      if (after > before) queue.push(parent);
-    }
-  }
-}
-
 function treeChildCount(tree: ParseTree): number {
   if (tree.children.length === 0) return 1;
   let count = 1;
@@ -509,27 +496,214 @@ function treeChildCount(tree: ParseTree): number {
   return count;
 }
 
-export function chartParse(tokens: string[], grammar: CfgGrammar, options?: { maxTrees?: number; startSymbol?: string }): ParseTree[] {
-  const maxTrees = Math.max(1, options?.maxTrees ?? 8);
-  const cnf = buildCnf(grammar);
-  const start = options?.startSymbol ?? grammar.startSymbol;
-  if (!maybeNativeRecognize(tokens, buildCykPlan(cnf, start))) return [];
+function indexBinaryByLeft<T>(binaryByChildren: Map<string, T[]>): Map<string, Map<string, T[]>> {
+  const out = new Map<string, Map<string, T[]>>();
+  for (const [pair, rows] of binaryByChildren) {
+    const [left, right] = pair.split(" ");
+    let byRight = out.get(left!);
+    if (!byRight) {
+      byRight = new Map<string, T[]>();
+      out.set(left!, byRight);
+    }
+    byRight.set(right!, rows);
+  }
+  return out;
+}
 
-  const n = tokens.length;
-  const chart: Array<Array<Map<string, ParseTree[]>>> = [];
-  for (let i = 0; i <= n; i += 1) {
-    const row: Array<Map<string, ParseTree[]>> = [];
-    for (let j = 0; j <= n; j += 1) row.push(new Map<string, ParseTree[]>());
-    chart.push(row);
+class ChartBuffer<T> {
+  private rows: Array<Array<Map<string, T>>> = [];
+  private bits = new BigUint64Array(0);
+
+  take(n: number): Array<Array<Map<string, T>>> {
+    while (this.rows.length <= n) this.rows.push([]);
+    for (let i = 0; i <= n; i += 1) {
+      const row = this.rows[i]!;
+      while (row.length <= n) row.push(new Map<string, T>());
+      for (let j = 0; j <= n; j += 1) {
+        const cell = row[j]!;
+        if (cell.size > 0) cell.clear();
+      }
+    }
+    return this.rows;
+  }
+
+  tokenBits(n: number): BigUint64Array {
+    if (this.bits.length < n) this.bits = new BigUint64Array(Math.max(n, this.bits.length * 2));
+    return this.bits.subarray(0, n);
+  }
+}
+
+export class CompiledCfg {
+  readonly grammar: CfgGrammar;
+  readonly cnf: CnfGrammar;
+  readonly binaryByLeft: Map<string, Map<string, string[]>>;
+  readonly productions: CfgProduction[];
+  readonly productionCount: number;
+  private readonly cykPlans = new Map<string, CykPlan | null>();
+  private earleyPlan: EarleyPlan | null = null;
+  private topDownPlan: TopDownPlan | null = null;
+
+  constructor(grammar: CfgGrammar) {
+    this.grammar = grammar;
+    this.productions = grammar.productions;
+    this.productionCount = grammar.productions.length;
+    this.cnf = buildCnf(grammar);
+    this.binaryByLeft = indexBinaryByLeft(this.cnf.binaryByChildren);
+  }
+
+  get startSymbol(): string {
+    return this.grammar.startSymbol;
+  }
+
+  cykPlan(startSymbol = this.grammar.startSymbol): CykPlan | null {
+    if (!this.cykPlans.has(startSymbol)) this.cykPlans.set(startSymbol, buildCykPlan(this.cnf, startSymbol));
+    return this.cykPlans.get(startSymbol) ?? null;
   }
 
+  earley(): EarleyPlan {
+    if (!this.earleyPlan) this.earleyPlan = buildEarleyPlan(this.grammar);
+    return this.earleyPlan;
+  }
+
+  topDown(): TopDownPlan {
+    if (!this.topDownPlan) this.topDownPlan = buildTopDownPlan(this.grammar);
+    return this.topDownPlan;
+  }
+}
+
+const compiledCfgs = new WeakMap<CfgGrammar, CompiledCfg>();
+
+export function compileCfg(grammar: CfgGrammar | CompiledCfg): CompiledCfg {
+  if (grammar instanceof CompiledCfg) return grammar;
+  const cached = compiledCfgs.get(grammar);
+  if (cached && cached.productions === grammar.productions && cached.productionCount === grammar.productions.length) {
+    return cached;
+  }
+  const compiled = new CompiledCfg(grammar);
+  compiledCfgs.set(grammar, compiled);
+  return compiled;
+}
+
+export class ParseForest {
+  readonly tokens: string[];
+  readonly root: number;
+  private readonly labels: string[];
+  private readonly starts: number[];
+  private readonly ends: number[];
+  private readonly derivations: number[][][];
+
+  constructor(
+    tokens: string[],
+    nodes: { labels: string[]; starts: number[]; ends: number[]; derivations: number[][][] },
+    root: number,
+  ) {
+    this.tokens = tokens;
+    this.labels = nodes.labels;
+    this.starts = nodes.starts;
+    this.ends = nodes.ends;
+    this.derivations = nodes.derivations;
+    this.root = root;
+  }
+
+  get nodeCount(): number {
+    return this.labels.length;
+  }
+
+  node(id: number): { label: string; start: number; end: number; derivations: number[][] } {
+    return { label: this.labels[id]!, start: this.starts[id]!, end: this.ends[id]!, derivations: this.derivations[id]! };
+  }
+
+  trees(limit = 8): ParseTree[] {
+    const memo = new Map<number, ParseTree[]>();
+    const active = new Set<number>();
+    const max = Math.max(1, limit);
+    const expand = (id: number): ParseTree[] => {
+      const cached = memo.get(id);
+      if (cached) return cached;
+      if (active.has(id)) return [];
+      active.add(id);
+      const label = this.labels[id]!;
+      const out: ParseTree[] = [];
+      for (const children of this.derivations[id]!) {
+        if (out.length >= max) break;
+        if (children.length === 0) {
+          out.push({ label, children: [this.tokens[this.starts[id]!]!] });
+        } else if (children.length === 1) {
+          for (const tree of expand(children[0]!)) {
+            if (out.length >= max) break;
+            out.push({ label, children: [tree] });
+          }
+        } else {
+          const leftTrees = expand(children[0]!);
+          if (leftTrees.length === 0) continue;
+          const rightTrees = expand(children[1]!);
+          for (const lt of leftTrees) {
+            if (out.length >= max) break;
+            for (const rt of rightTrees) {
+              if (out.length >= max) break;
+              out.push({ label, children: [lt, rt] });
+            }
+          }
+        }
+      }
+      active.delete(id);
+      memo.set(id, out);
+      return out;
+    };
+    return expand(this.root);
+  }
+}
+
+class ForestBuilder {
+  readonly labels: string[] = [];
+  readonly starts: number[] = [];
+  readonly ends: number[] = [];
+  readonly derivations: number[][][] = [];
+
+  node(cell: Map<string, number>, label: string, start: number, end: number): number {
+    const existing = cell.get(label);
+    if (existing !== undefined) return existing;
+    const id = this.labels.length;
+    this.labels.push(label);
+    this.starts.push(start);
+    this.ends.push(end);
+    this.derivations.push([]);
+    cell.set(label, id);
+    return id;
+  }
+
+  closeUnary(cell: Map<string, number>, unaryByChild: Map<string, string[]>, start: number, end: number): void {
+    const queue = [...cell.values()];
+    for (let idx = 0; idx < queue.length; idx += 1) {
+      const child = queue[idx]!;
+      for (const parent of unaryByChild.get(this.labels[child]!) ?? []) {
+        const before = this.labels.length;
+        const id = this.node(cell, parent, start, end);
+        if (id === before) queue.push(id);
+        this.derivations[id]!.push([child]);
+      }
+    }
+  }
+}
+
+function buildChartForest(
+  tokens: string[],
+  compiled: CompiledCfg,
+  start: string,
+  buffer: ChartBuffer<number>,
+): ParseForest | null {
+  if (!maybeNativeRecognize(tokens, compiled.cykPlan(start), buffer)) return null;
+  const cnf = compiled.cnf;
+  const n = tokens.length;
+  const chart = buffer.take(n);
+  const forest = new ForestBuilder();
+
   for (let i = 0; i < n; i += 1) {
-    const token = tokens[i]!;
     const cell = chart[i]![i + 1]!;
-    for (const lhs of cnf.lexicalByToken.get(token) ?? []) {
-      dedupePushTree(cell, lhs, { label: lhs, children: [token] }, maxTrees);
+    for (const lhs of cnf.lexicalByToken.get(tokens[i]!) ?? []) {
+      forest.derivations[forest.node(cell, lhs, i, i + 1)]!.push([]);
     }
-    applyUnaryClosure(cell, cnf.unaryByChild, maxTrees);
+    forest.closeUnary(cell, cnf.unaryByChild, i, i + 1);
   }
 
   for (let span = 2; span <= n; span += 1) {
@@ -541,373 +715,574 @@ export function chartParse(tokens: string[], grammar: CfgGrammar, options?: { ma
         const right = chart[k]![j]!;
         if (left.size === 0 || right.size === 0) continue;
 
-        for (const [leftSym, leftTrees] of left) {
-          for (const [rightSym, rightTrees] of right) {
-            const parents = cnf.binaryByChildren.get(`${leftSym} ${rightSym}`) ?? [];
-            if (parents.length === 0) continue;
+        for (const [leftSym, leftId] of left) {
+          const byRight = compiled.binaryByLeft.get(leftSym);
+          if (!byRight) continue;
+          for (const [rightSym, rightId] of right) {
+            const parents = byRight.get(rightSym);
+            if (!parents) continue;
             for (const parent of parents) {
-              for (const lt of leftTrees) {
-                for (const rt of rightTrees) {
-                  dedupePushTree(cell, parent, { label: parent, children: [lt, rt] }, maxTrees);
-                }
-              }
+              forest.derivations[forest.node(cell, parent, i, j)]!.push([leftId, rightId]);
             }
           }
         }
       }
-      if (cell.size > 0) applyUnaryClosure(cell, cnf.unaryByChild, maxTrees);
+      if (cell.size > 0) forest.closeUnary(cell, cnf.unaryByChild, i, j);
     }
   }
 
-  return (chart[0]![n]!.get(start) ?? []).slice(0, maxTrees).sort((a, b) => treeChildCount(a) - treeChildCount(b));
+  const root = chart[0]![n]!.get(start);
+  return root === undefined ? null : new ParseForest(tokens, forest, root);
 }
 
-type RecursiveParseResult = {
-  tree: ParseTree;
-  next: number;
-};
-
-export function recursiveDescentParse(
+function chartParseCompiled(
   tokens: string[],
-  grammar: CfgGrammar,
-  options?: { maxTrees?: number; startSymbol?: string; maxDepth?: number },
+  compiled: CompiledCfg,
+  options: { maxTrees?: number; startSymbol?: string } | undefined,
+  buffer: ChartBuffer<number>,
 ): ParseTree[] {
   const maxTrees = Math.max(1, options?.maxTrees ?? 8);
-  const maxDepth = Math.max(1, options?.maxDepth ?? Math.max(32, tokens.length * 4));
-  const start = options?.startSymbol ?? grammar.startSymbol;
+  const forest = buildChartForest(tokens, compiled, options?.startSymbol ?? compiled.startSymbol, buffer);
+  if (!forest) return [];
+  return forest.trees(maxTrees).sort((a, b) => treeChildCount(a) - treeChildCount(b));
+}
 
-  const rulesByLhs = new Map<string, string[][]>();
-  const nonterminals = new Set<string>();
-  for (const prod of grammar.productions) {
-    nonterminals.add(prod.lhs);
-    const rows = rulesByLhs.get(prod.lhs) ?? [];
-    rows.push(prod.rhs);
-    rulesByLhs.set(prod.lhs, rows);
-  }
+export function chartParseForest(
+  tokens: string[],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { startSymbol?: string },
+): ParseForest | null {
+  const compiled = compileCfg(grammar);
+  return buildChartForest(tokens, compiled, options?.startSymbol ?? compiled.startSymbol, new ChartBuffer<number>());
+}
 
-  const memo = new Map<string, RecursiveParseResult[]>();
-  const inProgress = new Set<string>();
-  const keyOf = (lhs: string, index: number): string => `${lhs}@${index}`;
+export function chartParse(
+  tokens: string[],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { maxTrees?: number; startSymbol?: string },
+): ParseTree[] {
+  return chartParseCompiled(tokens, compileCfg(grammar), options, new ChartBuffer<number>());
+}
 
-  const parseSymbol = (lhs: string, index: number, depth: number): RecursiveParseResult[] => {
-    if (depth > maxDepth) return [];
-    const key = keyOf(lhs, index);
-    const cached = memo.get(key);
-    if (cached) return cached;
-    if (inProgress.has(key)) return [];
-    inProgress.add(key);
-
-    const out: RecursiveParseResult[] = [];
-    const dedupe = new Set<string>();
-    const alternatives = rulesByLhs.get(lhs) ?? [];
-    for (const rhs of alternatives) {
-      if (rhs.length === 0) {
-        const tree: ParseTree = { label: lhs, children: [] };
-        const dkey = `${index}\u0001${JSON.stringify(tree)}`;
-        if (!dedupe.has(dkey)) {
-          dedupe.add(dkey);
-          out.push({ tree, next: index });
-        }
-        continue;
-      }
+export function chartParseBatch(
+  sentences: string[][],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { maxTrees?: number; startSymbol?: string },
+): ParseTree[][] {
+  const compiled = compileCfg(grammar);
+  const buffer = new ChartBuffer<number>();
+  return sentences.map((tokens) => chartParseCompiled(tokens, compiled, options, buffer));
+}
 
-      let partials: Array<{ children: Array<ParseTree | string>; next: number }> = [{ children: [], next: index }];
-      for (const symbol of rhs) {
-        const nextPartials: Array<{ children: Array<ParseTree | string>; next: number }> = [];
-        for (const partial of partials) {
-          if (nonterminals.has(symbol)) {
-            const childParses = parseSymbol(symbol, partial.next, depth + 1);
-            for (const child of childParses) {
-              nextPartials.push({
-                children: [...partial.children, child.tree],
-                next: child.next,
-              });
-            }
-          } else if (partial.next < tokens.length && tokens[partial.next] === symbol) {
-            nextPartials.push({
-              children: [...partial.children, symbol],
-              next: partial.next + 1,
-            });
-          }
-        }
-        if (nextPartials.length === 0) {
-          partials = [];
-          break;
-        }
-        partials = nextPartials.slice(0, maxTrees * 8);
-      }
+type RecursiveParseResult = {
+  tree: ParseTree;
+  next: number;
+};
 
-      for (const partial of partials) {
-        const tree: ParseTree = {
-          label: lhs,
-          children: partial.children,
-        };
-        const dkey = `${partial.next}\u0001${JSON.stringify(tree)}`;
-        if (!dedupe.has(dkey)) {
-          dedupe.add(dkey);
-          out.push({ tree, next: partial.next });
-        }
-      }
-    }
+type TopDownPlan = {
+  nonterminalIds: Map<string, number>;
+  terminalIds: Map<string, number>;
+  labels: string[];
+  ruleOffsets: Uint32Array;
+  rhsOffsets: Uint32Array;
+  rhs: Uint32Array;
+  cornerWords: number;
+  leftCorners: Uint32Array;
+  hasLeftCorners: Uint8Array;
+};
 
-    inProgress.delete(key);
-    memo.set(key, out);
-    return out;
+/**
+ * Integer rule tables for the top-down parsers. Nonterminal IDs come first and
+ * terminal IDs follow; `leftCorners` holds, per nonterminal, a bitset over terminal
+ * indices (`id - nonterminalCount`) reachable through first symbols. Duplicate
+ * alternatives are dropped here so the parsers never build identical trees.
+ */
+function buildTopDownPlan(grammar: CfgGrammar): TopDownPlan {
+  const nonterminalIds = new Map<string, number>();
+  const labels: string[] = [];
+  for (const prod of grammar.productions) {
+    if (nonterminalIds.has(prod.lhs)) continue;
+    nonterminalIds.set(prod.lhs, labels.length);
+    labels.push(prod.lhs);
+  }
+  const nt = labels.length;
+  const terminalIds = new Map<string, number>();
+  const symbolId = (sym: string): number => {
+    const id = nonterminalIds.get(sym);
+    if (id !== undefined) return id;
+    let term = terminalIds.get(sym);
+    if (term === undefined) {
+      term = nt + terminalIds.size;
+      terminalIds.set(sym, term);
+    }
+    return term;
   };
 
-  const parsed = parseSymbol(start, 0, 0)
-    .filter((row) => row.next === tokens.length)
-    .map((row) => row.tree);
-  return parsed.slice(0, maxTrees).sort((a, b) => treeChildCount(a) - treeChildCount(b));
-}
-
-type LeftCornerTable = {
-  startsWithTerminals: Map<string, Set<string>>;
-};
-
-function buildLeftCornerTable(grammar: CfgGrammar): LeftCornerTable {
-  const rulesByLhs = new Map<string, string[][]>();
-  const nonterminals = new Set<string>();
+  const rulesByLhs: number[][][] = labels.map(() => []);
+  const seen = new Set<string>();
   for (const prod of grammar.productions) {
-    nonterminals.add(prod.lhs);
-    const rows = rulesByLhs.get(prod.lhs) ?? [];
-    rows.push(prod.rhs);
-    rulesByLhs.set(prod.lhs, rows);
+    const key = `${prod.lhs}\u0001${prod.rhs.join("\u0001")}`;
+    if (seen.has(key)) continue;
+    seen.add(key);
+    rulesByLhs[nonterminalIds.get(prod.lhs)!]!.push(prod.rhs.map(symbolId));
   }
 
-  const startsWithTerminals = new Map<string, Set<string>>();
-  for (const nt of nonterminals) startsWithTerminals.set(nt, new Set<string>());
+  const ruleOffsets = new Uint32Array(nt + 1);
+  const rhsOffsets: number[] = [0];
+  const rhs: number[] = [];
+  for (let lhs = 0; lhs < nt; lhs += 1) {
+    for (const row of rulesByLhs[lhs]!) {
+      rhs.push(...row);
+      rhsOffsets.push(rhs.length);
+    }
+    ruleOffsets[lhs + 1] = rhsOffsets.length - 1;
+  }
 
+  const cornerWords = Math.max(1, Math.ceil(terminalIds.size / 32));
+  const leftCorners = new Uint32Array(nt * cornerWords);
   let changed = true;
   while (changed) {
     changed = false;
-    for (const nt of nonterminals) {
-      const target = startsWithTerminals.get(nt)!;
-      for (const rhs of rulesByLhs.get(nt) ?? []) {
-        if (rhs.length === 0) continue;
-        const first = rhs[0]!;
-        if (nonterminals.has(first)) {
-          for (const tok of startsWithTerminals.get(first) ?? []) {
-            if (!target.has(tok)) {
-              target.add(tok);
+    for (let lhs = 0; lhs < nt; lhs += 1) {
+      const target = lhs * cornerWords;
+      for (const row of rulesByLhs[lhs]!) {
+        if (row.length === 0) continue;
+        const first = row[0]!;
+        if (first < nt) {
+          const source = first * cornerWords;
+          for (let w = 0; w < cornerWords; w += 1) {
+            const merged = leftCorners[target + w]! | leftCorners[source + w]!;
+            if (merged !== leftCorners[target + w]) {
+              leftCorners[target + w] = merged;
               changed = true;
             }
           }
-        } else if (!target.has(first)) {
-          target.add(first);
-          changed = true;
+        } else {
+          const t = first - nt;
+          const word = target + (t >>> 5);
+          const bit = 1 << (t & 31);
+          if ((leftCorners[word]! & bit) === 0) {
+            leftCorners[word] = leftCorners[word]! | bit;
+            changed = true;
+          }
         }
       }
     }
   }
 
-  return { startsWithTerminals };
+  const hasLeftCorners = new Uint8Array(nt);
+  for (let lhs = 0; lhs < nt; lhs += 1) {
+    for (let w = 0; w < cornerWords; w += 1) {
+      if (leftCorners[lhs * cornerWords + w] !== 0) {
+        hasLeftCorners[lhs] = 1;
+        break;
+      }
+    }
+  }
+
+  return {
+    nonterminalIds,
+    terminalIds,
+    labels,
+    ruleOffsets,
+    rhsOffsets: Uint32Array.from(rhsOffsets),
+    rhs: Uint32Array.from(rhs),
+    cornerWords,
+    leftCorners,
+    hasLeftCorners,
+  };
 }
 
-export function leftCornerParse(
+const NO_PARSES: RecursiveParseResult[] = [];
+
+/**
+ * Memo storage reused across sentences. A (symbol, position) cell is valid only when
+ * its stamp equals the current sentence's stamp, so nothing is cleared between
+ * sentences; failed goals are memoized as the shared empty result list.
+ */
+class TopDownBuffer {
+  private stamp = 0;
+  memoStamp = new Uint32Array(0);
+  activeStamp = new Uint32Array(0);
+  memo: RecursiveParseResult[][] = [];
+  tokenIds = new Int32Array(0);
+
+  begin(cells: number, n: number): number {
+    if (this.memoStamp.length < cells) {
+      const size = Math.max(cells, this.memoStamp.length * 2);
+      this.memoStamp = new Uint32Array(size);
+      this.activeStamp = new Uint32Array(size);
+      this.stamp = 0;
+    }
+    if (this.tokenIds.length < n) this.tokenIds = new Int32Array(Math.max(n, this.tokenIds.length * 2));
+    if (this.stamp === 0xffffffff) {
+      this.memoStamp.fill(0);
+      this.activeStamp.fill(0);
+      this.stamp = 0;
+    }
+    this.stamp += 1;
+    return this.stamp;
+  }
+}
+
+function topDownParseCompiled(
   tokens: string[],
-  grammar: CfgGrammar,
-  options?: { maxTrees?: number; startSymbol?: string; maxDepth?: number },
+  compiled: CompiledCfg,
+  leftCorner: boolean,
+  options: { maxTrees?: number; startSymbol?: string; maxDepth?: number } | undefined,
+  buffer: TopDownBuffer,
 ): ParseTree[] {
+  const plan = compiled.topDown();
   const maxTrees = Math.max(1, options?.maxTrees ?? 8);
   const maxDepth = Math.max(1, options?.maxDepth ?? Math.max(32, tokens.length * 4));
-  const start = options?.startSymbol ?? grammar.startSymbol;
-  const leftCorner = buildLeftCornerTable(grammar);
-
-  const rulesByLhs = new Map<string, string[][]>();
-  const nonterminals = new Set<string>();
-  for (const prod of grammar.productions) {
-    nonterminals.add(prod.lhs);
-    const rows = rulesByLhs.get(prod.lhs) ?? [];
-    rows.push(prod.rhs);
-    rulesByLhs.set(prod.lhs, rows);
-  }
+  const start = plan.nonterminalIds.get(options?.startSymbol ?? compiled.startSymbol);
+  if (start === undefined) return [];
 
-  const memo = new Map<string, RecursiveParseResult[]>();
-  const inProgress = new Set<string>();
-  const keyOf = (lhs: string, index: number): string => `${lhs}@${index}`;
-
-  const parseSymbol = (lhs: string, index: number, depth: number): RecursiveParseResult[] => {
-    if (depth > maxDepth) return [];
-    if (index >= tokens.length) return [];
-    const firstToken = tokens[index]!;
-    const starters = leftCorner.startsWithTerminals.get(lhs);
-    if (starters && starters.size > 0 && !starters.has(firstToken)) return [];
+  const n = tokens.length;
+  const width = n + 1;
+  const nt = plan.labels.length;
+  const stamp = buffer.begin(nt * width, n);
+  const { memoStamp, activeStamp, memo, tokenIds } = buffer;
+  for (let i = 0; i < n; i += 1) tokenIds[i] = plan.terminalIds.get(tokens[i]!) ?? -1;
+  const { ruleOffsets, rhsOffsets, rhs, leftCorners, hasLeftCorners, cornerWords } = plan;
+  const partialLimit = maxTrees * 8;
+
+  const startsWith = (sym: number, token: number): boolean => {
+    if (hasLeftCorners[sym] === 0) return true;
+    if (token < 0) return false;
+    const t = token - nt;
+    return (leftCorners[sym * cornerWords + (t >>> 5)]! & (1 << (t & 31))) !== 0;
+  };
 
-    const key = keyOf(lhs, index);
-    const cached = memo.get(key);
-    if (cached) return cached;
-    if (inProgress.has(key)) return [];
-    inProgress.add(key);
-
-    const out: RecursiveParseResult[] = [];
-    const dedupe = new Set<string>();
-    const alternatives = rulesByLhs.get(lhs) ?? [];
-
-    for (const rhs of alternatives) {
-      if (rhs.length === 0) continue;
-      const first = rhs[0]!;
-      if (nonterminals.has(first)) {
-        const childStarters = leftCorner.startsWithTerminals.get(first);
-        if (childStarters && childStarters.size > 0 && !childStarters.has(firstToken)) continue;
-      } else if (first !== firstToken) {
+  const parseSymbol = (sym: number, index: number, depth: number): RecursiveParseResult[] => {
+    if (depth > maxDepth) return NO_PARSES;
+    if (leftCorner && (index >= n || !startsWith(sym, tokenIds[index]!))) return NO_PARSES;
+
+    const cell = sym * width + index;
+    if (memoStamp[cell] === stamp) return memo[cell]!;
+    if (activeStamp[cell] === stamp) return NO_PARSES;
+    activeStamp[cell] = stamp;
+
+    const label = plan.labels[sym]!;
+    let out: RecursiveParseResult[] = NO_PARSES;
+    for (let r = ruleOffsets[sym]!; r < ruleOffsets[sym + 1]!; r += 1) {
+      const from = rhsOffsets[r]!;
+      const to = rhsOffsets[r + 1]!;
+      if (from === to) {
+        if (leftCorner) continue;
+        if (out === NO_PARSES) out = [];
+        out.push({ tree: { label, children: [] }, next: index });
         continue;
       }
+      if (leftCorner) {
+        const first = rhs[from]!;
+        if (first < nt ? !startsWith(first, tokenIds[index]!) : first !== tokenIds[index]) continue;
+      }
 
       let partials: Array<{ children: Array<ParseTree | string>; next: number }> = [{ children: [], next: index }];
-      for (const symbol of rhs) {
+      for (let k = from; k < to; k += 1) {
+        const symbol = rhs[k]!;
         const nextPartials: Array<{ children: Array<ParseTree | string>; next: number }> = [];
         for (const partial of partials) {
-          if (nonterminals.has(symbol)) {
-            const childParses = parseSymbol(symbol, partial.next, depth + 1);
-            for (const child of childParses) {
-              nextPartials.push({
-                children: [...partial.children, child.tree],
-                next: child.next,
-              });
+          if (symbol < nt) {
+            for (const child of parseSymbol(symbol, partial.next, depth + 1)) {
+              nextPartials.push({ children: [...partial.children, child.tree], next: child.next });
             }
-          } else if (partial.next < tokens.length && tokens[partial.next] === symbol) {
-            nextPartials.push({
-              children: [...partial.children, symbol],
-              next: partial.next + 1,
-            });
+          } else if (partial.next < n && tokenIds[partial.next] === symbol) {
+            nextPartials.push({ children: [...partial.children, tokens[partial.next]!], next: partial.next + 1 });
           }
         }
         if (nextPartials.length === 0) {
           partials = [];
           break;
         }
-        partials = nextPartials.slice(0, maxTrees * 8);
+        partials = nextPartials.length > partialLimit ? nextPartials.slice(0, partialLimit) : nextPartials;
       }
 
-      for (const partial of partials) {
-        const tree: ParseTree = {
-          label: lhs,
-          children: partial.children,
-        };
-        const dkey = `${partial.next}\u0001${JSON.stringify(tree)}`;
-        if (!dedupe.has(dkey)) {
-          dedupe.add(dkey);
-          out.push({ tree, next: partial.next });
-        }
-      }
+      if (partials.length > 0 && out === NO_PARSES) out = [];
+      for (const partial of partials) out.push({ tree: { label, children: partial.children }, next: partial.next });
     }
 
-    inProgress.delete(key);
-    memo.set(key, out);
+    activeStamp[cell] = 0;
+    memoStamp[cell] = stamp;
+    memo[cell] = out;
     return out;
   };
 
   const parsed = parseSymbol(start, 0, 0)
-    .filter((row) => row.next === tokens.length)
+    .filter((row) => row.next === n)
     .map((row) => row.tree);
   return parsed.slice(0, maxTrees).sort((a, b) => treeChildCount(a) - treeChildCount(b));
 }
 
-type EarleyState = {
-  lhs: string;
-  rhs: string[];
-  dot: number;
-  start: number;
-  end: number;
-};
+export function recursiveDescentParse(
+  tokens: string[],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { maxTrees?: number; startSymbol?: string; maxDepth?: number },
+): ParseTree[] {
+  return topDownParseCompiled(tokens, compileCfg(grammar), false, options, new TopDownBuffer());
+}
 
-function earleyStateKey(state: EarleyState): string {
-  return `${state.lhs}->${state.rhs.join(" ")}@${state.dot}:${state.start}:${state.end}`;
+export function recursiveDescentParseBatch(
+  sentences: string[][],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { maxTrees?: number; startSymbol?: string; maxDepth?: number },
+): ParseTree[][] {
+  const compiled = compileCfg(grammar);
+  const buffer = new TopDownBuffer();
+  return sentences.map((tokens) => topDownParseCompiled(tokens, compiled, false, options, buffer));
 }
 
-function earleyAddState(target: Map<string, EarleyState>, queue: EarleyState[], state: EarleyState): void {
-  const key = earleyStateKey(state);
-  if (!target.has(key)) {
-    target.set(key, state);
-    queue.push(state);
-  }
+export function leftCornerParse(
+  tokens: string[],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { maxTrees?: number; startSymbol?: string; maxDepth?: number },
+): ParseTree[] {
+  return topDownParseCompiled(tokens, compileCfg(grammar), true, options, new TopDownBuffer());
 }
 
-export function earleyRecognize(tokens: string[], grammar: CfgGrammar, options?: { startSymbol?: string }): boolean {
-  const start = options?.startSymbol ?? grammar.startSymbol;
-  const n = tokens.length;
-  const chart: Array<Map<string, EarleyState>> = [];
-  for (let i = 0; i <= n; i += 1) chart.push(new Map());
+export function leftCornerParseBatch(
+  sentences: string[][],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { maxTrees?: number; startSymbol?: string; maxDepth?: number },
+): ParseTree[][] {
+  const compiled = compileCfg(grammar);
+  const buffer = new TopDownBuffer();
+  return sentences.map((tokens) => topDownParseCompiled(tokens, compiled, true, options, buffer));
+}
+
+const EARLEY_COMPLETE = 0xffffffff;
+
+type EarleyPlan = {
+  nonterminalIds: Map<string, number>;
+  terminalIds: Map<string, number>;
+  tables: EarleyTables;
+};
+
+function buildEarleyPlan(grammar: CfgGrammar): EarleyPlan {
+  const nonterminalIds = new Map<string, number>();
+  for (const prod of grammar.productions) {
+    if (!nonterminalIds.has(prod.lhs)) nonterminalIds.set(prod.lhs, nonterminalIds.size);
+  }
+  const nt = nonterminalIds.size;
+  const terminalIds = new Map<string, number>();
+  const symbolId = (sym: string): number => {
+    const id = nonterminalIds.get(sym);
+    if (id !== undefined) return id;
+    let term = terminalIds.get(sym);
+    if (term === undefined) {
+      term = nt + terminalIds.size;
+      terminalIds.set(sym, term);
+    }
+    return term;
+  };
 
-  const rulesByLhs = new Map<string, string[][]>();
-  const nonterminals = new Set<string>();
+  // Dotted rule (rule, dot) is item ruleBase + dot, so advancing the dot is item + 1.
+  const itemNext: number[] = [];
+  const itemLhs: number[] = [];
+  const ruleItemsByLhs: number[][] = Array.from({ length: nt }, () => []);
+  const leftCorners: Array<Set<number>> = Array.from({ length: nt }, () => new Set<number>());
   for (const prod of grammar.productions) {
-    nonterminals.add(prod.lhs);
-    const rows = rulesByLhs.get(prod.lhs) ?? [];
-    rows.push(prod.rhs);
-    rulesByLhs.set(prod.lhs, rows);
-  }
-
-  const seed: EarleyState = {
-    lhs: "__GAMMA__",
-    rhs: [start],
-    dot: 0,
-    start: 0,
-    end: 0,
+    if (prod.rhs.length === 0) continue;
+    const lhs = nonterminalIds.get(prod.lhs)!;
+    ruleItemsByLhs[lhs]!.push(itemNext.length);
+    for (const sym of prod.rhs) {
+      itemNext.push(symbolId(sym));
+      itemLhs.push(lhs);
+    }
+    itemNext.push(EARLEY_COMPLETE);
+    itemLhs.push(lhs);
+    const first = nonterminalIds.get(prod.rhs[0]!);
+    if (first !== undefined) leftCorners[lhs]!.add(first);
+  }
+
+  const predictOffsets = new Uint32Array(nt + 1);
+  const predictItems: number[] = [];
+  for (let a = 0; a < nt; a += 1) {
+    const reach = [a];
+    const seen = new Set<number>(reach);
+    for (let idx = 0; idx < reach.length; idx += 1) {
+      const b = reach[idx]!;
+      for (const item of ruleItemsByLhs[b]!) predictItems.push(item);
+      for (const c of leftCorners[b]!) {
+        if (seen.has(c)) continue;
+        seen.add(c);
+        reach.push(c);
+      }
+    }
+    predictOffsets[a + 1] = predictItems.length;
+  }
+
+  return {
+    nonterminalIds,
+    terminalIds,
+    tables: {
+      nonterminalCount: nt,
+      itemNext: Uint32Array.from(itemNext),
+      itemLhs: Uint32Array.from(itemLhs),
+      predictOffsets,
+      predictItems: Uint32Array.from(predictItems),
+    },
+  };
+}
+
+function earleyRecognizeTables(tokenSymbols: Uint32Array, g: EarleyTables, start: number): boolean {
+  const n = tokenSymbols.length;
+  if (n === 0) return false;
+  const nt = g.nonterminalCount;
+  const itemCount = g.itemNext.length;
+  const seenWords = Math.ceil(((n + 1) * itemCount) / 32);
+  let seen = new Uint32Array(seenWords);
+  let seenNext = new Uint32Array(seenWords);
+  const insert = (bits: Uint32Array, origin: number, item: number): boolean => {
+    const key = origin * itemCount + item;
+    const mask = 1 << (key & 31);
+    const word = key >>> 5;
+    if ((bits[word]! & mask) !== 0) return false;
+    bits[word] = bits[word]! | mask;
+    return true;
   };
-  chart[0]!.set(earleyStateKey(seed), seed);
+
+  // Finished columns: states plus a CSR index of waiting states by next nonterminal.
+  const columnItems: number[][] = [];
+  const columnOrigins: number[][] = [];
+  const waitingOffsets: Uint32Array[] = [];
+  const waiting: Uint32Array[] = [];
+  const predicted = new Uint8Array(nt);
+
+  let items: number[] = [];
+  let origins: number[] = [];
+  let nextItems: number[] = [];
+  let nextOrigins: number[] = [];
+  predicted[start] = 1;
+  for (let p = g.predictOffsets[start]!; p < g.predictOffsets[start + 1]!; p += 1) {
+    const item = g.predictItems[p]!;
+    if (insert(seen, 0, item)) {
+      items.push(item);
+      origins.push(0);
+    }
+  }
 
   for (let i = 0; i <= n; i += 1) {
-    const cell = chart[i]!;
-    const queue = [...cell.values()];
-    let head = 0;
-    while (head < queue.length) {
-      const state = queue[head++]!;
-      if (state.dot < state.rhs.length) {
-        const next = state.rhs[state.dot]!;
-        if (nonterminals.has(next)) {
-          for (const rhs of rulesByLhs.get(next) ?? []) {
-            earleyAddState(cell, queue, {
-              lhs: next,
-              rhs,
-              dot: 0,
-              start: i,
-              end: i,
-            });
+    for (let head = 0; head < items.length; head += 1) {
+      const item = items[head]!;
+      const origin = origins[head]!;
+      const next = g.itemNext[item]!;
+      if (next === EARLEY_COMPLETE) {
+        if (origin >= i) continue;
+        const lhs = g.itemLhs[item]!;
+        const offsets = waitingOffsets[origin]!;
+        const rows = waiting[origin]!;
+        const prevItems = columnItems[origin]!;
+        const prevOrigins = columnOrigins[origin]!;
+        for (let w = offsets[lhs]!; w < offsets[lhs + 1]!; w += 1) {
+          const idx = rows[w]!;
+          const advanced = prevItems[idx]! + 1;
+          if (insert(seen, prevOrigins[idx]!, advanced)) {
+            items.push(advanced);
+            origins.push(prevOrigins[idx]!);
           }
-        } else if (i < n && tokens[i] === next) {
-          const advanced: EarleyState = {
-            lhs: state.lhs,
-            rhs: state.rhs,
-            dot: state.dot + 1,
-            start: state.start,
-            end: i + 1,
-          };
-          const nextCell = chart[i + 1]!;
-          const key = earleyStateKey(advanced);
-          if (!nextCell.has(key)) nextCell.set(key, advanced);
         }
-      } else {
-        const origin = chart[state.start]!;
-        for (const prev of origin.values()) {
-          if (prev.dot >= prev.rhs.length) continue;
-          if (prev.rhs[prev.dot] !== state.lhs) continue;
-          earleyAddState(cell, queue, {
-            lhs: prev.lhs,
-            rhs: prev.rhs,
-            dot: prev.dot + 1,
-            start: prev.start,
-            end: i,
-          });
+      } else if (next < nt) {
+        if (predicted[next]) continue;
+        predicted[next] = 1;
+        for (let p = g.predictOffsets[next]!; p < g.predictOffsets[next + 1]!; p += 1) {
+          const predictedItem = g.predictItems[p]!;
+          if (insert(seen, i, predictedItem)) {
+            items.push(predictedItem);
+            origins.push(i);
+          }
+        }
+      } else if (i < n && tokenSymbols[i] === next) {
+        if (insert(seenNext, origin, item + 1)) {
+          nextItems.push(item + 1);
+          nextOrigins.push(origin);
         }
       }
     }
+
+    const offsets = new Uint32Array(nt + 1);
+    for (const item of items) {
+      const next = g.itemNext[item]!;
+      if (next < nt) offsets[next + 1] = offsets[next + 1]! + 1;
+    }
+    for (let sym = 1; sym <= nt; sym += 1) offsets[sym] = offsets[sym]! + offsets[sym - 1]!;
+    const rows = new Uint32Array(offsets[nt]!);
+    const cursor = offsets.slice(0, nt);
+    for (let idx = 0; idx < items.length; idx += 1) {
+      const next = g.itemNext[items[idx]!]!;
+      if (next >= nt) continue;
+      rows[cursor[next]!] = idx;
+      cursor[next] = cursor[next]! + 1;
+    }
+    columnItems.push(items);
+    columnOrigins.push(origins);
+    waitingOffsets.push(offsets);
+    waiting.push(rows);
+
+    if (i === n) break;
+    items = nextItems;
+    origins = nextOrigins;
+    nextItems = [];
+    nextOrigins = [];
+    [seen, seenNext] = [seenNext, seen];
+    seenNext.fill(0);
+    predicted.fill(0);
+    if (items.length === 0) return false;
   }
 
-  const acceptKey = earleyStateKey({
-    lhs: "__GAMMA__",
-    rhs: [start],
-    dot: 1,
-    start: 0,
-    end: n,
-  });
-  return chart[n]!.has(acceptKey);
+  for (let idx = 0; idx < items.length; idx += 1) {
+    const item = items[idx]!;
+    if (origins[idx] === 0 && g.itemNext[item] === EARLEY_COMPLETE && g.itemLhs[item] === start) return true;
+  }
+  return false;
 }
 
-export function earleyParse(tokens: string[], grammar: CfgGrammar, options?: { maxTrees?: number; startSymbol?: string }): ParseTree[] {
-  if (!earleyRecognize(tokens, grammar, options)) return [];
-  return chartParse(tokens, grammar, options);
+export function earleyRecognize(
+  tokens: string[],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { startSymbol?: string; useNative?: boolean },
+): boolean {
+  const compiled = compileCfg(grammar);
+  const plan = compiled.earley();
+  const start = plan.nonterminalIds.get(options?.startSymbol ?? compiled.startSymbol);
+  if (start === undefined || tokens.length === 0) return false;
+  const tokenSymbols = new Uint32Array(tokens.length);
+  for (let i = 0; i < tokens.length; i += 1) {
+    const id = plan.terminalIds.get(tokens[i]!);
+    if (id === undefined) return false;
+    tokenSymbols[i] = id;
+  }
+  if (options?.useNative !== false) {
+    try {
+      return earleyRecognizeIdsNative({ tokenSymbols, grammar: plan.tables, startSymbol: start });
+    } catch {
+      // fall back to the JS engine below
+    }
+  }
+  return earleyRecognizeTables(tokenSymbols, plan.tables, start);
+}
+
+export function earleyParse(
+  tokens: string[],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { maxTrees?: number; startSymbol?: string; useNative?: boolean },
+): ParseTree[] {
+  const compiled = compileCfg(grammar);
+  if (!earleyRecognize(tokens, compiled, options)) return [];
+  return chartParseCompiled(tokens, compiled, options, new ChartBuffer<number>());
+}
+
+export function earleyParseBatch(
+  sentences: string[][],
+  grammar: CfgGrammar | CompiledCfg,
+  options?: { maxTrees?: number; startSymbol?: string; useNative?: boolean },
+): ParseTree[][] {
+  const compiled = compileCfg(grammar);
+  const buffer = new ChartBuffer<number>();
+  return sentences.map((tokens) =>
+    earleyRecognize(tokens, compiled, options) ? chartParseCompiled(tokens, compiled, options, buffer) : [],
+  );
 }
 
 type WeightedCellEntry = {
@@ -941,24 +1316,178 @@ function applyUnaryClosureWeighted(cell: Map<string, WeightedCellEntry>, unaryBy
   }
 }
 
-export function probabilisticChartParse(
+type ViterbiPlan = {
+  productions: PcfgProduction[];
+  productionCount: number;
+  cnf: CnfPcfgGrammar;
+  symbols: string[];
+  symbolToId: Map<string, number>;
+  lexicalByToken: Map<string, { symbols: number[]; logProbs: number[] }>;
+  tables: PcfgViterbiTables;
+};
+
+const viterbiPlans = new WeakMap<PcfgGrammar, ViterbiPlan>();
+
+function buildViterbiPlan(grammar: PcfgGrammar): ViterbiPlan {
+  const cached = viterbiPlans.get(grammar);
+  if (cached && cached.productions === grammar.productions && cached.productionCount === grammar.productions.length) {
+    return cached;
+  }
+  const cnf = buildCnfPcfg(grammar);
+  const symbols = collectSymbols(cnf, grammar.startSymbol);
+  const symbolToId = new Map<string, number>(symbols.map((sym, id) => [sym, id]));
+  const lexicalByToken = new Map<string, { symbols: number[]; logProbs: number[] }>();
+  for (const [token, rules] of cnf.lexicalByToken) {
+    lexicalByToken.set(token, {
+      symbols: rules.map((rule) => symbolToId.get(rule.lhs)!),
+      logProbs: rules.map((rule) => rule.logProb),
+    });
+  }
+
+  const unaryChild: number[] = [];
+  const unaryParent: number[] = [];
+  const unaryLogProbs: number[] = [];
+  for (const [child, rules] of cnf.unaryByChild) {
+    for (const rule of rules) {
+      unaryChild.push(symbolToId.get(child)!);
+      unaryParent.push(symbolToId.get(rule.lhs)!);
+      unaryLogProbs.push(rule.logProb);
+    }
+  }
+  const binaryLeft: number[] = [];
+  const binaryRight: number[] = [];
+  const binaryParent: number[] = [];
+  const binaryLogProbs: number[] = [];
+  for (const [pair, rules] of cnf.binaryByChildren) {
+    const [left, right] = pair.split(" ");
+    for (const rule of rules) {
+      binaryLeft.push(symbolToId.get(left!)!);
+      binaryRight.push(symbolToId.get(right!)!);
+      binaryParent.push(symbolToId.get(rule.lhs)!);
+      binaryLogProbs.push(rule.logProb);
+    }
+  }
+
+  const plan: ViterbiPlan = {
+    productions: grammar.productions,
+    productionCount: grammar.productions.length,
+    cnf,
+    symbols,
+    symbolToId,
+    lexicalByToken,
+    tables: {
+      symbolCount: symbols.length,
+      unaryChild: Uint32Array.from(unaryChild),
+      unaryParent: Uint32Array.from(unaryParent),
+      unaryLogProbs: Float64Array.from(unaryLogProbs),
+      binaryLeft: Uint32Array.from(binaryLeft),
+      binaryRight: Uint32Array.from(binaryRight),
+      binaryParent: Uint32Array.from(binaryParent),
+      binaryLogProbs: Float64Array.from(binaryLogProbs),
+    },
+  };
+  viterbiPlans.set(grammar, plan);
+  return plan;
+}
+
+function viterbiTreeFromNodes(nodes: PcfgViterbiNodes, symbols: string[], tokens: string[]): ParseTree {
+  let cursor = 0;
+  const build = (): ParseTree => {
+    const at = cursor++;
+    const label = symbols[nodes.labels[at]!]!;
+    const kind = nodes.kinds[at]!;
+    if (kind === 1) return { label, children: [tokens[nodes.starts[at]!]!] };
+    if (kind === 2) return { label, children: [build()] };
+    const left = build();
+    return { label, children: [left, build()] };
+  };
+  return build();
+}
+
+function nativeViterbiParse(tokens: string[], plan: ViterbiPlan, start: string): ProbabilisticParse | null {
+  const startSymbol = plan.symbolToId.get(start);
+  if (startSymbol === undefined) return null;
+  const lexicalOffsets = new Uint32Array(tokens.length + 1);
+  const lexicalSymbols: number[] = [];
+  const lexicalLogProbs: number[] = [];
+  for (let i = 0; i < tokens.length; i += 1) {
+    const entry = plan.lexicalByToken.get(tokens[i]!);
+    if (!entry) return null;
+    lexicalSymbols.push(...entry.symbols);
+    lexicalLogProbs.push(...entry.logProbs);
+    lexicalOffsets[i + 1] = lexicalSymbols.length;
+  }
+  const nodes = pcfgViterbiParseNative({
+    lexicalOffsets,
+    lexicalSymbols: Uint32Array.from(lexicalSymbols),
+    lexicalLogProbs: Float64Array.from(lexicalLogProbs),
+    grammar: plan.tables,
+    startSymbol,
+  });
+  if (!nodes) return null;
+  return {
+    tree: viterbiTreeFromNodes(nodes, plan.symbols, tokens),
+    logProb: nodes.logProb,
+    prob: Math.exp(nodes.logProb),
+  };
+}
+
+export class CompiledPcfg {
+  readonly grammar: PcfgGrammar;
+  readonly plan: ViterbiPlan;
+  readonly binaryByLeft: Map<string, Map<string, WeightedRule[]>>;
+  private readonly cykPlans = new Map<string, CykPlan | null>();
+
+  constructor(grammar: PcfgGrammar) {
+    this.grammar = grammar;
+    this.plan = buildViterbiPlan(grammar);
+    this.binaryByLeft = indexBinaryByLeft(this.plan.cnf.binaryByChildren);
+  }
+
+  get startSymbol(): string {
+    return this.grammar.startSymbol;
+  }
+
+  cykPlan(startSymbol = this.grammar.startSymbol): CykPlan | null {
+    if (!this.cykPlans.has(startSymbol)) this.cykPlans.set(startSymbol, buildCykPlan(this.plan.cnf, startSymbol));
+    return this.cykPlans.get(startSymbol) ?? null;
+  }
+}
+
+const compiledPcfgs = new WeakMap<PcfgGrammar, CompiledPcfg>();
+
+export function compilePcfg(grammar: PcfgGrammar | CompiledPcfg): CompiledPcfg {
+  if (grammar instanceof CompiledPcfg) return grammar;
+  const cached = compiledPcfgs.get(grammar);
+  if (cached && cached.plan === buildViterbiPlan(grammar)) return cached;
+  const compiled = new CompiledPcfg(grammar);
+  compiledPcfgs.set(grammar, compiled);
+  return compiled;
+}
+
+function probabilisticChartParseCompiled(
   tokens: string[],
-  grammar: PcfgGrammar,
-  options?: { startSymbol?: string },
+  compiled: CompiledPcfg,
+  options: { startSymbol?: string; useNative?: boolean } | undefined,
+  buffer: ChartBuffer<WeightedCellEntry>,
 ): ProbabilisticParse | null {
-  const cnf = buildCnfPcfg(grammar);
-  const start = options?.startSymbol ?? grammar.startSymbol;
-  if (!maybeNativeRecognize(tokens, buildCykPlan(cnf, start))) return null;
+  const start = options?.startSymbol ?? compiled.startSymbol;
   const n = tokens.length;
   if (n === 0) return null;
-
-  const chart: Array<Array<Map<string, WeightedCellEntry>>> = [];
-  for (let i = 0; i <= n; i += 1) {
-    const row: Array<Map<string, WeightedCellEntry>> = [];
-    for (let j = 0; j <= n; j += 1) row.push(new Map<string, WeightedCellEntry>());
-    chart.push(row);
+  const plan = compiled.plan;
+  if (options?.useNative !== false) {
+    try {
+      return nativeViterbiParse(tokens, plan, start);
+    } catch {
+      // fall back to the JS chart below
+    }
   }
 
+  const cnf = plan.cnf;
+  if (!maybeNativeRecognize(tokens, compiled.cykPlan(start), buffer)) return null;
+
+  const chart = buffer.take(n);
+
   for (let i = 0; i < n; i += 1) {
     const token = tokens[i]!;
     const cell = chart[i]![i + 1]!;
@@ -980,8 +1509,10 @@ export function probabilisticChartParse(
         const right = chart[k]![j]!;
         if (left.size === 0 || right.size === 0) continue;
         for (const [leftSym, leftEntry] of left) {
+          const byRight = compiled.binaryByLeft.get(leftSym);
+          if (!byRight) continue;
           for (const [rightSym, rightEntry] of right) {
-            for (const rule of cnf.binaryByChildren.get(`${leftSym} ${rightSym}`) ?? []) {
+            for (const rule of byRight.get(rightSym) ?? []) {
               setBest(cell, rule.lhs, {
                 logProb: leftEntry.logProb + rightEntry.logProb + rule.logProb,
                 tree: {
@@ -1006,9 +1537,27 @@ export function probabilisticChartParse(
   };
 }
 
+export function probabilisticChartParse(
+  tokens: string[],
+  grammar: PcfgGrammar | CompiledPcfg,
+  options?: { startSymbol?: string; useNative?: boolean },
+): ProbabilisticParse | null {
+  return probabilisticChartParseCompiled(tokens, compilePcfg(grammar), options, new ChartBuffer<WeightedCellEntry>());
+}
+
+export function probabilisticChartParseBatch(
+  sentences: string[][],
+  grammar: PcfgGrammar | CompiledPcfg,
+  options?: { startSymbol?: string; useNative?: boolean },
+): Array<ProbabilisticParse | null> {
+  const compiled = compilePcfg(grammar);
+  const buffer = new ChartBuffer<WeightedCellEntry>();
+  return sentences.map((tokens) => probabilisticChartParseCompiled(tokens, compiled, options, buffer));
+}
+
 export function parseTextWithCfg(
   text: string,
-  grammar: CfgGrammar | string,
+  grammar: CfgGrammar | CompiledCfg | string,
   options?: { maxTrees?: number; startSymbol?: string; normalizeTokens?: boolean },
 ): ParseTree[] {
   const cfg = typeof grammar === "string" ? parseCfgGrammar(grammar, { startSymbol: options?.startSymbol }) : grammar;
@@ -1019,7 +1568,7 @@ export function parseTextWithCfg(
 
 export function parseTextWithEarley(
   text: string,
-  grammar: CfgGrammar | string,
+  grammar: CfgGrammar | CompiledCfg | string,
   options?: { maxTrees?: number; startSymbol?: string; normalizeTokens?: boolean },
 ): ParseTree[] {
   const cfg = typeof grammar === "string" ? parseCfgGrammar(grammar, { startSymbol: options?.startSymbol }) : grammar;
@@ -1030,8 +1579,8 @@ export function parseTextWithEarley(
 
 export function parseTextWithPcfg(
   text: string,
-  grammar: PcfgGrammar | string,
-  options?: { startSymbol?: string; normalizeTokens?: boolean },
+  grammar: PcfgGrammar | CompiledPcfg | string,
+  options?: { startSymbol?: string; normalizeTokens?: boolean; useNative?: boolean },
 ): ProbabilisticParse | null {
   const pcfg = typeof grammar === "string" ? parsePcfgGrammar(grammar, { startSymbol: options?.startSymbol }) : grammar;
   const tokens = wordTokenizeSubset(text).filter((tok) => /[A-Za-z0-9']/.test(tok));
@@ -1041,7 +1590,7 @@ export function parseTextWithPcfg(
 
 export function parseTextWithRecursiveDescent(
   text: string,
-  grammar: CfgGrammar | string,
+  grammar: CfgGrammar | CompiledCfg | string,
   options?: { maxTrees?: number; startSymbol?: string; normalizeTokens?: boolean; maxDepth?: number },
 ): ParseTree[] {
   const cfg = typeof grammar === "string" ? parseCfgGrammar(grammar, { startSymbol: options?.startSymbol }) : grammar;
@@ -1052,7 +1601,7 @@ export function parseTextWithRecursiveDescent(
 
 export function parseTextWithLeftCorner(
   text: string,
-  grammar: CfgGrammar | string,
+  grammar: CfgGrammar | CompiledCfg | string,
   options?: { maxTrees?: number; startSymbol?: string; normalizeTokens?: boolean; maxDepth?: number },
 ): ParseTree[] {
   const cfg = typeof grammar === "string" ? parseCfgGrammar(grammar, { startSymbol: options?.startSymbol }) : grammar;
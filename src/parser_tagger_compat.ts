@@ -1,12 +1,21 @@
 import {
   chartParse,
+  chartParseBatch,
+  compileCfg,
+  compilePcfg,
   earleyParse,
+  earleyParseBatch,
   leftCornerParse,
+  leftCornerParseBatch,
   parseCfgGrammar,
   parsePcfgGrammar,
   probabilisticChartParse,
+  probabilisticChartParseBatch,
   recursiveDescentParse,
+  recursiveDescentParseBatch,
   type CfgGrammar,
+  type CompiledCfg,
+  type CompiledPcfg,
   type ParseTree,
   type PcfgGrammar,
   type ProbabilisticParse,
@@ -69,13 +78,19 @@ function asFeatureGrammar(grammar: FeatureCFG | FeatureCfgGrammar | string): Fea
 
 export class ChartParser {
   protected readonly grammar: CfgGrammar;
+  protected readonly compiled: CompiledCfg;
 
   constructor(grammar: CFG | CfgGrammar | string) {
     this.grammar = asCfgGrammar(grammar);
+    this.compiled = compileCfg(this.grammar);
   }
 
   parse(tokens: string[]): ParseTree[] {
-    return chartParse(tokens, this.grammar);
+    return chartParse(tokens, this.compiled);
+  }
+
+  parseBatch(sentences: string[][]): ParseTree[][] {
+    return chartParseBatch(sentences, this.compiled);
   }
 
   parseOne(tokens: string[]): ParseTree | null {
@@ -85,36 +100,54 @@ export class ChartParser {
 
 export class EarleyChartParser extends ChartParser {
   override parse(tokens: string[]): ParseTree[] {
-    return earleyParse(tokens, this.grammar);
+    return earleyParse(tokens, this.compiled);
+  }
+
+  override parseBatch(sentences: string[][]): ParseTree[][] {
+    return earleyParseBatch(sentences, this.compiled);
   }
 }
 
 export class RecursiveDescentParser extends ChartParser {
   override parse(tokens: string[]): ParseTree[] {
-    return recursiveDescentParse(tokens, this.grammar);
+    return recursiveDescentParse(tokens, this.compiled);
+  }
+
+  override parseBatch(sentences: string[][]): ParseTree[][] {
+    return recursiveDescentParseBatch(sentences, this.compiled);
   }
 }
 
 export class LeftCornerChartParser extends ChartParser {
   override parse(tokens: string[]): ParseTree[] {
-    return leftCornerParse(tokens, this.grammar);
+    return leftCornerParse(tokens, this.compiled);
+  }
+
+  override parseBatch(sentences: string[][]): ParseTree[][] {
+    return leftCornerParseBatch(sentences, this.compiled);
   }
 }
 
 export class ViterbiParser {
   private readonly grammar: PcfgGrammar;
+  private readonly compiled: CompiledPcfg;
 
   constructor(grammar: PCFG | PcfgGrammar | string) {
     this.grammar = asPcfgGrammar(grammar);
+    this.compiled = compilePcfg(this.grammar);
   }
 
   parse(tokens: string[]): ProbabilisticParse[] {
-    const best = probabilisticChartParse(tokens, this.grammar);
+    const best = probabilisticChartParse(tokens, this.compiled);
     return best ? [best] : [];
   }
 
+  parseBatch(sentences: string[][]): ProbabilisticParse[][] {
+    return probabilisticChartParseBatch(sentences, this.compiled).map((best) => (best ? [best] : []));
+  }
+
   parseOne(tokens: string[]): ProbabilisticParse | null {
-    return probabilisticChartParse(tokens, this.grammar);
+    return probabilisticChartParse(tokens, this.compiled);
   }
 }
 
@@ -1,6 +1,13 @@
-import { readFileSync } from "node:fs";
-import { resolve } from "node:path";
-import { perceptronPredictBatchNative } from "./native";
+import { existsSync, readFileSync } from "node:fs";
+import { dirname, resolve } from "node:path";
+import {
+  perceptronPredictBatchNative,
+  perceptronPredictBatchQuantizedNative,
+  perceptronTagBatchAsciiNative,
+  perceptronTrainAveragedNative,
+  type PerceptronFeatureTable,
+  type PerceptronQuantizedWeights,
+} from "./native";
 import { WasmNltk } from "./wasm";
 
 const ASCII_TOKEN_RE = /[A-Za-z0-9']+/g;
@@ -13,9 +20,12 @@ export type PerceptronTaggerModelSerialized = {
   tag_count: number;
   feature_index: Record<string, number>;
   weights: number[];
+  weights_file?: string;
   metadata?: Record<string, unknown>;
 };
 
+export type PerceptronWeightPrecision = "f32" | "f16" | "int8";
+
 export type PerceptronTaggerModel = {
   version: number;
   tags: string[];
@@ -24,6 +34,8 @@ export type PerceptronTaggerModel = {
   featureIndex: Record<string, number>;
   weights: Float32Array;
   metadata?: Record<string, unknown>;
+  featureId?: (key: string) => number | undefined;
+  quantized?: PerceptronQuantizedWeights;
 };
 
 export type PerceptronTaggedToken = {
@@ -95,10 +107,10 @@ function featureKeys(tokens: TokenOffset[], i: number): string[] {
   ];
 }
 
-function featureIds(tokens: TokenOffset[], i: number, featureIndex: Record<string, number>): number[] {
+function featureIds(tokens: TokenOffset[], i: number, model: PerceptronTaggerModel): number[] {
   const ids: number[] = [];
   for (const f of featureKeys(tokens, i)) {
-    const id = featureIndex[f];
+    const id = model.featureId ? model.featureId(f) : model.featureIndex[f];
     if (id !== undefined) ids.push(id);
   }
   return ids;
@@ -120,24 +132,162 @@ function argmax(scores: Float32Array): number {
 function predictTagIdJs(model: PerceptronTaggerModel, fids: ArrayLike<number>, scratch: Float32Array): number {
   scratch.fill(0);
   const tc = model.tagCount;
+  const quantized = model.quantized;
+  const weights = quantized ? null : model.weights;
+  const halfTable = quantized?.precision === "f16" ? float16Table() : null;
   for (let i = 0; i < fids.length; i += 1) {
     const fid = fids[i]!;
     if (fid < 0 || fid >= model.featureCount) continue;
     const base = fid * tc;
-    for (let j = 0; j < tc; j += 1) {
-      scratch[j]! += model.weights[base + j]!;
+    if (weights) {
+      for (let j = 0; j < tc; j += 1) scratch[j]! += weights[base + j]!;
+    } else if (quantized!.precision === "f16") {
+      for (let j = 0; j < tc; j += 1) scratch[j]! += halfTable![quantized!.values[base + j]!]!;
+    } else {
+      const scale = quantized!.scales[fid]!;
+      for (let j = 0; j < tc; j += 1) scratch[j]! += Math.fround(quantized!.values[base + j]! * scale);
     }
   }
   return argmax(scratch);
 }
 
-export function preparePerceptronTaggerModel(payload: PerceptronTaggerModelSerialized): PerceptronTaggerModel {
+const float32Scratch = new Float32Array(1);
+const float32BitsScratch = new Uint32Array(float32Scratch.buffer);
+let cachedFloat16Table: Float32Array | null = null;
+
+function toFloat16Bits(value: number): number {
+  float32Scratch[0] = value;
+  const bits = float32BitsScratch[0]!;
+  const sign = (bits >>> 16) & 0x8000;
+  const exponent = (bits >>> 23) & 0xff;
+  let mantissa = bits & 0x7fffff;
+  if (exponent === 0xff) return sign | 0x7c00 | (mantissa ? 0x200 : 0);
+
+  const halfExponent = exponent - 112;
+  if (halfExponent >= 0x1f) return sign | 0x7c00;
+  if (halfExponent <= 0) {
+    if (halfExponent < -10) return sign;
+    mantissa |= 0x800000;
+    const shift = 14 - halfExponent;
+    const halfway = 1 << (shift - 1);
+    const rest = mantissa & ((1 << shift) - 1);
+    let half = mantissa >>> shift;
+    if (rest > halfway || (rest === halfway && (half & 1) === 1)) half += 1;
+    return sign | half;
+  }
+
+  let half = (halfExponent << 10) | (mantissa >>> 13);
+  const rest = mantissa & 0x1fff;
+  if (rest > 0x1000 || (rest === 0x1000 && (half & 1) === 1)) half += 1;
+  return sign | half;
+}
+
+function float16Table(): Float32Array {
+  if (cachedFloat16Table) return cachedFloat16Table;
+  const table = new Float32Array(0x10000);
+  for (let bits = 0; bits < table.length; bits += 1) {
+    const sign = bits & 0x8000 ? -1 : 1;
+    const exponent = (bits >>> 10) & 0x1f;
+    const mantissa = bits & 0x3ff;
+    if (exponent === 0) table[bits] = sign * mantissa * 2 ** -24;
+    else if (exponent === 0x1f) table[bits] = mantissa ? Number.NaN : sign * Number.POSITIVE_INFINITY;
+    else table[bits] = sign * (1 + mantissa / 1024) * 2 ** (exponent - 15);
+  }
+  cachedFloat16Table = table;
+  return table;
+}
+
+function quantizeWeights(model: PerceptronTaggerModel, precision: "f16" | "int8"): PerceptronQuantizedWeights {
+  const source = model.weights;
+  if (precision === "f16") {
+    const values = new Uint16Array(source.length);
+    for (let i = 0; i < source.length; i += 1) values[i] = toFloat16Bits(source[i]!);
+    return { precision, values };
+  }
+
+  const tc = model.tagCount;
+  const values = new Int8Array(source.length);
+  const scales = new Float32Array(model.featureCount);
+  for (let fid = 0; fid < model.featureCount; fid += 1) {
+    const base = fid * tc;
+    let maxAbs = 0;
+    for (let j = 0; j < tc; j += 1) maxAbs = Math.max(maxAbs, Math.abs(source[base + j]!));
+    if (maxAbs === 0) continue;
+    scales[fid] = maxAbs / 127;
+    for (let j = 0; j < tc; j += 1) {
+      values[base + j] = Math.max(-127, Math.min(127, Math.round(source[base + j]! / scales[fid]!)));
+    }
+  }
+  return { precision, values, scales };
+}
+
+function dequantizeWeights(model: PerceptronTaggerModel, quantized: PerceptronQuantizedWeights): Float32Array {
+  const out = new Float32Array(quantized.values.length);
+  if (quantized.precision === "f16") {
+    const table = float16Table();
+    for (let i = 0; i < out.length; i += 1) out[i] = table[quantized.values[i]!]!;
+    return out;
+  }
+  for (let i = 0; i < out.length; i += 1) {
+    out[i] = quantized.values[i]! * quantized.scales[Math.floor(i / model.tagCount)]!;
+  }
+  return out;
+}
+
+export function quantizePerceptronTaggerModel(
+  model: PerceptronTaggerModel,
+  precision: PerceptronWeightPrecision,
+): PerceptronTaggerModel {
+  if (precision === "f32") return model;
+  if (model.quantized) throw new Error("perceptron model is already quantized");
+
+  const quantized = quantizeWeights(model, precision);
+  let table = featureTables.get(model);
+  let featureId: ((key: string) => number | undefined) | undefined;
+  let featureIndex: () => Record<string, number>;
+  if (model.featureId) {
+    // Packed models resolve features through views into the model bytes; copy only the
+    // feature table so the quantized model does not keep the f32 weights resident.
+    const source = table ?? buildFeatureTable(model);
+    table = { strings: source.strings.slice(), offsets: source.offsets.slice(), slots: source.slots.slice() };
+    featureId = featureTableLookup(table);
+    featureIndex = lazyFeatureIndex(table, model.featureCount);
+  } else {
+    const index = model.featureIndex;
+    featureIndex = () => index;
+  }
+  let weights: Float32Array | null = null;
+  const out: PerceptronTaggerModel = {
+    version: model.version,
+    tags: model.tags,
+    featureCount: model.featureCount,
+    tagCount: model.tagCount,
+    get featureIndex(): Record<string, number> {
+      return featureIndex();
+    },
+    get weights(): Float32Array {
+      weights ??= dequantizeWeights(out, quantized);
+      return weights;
+    },
+    metadata: model.metadata,
+    featureId,
+    quantized,
+  };
+  if (table) featureTables.set(out, table);
+  return out;
+}
+
+export function preparePerceptronTaggerModel(
+  payload: PerceptronTaggerModelSerialized,
+  sidecarWeights?: Float32Array,
+): PerceptronTaggerModel {
   if (payload.feature_count <= 0 || payload.tag_count <= 0) {
     throw new Error("invalid perceptron model dimensions");
   }
   const expectedWeights = payload.feature_count * payload.tag_count;
-  if (payload.weights.length !== expectedWeights) {
-    throw new Error(`invalid perceptron model weight length: expected ${expectedWeights}, got ${payload.weights.length}`);
+  const weightCount = sidecarWeights ? sidecarWeights.length : payload.weights.length;
+  if (weightCount !== expectedWeights) {
+    throw new Error(`invalid perceptron model weight length: expected ${expectedWeights}, got ${weightCount}`);
   }
 
   return {
@@ -146,17 +296,313 @@ export function preparePerceptronTaggerModel(payload: PerceptronTaggerModelSeria
     featureCount: payload.feature_count,
     tagCount: payload.tag_count,
     featureIndex: payload.feature_index,
-    weights: Float32Array.from(payload.weights),
+    weights: sidecarWeights ?? Float32Array.from(payload.weights),
     metadata: payload.metadata,
   };
 }
 
-export function loadPerceptronTaggerModel(path?: string): PerceptronTaggerModel {
-  const modelPath = path ?? resolve(import.meta.dir, "..", "models", "perceptron_tagger_ascii.json");
-  const raw = JSON.parse(readFileSync(modelPath, "utf8")) as PerceptronTaggerModelSerialized;
+// Binary model layout (little-endian), all u32 unless noted:
+//   header: magic "BNPT1\0\0\0", version, feature_count, tag_count, hash_slots, string_bytes, metadata_bytes
+//   string offsets [tag_count + feature_count + 1] (tags first, then features by id)
+//   feature hash slots [hash_slots] (FNV-1a over key bytes, linear probing, value = feature id + 1, 0 = empty)
+//   weights f32 [feature_count * tag_count]
+//   string table bytes, then metadata JSON bytes
+const TAGGER_PACK_MAGIC = "BNPT1";
+const TAGGER_PACK_HEADER_BYTES = 32;
+const FNV_OFFSET_32 = 0x811c9dc5;
+const FNV_PRIME_32 = 0x01000193;
+const HOST_LITTLE_ENDIAN = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+const cachedDefaultTaggerModels = new Map<PerceptronWeightPrecision, PerceptronTaggerModel>();
+const featureTables = new WeakMap<PerceptronTaggerModel, PerceptronFeatureTable>();
+
+function fnv1a32(bytes: Uint8Array): number {
+  let hash = FNV_OFFSET_32;
+  for (let i = 0; i < bytes.length; i += 1) {
+    hash = Math.imul(hash ^ bytes[i]!, FNV_PRIME_32) >>> 0;
+  }
+  return hash;
+}
+
+function hashSlotCount(featureCount: number): number {
+  let slots = 16;
+  while (slots < featureCount * 2) slots *= 2;
+  return slots;
+}
+
+function align4(value: number): number {
+  return (value + 3) & ~3;
+}
+
+function featureNamesById(model: PerceptronTaggerModel): string[] {
+  const names = new Array<string>(model.featureCount);
+  for (const [key, id] of Object.entries(model.featureIndex)) {
+    if (!Number.isInteger(id) || id < 0 || id >= model.featureCount) {
+      throw new Error(`invalid perceptron feature id for ${key}: ${id}`);
+    }
+    names[id] = key;
+  }
+  for (let i = 0; i < names.length; i += 1) {
+    if (names[i] === undefined) throw new Error(`perceptron model is missing a feature name for id ${i}`);
+  }
+  return names;
+}
+
+function buildFeatureTable(model: PerceptronTaggerModel): PerceptronFeatureTable {
+  const encoder = new TextEncoder();
+  const encoded = featureNamesById(model).map((name) => encoder.encode(name));
+  const offsets = new Uint32Array(encoded.length + 1);
+  let cursor = 0;
+  for (let fid = 0; fid < encoded.length; fid += 1) {
+    offsets[fid] = cursor;
+    cursor += encoded[fid]!.length;
+  }
+  offsets[encoded.length] = cursor;
+
+  const strings = new Uint8Array(cursor);
+  const slots = new Uint32Array(hashSlotCount(model.featureCount));
+  const mask = slots.length - 1;
+  for (let fid = 0; fid < encoded.length; fid += 1) {
+    strings.set(encoded[fid]!, offsets[fid]!);
+    let slot = fnv1a32(encoded[fid]!) & mask;
+    while (slots[slot] !== 0) slot = (slot + 1) & mask;
+    slots[slot] = fid + 1;
+  }
+  return { strings, offsets, slots };
+}
+
+export function packPerceptronTaggerModel(model: PerceptronTaggerModel): Uint8Array {
+  const encoder = new TextEncoder();
+  const table = buildFeatureTable(model);
+  const encodedTags = model.tags.map((value) => encoder.encode(value));
+  const metadataBytes = encoder.encode(model.metadata ? JSON.stringify(model.metadata) : "");
+  const tagBytes = encodedTags.reduce((sum, row) => sum + row.length, 0);
+  const stringBytes = tagBytes + table.strings.length;
+  const slots = table.slots.length;
+  const weightCount = model.featureCount * model.tagCount;
+
+  const offsetsStart = TAGGER_PACK_HEADER_BYTES;
+  const slotsStart = offsetsStart + (encodedTags.length + model.featureCount + 1) * 4;
+  const weightsStart = slotsStart + slots * 4;
+  const stringsStart = weightsStart + weightCount * 4;
+  const metadataStart = stringsStart + stringBytes;
+  const out = new Uint8Array(align4(metadataStart + metadataBytes.length));
+  const view = new DataView(out.buffer);
+
+  out.set(encoder.encode(TAGGER_PACK_MAGIC), 0);
+  view.setUint32(8, model.version, true);
+  view.setUint32(12, model.featureCount, true);
+  view.setUint32(16, model.tagCount, true);
+  view.setUint32(20, slots, true);
+  view.setUint32(24, stringBytes, true);
+  view.setUint32(28, metadataBytes.length, true);
+
+  let cursor = 0;
+  for (let i = 0; i < encodedTags.length; i += 1) {
+    view.setUint32(offsetsStart + i * 4, cursor, true);
+    out.set(encodedTags[i]!, stringsStart + cursor);
+    cursor += encodedTags[i]!.length;
+  }
+  const featureOffsetsStart = offsetsStart + encodedTags.length * 4;
+  for (let fid = 0; fid <= model.featureCount; fid += 1) {
+    view.setUint32(featureOffsetsStart + fid * 4, tagBytes + table.offsets[fid]!, true);
+  }
+  out.set(table.strings, stringsStart + tagBytes);
+
+  for (let slot = 0; slot < slots; slot += 1) {
+    view.setUint32(slotsStart + slot * 4, table.slots[slot]!, true);
+  }
+  for (let i = 0; i < weightCount; i += 1) {
+    view.setFloat32(weightsStart + i * 4, model.weights[i]!, true);
+  }
+  out.set(metadataBytes, metadataStart);
+  return out;
+}
+
+function readModelBytes(path: string): Uint8Array {
+  try {
+    return Bun.mmap(path, { shared: false });
+  } catch {
+    return readFileSync(path);
+  }
+}
+
+function u32View(bytes: Uint8Array, start: number, length: number): Uint32Array {
+  const byteOffset = bytes.byteOffset + start;
+  if (HOST_LITTLE_ENDIAN && byteOffset % 4 === 0) return new Uint32Array(bytes.buffer, byteOffset, length);
+  const view = new DataView(bytes.buffer, byteOffset, length * 4);
+  const out = new Uint32Array(length);
+  for (let i = 0; i < length; i += 1) out[i] = view.getUint32(i * 4, true);
+  return out;
+}
+
+function f32View(bytes: Uint8Array, start: number, length: number): Float32Array {
+  const byteOffset = bytes.byteOffset + start;
+  if (HOST_LITTLE_ENDIAN && byteOffset % 4 === 0) return new Float32Array(bytes.buffer, byteOffset, length);
+  const view = new DataView(bytes.buffer, byteOffset, length * 4);
+  const out = new Float32Array(length);
+  for (let i = 0; i < length; i += 1) out[i] = view.getFloat32(i * 4, true);
+  return out;
+}
+
+function featureTableLookup(table: PerceptronFeatureTable): (key: string) => number | undefined {
+  const { strings, offsets, slots } = table;
+  const encoder = new TextEncoder();
+  const mask = slots.length - 1;
+  return (key: string): number | undefined => {
+    let keyBytes: Uint8Array | null = null;
+    let hash = FNV_OFFSET_32;
+    for (let i = 0; i < key.length; i += 1) {
+      const ch = key.charCodeAt(i);
+      if (ch > 0x7f) {
+        keyBytes = encoder.encode(key);
+        hash = fnv1a32(keyBytes);
+        break;
+      }
+      hash = Math.imul(hash ^ ch, FNV_PRIME_32) >>> 0;
+    }
+    const keyLength = keyBytes ? keyBytes.length : key.length;
+
+    let slot = hash & mask;
+    for (let probes = 0; probes < slots.length; probes += 1) {
+      const entry = slots[slot]!;
+      if (entry === 0) return undefined;
+      const fid = entry - 1;
+      const start = offsets[fid]!;
+      if (offsets[fid + 1]! - start === keyLength) {
+        let same = true;
+        for (let i = 0; i < keyLength; i += 1) {
+          const expected = keyBytes ? keyBytes[i]! : key.charCodeAt(i);
+          if (strings[start + i] !== expected) {
+            same = false;
+            break;
+          }
+        }
+        if (same) return fid;
+      }
+      slot = (slot + 1) & mask;
+    }
+    return undefined;
+  };
+}
+
+function lazyFeatureIndex(table: PerceptronFeatureTable, featureCount: number): () => Record<string, number> {
+  let featureIndex: Record<string, number> | null = null;
+  return () => {
+    if (!featureIndex) {
+      const decoder = new TextDecoder();
+      featureIndex = {};
+      for (let fid = 0; fid < featureCount; fid += 1) {
+        featureIndex[decoder.decode(table.strings.subarray(table.offsets[fid]!, table.offsets[fid + 1]!))] = fid;
+      }
+    }
+    return featureIndex;
+  };
+}
+
+export function loadPerceptronTaggerModelPacked(bytes: Uint8Array): PerceptronTaggerModel {
+  const decoder = new TextDecoder();
+  const magic = decoder.decode(bytes.subarray(0, TAGGER_PACK_MAGIC.length));
+  if (magic !== TAGGER_PACK_MAGIC || bytes.length < TAGGER_PACK_HEADER_BYTES) {
+    throw new Error(`invalid perceptron model pack magic: ${magic}`);
+  }
+  const header = new DataView(bytes.buffer, bytes.byteOffset, TAGGER_PACK_HEADER_BYTES);
+  const version = header.getUint32(8, true);
+  const featureCount = header.getUint32(12, true);
+  const tagCount = header.getUint32(16, true);
+  const slots = header.getUint32(20, true);
+  const stringBytes = header.getUint32(24, true);
+  const metadataBytes = header.getUint32(28, true);
+  if (featureCount <= 0 || tagCount <= 0 || slots === 0 || (slots & (slots - 1)) !== 0) {
+    throw new Error("invalid perceptron model dimensions");
+  }
+
+  const stringCount = tagCount + featureCount;
+  const offsetsStart = TAGGER_PACK_HEADER_BYTES;
+  const slotsStart = offsetsStart + (stringCount + 1) * 4;
+  const weightsStart = slotsStart + slots * 4;
+  const stringsStart = weightsStart + featureCount * tagCount * 4;
+  const metadataStart = stringsStart + stringBytes;
+  if (metadataStart + metadataBytes > bytes.length) {
+    throw new Error("invalid perceptron model pack length");
+  }
+
+  const stringOffsets = u32View(bytes, offsetsStart, stringCount + 1);
+  const hashSlots = u32View(bytes, slotsStart, slots);
+  const weights = f32View(bytes, weightsStart, featureCount * tagCount);
+  const strings = bytes.subarray(stringsStart, metadataStart);
+  const stringAt = (index: number): string => decoder.decode(strings.subarray(stringOffsets[index]!, stringOffsets[index + 1]!));
+
+  const tags: string[] = [];
+  for (let i = 0; i < tagCount; i += 1) tags.push(stringAt(i));
+  const metadata =
+    metadataBytes > 0
+      ? (JSON.parse(decoder.decode(bytes.subarray(metadataStart, metadataStart + metadataBytes))) as Record<string, unknown>)
+      : undefined;
+
+  const table: PerceptronFeatureTable = {
+    strings,
+    offsets: stringOffsets.subarray(tagCount),
+    slots: hashSlots,
+  };
+  const featureIndex = lazyFeatureIndex(table, featureCount);
+  const model: PerceptronTaggerModel = {
+    version,
+    tags,
+    featureCount,
+    tagCount,
+    get featureIndex(): Record<string, number> {
+      return featureIndex();
+    },
+    weights,
+    metadata,
+    featureId: featureTableLookup(table),
+  };
+  featureTables.set(model, table);
+  return model;
+}
+
+function perceptronFeatureTable(model: PerceptronTaggerModel): PerceptronFeatureTable {
+  let table = featureTables.get(model);
+  if (!table) {
+    table = buildFeatureTable(model);
+    featureTables.set(model, table);
+  }
+  return table;
+}
+
+function loadPerceptronTaggerModelFromPath(path: string): PerceptronTaggerModel {
+  if (path.endsWith(".bin")) return loadPerceptronTaggerModelPacked(readModelBytes(path));
+  const raw = JSON.parse(readFileSync(path, "utf8")) as PerceptronTaggerModelSerialized;
+  if (raw.weights_file) {
+    const bytes = readModelBytes(resolve(dirname(path), raw.weights_file));
+    return preparePerceptronTaggerModel(raw, f32View(bytes, 0, Math.floor(bytes.length / 4)));
+  }
   return preparePerceptronTaggerModel(raw);
 }
 
+export function loadPerceptronTaggerModel(
+  path?: string,
+  options: { precision?: PerceptronWeightPrecision } = {},
+): PerceptronTaggerModel {
+  const precision = options.precision ?? "f32";
+  if (path) return quantizePerceptronTaggerModel(loadPerceptronTaggerModelFromPath(path), precision);
+  const cached = cachedDefaultTaggerModels.get(precision);
+  if (cached) return cached;
+
+  // Only the requested precision is cached: a quantized default model must not keep the
+  // f32 weights it was built from alive.
+  const packedPath = resolve(import.meta.dir, "..", "models", "perceptron_tagger_ascii.bin");
+  const base =
+    cachedDefaultTaggerModels.get("f32") ??
+    (existsSync(packedPath)
+      ? loadPerceptronTaggerModelFromPath(packedPath)
+      : loadPerceptronTaggerModelFromPath(resolve(import.meta.dir, "..", "models", "perceptron_tagger_ascii.json")));
+  const model = quantizePerceptronTaggerModel(base, precision);
+  cachedDefaultTaggerModels.set(precision, model);
+  return model;
+}
+
 export type PerceptronTaggerOptions = {
   model?: PerceptronTaggerModel;
   wasm?: WasmNltk;
@@ -166,7 +612,7 @@ export type PerceptronTaggerOptions = {
 
 function buildBatchFeatureBuffers(
   tokens: TokenOffset[],
-  featureIndex: Record<string, number>,
+  model: PerceptronTaggerModel,
 ): { featureIds: Uint32Array; tokenOffsets: Uint32Array } {
   const featureIdList: number[] = [];
   const tokenOffsets = new Uint32Array(tokens.length + 1);
@@ -174,7 +620,7 @@ function buildBatchFeatureBuffers(
 
   for (let i = 0; i < tokens.length; i += 1) {
     tokenOffsets[i] = cursor;
-    const ids = featureIds(tokens, i, featureIndex);
+    const ids = featureIds(tokens, i, model);
     cursor += ids.length;
     for (const id of ids) featureIdList.push(id);
   }
@@ -192,24 +638,32 @@ export function posTagPerceptronAscii(text: string, options: PerceptronTaggerOpt
   if (tokens.length === 0) return [];
 
   let tagIds: Uint16Array | null = null;
-  const batch = buildBatchFeatureBuffers(tokens, model.featureIndex);
+  const batch = buildBatchFeatureBuffers(tokens, model);
   if (options.useWasm && options.wasm) {
     tagIds = options.wasm.perceptronPredictBatch(
       batch.featureIds,
       batch.tokenOffsets,
-      model.weights,
+      model.quantized ?? model.weights,
       model.featureCount,
       model.tagCount,
     );
   } else if (options.useNative !== false) {
     try {
-      tagIds = perceptronPredictBatchNative(
-        batch.featureIds,
-        batch.tokenOffsets,
-        model.weights,
-        model.featureCount,
-        model.tagCount,
-      );
+      tagIds = model.quantized
+        ? perceptronPredictBatchQuantizedNative(
+            batch.featureIds,
+            batch.tokenOffsets,
+            model.quantized,
+            model.featureCount,
+            model.tagCount,
+          )
+        : perceptronPredictBatchNative(
+            batch.featureIds,
+            batch.tokenOffsets,
+            model.weights,
+            model.featureCount,
+            model.tagCount,
+          );
     } catch {
       tagIds = null;
     }
@@ -237,3 +691,279 @@ export function posTagPerceptronAscii(text: string, options: PerceptronTaggerOpt
 
   return out;
 }
+
+export type PerceptronTagBatch = {
+  docOffsets: Uint32Array;
+  tokenStarts: Uint32Array;
+  tokenLengths: Uint32Array;
+  tagIds: Uint16Array;
+  tags: string[];
+};
+
+function isAsciiTokenByte(ch: number): boolean {
+  return (ch >= 48 && ch <= 57) || (ch >= 65 && ch <= 90) || (ch >= 97 && ch <= 122) || ch === 39;
+}
+
+function tagBatchJs(bytes: Uint8Array, docOffsets: Uint32Array, model: PerceptronTaggerModel) {
+  const decoder = new TextDecoder();
+  const outDocOffsets = new Uint32Array(docOffsets.length);
+  const starts: number[] = [];
+  const lengths: number[] = [];
+  const tagIds: number[] = [];
+  const scratch = new Float32Array(model.tagCount);
+
+  for (let doc = 0; doc + 1 < docOffsets.length; doc += 1) {
+    outDocOffsets[doc] = starts.length;
+    const docStart = docOffsets[doc]!;
+    const docEnd = docOffsets[doc + 1]!;
+    const tokens: TokenOffset[] = [];
+    let i = docStart;
+    while (i < docEnd) {
+      if (!isAsciiTokenByte(bytes[i]!)) {
+        i += 1;
+        continue;
+      }
+      const start = i;
+      while (i < docEnd && isAsciiTokenByte(bytes[i]!)) i += 1;
+      const token = decoder.decode(bytes.subarray(start, i));
+      tokens.push({ token, lower: token.toLowerCase(), start: start - docStart, length: i - start });
+    }
+    for (let t = 0; t < tokens.length; t += 1) {
+      starts.push(tokens[t]!.start);
+      lengths.push(tokens[t]!.length);
+      tagIds.push(predictTagIdJs(model, featureIds(tokens, t, model), scratch));
+    }
+  }
+  outDocOffsets[docOffsets.length - 1] = starts.length;
+
+  return {
+    docOffsets: outDocOffsets,
+    tokenStarts: Uint32Array.from(starts),
+    tokenLengths: Uint32Array.from(lengths),
+    tagIds: Uint16Array.from(tagIds),
+  };
+}
+
+export function posTagBatch(texts: string[], options: PerceptronTaggerOptions = {}): PerceptronTagBatch {
+  const model = options.model ?? loadPerceptronTaggerModel();
+  const encoder = new TextEncoder();
+  const docOffsets = new Uint32Array(texts.length + 1);
+  let bytes = new Uint8Array(texts.reduce((sum, text) => sum + text.length * 3, 0));
+  let cursor = 0;
+  for (let i = 0; i < texts.length; i += 1) {
+    docOffsets[i] = cursor;
+    cursor += encoder.encodeInto(texts[i]!, bytes.subarray(cursor)).written;
+  }
+  docOffsets[texts.length] = cursor;
+  bytes = bytes.subarray(0, cursor);
+
+  let result: Omit<PerceptronTagBatch, "tags"> | null = null;
+  const input = () => ({
+    bytes,
+    docOffsets,
+    featureTable: perceptronFeatureTable(model),
+    weights: model.quantized ?? model.weights,
+    modelFeatureCount: model.featureCount,
+    tagCount: model.tagCount,
+  });
+  if (options.useWasm && options.wasm) {
+    result = options.wasm.perceptronTagBatchAscii(input());
+  } else if (options.useNative !== false) {
+    try {
+      result = perceptronTagBatchAsciiNative(input());
+    } catch {
+      result = null;
+    }
+  }
+  result ??= tagBatchJs(bytes, docOffsets, model);
+
+  return {
+    ...result,
+    tags: model.tags,
+  };
+}
+
+export type PerceptronTrainingOptions = {
+  epochs?: number;
+  seed?: number;
+  tags?: string[];
+  useNative?: boolean;
+  metadata?: Record<string, unknown>;
+};
+
+type PerceptronTrainingBuffers = {
+  featureIds: Uint32Array;
+  tokenOffsets: Uint32Array;
+  goldTagIds: Uint16Array;
+  sentenceOffsets: Uint32Array;
+  featureCount: number;
+  tagCount: number;
+  epochs: number;
+  seed: number;
+};
+
+function nextShuffleState(state: number): number {
+  let x = state;
+  x = (x ^ (x << 13)) >>> 0;
+  x = (x ^ (x >>> 17)) >>> 0;
+  x = (x ^ (x << 5)) >>> 0;
+  return x;
+}
+
+function trainAveragedJs(input: PerceptronTrainingBuffers): Float32Array {
+  const tc = input.tagCount;
+  const cells = input.featureCount * tc;
+  const weights = new Float64Array(cells);
+  const totals = new Float64Array(cells);
+  const stamps = new Uint32Array(cells);
+  const scores = new Float64Array(tc);
+  const sentenceCount = input.sentenceOffsets.length - 1;
+  const order = Uint32Array.from({ length: sentenceCount }, (_, i) => i);
+  const update = (cell: number, instances: number, delta: number) => {
+    totals[cell]! += (instances - stamps[cell]!) * weights[cell]!;
+    stamps[cell] = instances;
+    weights[cell]! += delta;
+  };
+
+  let state = input.seed >>> 0 || 0x9e3779b9;
+  let instances = 0;
+  for (let epoch = 0; epoch < input.epochs; epoch += 1) {
+    for (let remaining = sentenceCount; remaining > 1; remaining -= 1) {
+      state = nextShuffleState(state);
+      const pick = state % remaining;
+      const held = order[remaining - 1]!;
+      order[remaining - 1] = order[pick]!;
+      order[pick] = held;
+    }
+
+    for (const sentence of order) {
+      for (let token = input.sentenceOffsets[sentence]!; token < input.sentenceOffsets[sentence + 1]!; token += 1) {
+        const start = input.tokenOffsets[token]!;
+        const end = input.tokenOffsets[token + 1]!;
+        scores.fill(0);
+        for (let f = start; f < end; f += 1) {
+          const base = input.featureIds[f]! * tc;
+          for (let j = 0; j < tc; j += 1) scores[j]! += weights[base + j]!;
+        }
+        let guess = 0;
+        for (let j = 1; j < tc; j += 1) {
+          if (scores[j]! > scores[guess]!) guess = j;
+        }
+
+        instances += 1;
+        const truth = input.goldTagIds[token]!;
+        if (truth === guess) continue;
+        for (let f = start; f < end; f += 1) {
+          const base = input.featureIds[f]! * tc;
+          update(base + truth, instances, 1);
+          update(base + guess, instances, -1);
+        }
+      }
+    }
+  }
+
+  const out = new Float32Array(cells);
+  const divisor = Math.max(instances, 1);
+  for (let cell = 0; cell < cells; cell += 1) {
+    const avg = (totals[cell]! + (instances - stamps[cell]!) * weights[cell]!) / divisor;
+    out[cell] = Math.abs(avg) > 1e-6 ? avg : 0;
+  }
+  return out;
+}
+
+export function trainPerceptronTagger(
+  taggedSentences: Array<Array<[string, string]>>,
+  options: PerceptronTrainingOptions = {},
+): PerceptronTaggerModel {
+  const epochs = options.epochs ?? 8;
+  const seed = options.seed ?? 1337;
+  if (!Number.isInteger(epochs) || epochs <= 0) throw new Error("epochs must be a positive integer");
+
+  const tags = [...(options.tags ?? [])];
+  const tagIndex = new Map(tags.map((tag, i) => [tag, i]));
+  const featureIndex = new Map<string, number>();
+  const featureIdList: number[] = [];
+  const tokenOffsetList: number[] = [0];
+  const goldList: number[] = [];
+  const sentenceOffsets = new Uint32Array(taggedSentences.length + 1);
+
+  for (let s = 0; s < taggedSentences.length; s += 1) {
+    sentenceOffsets[s] = goldList.length;
+    const sentence = taggedSentences[s]!;
+    const tokens: TokenOffset[] = sentence.map(([token]) => ({ token, lower: token.toLowerCase(), start: 0, length: token.length }));
+    for (let i = 0; i < sentence.length; i += 1) {
+      const tag = sentence[i]![1];
+      let tagId = tagIndex.get(tag);
+      if (tagId === undefined) {
+        if (options.tags) throw new Error(`unknown tag in training data: ${tag}`);
+        tagId = tags.length;
+        tags.push(tag);
+        tagIndex.set(tag, tagId);
+      }
+      goldList.push(tagId);
+      for (const key of featureKeys(tokens, i)) {
+        let id = featureIndex.get(key);
+        if (id === undefined) {
+          id = featureIndex.size;
+          featureIndex.set(key, id);
+        }
+        featureIdList.push(id);
+      }
+      tokenOffsetList.push(featureIdList.length);
+    }
+  }
+  sentenceOffsets[taggedSentences.length] = goldList.length;
+  if (goldList.length === 0) throw new Error("training data must contain at least one tagged token");
+  if (tags.length > 0xffff) throw new Error("too many tags for perceptron tagger");
+
+  const input: PerceptronTrainingBuffers = {
+    featureIds: Uint32Array.from(featureIdList),
+    tokenOffsets: Uint32Array.from(tokenOffsetList),
+    goldTagIds: Uint16Array.from(goldList),
+    sentenceOffsets,
+    featureCount: featureIndex.size,
+    tagCount: tags.length,
+    epochs,
+    seed,
+  };
+  let averaged: Float32Array | null = null;
+  if (options.useNative !== false) {
+    try {
+      averaged = perceptronTrainAveragedNative(input);
+    } catch {
+      averaged = null;
+    }
+  }
+  averaged ??= trainAveragedJs(input);
+
+  const tc = tags.length;
+  const keptIndex: Record<string, number> = {};
+  const kept: number[] = [];
+  for (const [key, id] of featureIndex) {
+    const row = averaged.subarray(id * tc, (id + 1) * tc);
+    if (row.some((value) => value !== 0)) {
+      keptIndex[key] = kept.length;
+      kept.push(id);
+    }
+  }
+  const weights = new Float32Array(kept.length * tc);
+  for (let i = 0; i < kept.length; i += 1) {
+    weights.set(averaged.subarray(kept[i]! * tc, (kept[i]! + 1) * tc), i * tc);
+  }
+
+  return {
+    version: 1,
+    tags,
+    featureCount: kept.length,
+    tagCount: tc,
+    featureIndex: keptIndex,
+    weights,
+    metadata: {
+      source: "trainPerceptronTagger",
+      epochs,
+      seed,
+      train_sentences: taggedSentences.length,
+      ...options.metadata,
+    },
+  };
+}
@@ -1,5 +1,5 @@
-import { porterStemAscii } from "./native";
-import { loadWordNet, type WordNetPos } from "./wordnet";
+import { NativeWordNetLemmaSet, porterStemAscii } from "./native";
+import { loadWordNet, type WordNet, type WordNetPos } from "./wordnet";
 
 function normalize(word: string): string {
   return word.trim().toLowerCase();
@@ -98,16 +98,119 @@ function normalizePos(pos?: string): WordNetPos | undefined {
   if (lower === "v" || lower === "verb") return "v";
   if (lower === "a" || lower === "s" || lower === "adj" || lower === "adjective") return "a";
   if (lower === "r" || lower === "adv" || lower === "adverb") return "r";
+  if (lower.startsWith("nn")) return "n";
+  if (lower.startsWith("vb")) return "v";
+  if (lower.startsWith("jj")) return "a";
+  if (lower.startsWith("rb")) return "r";
   return undefined;
 }
 
+const WORDNET_POS_ORDER: WordNetPos[] = ["n", "v", "a", "r"];
+const NATIVE_LEMMA_TOKEN = /^[\x21-\x7e]{1,128}$/;
+const nativeLemmaSets = new WeakMap<WordNet, NativeWordNetLemmaSet>();
+// Lemma sets live as long as their WordNet; free the native handle once the WordNet is collected.
+const nativeLemmaSetRegistry = new FinalizationRegistry<NativeWordNetLemmaSet>((set) => set.dispose());
+
+function nativeLemmaSet(wordnet: WordNet): NativeWordNetLemmaSet {
+  let set = nativeLemmaSets.get(wordnet);
+  if (!set) {
+    const masks = new Map<string, number>();
+    WORDNET_POS_ORDER.forEach((pos, bit) => {
+      for (const lemma of wordnet.lemmas(pos)) masks.set(lemma, (masks.get(lemma) ?? 0) | (1 << bit));
+    });
+    set = new NativeWordNetLemmaSet([...masks.keys()], Uint8Array.from(masks.values()));
+    nativeLemmaSets.set(wordnet, set);
+    nativeLemmaSetRegistry.register(wordnet, set);
+  }
+  return set;
+}
+
+export type WordNetLemmatizerOptions = {
+  cacheSize?: number;
+  wordnet?: WordNet;
+};
+
 export class WordNetLemmatizer {
+  private readonly cache = new Map<string, string>();
+  private readonly cacheSize: number;
+  private readonly wordnet: WordNet | null;
+
+  constructor(options: WordNetLemmatizerOptions = {}) {
+    this.cacheSize = Math.max(0, Math.floor(options.cacheSize ?? 65536));
+    this.wordnet = options.wordnet ?? null;
+  }
+
+  private cached(key: string): string | undefined {
+    const hit = this.cache.get(key);
+    if (hit !== undefined) {
+      this.cache.delete(key);
+      this.cache.set(key, hit);
+    }
+    return hit;
+  }
+
+  private remember(key: string, lemma: string): void {
+    if (this.cacheSize === 0) return;
+    if (this.cache.size >= this.cacheSize) this.cache.delete(this.cache.keys().next().value!);
+    this.cache.set(key, lemma);
+  }
+
   lemmatize(word: string, pos: string = "n"): string {
     const value = normalize(word);
     if (!value) return value;
     const wnPos = normalizePos(pos);
-    const lemma = loadWordNet().morphy(value, wnPos);
-    return lemma ?? value;
+    const key = `${wnPos ?? ""}\u0000${value}`;
+    const hit = this.cached(key);
+    if (hit !== undefined) return hit;
+    const lemma = (this.wordnet ?? loadWordNet()).morphy(value, wnPos) ?? value;
+    this.remember(key, lemma);
+    return lemma;
   }
-}
 
+  lemmatizeBatch(tokens: string[], posTags?: string[], options: { useNative?: boolean } = {}): string[] {
+    const wordnet = this.wordnet ?? loadWordNet();
+    const useNative = options.useNative ?? true;
+    const keys = new Array<string>(tokens.length);
+    const resolved = new Map<string, string>();
+    const nativeWords: string[] = [];
+    const nativePos: Array<WordNetPos | undefined> = [];
+    const nativeKeys: string[] = [];
+
+    for (let i = 0; i < tokens.length; i += 1) {
+      const value = normalize(tokens[i]!);
+      const wnPos = normalizePos(posTags?.[i] ?? "n");
+      const key = `${wnPos ?? ""}\u0000${value}`;
+      keys[i] = key;
+      if (resolved.has(key)) continue;
+      const hit = value ? this.cached(key) : value;
+      if (hit !== undefined) {
+        resolved.set(key, hit);
+      } else if (useNative && NATIVE_LEMMA_TOKEN.test(value)) {
+        resolved.set(key, value);
+        nativeWords.push(value);
+        nativePos.push(wnPos);
+        nativeKeys.push(key);
+      } else {
+        const lemma = wordnet.morphy(value, wnPos) ?? value;
+        resolved.set(key, lemma);
+        this.remember(key, lemma);
+      }
+    }
+
+    if (nativeWords.length > 0) {
+      let lemmas: Array<string | null>;
+      try {
+        lemmas = nativeLemmaSet(wordnet).morphyBatch(nativeWords, nativePos);
+      } catch {
+        lemmas = nativeWords.map((word, i) => wordnet.morphy(word, nativePos[i]));
+      }
+      for (let i = 0; i < nativeWords.length; i += 1) {
+        const lemma = lemmas[i] ?? nativeWords[i]!;
+        resolved.set(nativeKeys[i]!, lemma);
+        this.remember(nativeKeys[i]!, lemma);
+      }
+    }
+
+    return keys.map((key) => resolved.get(key)!);
+  }
+}
@@ -47,6 +47,100 @@ type WasmExports = {
     tagCount: number,
     outTagIdsPtr: number,
   ) => void;
+  bunnltk_wasm_perceptron_predict_batch_f16: (
+    featureIdsPtr: number,
+    featureIdsLen: number,
+    tokenOffsetsPtr: number,
+    tokenCount: number,
+    weightsPtr: number,
+    modelFeatureCount: number,
+    tagCount: number,
+    outTagIdsPtr: number,
+  ) => void;
+  bunnltk_wasm_perceptron_predict_batch_i8: (
+    featureIdsPtr: number,
+    featureIdsLen: number,
+    tokenOffsetsPtr: number,
+    tokenCount: number,
+    weightsPtr: number,
+    scalesPtr: number,
+    modelFeatureCount: number,
+    tagCount: number,
+    outTagIdsPtr: number,
+  ) => void;
+  bunnltk_wasm_count_tokens_batch_ascii: (inputLen: number, docOffsetsPtr: number, docOffsetsLen: number) => bigint;
+  bunnltk_wasm_hash_ngram_features_batch_ascii: (
+    inputLen: number,
+    docOffsetsPtr: number,
+    docOffsetsLen: number,
+    ngramMin: number,
+    ngramMax: number,
+    dimension: number,
+    signed: number,
+    binary: number,
+    outDocOffsetsPtr: number,
+    outIdsPtr: number,
+    outValuesPtr: number,
+    capacity: number,
+  ) => bigint;
+  bunnltk_wasm_perceptron_tag_batch_ascii: (
+    inputLen: number,
+    docOffsetsPtr: number,
+    docOffsetsLen: number,
+    featureStringsPtr: number,
+    featureStringsLen: number,
+    featureStringOffsetsPtr: number,
+    featureStringOffsetsLen: number,
+    featureSlotsPtr: number,
+    featureSlotsLen: number,
+    weightsPtr: number,
+    modelFeatureCount: number,
+    tagCount: number,
+    outTokenDocOffsetsPtr: number,
+    outTokenStartsPtr: number,
+    outTokenLengthsPtr: number,
+    outTagIdsPtr: number,
+    capacity: number,
+  ) => bigint;
+  bunnltk_wasm_perceptron_tag_batch_ascii_f16: (
+    inputLen: number,
+    docOffsetsPtr: number,
+    docOffsetsLen: number,
+    featureStringsPtr: number,
+    featureStringsLen: number,
+    featureStringOffsetsPtr: number,
+    featureStringOffsetsLen: number,
+    featureSlotsPtr: number,
+    featureSlotsLen: number,
+    weightsPtr: number,
+    modelFeatureCount: number,
+    tagCount: number,
+    outTokenDocOffsetsPtr: number,
+    outTokenStartsPtr: number,
+    outTokenLengthsPtr: number,
+    outTagIdsPtr: number,
+    capacity: number,
+  ) => bigint;
+  bunnltk_wasm_perceptron_tag_batch_ascii_i8: (
+    inputLen: number,
+    docOffsetsPtr: number,
+    docOffsetsLen: number,
+    featureStringsPtr: number,
+    featureStringsLen: number,
+    featureStringOffsetsPtr: number,
+    featureStringOffsetsLen: number,
+    featureSlotsPtr: number,
+    featureSlotsLen: number,
+    weightsPtr: number,
+    scalesPtr: number,
+    modelFeatureCount: number,
+    tagCount: number,
+    outTokenDocOffsetsPtr: number,
+    outTokenStartsPtr: number,
+    outTokenLengthsPtr: number,
+    outTagIdsPtr: number,
+    capacity: number,
+  ) => bigint;
   bunnltk_wasm_wordnet_morphy_ascii: (
     inputLen: number,
     pos: number,
@@ -93,9 +187,30 @@ type WasmExports = {
     outBeginsPtr: number,
     outCapacity: number,
   ) => bigint;
+  bunnltk_wasm_chunk_iob_ids_batch: (
+    tokenTagIdsPtr: number,
+    tokenCount: number,
+    sentenceOffsetsPtr: number,
+    sentenceCount: number,
+    atomAllowedOffsetsPtr: number,
+    atomAllowedLengthsPtr: number,
+    atomAllowedFlatPtr: number,
+    atomAllowedFlatLen: number,
+    atomMinsPtr: number,
+    atomMaxsPtr: number,
+    atomCount: number,
+    ruleAtomOffsetsPtr: number,
+    ruleAtomCountsPtr: number,
+    ruleLabelIdsPtr: number,
+    ruleCount: number,
+    outLabelIdsPtr: number,
+    outBeginsPtr: number,
+    outCapacity: number,
+  ) => bigint;
   bunnltk_wasm_cyk_recognize_ids: (
     tokenBitsPtr: number,
     tokenCount: number,
+    wordsPerToken: number,
     binaryLeftPtr: number,
     binaryRightPtr: number,
     binaryParentPtr: number,
@@ -119,6 +234,23 @@ type WasmExports = {
     outScoresPtr: number,
     outScoresLen: number,
   ) => void;
+  bunnltk_wasm_naive_bayes_sparse_log_scores_batch: (
+    docOffsetsPtr: number,
+    docCount: number,
+    docTokenIdsPtr: number,
+    docTokenCount: number,
+    tokenStartsPtr: number,
+    tokenLengthsPtr: number,
+    vocabSize: number,
+    entryLabelIdsPtr: number,
+    entryLogDeltasPtr: number,
+    entryCount: number,
+    labelPriorLogsPtr: number,
+    labelDefaultLogsPtr: number,
+    labelCount: number,
+    outScoresPtr: number,
+    outScoresLen: number,
+  ) => void;
 };
 
 export type AsciiMetrics = {
@@ -144,6 +276,23 @@ export type WasmNltkInit = {
 
 export type WasmLmModelType = "mle" | "lidstone" | "kneser_ney_interpolated";
 
+export type WasmPerceptronFeatureTable = {
+  strings: Uint8Array;
+  offsets: Uint32Array;
+  slots: Uint32Array;
+};
+
+export type WasmPerceptronQuantizedWeights =
+  | { precision: "f16"; values: Uint16Array }
+  | { precision: "int8"; values: Int8Array; scales: Float32Array };
+
+export type WasmPerceptronTagBatchIds = {
+  docOffsets: Uint32Array;
+  tokenStarts: Uint32Array;
+  tokenLengths: Uint32Array;
+  tagIds: Uint16Array;
+};
+
 export class WasmNltk {
   private readonly exports: WasmExports;
   private readonly inputPtr: number;
@@ -197,7 +346,10 @@ export class WasmNltk {
   }
 
   private writeInput(text: string): number {
-    const encoded = this.encoder.encode(text);
+    return this.writeInputBytes(this.encoder.encode(text));
+  }
+
+  private writeInputBytes(encoded: Uint8Array): number {
     if (encoded.length > this.inputCapacity) {
       throw new Error(`input too large for wasm input buffer: ${encoded.length} > ${this.inputCapacity}`);
     }
@@ -352,10 +504,26 @@ export class WasmNltk {
     return out;
   }
 
+  private writePerceptronWeights(weights: Float32Array | WasmPerceptronQuantizedWeights): {
+    weightsPtr: number;
+    scalesPtr: number;
+  } {
+    const values = weights instanceof Float32Array ? weights : weights.values;
+    const weightBlock = this.ensureBlock("perceptron_weights", values.byteLength);
+    const scales = weights instanceof Float32Array || weights.precision === "f16" ? null : weights.scales;
+    const scaleBlock = scales ? this.ensureBlock("perceptron_scales", scales.byteLength) : null;
+
+    new Uint8Array(this.exports.memory.buffer, weightBlock.ptr, values.byteLength).set(
+      new Uint8Array(values.buffer, values.byteOffset, values.byteLength),
+    );
+    if (scales) new Float32Array(this.exports.memory.buffer, scaleBlock!.ptr, scales.length).set(scales);
+    return { weightsPtr: weightBlock.ptr, scalesPtr: scaleBlock?.ptr ?? 0 };
+  }
+
   perceptronPredictBatch(
     featureIds: Uint32Array,
     tokenOffsets: Uint32Array,
-    weights: Float32Array,
+    weights: Float32Array | WasmPerceptronQuantizedWeights,
     modelFeatureCount: number,
     tagCount: number,
   ): Uint16Array {
@@ -364,28 +532,229 @@ export class WasmNltk {
 
     const featureBlock = this.ensureBlock("perceptron_feature_ids", featureIds.length * Uint32Array.BYTES_PER_ELEMENT);
     const offsetBlock = this.ensureBlock("perceptron_token_offsets", tokenOffsets.length * Uint32Array.BYTES_PER_ELEMENT);
-    const weightBlock = this.ensureBlock("perceptron_weights", weights.length * Float32Array.BYTES_PER_ELEMENT);
     const outBlock = this.ensureBlock("perceptron_out_tags", tokenCount * Uint16Array.BYTES_PER_ELEMENT);
+    const { weightsPtr, scalesPtr } = this.writePerceptronWeights(weights);
 
     new Uint32Array(this.exports.memory.buffer, featureBlock.ptr, featureIds.length).set(featureIds);
     new Uint32Array(this.exports.memory.buffer, offsetBlock.ptr, tokenOffsets.length).set(tokenOffsets);
-    new Float32Array(this.exports.memory.buffer, weightBlock.ptr, weights.length).set(weights);
-
-    this.exports.bunnltk_wasm_perceptron_predict_batch(
-      featureBlock.ptr,
-      featureIds.length,
-      offsetBlock.ptr,
-      tokenCount,
-      weightBlock.ptr,
-      modelFeatureCount,
-      tagCount,
-      outBlock.ptr,
-    );
+
+    if (weights instanceof Float32Array) {
+      this.exports.bunnltk_wasm_perceptron_predict_batch(
+        featureBlock.ptr,
+        featureIds.length,
+        offsetBlock.ptr,
+        tokenCount,
+        weightsPtr,
+        modelFeatureCount,
+        tagCount,
+        outBlock.ptr,
+      );
+    } else if (weights.precision === "f16") {
+      this.exports.bunnltk_wasm_perceptron_predict_batch_f16(
+        featureBlock.ptr,
+        featureIds.length,
+        offsetBlock.ptr,
+        tokenCount,
+        weightsPtr,
+        modelFeatureCount,
+        tagCount,
+        outBlock.ptr,
+      );
+    } else {
+      this.exports.bunnltk_wasm_perceptron_predict_batch_i8(
+        featureBlock.ptr,
+        featureIds.length,
+        offsetBlock.ptr,
+        tokenCount,
+        weightsPtr,
+        scalesPtr,
+        modelFeatureCount,
+        tagCount,
+        outBlock.ptr,
+      );
+    }
     this.assertNoError("perceptronPredictBatch");
 
     return Uint16Array.from(new Uint16Array(this.exports.memory.buffer, outBlock.ptr, tokenCount));
   }
 
+  perceptronTagBatchAscii(input: {
+    bytes: Uint8Array;
+    docOffsets: Uint32Array;
+    featureTable: WasmPerceptronFeatureTable;
+    weights: Float32Array | WasmPerceptronQuantizedWeights;
+    modelFeatureCount: number;
+    tagCount: number;
+  }): WasmPerceptronTagBatchIds {
+    if (input.docOffsets.length === 0) throw new Error("docOffsets must include at least one offset");
+    const docCount = input.docOffsets.length - 1;
+    const inputLen = this.writeInputBytes(input.bytes);
+
+    const docBlock = this.ensureBlock("tag_batch_doc_offsets", input.docOffsets.length * Uint32Array.BYTES_PER_ELEMENT);
+    new Uint32Array(this.exports.memory.buffer, docBlock.ptr, input.docOffsets.length).set(input.docOffsets);
+    const total = toNumber(
+      this.exports.bunnltk_wasm_count_tokens_batch_ascii(inputLen, docBlock.ptr, input.docOffsets.length),
+    );
+    this.assertNoError("perceptronTagBatchAscii.count");
+    if (total === 0) {
+      return {
+        docOffsets: new Uint32Array(docCount + 1),
+        tokenStarts: new Uint32Array(0),
+        tokenLengths: new Uint32Array(0),
+        tagIds: new Uint16Array(0),
+      };
+    }
+
+    const { strings, offsets, slots } = input.featureTable;
+    const stringsBlock = this.ensureBlock("tag_batch_feature_strings", Math.max(1, strings.length));
+    const offsetsBlock = this.ensureBlock("tag_batch_feature_offsets", offsets.length * Uint32Array.BYTES_PER_ELEMENT);
+    const slotsBlock = this.ensureBlock("tag_batch_feature_slots", slots.length * Uint32Array.BYTES_PER_ELEMENT);
+    const outDocBlock = this.ensureBlock("tag_batch_out_doc_offsets", input.docOffsets.length * Uint32Array.BYTES_PER_ELEMENT);
+    const outStartsBlock = this.ensureBlock("tag_batch_out_starts", total * Uint32Array.BYTES_PER_ELEMENT);
+    const outLengthsBlock = this.ensureBlock("tag_batch_out_lengths", total * Uint32Array.BYTES_PER_ELEMENT);
+    const outTagsBlock = this.ensureBlock("tag_batch_out_tags", total * Uint16Array.BYTES_PER_ELEMENT);
+
+    new Uint8Array(this.exports.memory.buffer, stringsBlock.ptr, strings.length).set(strings);
+    new Uint32Array(this.exports.memory.buffer, offsetsBlock.ptr, offsets.length).set(offsets);
+    new Uint32Array(this.exports.memory.buffer, slotsBlock.ptr, slots.length).set(slots);
+    const weights = input.weights;
+    const { weightsPtr, scalesPtr } = this.writePerceptronWeights(weights);
+
+    let written: number;
+    if (weights instanceof Float32Array) {
+      written = toNumber(
+        this.exports.bunnltk_wasm_perceptron_tag_batch_ascii(
+          inputLen,
+          docBlock.ptr,
+          input.docOffsets.length,
+          stringsBlock.ptr,
+          strings.length,
+          offsetsBlock.ptr,
+          offsets.length,
+          slotsBlock.ptr,
+          slots.length,
+          weightsPtr,
+          input.modelFeatureCount,
+          input.tagCount,
+          outDocBlock.ptr,
+          outStartsBlock.ptr,
+          outLengthsBlock.ptr,
+          outTagsBlock.ptr,
+          total,
+        ),
+      );
+    } else if (weights.precision === "f16") {
+      written = toNumber(
+        this.exports.bunnltk_wasm_perceptron_tag_batch_ascii_f16(
+          inputLen,
+          docBlock.ptr,
+          input.docOffsets.length,
+          stringsBlock.ptr,
+          strings.length,
+          offsetsBlock.ptr,
+          offsets.length,
+          slotsBlock.ptr,
+          slots.length,
+          weightsPtr,
+          input.modelFeatureCount,
+          input.tagCount,
+          outDocBlock.ptr,
+          outStartsBlock.ptr,
+          outLengthsBlock.ptr,
+          outTagsBlock.ptr,
+          total,
+        ),
+      );
+    } else {
+      written = toNumber(
+        this.exports.bunnltk_wasm_perceptron_tag_batch_ascii_i8(
+          inputLen,
+          docBlock.ptr,
+          input.docOffsets.length,
+          stringsBlock.ptr,
+          strings.length,
+          offsetsBlock.ptr,
+          offsets.length,
+          slotsBlock.ptr,
+          slots.length,
+          weightsPtr,
+          scalesPtr,
+          input.modelFeatureCount,
+          input.tagCount,
+          outDocBlock.ptr,
+          outStartsBlock.ptr,
+          outLengthsBlock.ptr,
+          outTagsBlock.ptr,
+          total,
+        ),
+      );
+    }
+    this.assertNoError("perceptronTagBatchAscii.fill");
+
+    return {
+      docOffsets: Uint32Array.from(new Uint32Array(this.exports.memory.buffer, outDocBlock.ptr, input.docOffsets.length)),
+      tokenStarts: Uint32Array.from(new Uint32Array(this.exports.memory.buffer, outStartsBlock.ptr, written)),
+      tokenLengths: Uint32Array.from(new Uint32Array(this.exports.memory.buffer, outLengthsBlock.ptr, written)),
+      tagIds: Uint16Array.from(new Uint16Array(this.exports.memory.buffer, outTagsBlock.ptr, written)),
+    };
+  }
+
+  hashNgramFeaturesBatchAscii(input: {
+    bytes: Uint8Array;
+    docOffsets: Uint32Array;
+    ngramMin: number;
+    ngramMax: number;
+    dimension: number;
+    signed?: boolean;
+    binary?: boolean;
+  }): { docOffsets: Uint32Array; featureIds: Uint32Array; featureValues: Float64Array } {
+    if (input.docOffsets.length === 0) throw new Error("docOffsets must include at least one offset");
+    const inputLen = this.writeInputBytes(input.bytes);
+
+    const docBlock = this.ensureBlock("hash_batch_doc_offsets", input.docOffsets.length * Uint32Array.BYTES_PER_ELEMENT);
+    new Uint32Array(this.exports.memory.buffer, docBlock.ptr, input.docOffsets.length).set(input.docOffsets);
+    const tokens = toNumber(
+      this.exports.bunnltk_wasm_count_tokens_batch_ascii(inputLen, docBlock.ptr, input.docOffsets.length),
+    );
+    this.assertNoError("hashNgramFeaturesBatchAscii.count");
+    if (tokens === 0) {
+      return {
+        docOffsets: new Uint32Array(input.docOffsets.length),
+        featureIds: new Uint32Array(0),
+        featureValues: new Float64Array(0),
+      };
+    }
+
+    const capacity = tokens * Math.max(1, input.ngramMax - input.ngramMin + 1);
+    const outDocBlock = this.ensureBlock("hash_batch_out_doc_offsets", input.docOffsets.length * Uint32Array.BYTES_PER_ELEMENT);
+    const outIdsBlock = this.ensureBlock("hash_batch_out_ids", capacity * Uint32Array.BYTES_PER_ELEMENT);
+    const outValuesBlock = this.ensureBlock("hash_batch_out_values", capacity * Float64Array.BYTES_PER_ELEMENT);
+
+    const written = toNumber(
+      this.exports.bunnltk_wasm_hash_ngram_features_batch_ascii(
+        inputLen,
+        docBlock.ptr,
+        input.docOffsets.length,
+        input.ngramMin,
+        input.ngramMax,
+        input.dimension,
+        input.signed ? 1 : 0,
+        input.binary ? 1 : 0,
+        outDocBlock.ptr,
+        outIdsBlock.ptr,
+        outValuesBlock.ptr,
+        capacity,
+      ),
+    );
+    this.assertNoError("hashNgramFeaturesBatchAscii.fill");
+
+    return {
+      docOffsets: Uint32Array.from(new Uint32Array(this.exports.memory.buffer, outDocBlock.ptr, input.docOffsets.length)),
+      featureIds: Uint32Array.from(new Uint32Array(this.exports.memory.buffer, outIdsBlock.ptr, written)),
+      featureValues: Float64Array.from(new Float64Array(this.exports.memory.buffer, outValuesBlock.ptr, written)),
+    };
+  }
+
   wordnetMorphyAscii(word: string, pos?: "n" | "v" | "a" | "r"): string {
     const inputLen = this.writeInput(word);
     const outBlock = this.ensureBlock("wordnet_morphy", Math.max(64, inputLen + 8));
@@ -477,8 +846,7 @@ export class WasmNltk {
     return { scores, perplexity };
   }
 
-  chunkIobIds(input: {
-    tokenTagIds: Uint16Array;
+  private writeChunkPlan(input: {
     atomAllowedOffsets: Uint32Array;
     atomAllowedLengths: Uint32Array;
     atomAllowedFlat: Uint16Array;
@@ -487,8 +855,7 @@ export class WasmNltk {
     ruleAtomOffsets: Uint32Array;
     ruleAtomCounts: Uint32Array;
     ruleLabelIds: Uint16Array;
-  }): { labelIds: Uint16Array; begins: Uint8Array } {
-    const tokenTagsBlock = this.ensureBlock("chunk_token_tags", Math.max(1, input.tokenTagIds.length) * Uint16Array.BYTES_PER_ELEMENT);
+  }) {
     const atomOffBlock = this.ensureBlock("chunk_atom_off", Math.max(1, input.atomAllowedOffsets.length) * Uint32Array.BYTES_PER_ELEMENT);
     const atomLenBlock = this.ensureBlock("chunk_atom_len", Math.max(1, input.atomAllowedLengths.length) * Uint32Array.BYTES_PER_ELEMENT);
     const atomFlatBlock = this.ensureBlock("chunk_atom_flat", Math.max(1, input.atomAllowedFlat.length) * Uint16Array.BYTES_PER_ELEMENT);
@@ -497,40 +864,59 @@ export class WasmNltk {
     const ruleOffBlock = this.ensureBlock("chunk_rule_off", Math.max(1, input.ruleAtomOffsets.length) * Uint32Array.BYTES_PER_ELEMENT);
     const ruleCountBlock = this.ensureBlock("chunk_rule_count", Math.max(1, input.ruleAtomCounts.length) * Uint32Array.BYTES_PER_ELEMENT);
     const ruleLabelBlock = this.ensureBlock("chunk_rule_label", Math.max(1, input.ruleLabelIds.length) * Uint16Array.BYTES_PER_ELEMENT);
-    const outLabelBlock = this.ensureBlock("chunk_out_label", Math.max(1, input.tokenTagIds.length) * Uint16Array.BYTES_PER_ELEMENT);
-    const outBeginBlock = this.ensureBlock("chunk_out_begin", Math.max(1, input.tokenTagIds.length));
 
-    if (input.tokenTagIds.length > 0) {
-      new Uint16Array(this.exports.memory.buffer, tokenTagsBlock.ptr, input.tokenTagIds.length).set(input.tokenTagIds);
-      new Uint16Array(this.exports.memory.buffer, outLabelBlock.ptr, input.tokenTagIds.length).fill(0xffff);
-      new Uint8Array(this.exports.memory.buffer, outBeginBlock.ptr, input.tokenTagIds.length).fill(0);
-    }
     if (input.atomAllowedOffsets.length > 0) {
       new Uint32Array(this.exports.memory.buffer, atomOffBlock.ptr, input.atomAllowedOffsets.length).set(input.atomAllowedOffsets);
       new Uint32Array(this.exports.memory.buffer, atomLenBlock.ptr, input.atomAllowedLengths.length).set(input.atomAllowedLengths);
-      new Uint16Array(this.exports.memory.buffer, atomFlatBlock.ptr, input.atomAllowedFlat.length).set(input.atomAllowedFlat);
       new Uint8Array(this.exports.memory.buffer, atomMinBlock.ptr, input.atomMins.length).set(input.atomMins);
       new Uint8Array(this.exports.memory.buffer, atomMaxBlock.ptr, input.atomMaxs.length).set(input.atomMaxs);
     }
+    if (input.atomAllowedFlat.length > 0) {
+      new Uint16Array(this.exports.memory.buffer, atomFlatBlock.ptr, input.atomAllowedFlat.length).set(input.atomAllowedFlat);
+    }
     if (input.ruleAtomOffsets.length > 0) {
       new Uint32Array(this.exports.memory.buffer, ruleOffBlock.ptr, input.ruleAtomOffsets.length).set(input.ruleAtomOffsets);
       new Uint32Array(this.exports.memory.buffer, ruleCountBlock.ptr, input.ruleAtomCounts.length).set(input.ruleAtomCounts);
       new Uint16Array(this.exports.memory.buffer, ruleLabelBlock.ptr, input.ruleLabelIds.length).set(input.ruleLabelIds);
     }
+    return { atomOffBlock, atomLenBlock, atomFlatBlock, atomMinBlock, atomMaxBlock, ruleOffBlock, ruleCountBlock, ruleLabelBlock };
+  }
+
+  chunkIobIds(input: {
+    tokenTagIds: Uint16Array;
+    atomAllowedOffsets: Uint32Array;
+    atomAllowedLengths: Uint32Array;
+    atomAllowedFlat: Uint16Array;
+    atomMins: Uint8Array;
+    atomMaxs: Uint8Array;
+    ruleAtomOffsets: Uint32Array;
+    ruleAtomCounts: Uint32Array;
+    ruleLabelIds: Uint16Array;
+  }): { labelIds: Uint16Array; begins: Uint8Array } {
+    const tokenTagsBlock = this.ensureBlock("chunk_token_tags", Math.max(1, input.tokenTagIds.length) * Uint16Array.BYTES_PER_ELEMENT);
+    const outLabelBlock = this.ensureBlock("chunk_out_label", Math.max(1, input.tokenTagIds.length) * Uint16Array.BYTES_PER_ELEMENT);
+    const outBeginBlock = this.ensureBlock("chunk_out_begin", Math.max(1, input.tokenTagIds.length));
+    const plan = this.writeChunkPlan(input);
+
+    if (input.tokenTagIds.length > 0) {
+      new Uint16Array(this.exports.memory.buffer, tokenTagsBlock.ptr, input.tokenTagIds.length).set(input.tokenTagIds);
+      new Uint16Array(this.exports.memory.buffer, outLabelBlock.ptr, input.tokenTagIds.length).fill(0xffff);
+      new Uint8Array(this.exports.memory.buffer, outBeginBlock.ptr, input.tokenTagIds.length).fill(0);
+    }
 
     this.exports.bunnltk_wasm_chunk_iob_ids(
       tokenTagsBlock.ptr,
       input.tokenTagIds.length,
-      atomOffBlock.ptr,
-      atomLenBlock.ptr,
-      atomFlatBlock.ptr,
+      plan.atomOffBlock.ptr,
+      plan.atomLenBlock.ptr,
+      plan.atomFlatBlock.ptr,
       input.atomAllowedFlat.length,
-      atomMinBlock.ptr,
-      atomMaxBlock.ptr,
+      plan.atomMinBlock.ptr,
+      plan.atomMaxBlock.ptr,
       input.atomMins.length,
-      ruleOffBlock.ptr,
-      ruleCountBlock.ptr,
-      ruleLabelBlock.ptr,
+      plan.ruleOffBlock.ptr,
+      plan.ruleCountBlock.ptr,
+      plan.ruleLabelBlock.ptr,
       input.ruleLabelIds.length,
       outLabelBlock.ptr,
       outBeginBlock.ptr,
@@ -544,8 +930,62 @@ export class WasmNltk {
     };
   }
 
+  chunkIobIdsBatch(input: {
+    tokenTagIds: Uint16Array;
+    sentenceOffsets: Uint32Array;
+    atomAllowedOffsets: Uint32Array;
+    atomAllowedLengths: Uint32Array;
+    atomAllowedFlat: Uint16Array;
+    atomMins: Uint8Array;
+    atomMaxs: Uint8Array;
+    ruleAtomOffsets: Uint32Array;
+    ruleAtomCounts: Uint32Array;
+    ruleLabelIds: Uint16Array;
+  }): { labelIds: Uint16Array; begins: Uint8Array } {
+    if (input.tokenTagIds.length === 0) {
+      return { labelIds: new Uint16Array(0), begins: new Uint8Array(0) };
+    }
+    if (input.sentenceOffsets.length === 0) throw new Error("sentenceOffsets must hold at least one offset");
+    const tokenTagsBlock = this.ensureBlock("chunk_token_tags", input.tokenTagIds.length * Uint16Array.BYTES_PER_ELEMENT);
+    const offsetsBlock = this.ensureBlock("chunk_sentence_offsets", input.sentenceOffsets.length * Uint32Array.BYTES_PER_ELEMENT);
+    const outLabelBlock = this.ensureBlock("chunk_out_label", input.tokenTagIds.length * Uint16Array.BYTES_PER_ELEMENT);
+    const outBeginBlock = this.ensureBlock("chunk_out_begin", input.tokenTagIds.length);
+    const plan = this.writeChunkPlan(input);
+
+    new Uint16Array(this.exports.memory.buffer, tokenTagsBlock.ptr, input.tokenTagIds.length).set(input.tokenTagIds);
+    new Uint32Array(this.exports.memory.buffer, offsetsBlock.ptr, input.sentenceOffsets.length).set(input.sentenceOffsets);
+
+    this.exports.bunnltk_wasm_chunk_iob_ids_batch(
+      tokenTagsBlock.ptr,
+      input.tokenTagIds.length,
+      offsetsBlock.ptr,
+      input.sentenceOffsets.length - 1,
+      plan.atomOffBlock.ptr,
+      plan.atomLenBlock.ptr,
+      plan.atomFlatBlock.ptr,
+      input.atomAllowedFlat.length,
+      plan.atomMinBlock.ptr,
+      plan.atomMaxBlock.ptr,
+      input.atomMins.length,
+      plan.ruleOffBlock.ptr,
+      plan.ruleCountBlock.ptr,
+      plan.ruleLabelBlock.ptr,
+      input.ruleLabelIds.length,
+      outLabelBlock.ptr,
+      outBeginBlock.ptr,
+      input.tokenTagIds.length,
+    );
+    this.assertNoError("chunkIobIdsBatch");
+
+    return {
+      labelIds: Uint16Array.from(new Uint16Array(this.exports.memory.buffer, outLabelBlock.ptr, input.tokenTagIds.length)),
+      begins: Uint8Array.from(new Uint8Array(this.exports.memory.buffer, outBeginBlock.ptr, input.tokenTagIds.length)),
+    };
+  }
+
   cykRecognizeIds(input: {
     tokenBits: BigUint64Array;
+    wordsPerToken?: number;
     binaryLeft: Uint16Array;
     binaryRight: Uint16Array;
     binaryParent: Uint16Array;
@@ -553,6 +993,10 @@ export class WasmNltk {
     unaryParent: Uint16Array;
     startSymbol: number;
   }): boolean {
+    const wordsPerToken = input.wordsPerToken ?? 1;
+    if (!Number.isInteger(wordsPerToken) || wordsPerToken <= 0 || input.tokenBits.length % wordsPerToken !== 0) {
+      throw new Error("tokenBits length must be a multiple of wordsPerToken");
+    }
     const tokenBitsBlock = this.ensureBlock("cyk_token_bits", Math.max(1, input.tokenBits.length) * BigUint64Array.BYTES_PER_ELEMENT);
     const bLeftBlock = this.ensureBlock("cyk_binary_left", Math.max(1, input.binaryLeft.length) * Uint16Array.BYTES_PER_ELEMENT);
     const bRightBlock = this.ensureBlock("cyk_binary_right", Math.max(1, input.binaryRight.length) * Uint16Array.BYTES_PER_ELEMENT);
@@ -575,7 +1019,8 @@ export class WasmNltk {
 
     const out = this.exports.bunnltk_wasm_cyk_recognize_ids(
       tokenBitsBlock.ptr,
-      input.tokenBits.length,
+      input.tokenBits.length / wordsPerToken,
+      wordsPerToken,
       bLeftBlock.ptr,
       bRightBlock.ptr,
       bParentBlock.ptr,
@@ -628,4 +1073,62 @@ export class WasmNltk {
     this.assertNoError("naiveBayesLogScoresIds");
     return Float64Array.from(new Float64Array(this.exports.memory.buffer, outBlock.ptr, input.labelDocCounts.length));
   }
+
+  naiveBayesSparseLogScoresBatch(input: {
+    docOffsets: Uint32Array;
+    docTokenIds: Uint32Array;
+    tokenStarts: Uint32Array;
+    tokenLengths: Uint32Array;
+    entryLabelIds: Uint32Array;
+    entryLogDeltas: Float64Array;
+    labelPriorLogs: Float64Array;
+    labelDefaultLogs: Float64Array;
+  }): Float64Array {
+    if (input.docOffsets.length === 0) throw new Error("docOffsets must hold at least one offset");
+    if (input.tokenLengths.length !== input.tokenStarts.length) throw new Error("tokenStarts and tokenLengths must have the same length");
+    const docCount = input.docOffsets.length - 1;
+    const labelCount = input.labelPriorLogs.length;
+    const outLen = docCount * labelCount;
+    if (outLen === 0) return new Float64Array(0);
+
+    const docOffsetsBlock = this.ensureBlock("nbs_doc_offsets", input.docOffsets.length * Uint32Array.BYTES_PER_ELEMENT);
+    const docIdsBlock = this.ensureBlock("nbs_doc_ids", Math.max(1, input.docTokenIds.length) * Uint32Array.BYTES_PER_ELEMENT);
+    const tokenStartsBlock = this.ensureBlock("nbs_token_starts", Math.max(1, input.tokenStarts.length) * Uint32Array.BYTES_PER_ELEMENT);
+    const tokenLengthsBlock = this.ensureBlock("nbs_token_lengths", Math.max(1, input.tokenLengths.length) * Uint32Array.BYTES_PER_ELEMENT);
+    const entryLabelsBlock = this.ensureBlock("nbs_entry_labels", Math.max(1, input.entryLabelIds.length) * Uint32Array.BYTES_PER_ELEMENT);
+    const entryDeltasBlock = this.ensureBlock("nbs_entry_deltas", Math.max(1, input.entryLogDeltas.length) * Float64Array.BYTES_PER_ELEMENT);
+    const priorsBlock = this.ensureBlock("nbs_priors", labelCount * Float64Array.BYTES_PER_ELEMENT);
+    const defaultsBlock = this.ensureBlock("nbs_defaults", Math.max(1, input.labelDefaultLogs.length) * Float64Array.BYTES_PER_ELEMENT);
+    const outBlock = this.ensureBlock("nbs_out_scores", outLen * Float64Array.BYTES_PER_ELEMENT);
+
+    const buffer = this.exports.memory.buffer;
+    new Uint32Array(buffer, docOffsetsBlock.ptr, input.docOffsets.length).set(input.docOffsets);
+    new Uint32Array(buffer, docIdsBlock.ptr, input.docTokenIds.length).set(input.docTokenIds);
+    new Uint32Array(buffer, tokenStartsBlock.ptr, input.tokenStarts.length).set(input.tokenStarts);
+    new Uint32Array(buffer, tokenLengthsBlock.ptr, input.tokenLengths.length).set(input.tokenLengths);
+    new Uint32Array(buffer, entryLabelsBlock.ptr, input.entryLabelIds.length).set(input.entryLabelIds);
+    new Float64Array(buffer, entryDeltasBlock.ptr, input.entryLogDeltas.length).set(input.entryLogDeltas);
+    new Float64Array(buffer, priorsBlock.ptr, labelCount).set(input.labelPriorLogs);
+    new Float64Array(buffer, defaultsBlock.ptr, input.labelDefaultLogs.length).set(input.labelDefaultLogs);
+
+    this.exports.bunnltk_wasm_naive_bayes_sparse_log_scores_batch(
+      docOffsetsBlock.ptr,
+      docCount,
+      docIdsBlock.ptr,
+      input.docTokenIds.length,
+      tokenStartsBlock.ptr,
+      tokenLengthsBlock.ptr,
+      input.tokenStarts.length,
+      entryLabelsBlock.ptr,
+      entryDeltasBlock.ptr,
+      input.entryLabelIds.length,
+      priorsBlock.ptr,
+      defaultsBlock.ptr,
+      labelCount,
+      outBlock.ptr,
+      outLen,
+    );
+    this.assertNoError("naiveBayesSparseLogScoresBatch");
+    return Float64Array.from(new Float64Array(this.exports.memory.buffer, outBlock.ptr, outLen));
+  }
 }
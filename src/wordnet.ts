@@ -1,6 +1,8 @@
 import { existsSync, readFileSync } from "node:fs";
 import { resolve } from "node:path";
+import { FreqDist } from "./freqdist";
 import { wordnetMorphyAsciiNative } from "./native";
+import { HypernymIndex } from "./wordnet_hypernym_index";
 
 export type WordNetPos = "n" | "v" | "a" | "r";
 
@@ -16,6 +18,14 @@ export type WordNetSynset = {
   antonyms: string[];
 };
 
+export type WordNetInformationContent = {
+  counts: Float64Array;
+  ic: Float64Array;
+  rootCounts: Record<WordNetPos, number>;
+};
+
+export type WordNetIcSimilarity = "res" | "lin" | "jcn";
+
 export type WordNetMiniPayload = {
   version: number;
   synsets: WordNetSynset[];
@@ -95,11 +105,441 @@ function morphCandidates(word: string, pos?: WordNetPos): string[] {
   ]);
 }
 
+// Indexed binary layout (little-endian), all u32 unless noted:
+//   header: magic "BNWN2\0\0\0", version, synset_count, string_count, string_bytes, list_count,
+//           relation_count, lemma_count, posting_count, offset_count, id_count
+//   string offsets [string_count + 1]
+//   synset records [synset_count * 12]: id, pos, gloss, lemma start/count, example start/count,
+//           relation start, hypernym/hyponym/similar/antonym counts
+//   lists [list_count] (string ids for lemmas and examples)
+//   relations [relation_count] (synset index, or string id | 0x80000000 for targets outside the pack)
+//   id index [id_count] (synset indexes sorted by id bytes)
+//   lemma entries [lemma_count * 3]: lemma string, posting start, posting count (sorted by lemma bytes)
+//   postings [posting_count] (synset indexes in payload order)
+//   offset entries [offset_count * 3]: pos, offset, synset index (sorted by pos, offset)
+//   string bytes
+const WORDNET_INDEXED_MAGIC = "BNWN2";
+const WORDNET_INDEXED_HEADER_BYTES = 48;
+const SYNSET_RECORD_WORDS = 12;
+const UNRESOLVED_RELATION = 0x80000000;
+const POS_CODES: WordNetPos[] = ["n", "v", "a", "r"];
+const HOST_LITTLE_ENDIAN = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+function posCode(pos: WordNetPos): number {
+  return POS_CODES.indexOf(pos);
+}
+
+function compareBytes(left: Uint8Array, right: Uint8Array): number {
+  const n = Math.min(left.length, right.length);
+  for (let i = 0; i < n; i += 1) {
+    if (left[i] !== right[i]) return left[i]! - right[i]!;
+  }
+  return left.length - right.length;
+}
+
+function offsetKeyParts(id: string): { pos: WordNetPos; offset: number } | null {
+  const match = id.match(/^(\d{8})\.([nvar])$/);
+  if (!match) return null;
+  return { pos: match[2] as WordNetPos, offset: Number(match[1]) };
+}
+
+export function packWordNetIndexed(payload: WordNetMiniPayload): Uint8Array {
+  const encoder = new TextEncoder();
+  const strings: Uint8Array[] = [];
+  const stringIds = new Map<string, number>();
+  const intern = (value: string): number => {
+    let id = stringIds.get(value);
+    if (id === undefined) {
+      id = strings.length;
+      strings.push(encoder.encode(value));
+      stringIds.set(value, id);
+    }
+    return id;
+  };
+
+  const rows = payload.synsets;
+  const indexById = new Map<string, number>();
+  rows.forEach((row, index) => indexById.set(row.id, index));
+
+  const records = new Uint32Array(rows.length * SYNSET_RECORD_WORDS);
+  const lists: number[] = [];
+  const relations: number[] = [];
+  const lemmaPostings = new Map<string, number[]>();
+  for (let index = 0; index < rows.length; index += 1) {
+    const row = rows[index]!;
+    const lemmas = row.lemmas.map((lemma) => normalizeLemma(lemma));
+    const base = index * SYNSET_RECORD_WORDS;
+    records[base] = intern(row.id);
+    records[base + 1] = posCode(row.pos);
+    records[base + 2] = intern(row.gloss);
+    records[base + 3] = lists.length;
+    records[base + 4] = lemmas.length;
+    for (const lemma of lemmas) lists.push(intern(lemma));
+    records[base + 5] = lists.length;
+    records[base + 6] = row.examples.length;
+    for (const example of row.examples) lists.push(intern(example));
+    records[base + 7] = relations.length;
+    const groups = [row.hypernyms, row.hyponyms, row.similarTo, row.antonyms];
+    for (let g = 0; g < groups.length; g += 1) {
+      records[base + 8 + g] = groups[g]!.length;
+      for (const target of groups[g]!) {
+        const targetIndex = indexById.get(target);
+        relations.push(targetIndex ?? (UNRESOLVED_RELATION | intern(target)) >>> 0);
+      }
+    }
+    for (const lemma of lemmas) {
+      const bucket = lemmaPostings.get(lemma) ?? [];
+      bucket.push(index);
+      lemmaPostings.set(lemma, bucket);
+    }
+  }
+
+  const idBytes = (index: number) => strings[records[index * SYNSET_RECORD_WORDS]!]!;
+  const idIndex = [...indexById.values()].sort((a, b) => compareBytes(idBytes(a), idBytes(b)));
+  const lemmaEntries = [...lemmaPostings.keys()]
+    .map((lemma) => ({ lemma, id: intern(lemma) }))
+    .sort((a, b) => compareBytes(strings[a.id]!, strings[b.id]!));
+  const offsetEntries: Array<{ pos: number; offset: number; index: number }> = [];
+  for (const index of indexById.values()) {
+    const parts = offsetKeyParts(rows[index]!.id);
+    if (parts) offsetEntries.push({ pos: posCode(parts.pos), offset: parts.offset, index });
+  }
+  offsetEntries.sort((a, b) => a.pos - b.pos || a.offset - b.offset);
+
+  const stringBytes = strings.reduce((sum, row) => sum + row.length, 0);
+  const postingCount = [...lemmaPostings.values()].reduce((sum, bucket) => sum + bucket.length, 0);
+  const words =
+    strings.length +
+    1 +
+    records.length +
+    lists.length +
+    relations.length +
+    idIndex.length +
+    lemmaEntries.length * 3 +
+    postingCount +
+    offsetEntries.length * 3;
+  const out = new Uint8Array(WORDNET_INDEXED_HEADER_BYTES + words * 4 + ((stringBytes + 3) & ~3));
+  const view = new DataView(out.buffer);
+  out.set(encoder.encode(WORDNET_INDEXED_MAGIC), 0);
+  const header = [
+    payload.version,
+    rows.length,
+    strings.length,
+    stringBytes,
+    lists.length,
+    relations.length,
+    lemmaEntries.length,
+    postingCount,
+    offsetEntries.length,
+    idIndex.length,
+  ];
+  header.forEach((value, i) => view.setUint32(8 + i * 4, value, true));
+
+  let cursor = WORDNET_INDEXED_HEADER_BYTES;
+  const put = (value: number) => {
+    view.setUint32(cursor, value, true);
+    cursor += 4;
+  };
+  let stringCursor = 0;
+  for (const row of strings) {
+    put(stringCursor);
+    stringCursor += row.length;
+  }
+  put(stringCursor);
+  for (const value of records) put(value);
+  for (const value of lists) put(value);
+  for (const value of relations) put(value);
+  for (const value of idIndex) put(value);
+  let postingCursor = 0;
+  for (const entry of lemmaEntries) {
+    const bucket = lemmaPostings.get(entry.lemma)!;
+    put(entry.id);
+    put(postingCursor);
+    put(bucket.length);
+    postingCursor += bucket.length;
+  }
+  for (const entry of lemmaEntries) {
+    for (const index of lemmaPostings.get(entry.lemma)!) put(index);
+  }
+  for (const entry of offsetEntries) {
+    put(entry.pos);
+    put(entry.offset);
+    put(entry.index);
+  }
+  for (const row of strings) {
+    out.set(row, cursor);
+    cursor += row.length;
+  }
+  return out;
+}
+
+function u32View(bytes: Uint8Array, start: number, length: number): Uint32Array {
+  const byteOffset = bytes.byteOffset + start;
+  if (HOST_LITTLE_ENDIAN && byteOffset % 4 === 0) return new Uint32Array(bytes.buffer, byteOffset, length);
+  const view = new DataView(bytes.buffer, byteOffset, length * 4);
+  const out = new Uint32Array(length);
+  for (let i = 0; i < length; i += 1) out[i] = view.getUint32(i * 4, true);
+  return out;
+}
+
+class PackedWordNetReader {
+  readonly version: number;
+  readonly synsetCount: number;
+  private readonly stringOffsets: Uint32Array;
+  private readonly records: Uint32Array;
+  private readonly lists: Uint32Array;
+  private readonly relations: Uint32Array;
+  private readonly idIndex: Uint32Array;
+  private readonly lemmaEntries: Uint32Array;
+  private readonly postings: Uint32Array;
+  private readonly offsetEntries: Uint32Array;
+  private readonly strings: Uint8Array;
+  private readonly decoded: Array<WordNetSynset | undefined>;
+  private readonly decoder = new TextDecoder();
+  private readonly encoder = new TextEncoder();
+
+  constructor(bytes: Uint8Array) {
+    if (bytes.length < WORDNET_INDEXED_HEADER_BYTES) throw new Error("invalid wordnet pack length");
+    const header = new DataView(bytes.buffer, bytes.byteOffset, WORDNET_INDEXED_HEADER_BYTES);
+    const field = (i: number) => header.getUint32(8 + i * 4, true);
+    this.version = field(0);
+    this.synsetCount = field(1);
+    const stringCount = field(2);
+    const stringBytes = field(3);
+    const sizes = [
+      stringCount + 1,
+      this.synsetCount * SYNSET_RECORD_WORDS,
+      field(4),
+      field(5),
+      field(9),
+      field(6) * 3,
+      field(7),
+      field(8) * 3,
+    ];
+    const sections: Uint32Array[] = [];
+    let cursor = WORDNET_INDEXED_HEADER_BYTES;
+    for (const size of sizes) {
+      if (cursor + size * 4 > bytes.length) throw new Error("invalid wordnet pack length");
+      sections.push(u32View(bytes, cursor, size));
+      cursor += size * 4;
+    }
+    if (cursor + stringBytes > bytes.length) throw new Error("invalid wordnet pack length");
+    this.stringOffsets = sections[0]!;
+    this.records = sections[1]!;
+    this.lists = sections[2]!;
+    this.relations = sections[3]!;
+    this.idIndex = sections[4]!;
+    this.lemmaEntries = sections[5]!;
+    this.postings = sections[6]!;
+    this.offsetEntries = sections[7]!;
+    this.strings = bytes.subarray(cursor, cursor + stringBytes);
+    this.decoded = new Array(this.synsetCount);
+  }
+
+  private stringBytesAt(id: number): Uint8Array {
+    return this.strings.subarray(this.stringOffsets[id]!, this.stringOffsets[id + 1]!);
+  }
+
+  private stringAt(id: number): string {
+    return this.decoder.decode(this.stringBytesAt(id));
+  }
+
+  private search(count: number, stride: number, table: Uint32Array, keyOf: (row: number) => number, query: Uint8Array): number {
+    let lo = 0;
+    let hi = count;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      const cmp = compareBytes(this.stringBytesAt(keyOf(table[mid * stride]!)), query);
+      if (cmp === 0) return mid;
+      if (cmp < 0) lo = mid + 1;
+      else hi = mid;
+    }
+    return -1;
+  }
+
+  posAt(index: number): WordNetPos {
+    return POS_CODES[this.records[index * SYNSET_RECORD_WORDS + 1]!]!;
+  }
+
+  idAt(index: number): string {
+    return this.stringAt(this.records[index * SYNSET_RECORD_WORDS]!);
+  }
+
+  indexOf(id: string): number {
+    const found = this.search(
+      this.idIndex.length,
+      1,
+      this.idIndex,
+      (index) => this.records[index * SYNSET_RECORD_WORDS]!,
+      this.encoder.encode(id),
+    );
+    return found < 0 ? -1 : this.idIndex[found]!;
+  }
+
+  synsetAt(index: number): WordNetSynset {
+    const cached = this.decoded[index];
+    if (cached) return cached;
+    const base = index * SYNSET_RECORD_WORDS;
+    const record = this.records;
+    const list = (start: number, count: number) =>
+      Array.from(this.lists.subarray(start, start + count), (id) => this.stringAt(id));
+    let relationCursor = record[base + 7]!;
+    const relationIds = (count: number) => {
+      const out: string[] = [];
+      for (let i = 0; i < count; i += 1) {
+        const target = this.relations[relationCursor + i]!;
+        out.push(target >= UNRESOLVED_RELATION ? this.stringAt(target - UNRESOLVED_RELATION) : this.idAt(target));
+      }
+      relationCursor += count;
+      return out;
+    };
+    const row: WordNetSynset = {
+      id: this.stringAt(record[base]!),
+      pos: POS_CODES[record[base + 1]!]!,
+      lemmas: list(record[base + 3]!, record[base + 4]!),
+      gloss: this.stringAt(record[base + 2]!),
+      examples: list(record[base + 5]!, record[base + 6]!),
+      hypernyms: relationIds(record[base + 8]!),
+      hyponyms: relationIds(record[base + 9]!),
+      similarTo: relationIds(record[base + 10]!),
+      antonyms: relationIds(record[base + 11]!),
+    };
+    this.decoded[index] = row;
+    return row;
+  }
+
+  hypernymIndexes(index: number): number[] {
+    const base = index * SYNSET_RECORD_WORDS;
+    const start = this.records[base + 7]!;
+    const out: number[] = [];
+    for (let i = 0; i < this.records[base + 8]!; i += 1) {
+      const target = this.relations[start + i]!;
+      if (target < UNRESOLVED_RELATION) out.push(target);
+    }
+    return out;
+  }
+
+  validate(): { synsetCount: number; lemmaCount: number; stringCount: number } {
+    const stringCount = this.stringOffsets.length - 1;
+    for (let i = 0; i < stringCount; i += 1) {
+      if (this.stringOffsets[i]! > this.stringOffsets[i + 1]!) throw new Error(`wordnet pack string offsets not monotonic at ${i}`);
+    }
+    if (this.stringOffsets[stringCount]! !== this.strings.length) throw new Error("wordnet pack string table length mismatch");
+
+    let relationTotal = 0;
+    for (let index = 0; index < this.synsetCount; index += 1) {
+      const base = index * SYNSET_RECORD_WORDS;
+      const r = this.records;
+      if (r[base]! >= stringCount || r[base + 2]! >= stringCount) throw new Error(`wordnet pack synset ${index} has invalid strings`);
+      if (r[base + 1]! >= POS_CODES.length) throw new Error(`wordnet pack synset ${index} has invalid pos`);
+      if (r[base + 3]! + r[base + 4]! > this.lists.length || r[base + 5]! + r[base + 6]! > this.lists.length) {
+        throw new Error(`wordnet pack synset ${index} has invalid lemma/example ranges`);
+      }
+      const relationCount = r[base + 8]! + r[base + 9]! + r[base + 10]! + r[base + 11]!;
+      if (r[base + 7]! !== relationTotal) throw new Error(`wordnet pack synset ${index} has invalid relation start`);
+      relationTotal += relationCount;
+    }
+    if (relationTotal !== this.relations.length) throw new Error("wordnet pack relation count mismatch");
+    for (const id of this.lists) {
+      if (id >= stringCount) throw new Error("wordnet pack list references an invalid string");
+    }
+    for (const target of this.relations) {
+      const valid = target >= UNRESOLVED_RELATION ? target - UNRESOLVED_RELATION < stringCount : target < this.synsetCount;
+      if (!valid) throw new Error("wordnet pack relation references an invalid target");
+    }
+
+    const sortedByString = (count: number, keyAt: (i: number) => number, label: string) => {
+      for (let i = 1; i < count; i += 1) {
+        if (compareBytes(this.stringBytesAt(keyAt(i - 1)), this.stringBytesAt(keyAt(i))) >= 0) {
+          throw new Error(`wordnet pack ${label} index is not strictly sorted at ${i}`);
+        }
+      }
+    };
+    for (const index of this.idIndex) {
+      if (index >= this.synsetCount) throw new Error("wordnet pack id index references an invalid synset");
+    }
+    sortedByString(this.idIndex.length, (i) => this.records[this.idIndex[i]! * SYNSET_RECORD_WORDS]!, "id");
+    const lemmaCount = this.lemmaEntries.length / 3;
+    for (let i = 0; i < lemmaCount; i += 1) {
+      if (this.lemmaEntries[i * 3]! >= stringCount) throw new Error("wordnet pack lemma index references an invalid string");
+      if (this.lemmaEntries[i * 3 + 1]! + this.lemmaEntries[i * 3 + 2]! > this.postings.length) {
+        throw new Error("wordnet pack lemma index has an invalid posting range");
+      }
+    }
+    sortedByString(lemmaCount, (i) => this.lemmaEntries[i * 3]!, "lemma");
+    for (const index of this.postings) {
+      if (index >= this.synsetCount) throw new Error("wordnet pack posting references an invalid synset");
+    }
+    for (let i = 0; i < this.offsetEntries.length; i += 3) {
+      if (this.offsetEntries[i + 2]! >= this.synsetCount) throw new Error("wordnet pack offset index references an invalid synset");
+      if (i > 0) {
+        const prevPos = this.offsetEntries[i - 3]!;
+        const prevOffset = this.offsetEntries[i - 2]!;
+        const pos = this.offsetEntries[i]!;
+        if (prevPos > pos || (prevPos === pos && prevOffset >= this.offsetEntries[i + 1]!)) {
+          throw new Error("wordnet pack offset index is not strictly sorted");
+        }
+      }
+    }
+    return { synsetCount: this.synsetCount, lemmaCount, stringCount };
+  }
+
+  *canonicalIndexes(): Generator<number> {
+    const canonical = new Uint8Array(this.synsetCount);
+    for (const index of this.idIndex) canonical[index] = 1;
+    for (let index = 0; index < this.synsetCount; index += 1) {
+      if (canonical[index]) yield index;
+    }
+  }
+
+  lemmaPostings(lemma: string): Uint32Array {
+    const found = this.search(this.lemmaEntries.length / 3, 3, this.lemmaEntries, (id) => id, this.encoder.encode(lemma));
+    if (found < 0) return new Uint32Array(0);
+    const start = this.lemmaEntries[found * 3 + 1]!;
+    return this.postings.subarray(start, start + this.lemmaEntries[found * 3 + 2]!);
+  }
+
+  *lemmaNames(): Generator<{ lemma: string; postings: Uint32Array }> {
+    for (let i = 0; i < this.lemmaEntries.length; i += 3) {
+      const start = this.lemmaEntries[i + 1]!;
+      yield {
+        lemma: this.stringAt(this.lemmaEntries[i]!),
+        postings: this.postings.subarray(start, start + this.lemmaEntries[i + 2]!),
+      };
+    }
+  }
+
+  offsetLookup(pos: WordNetPos, offset: number): number {
+    const code = posCode(pos);
+    let lo = 0;
+    let hi = this.offsetEntries.length / 3;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      const midPos = this.offsetEntries[mid * 3]!;
+      const midOffset = this.offsetEntries[mid * 3 + 1]!;
+      if (midPos === code && midOffset === offset) return this.offsetEntries[mid * 3 + 2]!;
+      if (midPos < code || (midPos === code && midOffset < offset)) lo = mid + 1;
+      else hi = mid;
+    }
+    return -1;
+  }
+}
+
+export function validateWordNetPack(bytes: Uint8Array): { synsetCount: number; lemmaCount: number; stringCount: number } {
+  const magic = new TextDecoder().decode(bytes.subarray(0, WORDNET_INDEXED_MAGIC.length));
+  if (magic !== WORDNET_INDEXED_MAGIC) throw new Error(`invalid wordnet pack magic: ${magic}`);
+  return new PackedWordNetReader(bytes).validate();
+}
+
 export class WordNet {
   private readonly byId = new Map<string, WordNetSynset>();
   private readonly lemmaIndex = new Map<string, WordNetSynset[]>();
   private readonly offsetIndex = new Map<string, WordNetSynset>();
   private readonly senseKeyIndex = new Map<string, WordNetSynset>();
+  private packed: PackedWordNetReader | null = null;
+  private hypernymIndex: HypernymIndex | null = null;
+  private indexIds: string[] = [];
+  private readonly indexById = new Map<string, number>();
 
   private makeOffsetKey(pos: WordNetPos, offset: string | number): string {
     const raw = typeof offset === "number" ? String(Math.floor(Math.max(0, offset))) : String(offset).trim();
@@ -147,6 +587,41 @@ export class WordNet {
     }
   }
 
+  static fromPackedBytes(bytes: Uint8Array): WordNet {
+    const db = new WordNet({ version: 1, synsets: [] });
+    db.packed = new PackedWordNetReader(bytes);
+    return db;
+  }
+
+  private lookupId(id: string): WordNetSynset | null {
+    if (!this.packed) return this.byId.get(id) ?? null;
+    const index = this.packed.indexOf(id);
+    return index < 0 ? null : this.packed.synsetAt(index);
+  }
+
+  private lemmaRows(lemma: string, pos?: WordNetPos): WordNetSynset[] {
+    if (!this.packed) {
+      const rows = this.lemmaIndex.get(lemma) ?? [];
+      return pos ? rows.filter((row) => row.pos === pos) : rows;
+    }
+    const out: WordNetSynset[] = [];
+    for (const index of this.packed.lemmaPostings(lemma)) {
+      if (!pos || this.packed.posAt(index) === pos) out.push(this.packed.synsetAt(index));
+    }
+    return out;
+  }
+
+  private hasLemma(lemma: string, pos?: WordNetPos): boolean {
+    if (!this.packed) {
+      const rows = this.lemmaIndex.get(lemma);
+      return !!rows && rows.length > 0 && (!pos || rows.some((row) => row.pos === pos));
+    }
+    for (const index of this.packed.lemmaPostings(lemma)) {
+      if (!pos || this.packed.posAt(index) === pos) return true;
+    }
+    return false;
+  }
+
   private resolveSynset(idOrSynset: string | WordNetSynset): WordNetSynset | null {
     return typeof idOrSynset === "string" ? this.synset(idOrSynset) : idOrSynset;
   }
@@ -157,21 +632,65 @@ export class WordNet {
     return uniqueSynsets([...this.hypernyms(row), ...this.hyponyms(row)]);
   }
 
+  private synsetIndex(idOrSynset: string | WordNetSynset): number {
+    const id = typeof idOrSynset === "string" ? idOrSynset : idOrSynset.id;
+    if (this.packed) return this.packed.indexOf(id);
+    return this.indexById.get(id) ?? -1;
+  }
+
+  private synsetAtIndex(index: number): WordNetSynset {
+    return this.packed ? this.packed.synsetAt(index) : this.byId.get(this.indexIds[index]!)!;
+  }
+
+  buildHypernymIndex(): void {
+    if (this.hypernymIndex) return;
+    const packed = this.packed;
+    if (packed) {
+      this.hypernymIndex = HypernymIndex.build(packed.synsetCount, (index) => packed.hypernymIndexes(index));
+      return;
+    }
+    this.indexIds = [...this.byId.keys()];
+    this.indexIds.forEach((id, index) => this.indexById.set(id, index));
+    this.hypernymIndex = HypernymIndex.build(this.indexIds.length, (index) => {
+      const out: number[] = [];
+      for (const id of this.byId.get(this.indexIds[index]!)!.hypernyms) {
+        const parent = this.indexById.get(id);
+        if (parent !== undefined) out.push(parent);
+      }
+      return out;
+    });
+  }
+
+  hasHypernymIndex(): boolean {
+    return this.hypernymIndex !== null;
+  }
+
+  minDepth(idOrSynset: string | WordNetSynset): number | null {
+    this.buildHypernymIndex();
+    const index = this.synsetIndex(idOrSynset);
+    return index < 0 ? null : this.hypernymIndex!.minDepth[index]!;
+  }
+
+  maxDepth(idOrSynset: string | WordNetSynset): number | null {
+    this.buildHypernymIndex();
+    const index = this.synsetIndex(idOrSynset);
+    return index < 0 ? null : this.hypernymIndex!.maxDepth[index]!;
+  }
+
   synset(id: string): WordNetSynset | null {
-    return this.byId.get(id) ?? null;
+    return this.lookupId(id);
   }
 
   allSynsets(pos?: WordNetPos): WordNetSynset[] {
-    const rows = [...this.byId.values()];
+    const packed = this.packed;
+    const rows = packed ? Array.from(packed.canonicalIndexes(), (index) => packed.synsetAt(index)) : [...this.byId.values()];
     if (!pos) return rows;
     return rows.filter((row) => row.pos === pos);
   }
 
   synsets(word: string, pos?: WordNetPos): WordNetSynset[] {
     const lemma = this.morphy(word, pos) ?? normalizeLemma(word);
-    const rows = this.lemmaIndex.get(lemma) ?? [];
-    if (!pos) return rows;
-    return rows.filter((row) => row.pos === pos);
+    return this.lemmaRows(lemma, pos);
   }
 
   lemmaNames(idOrSynset: string | WordNetSynset): string[] {
@@ -182,8 +701,14 @@ export class WordNet {
 
   lemmas(pos?: WordNetPos): string[] {
     const out: string[] = [];
-    for (const [lemma, rows] of this.lemmaIndex.entries()) {
-      if (!pos || rows.some((row) => row.pos === pos)) out.push(lemma);
+    if (this.packed) {
+      for (const entry of this.packed.lemmaNames()) {
+        if (!pos || entry.postings.some((index) => this.packed!.posAt(index) === pos)) out.push(entry.lemma);
+      }
+    } else {
+      for (const [lemma, rows] of this.lemmaIndex.entries()) {
+        if (!pos || rows.some((row) => row.pos === pos)) out.push(lemma);
+      }
     }
     out.sort();
     return out;
@@ -191,23 +716,20 @@ export class WordNet {
 
   morphy(word: string, pos?: WordNetPos): string | null {
     const nativeCandidate = wordnetMorphyAsciiNative(word, pos);
-    if (nativeCandidate) {
-      const rows = this.lemmaIndex.get(nativeCandidate);
-      if (rows && rows.length > 0 && (!pos || rows.some((row) => row.pos === pos))) {
-        return nativeCandidate;
-      }
-    }
+    if (nativeCandidate && this.hasLemma(nativeCandidate, pos)) return nativeCandidate;
     for (const candidate of morphCandidates(word, pos)) {
-      const rows = this.lemmaIndex.get(candidate);
-      if (!rows || rows.length === 0) continue;
-      if (!pos || rows.some((row) => row.pos === pos)) return candidate;
+      if (this.hasLemma(candidate, pos)) return candidate;
     }
     return null;
   }
 
   synsetFromPosAndOffset(pos: WordNetPos, offset: string | number): WordNetSynset | null {
     const key = this.makeOffsetKey(pos, offset);
-    return this.offsetIndex.get(key) ?? null;
+    if (!this.packed) return this.offsetIndex.get(key) ?? null;
+    const digits = key.slice(2);
+    if (digits.length > 8) return null;
+    const index = this.packed.offsetLookup(pos, Number(digits));
+    return index < 0 ? null : this.packed.synsetAt(index);
   }
 
   synset_from_pos_and_offset(pos: WordNetPos, offset: string | number): WordNetSynset | null {
@@ -215,7 +737,10 @@ export class WordNet {
   }
 
   synsetFromSenseKey(senseKey: string): WordNetSynset | null {
-    return this.senseKeyIndex.get(senseKey.toLowerCase()) ?? null;
+    if (!this.packed) return this.senseKeyIndex.get(senseKey.toLowerCase()) ?? null;
+    const match = senseKey.toLowerCase().match(/^(.*)%([1-4]):00:00::$/);
+    if (!match) return null;
+    return this.lemmaRows(match[1]!, POS_CODES[Number(match[2]) - 1])[0] ?? null;
   }
 
   synset_from_sense_key(senseKey: string): WordNetSynset | null {
@@ -237,25 +762,25 @@ export class WordNet {
   hypernyms(idOrSynset: string | WordNetSynset): WordNetSynset[] {
     const node = typeof idOrSynset === "string" ? this.synset(idOrSynset) : idOrSynset;
     if (!node) return [];
-    return node.hypernyms.map((id) => this.byId.get(id)).filter((row): row is WordNetSynset => !!row);
+    return node.hypernyms.map((id) => this.lookupId(id)).filter((row): row is WordNetSynset => !!row);
   }
 
   hyponyms(idOrSynset: string | WordNetSynset): WordNetSynset[] {
     const node = typeof idOrSynset === "string" ? this.synset(idOrSynset) : idOrSynset;
     if (!node) return [];
-    return node.hyponyms.map((id) => this.byId.get(id)).filter((row): row is WordNetSynset => !!row);
+    return node.hyponyms.map((id) => this.lookupId(id)).filter((row): row is WordNetSynset => !!row);
   }
 
   similarTo(idOrSynset: string | WordNetSynset): WordNetSynset[] {
     const node = typeof idOrSynset === "string" ? this.synset(idOrSynset) : idOrSynset;
     if (!node) return [];
-    return node.similarTo.map((id) => this.byId.get(id)).filter((row): row is WordNetSynset => !!row);
+    return node.similarTo.map((id) => this.lookupId(id)).filter((row): row is WordNetSynset => !!row);
   }
 
   antonyms(idOrSynset: string | WordNetSynset): WordNetSynset[] {
     const node = this.resolveSynset(idOrSynset);
     if (!node) return [];
-    return node.antonyms.map((id) => this.byId.get(id)).filter((row): row is WordNetSynset => !!row);
+    return node.antonyms.map((id) => this.lookupId(id)).filter((row): row is WordNetSynset => !!row);
   }
 
   hypernymPaths(idOrSynset: string | WordNetSynset, options: { maxDepth?: number } = {}): WordNetSynset[][] {
@@ -330,7 +855,6 @@ export class WordNet {
     const rhs = this.resolveSynset(right);
     if (!lhs || !rhs) return [];
     const maxDepth = Math.max(1, Math.floor(options.maxDepth ?? 64));
-
     const buildAncestorDepths = (start: WordNetSynset): Map<string, number> => {
       const out = new Map<string, number>();
       const queue: Array<{ node: WordNetSynset; depth: number }> = [{ node: start, depth: 0 }];
@@ -370,6 +894,209 @@ export class WordNet {
       .filter((row): row is WordNetSynset => !!row)
       .sort((a, b) => a.id.localeCompare(b.id));
   }
+
+  // Ancestor-only distance through a common hypernym, answered from the hypernym index.
+  // Unlike `shortestPathDistance` it never walks down through hyponyms.
+  hypernymDistance(
+    left: string | WordNetSynset,
+    right: string | WordNetSynset,
+    options: { maxDepth?: number } = {},
+  ): number | null {
+    this.buildHypernymIndex();
+    const lhs = this.synsetIndex(left);
+    const rhs = this.synsetIndex(right);
+    if (lhs < 0 || rhs < 0) return null;
+    const maxDepth = Math.max(1, Math.floor(options.maxDepth ?? 64));
+    const distance = this.hypernymIndex!.shortestDistance(lhs, rhs, maxDepth, maxDepth);
+    return Number.isFinite(distance) ? distance : null;
+  }
+
+  hypernymPathSimilarity(
+    left: string | WordNetSynset,
+    right: string | WordNetSynset,
+    options: { maxDepth?: number } = {},
+  ): number | null {
+    const distance = this.hypernymDistance(left, right, options);
+    if (distance === null) return null;
+    return 1 / (distance + 1);
+  }
+
+  lowestCommonHypernymsIndexed(
+    left: string | WordNetSynset,
+    right: string | WordNetSynset,
+    options: { maxDepth?: number } = {},
+  ): WordNetSynset[] {
+    this.buildHypernymIndex();
+    const lhs = this.synsetIndex(left);
+    const rhs = this.synsetIndex(right);
+    if (lhs < 0 || rhs < 0) return [];
+    const maxDepth = Math.max(1, Math.floor(options.maxDepth ?? 64));
+    const match = this.hypernymIndex!.lowestCommon(lhs, rhs, maxDepth);
+    if (!match) return [];
+    return match.ancestors.map((index) => this.synsetAtIndex(index)).sort((a, b) => a.id.localeCompare(b.id));
+  }
+
+  private icTable(ic: WordNetInformationContent): HypernymIndex {
+    this.buildHypernymIndex();
+    const index = this.hypernymIndex!;
+    if (ic.ic.length !== index.size) throw new Error("information content table does not match this WordNet");
+    return index;
+  }
+
+  private newInformationContent(smoothing: number): WordNetInformationContent {
+    this.buildHypernymIndex();
+    const size = this.hypernymIndex!.size;
+    return {
+      counts: new Float64Array(size).fill(smoothing),
+      ic: new Float64Array(size),
+      rootCounts: { n: smoothing, v: smoothing, a: smoothing, r: smoothing },
+    };
+  }
+
+  private finishInformationContent(table: WordNetInformationContent): WordNetInformationContent {
+    for (let index = 0; index < table.counts.length; index += 1) {
+      const count = table.counts[index]!;
+      const root = table.rootCounts[this.synsetAtIndex(index).pos];
+      table.ic[index] = count === 0 ? Infinity : -Math.log(count / root);
+    }
+    return table;
+  }
+
+  informationContent(
+    source: FreqDist<string> | Iterable<string>,
+    options: { weightSensesEqually?: boolean; smoothing?: number } = {},
+  ): WordNetInformationContent {
+    const counts = source instanceof FreqDist ? source : new FreqDist<string>(source);
+    const table = this.newInformationContent(Math.max(0, options.smoothing ?? 1));
+    const index = this.hypernymIndex!;
+    for (const [word, count] of counts.entries()) {
+      const rows = this.synsets(word);
+      if (rows.length === 0) continue;
+      const weight = options.weightSensesEqually ? count : count / rows.length;
+      for (const row of rows) {
+        const synsetIndex = this.synsetIndex(row);
+        if (synsetIndex < 0) continue;
+        for (const ancestor of index.ancestors(synsetIndex).ids) table.counts[ancestor] += weight;
+        table.rootCounts[row.pos] += weight;
+      }
+    }
+    return this.finishInformationContent(table);
+  }
+
+  informationContentFromCounts(text: string): WordNetInformationContent {
+    const table = this.newInformationContent(0);
+    for (const line of text.split(/\r?\n/)) {
+      const fields = line.trim().split(/\s+/);
+      if (fields.length < 2 || fields[0]!.startsWith("wnver")) continue;
+      const value = Number(fields[1]);
+      if (!Number.isFinite(value)) continue;
+      const offsetKey = fields[0]!.match(/^(\d+)([nvar])$/);
+      const row = offsetKey
+        ? this.synsetFromPosAndOffset(offsetKey[2] as WordNetPos, offsetKey[1]!)
+        : this.synset(fields[0]!);
+      if (!row) continue;
+      if (fields[2] === "ROOT") table.rootCounts[row.pos] += value;
+      const synsetIndex = this.synsetIndex(row);
+      if (synsetIndex >= 0) table.counts[synsetIndex] = value;
+    }
+    return this.finishInformationContent(table);
+  }
+
+  informationContentOf(idOrSynset: string | WordNetSynset, ic: WordNetInformationContent): number | null {
+    this.icTable(ic);
+    const index = this.synsetIndex(idOrSynset);
+    return index < 0 ? null : ic.ic[index]!;
+  }
+
+  private icSimilarityAt(
+    index: HypernymIndex,
+    ic: Float64Array,
+    lhs: number,
+    rhs: number,
+    measure: WordNetIcSimilarity,
+  ): number {
+    const lcs = Math.max(0, index.maxCommonScore(lhs, rhs, ic));
+    if (measure === "res") return lcs;
+    const ic1 = ic[lhs]!;
+    const ic2 = ic[rhs]!;
+    if (measure === "lin") return (2 * lcs) / (ic1 + ic2);
+    if (ic1 === 0 || ic2 === 0) return 0;
+    const difference = ic1 + ic2 - 2 * lcs;
+    return difference === 0 ? 1e300 : 1 / difference;
+  }
+
+  private icSimilarity(
+    left: string | WordNetSynset,
+    right: string | WordNetSynset,
+    ic: WordNetInformationContent,
+    measure: WordNetIcSimilarity,
+  ): number | null {
+    const index = this.icTable(ic);
+    const lhs = this.synsetIndex(left);
+    const rhs = this.synsetIndex(right);
+    if (lhs < 0 || rhs < 0) return null;
+    if (this.synsetAtIndex(lhs).pos !== this.synsetAtIndex(rhs).pos) return null;
+    return this.icSimilarityAt(index, ic.ic, lhs, rhs, measure);
+  }
+
+  resSimilarity(left: string | WordNetSynset, right: string | WordNetSynset, ic: WordNetInformationContent): number | null {
+    return this.icSimilarity(left, right, ic, "res");
+  }
+
+  linSimilarity(left: string | WordNetSynset, right: string | WordNetSynset, ic: WordNetInformationContent): number | null {
+    return this.icSimilarity(left, right, ic, "lin");
+  }
+
+  jcnSimilarity(left: string | WordNetSynset, right: string | WordNetSynset, ic: WordNetInformationContent): number | null {
+    return this.icSimilarity(left, right, ic, "jcn");
+  }
+
+  icSimilarityMatrix(
+    left: Array<string | WordNetSynset>,
+    right: Array<string | WordNetSynset>,
+    ic: WordNetInformationContent,
+    measure: WordNetIcSimilarity,
+  ): Float64Array {
+    const index = this.icTable(ic);
+    const rows = left.map((item) => this.synsetIndex(item));
+    const cols = right.map((item) => this.synsetIndex(item));
+    const colPos = cols.map((col) => (col < 0 ? null : this.synsetAtIndex(col).pos));
+    const out = new Float64Array(rows.length * cols.length);
+    for (let i = 0; i < rows.length; i += 1) {
+      const row = rows[i]!;
+      if (row < 0) continue;
+      const rowPos = this.synsetAtIndex(row).pos;
+      for (let j = 0; j < cols.length; j += 1) {
+        if (colPos[j] !== rowPos) continue;
+        out[i * cols.length + j] = this.icSimilarityAt(index, ic.ic, row, cols[j]!, measure);
+      }
+    }
+    return out;
+  }
+
+  similarityMatrix(
+    left: Array<string | WordNetSynset>,
+    right: Array<string | WordNetSynset>,
+    options: { maxDepth?: number } = {},
+  ): Float64Array {
+    this.buildHypernymIndex();
+    const index = this.hypernymIndex!;
+    const maxDepth = Math.max(1, Math.floor(options.maxDepth ?? 64));
+    const rows = left.map((item) => this.synsetIndex(item));
+    const cols = right.map((item) => this.synsetIndex(item));
+    const out = new Float64Array(rows.length * cols.length);
+    for (let i = 0; i < rows.length; i += 1) {
+      const row = rows[i]!;
+      if (row < 0) continue;
+      for (let j = 0; j < cols.length; j += 1) {
+        const col = cols[j]!;
+        if (col < 0) continue;
+        const distance = index.shortestDistance(row, col, maxDepth, maxDepth);
+        if (Number.isFinite(distance)) out[i * cols.length + j] = 1 / (distance + 1);
+      }
+    }
+    return out;
+  }
 }
 
 let cachedMiniWordNet: WordNet | null = null;
@@ -397,23 +1124,35 @@ export function loadWordNetExtended(path?: string): WordNet {
 
 const WORDNET_PACK_MAGIC = "BNWN1";
 
+function readPackBytes(path: string): Uint8Array {
+  try {
+    return Bun.mmap(path, { shared: false });
+  } catch {
+    return readFileSync(path);
+  }
+}
+
 export function loadWordNetPacked(path?: string): WordNet {
   if (!path && cachedPackedWordNet) return cachedPackedWordNet;
   const sourcePath = path ?? resolve(import.meta.dir, "..", "models", "wordnet_full.bin");
-  const bytes = readFileSync(sourcePath);
+  const bytes = readPackBytes(sourcePath);
   const magic = new TextDecoder().decode(bytes.subarray(0, WORDNET_PACK_MAGIC.length));
-  if (magic !== WORDNET_PACK_MAGIC) {
+  let db: WordNet;
+  if (magic === WORDNET_INDEXED_MAGIC) {
+    db = WordNet.fromPackedBytes(bytes);
+  } else if (magic === WORDNET_PACK_MAGIC) {
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    const len = view.getUint32(WORDNET_PACK_MAGIC.length, true);
+    const start = WORDNET_PACK_MAGIC.length + 4;
+    const end = start + len;
+    if (end > bytes.length) {
+      throw new Error("invalid wordnet pack length");
+    }
+    const payload = JSON.parse(new TextDecoder().decode(bytes.subarray(start, end))) as WordNetMiniPayload;
+    db = new WordNet(payload);
+  } else {
     throw new Error(`invalid wordnet pack magic: ${magic}`);
   }
-  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
-  const len = view.getUint32(WORDNET_PACK_MAGIC.length, true);
-  const start = WORDNET_PACK_MAGIC.length + 4;
-  const end = start + len;
-  if (end > bytes.length) {
-    throw new Error("invalid wordnet pack length");
-  }
-  const payload = JSON.parse(new TextDecoder().decode(bytes.subarray(start, end))) as WordNetMiniPayload;
-  const db = new WordNet(payload);
   if (!path) cachedPackedWordNet = db;
   return db;
 }
@@ -424,6 +1163,10 @@ function loadWordNetFromPath(path: string): WordNet {
   return new WordNet(payload);
 }
 
+export function loadWordNetInformationContent(wordnet: WordNet, path: string): WordNetInformationContent {
+  return wordnet.informationContentFromCounts(readFileSync(resolve(path), "utf8"));
+}
+
 export function loadWordNet(path?: string): WordNet {
   if (path) return loadWordNetFromPath(path);
   if (cachedDefaultWordNet) return cachedDefaultWordNet;
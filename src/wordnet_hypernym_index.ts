@@ -0,0 +1,181 @@
+export type HypernymIndexMatch = {
+  distance: number;
+  ancestors: number[];
+};
+
+export class HypernymIndex {
+  readonly size: number;
+  readonly minDepth: Uint32Array;
+  readonly maxDepth: Uint32Array;
+  private readonly ancestorOffsets: Uint32Array;
+  private readonly ancestorIds: Uint32Array;
+  private readonly ancestorDistances: Uint16Array;
+
+  private constructor(
+    minDepth: Uint32Array,
+    maxDepth: Uint32Array,
+    ancestorOffsets: Uint32Array,
+    ancestorIds: Uint32Array,
+    ancestorDistances: Uint16Array,
+  ) {
+    this.size = minDepth.length;
+    this.minDepth = minDepth;
+    this.maxDepth = maxDepth;
+    this.ancestorOffsets = ancestorOffsets;
+    this.ancestorIds = ancestorIds;
+    this.ancestorDistances = ancestorDistances;
+  }
+
+  static build(size: number, parentsOf: (index: number) => ArrayLike<number>): HypernymIndex {
+    const minDepth = new Uint32Array(size);
+    const maxDepth = new Uint32Array(size);
+    const closureIds: Uint32Array[] = new Array(size);
+    const closureDistances: Uint16Array[] = new Array(size);
+    const state = new Uint8Array(size);
+
+    const finish = (node: number) => {
+      const parents = parentsOf(node);
+      const ids: number[] = [node];
+      const distances: number[] = [0];
+      let minParent = Infinity;
+      let maxParent = -1;
+      for (let p = 0; p < parents.length; p += 1) {
+        const parent = parents[p]!;
+        if (parent >= size || state[parent] !== 2) continue;
+        minParent = Math.min(minParent, minDepth[parent]!);
+        maxParent = Math.max(maxParent, maxDepth[parent]!);
+        const parentIds = closureIds[parent]!;
+        const parentDistances = closureDistances[parent]!;
+        for (let i = 0; i < parentIds.length; i += 1) {
+          ids.push(parentIds[i]!);
+          distances.push(Math.min(0xffff, parentDistances[i]! + 1));
+        }
+      }
+      minDepth[node] = maxParent < 0 ? 0 : minParent + 1;
+      maxDepth[node] = maxParent < 0 ? 0 : maxParent + 1;
+
+      const order = ids.map((_, i) => i).sort((a, b) => ids[a]! - ids[b]! || distances[a]! - distances[b]!);
+      const outIds: number[] = [];
+      const outDistances: number[] = [];
+      for (const i of order) {
+        if (outIds.length > 0 && outIds[outIds.length - 1] === ids[i]) continue;
+        outIds.push(ids[i]!);
+        outDistances.push(distances[i]!);
+      }
+      closureIds[node] = Uint32Array.from(outIds);
+      closureDistances[node] = Uint16Array.from(outDistances);
+      state[node] = 2;
+    };
+
+    for (let root = 0; root < size; root += 1) {
+      if (state[root] !== 0) continue;
+      const stack: Array<{ node: number; next: number }> = [{ node: root, next: 0 }];
+      state[root] = 1;
+      while (stack.length > 0) {
+        const top = stack[stack.length - 1]!;
+        const parents = parentsOf(top.node);
+        if (top.next < parents.length) {
+          const parent = parents[top.next++]!;
+          if (parent < size && state[parent] === 0) {
+            state[parent] = 1;
+            stack.push({ node: parent, next: 0 });
+          }
+          continue;
+        }
+        finish(top.node);
+        stack.pop();
+      }
+    }
+
+    const ancestorOffsets = new Uint32Array(size + 1);
+    for (let i = 0; i < size; i += 1) ancestorOffsets[i + 1] = ancestorOffsets[i]! + closureIds[i]!.length;
+    const ancestorIds = new Uint32Array(ancestorOffsets[size]!);
+    const ancestorDistances = new Uint16Array(ancestorOffsets[size]!);
+    for (let i = 0; i < size; i += 1) {
+      ancestorIds.set(closureIds[i]!, ancestorOffsets[i]!);
+      ancestorDistances.set(closureDistances[i]!, ancestorOffsets[i]!);
+    }
+    return new HypernymIndex(minDepth, maxDepth, ancestorOffsets, ancestorIds, ancestorDistances);
+  }
+
+  ancestors(index: number): { ids: Uint32Array; distances: Uint16Array } {
+    const start = this.ancestorOffsets[index]!;
+    const end = this.ancestorOffsets[index + 1]!;
+    return { ids: this.ancestorIds.subarray(start, end), distances: this.ancestorDistances.subarray(start, end) };
+  }
+
+  shortestDistance(left: number, right: number, maxSide: number, maxTotal = Infinity): number {
+    if (left === right) return 0;
+    let li = this.ancestorOffsets[left]!;
+    let ri = this.ancestorOffsets[right]!;
+    const lEnd = this.ancestorOffsets[left + 1]!;
+    const rEnd = this.ancestorOffsets[right + 1]!;
+    let best = Infinity;
+    while (li < lEnd && ri < rEnd) {
+      const lId = this.ancestorIds[li]!;
+      const rId = this.ancestorIds[ri]!;
+      if (lId < rId) li += 1;
+      else if (lId > rId) ri += 1;
+      else {
+        const lDist = this.ancestorDistances[li]!;
+        const rDist = this.ancestorDistances[ri]!;
+        if (lDist <= maxSide && rDist <= maxSide && lDist + rDist < best) best = lDist + rDist;
+        li += 1;
+        ri += 1;
+      }
+    }
+    return best <= maxTotal ? best : Infinity;
+  }
+
+  maxCommonScore(left: number, right: number, scores: Float64Array): number {
+    let li = this.ancestorOffsets[left]!;
+    let ri = this.ancestorOffsets[right]!;
+    const lEnd = this.ancestorOffsets[left + 1]!;
+    const rEnd = this.ancestorOffsets[right + 1]!;
+    let best = -Infinity;
+    while (li < lEnd && ri < rEnd) {
+      const lId = this.ancestorIds[li]!;
+      const rId = this.ancestorIds[ri]!;
+      if (lId < rId) li += 1;
+      else if (lId > rId) ri += 1;
+      else {
+        if (scores[lId]! > best) best = scores[lId]!;
+        li += 1;
+        ri += 1;
+      }
+    }
+    return best;
+  }
+
+  lowestCommon(left: number, right: number, maxSide: number): HypernymIndexMatch | null {
+    let li = this.ancestorOffsets[left]!;
+    let ri = this.ancestorOffsets[right]!;
+    const lEnd = this.ancestorOffsets[left + 1]!;
+    const rEnd = this.ancestorOffsets[right + 1]!;
+    let best = Infinity;
+    const ancestors: number[] = [];
+    while (li < lEnd && ri < rEnd) {
+      const lId = this.ancestorIds[li]!;
+      const rId = this.ancestorIds[ri]!;
+      if (lId < rId) li += 1;
+      else if (lId > rId) ri += 1;
+      else {
+        const lDist = this.ancestorDistances[li]!;
+        const rDist = this.ancestorDistances[ri]!;
+        if (lDist <= maxSide && rDist <= maxSide) {
+          const score = lDist + rDist;
+          if (score < best) {
+            best = score;
+            ancestors.length = 0;
+            ancestors.push(lId);
+          } else if (score === best) {
+            ancestors.push(lId);
+          }
+        }
+        li += 1;
+        ri += 1;
+      }
+    }
+    return ancestors.length > 0 ? { distance: best, ancestors } : null;
+  }
+}
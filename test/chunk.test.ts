@@ -1,6 +1,14 @@
 import { expect, test } from "bun:test";
 import { resolve } from "node:path";
-import { chunkTreeToIob, regexpChunkParse, type TaggedToken } from "../index";
+import {
+  chunkTreeToIob,
+  compileRegexpChunkParser,
+  RegexpChunkParser,
+  regexpChunkParse,
+  regexpChunkParseBatch,
+  type ChunkIobBatch,
+  type TaggedToken,
+} from "../index";
 
 const tagged: TaggedToken[] = [
   { token: "The", tag: "DT" },
@@ -35,6 +43,70 @@ test("regexp chunk parser builds NP/VP chunks", () => {
   ]);
 });
 
+function batchIob(batch: ChunkIobBatch): string[][] {
+  const out: string[][] = [];
+  for (let s = 0; s + 1 < batch.sentenceOffsets.length; s += 1) {
+    const row: string[] = [];
+    for (let i = batch.sentenceOffsets[s]!; i < batch.sentenceOffsets[s + 1]!; i += 1) {
+      const labelId = batch.labelIds[i]!;
+      row.push(labelId === 0xffff ? "O" : `${batch.begins[i] ? "B" : "I"}-${batch.labels[labelId]}`);
+    }
+    out.push(row);
+  }
+  return out;
+}
+
+test("compiled regexp chunk parser is cached per grammar and matches per-call parsing", () => {
+  const parser = compileRegexpChunkParser(grammar);
+  expect(compileRegexpChunkParser(grammar)).toBe(parser);
+  expect(parser.parse(tagged)).toEqual(regexpChunkParse(tagged, grammar));
+
+  const nounsOnly: TaggedToken[] = [
+    { token: "dogs", tag: "NNS" },
+    { token: "cats", tag: "NNS" },
+  ];
+  expect(chunkTreeToIob(parser.parse(nounsOnly)).map((row) => row.iob)).toEqual(["B-NP", "I-NP"]);
+});
+
+test("regexp chunk parser batch returns columnar IOB labels per sentence", () => {
+  const sentences: TaggedToken[][] = [
+    tagged,
+    [],
+    [
+      { token: "birds", tag: "NNS" },
+      { token: "sing", tag: "VBP" },
+    ],
+    [{ token: "quickly", tag: "RB" }],
+  ];
+  const batch = new RegexpChunkParser(grammar).parseBatch(sentences);
+  expect(Array.from(batch.sentenceOffsets)).toEqual([0, 9, 9, 11, 12]);
+  expect(batchIob(batch)).toEqual(sentences.map((row) => chunkTreeToIob(regexpChunkParse(row, grammar)).map((item) => item.iob)));
+  expect(batchIob(regexpChunkParseBatch(sentences, grammar))[2]).toEqual(["B-NP", "B-VP"]);
+});
+
+test("chunk automaton keeps greedy backtracking order in native and JS paths", () => {
+  const tricky = `
+X: {<A|B>*<B><C>?}
+Y: {<A>?<A><B>*}
+`;
+  const rows: TaggedToken[] = ["A", "B", "B", "C", "A", "A", "B", "A"].map((tag, i) => ({ token: `t${i}`, tag }));
+  const expected = ["B-X", "I-X", "I-X", "I-X", "B-X", "I-X", "I-X", "B-Y"];
+  expect(chunkTreeToIob(regexpChunkParse(rows, tricky)).map((row) => row.iob)).toEqual(expected);
+  expect(chunkTreeToIob(regexpChunkParse(rows, tricky, { useNative: false })).map((row) => row.iob)).toEqual(expected);
+});
+
+test("chunk automaton handles long quantified runs without a completing match", () => {
+  const run: TaggedToken[] = Array.from({ length: 20000 }, (_, i) => ({ token: `w${i}`, tag: "JJ" }));
+  expect(regexpChunkParse(run, grammar).every((node) => !("kind" in node))).toBeTrue();
+  expect(regexpChunkParse(run, grammar, { useNative: false }).every((node) => !("kind" in node))).toBeTrue();
+
+  const withNoun = [...run, { token: "dog", tag: "NN" }];
+  const native = chunkTreeToIob(regexpChunkParse(withNoun, grammar));
+  expect(native[0]!.iob).toBe("B-NP");
+  expect(native.at(-1)!.iob).toBe("I-NP");
+  expect(chunkTreeToIob(regexpChunkParse(withNoun, grammar, { useNative: false }))).toEqual(native);
+});
+
 test("regexp chunk parser parity with nltk RegexpParser on sample grammar", () => {
   const tree = regexpChunkParse(tagged, grammar);
   const jsIob = chunkTreeToIob(tree).map((row) => [row.token, row.tag, row.iob]);
@@ -53,3 +125,14 @@ test("regexp chunk parser parity with nltk RegexpParser on sample grammar", () =
   const py = JSON.parse(new TextDecoder().decode(proc.stdout).trim()) as { iob: string[][] };
   expect(jsIob).toEqual(py.iob);
 }, 20000);
+
+test("regexp chunk parser leaves sentences whose tags match no rule atom unchunked", () => {
+  const rows: TaggedToken[] = [{ token: "quickly", tag: "RB" }];
+  expect(regexpChunkParse(rows, "NP: {<DT>?<NN>}")).toEqual([{ token: "quickly", tag: "RB" }]);
+
+  const parser = new RegexpChunkParser("NP: {<DT>?<NN>}");
+  expect(parser.parse(rows)).toEqual([{ token: "quickly", tag: "RB" }]);
+  const noun: TaggedToken[] = [{ token: "dog", tag: "NN" }];
+  expect(parser.parse(noun)).toEqual(parser.parse(noun, { useNative: false }));
+  expect(batchIob(new RegexpChunkParser("NP: {<DT>?<NN>}").parseBatch([rows]))).toEqual([["O"]]);
+});
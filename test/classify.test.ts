@@ -29,6 +29,60 @@ test("naive bayes classifier trains and predicts", () => {
   expect(evalOut.accuracy).toBeGreaterThanOrEqual(0.75);
 });
 
+test("naive bayes predictBatch matches per-text predict and dense scoring", () => {
+  const clf = trainNaiveBayesTextClassifier(trainRows, { smoothing: 0.5 });
+  const texts = [...testRows.map((row) => row.text), "", "unseen words only", "bad bad unknown happy"];
+  const batch = clf.predictBatch(texts);
+  expect(batch.length).toBe(texts.length);
+  for (let i = 0; i < texts.length; i += 1) {
+    const single = clf.predict(texts[i]!);
+    expect(batch[i]!.map((row) => row.label)).toEqual(single.map((row) => row.label));
+    for (let j = 0; j < single.length; j += 1) expect(batch[i]![j]!.logProb).toBeCloseTo(single[j]!.logProb, 9);
+  }
+  expect(clf.classifyBatch(texts)).toEqual(texts.map((text) => clf.classify(text)));
+
+  // Known tokens score log((count + a) / (labelTokens + a * vocab)); unseen tokens are ignored.
+  const vocab = new Set(trainRows.flatMap((row) => row.text.split(" ")));
+  const expected = (label: string, tokens: string[]) => {
+    const rows = trainRows.filter((row) => row.label === label);
+    const labelTokens = rows.flatMap((row) => row.text.split(" "));
+    let score = Math.log((rows.length + 0.5) / (trainRows.length + 0.5 * 2));
+    for (const token of tokens) {
+      if (!vocab.has(token)) continue;
+      const count = labelTokens.filter((tok) => tok === token).length;
+      score += Math.log((count + 0.5) / (labelTokens.length + 0.5 * vocab.size));
+    }
+    return score;
+  };
+  const last = batch[batch.length - 1]!;
+  for (const row of last) expect(row.logProb).toBeCloseTo(expected(row.label, ["bad", "bad", "unknown", "happy"]), 9);
+});
+
+test("naive bayes incremental training matches training from scratch", () => {
+  const extraRows: NaiveBayesExample[] = [
+    { label: "neu", text: "product arrived today" },
+    { label: "pos", text: "happy happy joy brand new words" },
+    { label: "neg", text: "broken broken today" },
+  ];
+  const probes = ["happy product today", "broken new words", "joy", ""];
+  const incremental = trainNaiveBayesTextClassifier(trainRows.slice(0, 2), { smoothing: 0.8 });
+  incremental.predictBatch(probes);
+  incremental.train(trainRows.slice(2));
+  incremental.predict("bad");
+  for (const row of extraRows) {
+    incremental.train([row]);
+    incremental.predictBatch(probes);
+  }
+  const fresh = trainNaiveBayesTextClassifier([...trainRows, ...extraRows], { smoothing: 0.8 });
+  expect(incremental.labels()).toEqual(fresh.labels());
+  const got = incremental.predictBatch(probes);
+  const want = fresh.predictBatch(probes);
+  for (let i = 0; i < probes.length; i += 1) {
+    expect(got[i]!.map((row) => row.label)).toEqual(want[i]!.map((row) => row.label));
+    for (let j = 0; j < want[i]!.length; j += 1) expect(got[i]![j]!.logProb).toBeCloseTo(want[i]![j]!.logProb, 9);
+  }
+});
+
 test("naive bayes classifier serializes and reloads", () => {
   const clf = trainNaiveBayesTextClassifier(trainRows, { smoothing: 0.7 });
   const serialized = clf.toJSON();
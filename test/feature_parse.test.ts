@@ -109,3 +109,39 @@ test("feature earley parity with python nltk feature earley parser", () => {
   expect(py.trees[0] ?? "").toContain("dog");
   expect(py.trees[0] ?? "").toContain("runs");
 });
+
+test("feature chart parser handles left-recursive productions", () => {
+  const grammar = parseFeatureCfgGrammar(`
+S -> NP[num=?n] VP[num=?n]
+NP[num=?n] -> NP[num=?n] PP | N[num=?n]
+PP -> P 'home'
+N[num=sg] -> 'dog'
+N[num=pl] -> 'dogs'
+P -> 'at'
+VP[num=sg] -> 'runs'
+VP[num=pl] -> 'run'
+`);
+  const trees = featureChartParse("dogs at home at home run".split(" "), grammar);
+  expect(trees.map(toBracket)).toEqual([
+    "(S (NP[num=pl] (NP[num=pl] (NP[num=pl] (N[num=pl] dogs)) (PP (P at) home)) (PP (P at) home)) (VP[num=pl] run))",
+  ]);
+  expect(featureChartParse("dogs at home runs".split(" "), grammar)).toEqual([]);
+});
+
+test("feature chart parser shares sub-derivations on ambiguous input", () => {
+  const grammar = parseFeatureCfgGrammar(`
+S -> NP VP
+NP -> NP PP | 'i' | Det N
+VP -> V NP | VP PP
+PP -> P NP
+Det -> 'the'
+N -> 'man' | 'park' | 'hill'
+V -> 'saw'
+P -> 'in' | 'on'
+`);
+  const tokens = "i saw the man in the park on the hill in the park on the hill".split(" ");
+  const trees = featureChartParse(tokens, grammar);
+  expect(trees.length).toBe(8);
+  expect(new Set(trees.map(toBracket)).size).toBe(8);
+  for (const tree of trees) expect(tree.label).toBe("S");
+});
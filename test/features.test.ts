@@ -1,5 +1,5 @@
 import { expect, test } from "bun:test";
-import { flattenSparseBatch, TextFeatureVectorizer } from "../index";
+import { flattenSparseBatch, StreamingVocabularyFitter, TextFeatureVectorizer } from "../index";
 
 test("text feature vectorizer builds vocabulary and transforms rows", () => {
   const vec = new TextFeatureVectorizer({ ngramMin: 1, ngramMax: 2, maxFeatures: 64 });
@@ -36,3 +36,120 @@ test("flattenSparseBatch packs offsets and feature payloads", () => {
   expect(flat.docOffsets[0]).toBe(0);
   expect(flat.docOffsets[flat.docOffsets.length - 1]).toBe(flat.featureIds.length);
 });
+
+test("transformBatch packs vocabulary rows like flattenSparseBatch(transformMany)", () => {
+  const vec = new TextFeatureVectorizer({ ngramMin: 1, ngramMax: 2, maxFeatures: 64 });
+  vec.fit(["fast good service", "slow bad support", "good support and fast updates"]);
+  const texts = ["good fast service", "", "bad bad support", "unknown words"];
+  const batch = vec.transformBatch(texts);
+  const flat = flattenSparseBatch(vec.transformMany(texts));
+  expect([...batch.docOffsets]).toEqual([...flat.docOffsets]);
+  expect([...batch.featureIds]).toEqual([...flat.featureIds]);
+  expect([...batch.featureValues]).toEqual([...flat.featureValues]);
+});
+
+test("hashing vectorizer matches between native and JS and needs no fit", () => {
+  const texts = ["Good good movie, GREAT cast!", "", "bad plot; bad acting", "café don't stop"];
+  for (const signedHash of [false, true]) {
+    for (const binary of [false, true]) {
+      const vec = new TextFeatureVectorizer({ ngramMin: 1, ngramMax: 3, hashDimension: 1 << 18, signedHash, binary });
+      expect(vec.fit(texts).vocabulary()).toEqual([]);
+      expect(vec.featureCount).toBe(1 << 18);
+      const native = vec.transformBatch(texts);
+      const js = vec.transformBatch(texts, { useNative: false });
+      expect([...native.docOffsets]).toEqual([...js.docOffsets]);
+      expect([...native.featureIds]).toEqual([...js.featureIds]);
+      expect([...native.featureValues]).toEqual([...js.featureValues]);
+      expect(native.docOffsets[2]).toBe(native.docOffsets[1]);
+      for (const value of native.featureValues) {
+        expect(value).not.toBe(0);
+        if (binary) expect(Math.abs(value)).toBe(1);
+        if (!signedHash) expect(value).toBeGreaterThan(0);
+      }
+    }
+  }
+});
+
+test("hashing vectorizer counts repeats, lowercases tokens and round-trips through JSON", () => {
+  const vec = new TextFeatureVectorizer({ ngramMin: 1, ngramMax: 1, hashDimension: 1 << 20 });
+  const row = vec.transform("Echo echo ECHO");
+  expect([...row.values]).toEqual([3]);
+  const loaded = TextFeatureVectorizer.fromJSON(vec.toJSON());
+  expect(loaded.hashDimension).toBe(1 << 20);
+  const again = loaded.transform("echo");
+  expect([...again.indices]).toEqual([...row.indices]);
+  expect(vec.transformMany(["echo", "Echo"]).map((r) => [...r.indices])).toEqual([[...row.indices], [...row.indices]]);
+});
+
+function zipfCorpus(docs: number): string[] {
+  // Word w_k appears with weight ~ 1/k, plus a unique rare token per document.
+  const out: string[] = [];
+  let seed = 7;
+  const next = () => {
+    seed = (seed * 1103515245 + 12345) % 2147483648;
+    return seed / 2147483648;
+  };
+  for (let d = 0; d < docs; d += 1) {
+    const words: string[] = [];
+    for (let i = 0; i < 12; i += 1) words.push(`w${Math.floor(Math.exp(next() * Math.log(400)))}`);
+    words.push(`rare${d}`);
+    out.push(words.join(" "));
+  }
+  return out;
+}
+
+test("partialFit over chunks matches fit when the budget is not exceeded", () => {
+  const texts = zipfCorpus(300);
+  const full = new TextFeatureVectorizer({ ngramMin: 1, ngramMax: 2, maxFeatures: 200 }).fit(texts);
+  const streamed = new TextFeatureVectorizer({ ngramMin: 1, ngramMax: 2, maxFeatures: 200 });
+  for (let i = 0; i < texts.length; i += 64) streamed.partialFit(texts.slice(i, i + 64));
+  expect(streamed.finalize().vocabulary()).toEqual(full.vocabulary());
+});
+
+test("streaming vocabulary fitter keeps heavy hitters under a small budget", () => {
+  const texts = zipfCorpus(2000);
+  const exact = new StreamingVocabularyFitter().partialFit(texts);
+  const bounded = new StreamingVocabularyFitter({ budget: 64 });
+  for (let i = 0; i < texts.length; i += 100) {
+    bounded.partialFit(texts.slice(i, i + 100));
+    expect(bounded.trackedFeatures).toBeLessThanOrEqual(128);
+  }
+  expect(bounded.documentCount).toBe(2000);
+  expect(bounded.errorBound).toBeGreaterThan(0);
+  // Misra-Gries undercounts by at most 26000 / 65 occurrences, below the top five counts.
+  const top = exact.finalize(5);
+  expect(bounded.finalize(64)).toEqual(expect.arrayContaining(top));
+});
+
+test("streaming fitters merge across shards and apply document-frequency thresholds", () => {
+  const texts = ["a b", "a c", "a b d", "a e", "b f"];
+  const single = new StreamingVocabularyFitter({ minDf: 2, maxDf: 0.7 }).partialFit(texts);
+  const left = new StreamingVocabularyFitter({ minDf: 2, maxDf: 0.7 }).partialFit(texts.slice(0, 2));
+  const right = new StreamingVocabularyFitter({ minDf: 2, maxDf: 0.7 }).partialFit(texts.slice(2));
+  const merged = StreamingVocabularyFitter.fromJSON(JSON.parse(JSON.stringify(left.toJSON()))).merge(right);
+  // "a" is in 4/5 documents (> 0.7); only "b" is in at least two.
+  expect(single.finalize(10)).toEqual(["b"]);
+  expect(merged.finalize(10)).toEqual(["b"]);
+  expect(merged.documentCount).toBe(5);
+
+  const shardA = new TextFeatureVectorizer({ maxFeatures: 64, minDf: 2 }).partialFit(texts.slice(0, 3));
+  const shardB = new TextFeatureVectorizer({ maxFeatures: 64, minDf: 2 }).partialFit(texts.slice(3));
+  expect(shardA.mergeFit(shardB).finalize().vocabulary()).toEqual(["a", "b"]);
+  expect(() => new StreamingVocabularyFitter({ ngramMax: 2 }).merge(left)).toThrow();
+  expect(() => new StreamingVocabularyFitter().partialFit(texts).merge(left)).toThrow();
+  expect(() => new StreamingVocabularyFitter({ minDf: 2 }).merge(left)).toThrow();
+  expect(() => new TextFeatureVectorizer({ hashDimension: 64 }).mergeFit(shardB)).toThrow();
+  expect(() => shardB.mergeFit(new TextFeatureVectorizer({ hashDimension: 64 }))).toThrow();
+});
+
+test("vectorizer JSON keeps streaming fit options", () => {
+  const texts = ["a b", "a c", "a b d", "a e", "b f"];
+  const vec = new TextFeatureVectorizer({ maxFeatures: 64, fitBudget: 32, minDf: 2, maxDf: 0.7 });
+  const restored = TextFeatureVectorizer.fromJSON(JSON.parse(JSON.stringify(vec.fit(texts).toJSON())));
+  expect(restored.fitBudget).toBe(32);
+  expect(restored.minDf).toBe(2);
+  expect(restored.maxDf).toBe(0.7);
+  expect(restored.vocabulary()).toEqual(["b"]);
+  expect(restored.fit(texts).vocabulary()).toEqual(vec.vocabulary());
+  expect(TextFeatureVectorizer.fromJSON(new TextFeatureVectorizer().toJSON()).minDf).toBeUndefined();
+});
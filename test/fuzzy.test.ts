@@ -0,0 +1,33 @@
+import { expect, test } from "bun:test";
+import { buildFuzzyIndex, editDistance, FreqDist, FuzzyIndex, loadWordNetMini } from "../index";
+
+test("fuzzy index lookup ranks by distance then frequency and matches brute force", () => {
+  const counts = new FreqDist(["dog", "dog", "dig", "dot", "cat", "doge", "god", "kitten", "sitting", "dóg"]);
+  const index = buildFuzzyIndex(counts, { maxDistance: 2 });
+  const hits = index.lookup("dgo", 2, 10);
+  expect(hits[0]).toEqual({ term: "dog", distance: 1, count: 2 });
+
+  for (const query of ["dgo", "kiten", "sittin", "dog", "dóg", "x"]) {
+    const expected = counts
+      .samples()
+      .map((term) => ({ term, distance: editDistance(query, term, { transpositions: true }) }))
+      .filter((row) => row.distance <= 2)
+      .map((row) => `${row.term}:${row.distance}`)
+      .sort();
+    const native = index.lookup(query, 2, 100).map((row) => `${row.term}:${row.distance}`);
+    const js = index.lookup(query, 2, 100, { useNative: false }).map((row) => `${row.term}:${row.distance}`);
+    expect([...native].sort()).toEqual(expected);
+    expect(js).toEqual(native);
+  }
+  expect(index.lookup("dgo", 0, 10)).toEqual([]);
+});
+
+test("fuzzy index serializes and builds from WordNet lemmas", () => {
+  const index = buildFuzzyIndex(loadWordNetMini(), { maxDistance: 2 });
+  expect(index.lookup("animl", 2, 1)[0]?.term).toBe("animal");
+
+  const restored = FuzzyIndex.fromBytes(index.toBytes());
+  expect(restored.size).toBe(index.size);
+  expect(restored.lookup("reserch_paper", 2, 3)).toEqual(index.lookup("reserch_paper", 2, 3));
+  expect(() => FuzzyIndex.fromBytes(new Uint8Array(8))).toThrow();
+});
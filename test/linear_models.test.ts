@@ -50,3 +50,57 @@ test("linear svm classifier serializes and reloads", () => {
   expect(loaded.classify("stable fast happy")).toBe(clf.classify("stable fast happy"));
   expect(loaded.classify("negative crash slow")).toBe(clf.classify("negative crash slow"));
 });
+
+test("sgd solver trains logistic and svm classifiers", () => {
+  const logistic = trainLogisticTextClassifier(trainRows, { solver: "sgd", epochs: 40, learningRate: 0.5, batchSize: 2, maxFeatures: 1024 });
+  expect(logistic.evaluate(testRows).accuracy).toBeGreaterThanOrEqual(0.75);
+  expect(logistic.classify("fast smooth upgrade")).toBe("pos");
+  expect(logistic.classify("broken crash error")).toBe("neg");
+
+  const svm = trainLinearSvmTextClassifier(trainRows, { solver: "sgd", epochs: 40, learningRate: 0.2, batchSize: 2, maxFeatures: 1024 });
+  expect(svm.evaluate(testRows).accuracy).toBeGreaterThanOrEqual(0.75);
+  expect(svm.classify("awful delay crash")).toBe("neg");
+
+  const loaded = loadLinearSvmTextClassifier(svm.toJSON());
+  expect(loaded.toJSON().options.solver).toBe("sgd");
+  expect(loaded.classify("stable fast happy")).toBe(svm.classify("stable fast happy"));
+});
+
+test("sgd solver native and js trainers agree for the same seed", () => {
+  const rows = [...trainRows, ...trainRows.map((x) => ({ label: x.label, text: `${x.text} again` }))];
+  for (const train of [trainLogisticTextClassifier, trainLinearSvmTextClassifier]) {
+    const options = { solver: "sgd" as const, epochs: 12, batchSize: 3, seed: 9, l2: 1e-2, validationFraction: 0.25, patience: 2 };
+    const native = train(rows, { ...options, useNativeScoring: true }).toJSON();
+    const js = train(rows, { ...options, useNativeScoring: false }).toJSON();
+    expect(js.weights.length).toBe(native.weights.length);
+    for (let i = 0; i < js.weights.length; i += 1) expect(js.weights[i]!).toBeCloseTo(native.weights[i]!, 9);
+    for (let i = 0; i < js.bias.length; i += 1) expect(js.bias[i]!).toBeCloseTo(native.bias[i]!, 9);
+  }
+});
+
+test("sgd solver keeps the initial weights when held-out loss never becomes finite", () => {
+  const rows = [...trainRows, ...trainRows.map((x) => ({ label: x.label, text: `${x.text} again` }))];
+  for (const useNativeScoring of [true, false]) {
+    const options = { solver: "sgd" as const, epochs: 5, batchSize: 2, learningRate: Infinity, validationFraction: 0.25, patience: 2 };
+    const payload = trainLogisticTextClassifier(rows, { ...options, useNativeScoring }).toJSON();
+    expect(payload.weights.every((w) => w === 0)).toBeTrue();
+    expect(payload.bias.every((b) => b === 0)).toBeTrue();
+  }
+});
+
+test("native and js prediction agree on the feature-major weights", () => {
+  const logistic = trainLogisticTextClassifier(trainRows, { epochs: 12, learningRate: 0.1, maxFeatures: 1024 });
+  const payload = logistic.toJSON();
+  const js = loadLogisticTextClassifier({ ...payload, options: { ...payload.options, useNativeScoring: false } });
+  for (const row of testRows) {
+    const native = logistic.predict(row.text);
+    const fallback = js.predict(row.text);
+    expect(fallback.map((x) => x.label)).toEqual(native.map((x) => x.label));
+    for (let i = 0; i < native.length; i += 1) expect(fallback[i]!.score).toBeCloseTo(native[i]!.score, 12);
+  }
+  expect(js.classifyBatch(testRows.map((x) => x.text))).toEqual(logistic.classifyBatch(testRows.map((x) => x.text)));
+
+  const svm = trainLinearSvmTextClassifier(trainRows, { epochs: 12, learningRate: 0.08, maxFeatures: 1024 });
+  expect(svm.predict("fast stable reliable")[0]!.label).toBe(svm.classify("fast stable reliable"));
+  expect(svm.classifyBatch(testRows.map((x) => x.text))).toEqual(testRows.map((x) => svm.classify(x.text)));
+});
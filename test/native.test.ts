@@ -21,10 +21,16 @@ import {
   everygramsAscii,
   everygramsAsciiNative,
   evaluateLanguageModelIdsNative,
+  chunkIobIdsBatchNative,
   chunkIobIdsNative,
   cykRecognizeIdsNative,
+  earleyRecognizeIdsNative,
   naiveBayesLogScoresIdsNative,
+  naiveBayesSparseLogScoresBatchNative,
   linearScoresSparseIdsNative,
+  linearScoresSparseIdsFeatureMajorNative,
+  linearTrainSgdSparseNative,
+  hashNgramFeaturesBatchAsciiNative,
   normalizeTokensAscii,
   normalizeTokensAsciiNative,
   ngramsAscii,
@@ -324,6 +330,29 @@ test("native chunk iob evaluator emits expected labels", () => {
   expect(out.begins[0]!).toBe(1);
 });
 
+test("native batch chunk iob evaluator keeps chunks inside sentences", () => {
+  const plan = {
+    atomAllowedOffsets: Uint32Array.from([0, 1]),
+    atomAllowedLengths: Uint32Array.from([1, 1]),
+    atomAllowedFlat: Uint16Array.from([1, 3]),
+    atomMins: Uint8Array.from([0, 1]),
+    atomMaxs: Uint8Array.from([1, 255]),
+    ruleAtomOffsets: Uint32Array.from([0]),
+    ruleAtomCounts: Uint32Array.from([2]),
+    ruleLabelIds: Uint16Array.from([0]),
+  };
+  const out = chunkIobIdsBatchNative({
+    tokenTagIds: Uint16Array.from([1, 3, 3, 2, 3]),
+    sentenceOffsets: Uint32Array.from([0, 2, 2, 5]),
+    ...plan,
+  });
+  expect(Array.from(out.labelIds)).toEqual([0, 0, 0, 0xffff, 0]);
+  expect(Array.from(out.begins)).toEqual([1, 0, 1, 0, 1]);
+  expect(() =>
+    chunkIobIdsBatchNative({ tokenTagIds: Uint16Array.from([3, 3]), sentenceOffsets: Uint32Array.from([0, 1]), ...plan }),
+  ).toThrow();
+});
+
 test("native cyk recognizer handles simple grammar ids", () => {
   const tokenBits = new BigUint64Array([
     1n << 4n, // Name
@@ -342,6 +371,45 @@ test("native cyk recognizer handles simple grammar ids", () => {
   expect(out).toBeTrue();
 });
 
+test("native earley recognizer handles integer dotted rules", () => {
+  // Nonterminals: 0=S, 1=NP, 2=VP; terminals: 3='alice', 4='sees'.
+  // Rules: S -> NP VP (items 0..2), NP -> 'alice' (3..4), VP -> 'sees' NP (5..7).
+  const done = 0xffffffff;
+  const grammar = {
+    nonterminalCount: 3,
+    itemNext: Uint32Array.from([1, 2, done, 3, done, 4, 1, done]),
+    itemLhs: Uint32Array.from([0, 0, 0, 1, 1, 2, 2, 2]),
+    predictOffsets: Uint32Array.from([0, 2, 3, 4]),
+    predictItems: Uint32Array.from([0, 3, 3, 5]),
+  };
+  expect(earleyRecognizeIdsNative({ tokenSymbols: Uint32Array.from([3, 4, 3]), grammar, startSymbol: 0 })).toBeTrue();
+  expect(earleyRecognizeIdsNative({ tokenSymbols: Uint32Array.from([3, 4]), grammar, startSymbol: 0 })).toBeFalse();
+  expect(earleyRecognizeIdsNative({ tokenSymbols: Uint32Array.from([4, 3]), grammar, startSymbol: 2 })).toBeTrue();
+});
+
+test("native cyk recognizer handles multi-word symbol bitsets", () => {
+  // Symbols: 0=S, 70=NP, 130=VP, 131=V, 140=Name; three u64 words per token.
+  const bit = (id: number) => {
+    const words = new BigUint64Array(3);
+    words[id >>> 6] = 1n << BigInt(id & 63);
+    return words;
+  };
+  const tokenBits = new BigUint64Array(9);
+  tokenBits.set(bit(140), 0);
+  tokenBits.set(bit(131), 3);
+  tokenBits.set(bit(140), 6);
+  const grammar = {
+    binaryLeft: Uint16Array.from([70, 131]),
+    binaryRight: Uint16Array.from([130, 70]),
+    binaryParent: Uint16Array.from([0, 130]),
+    unaryChild: Uint16Array.from([140]),
+    unaryParent: Uint16Array.from([70]),
+    startSymbol: 0,
+  };
+  expect(cykRecognizeIdsNative({ tokenBits, wordsPerToken: 3, ...grammar })).toBeTrue();
+  expect(cykRecognizeIdsNative({ tokenBits: tokenBits.subarray(0, 6), wordsPerToken: 3, ...grammar })).toBeFalse();
+});
+
 test("native naive bayes log score hot loop prefers expected label", () => {
   const scores = naiveBayesLogScoresIdsNative({
     docTokenIds: Uint32Array.from([0, 2]), // good, fast
@@ -363,6 +431,52 @@ test("native naive bayes log score hot loop prefers expected label", () => {
   expect(scores[0]!).toBeGreaterThan(scores[1]!);
 });
 
+test("native sparse naive bayes batch scores match the dense kernel", () => {
+  const dense = {
+    vocabSize: 3,
+    tokenCountsMatrix: Uint32Array.from([10, 1, 8, 1, 10, 1]),
+    labelDocCounts: Uint32Array.from([5, 5]),
+    labelTokenTotals: Uint32Array.from([19, 12]),
+    totalDocs: 10,
+    smoothing: 1.0,
+  };
+  const scores = naiveBayesSparseLogScoresBatchNative({
+    docOffsets: Uint32Array.from([0, 2, 4, 4]),
+    docTokenIds: Uint32Array.from([0, 2, 1, 99]),
+    tokenStarts: Uint32Array.from([0, 2, 4]),
+    tokenLengths: Uint32Array.from([2, 2, 2]),
+    entryLabelIds: Uint32Array.from([0, 1, 0, 1, 0, 1]),
+    entryLogDeltas: Float64Array.from([10, 1, 1, 10, 8, 1].map((count) => Math.log(count + 1))),
+    labelPriorLogs: Float64Array.from([Math.log(6 / 12), Math.log(6 / 12)]),
+    labelDefaultLogs: Float64Array.from([Math.log(1 / 22), Math.log(1 / 15)]),
+  });
+  expect(scores.length).toBe(6);
+  const first = naiveBayesLogScoresIdsNative({ ...dense, docTokenIds: Uint32Array.from([0, 2]) });
+  const second = naiveBayesLogScoresIdsNative({ ...dense, docTokenIds: Uint32Array.from([1]) });
+  expect(scores[0]!).toBeCloseTo(first[0]!, 9);
+  expect(scores[1]!).toBeCloseTo(first[1]!, 9);
+  expect(scores[2]!).toBeCloseTo(second[0]!, 9);
+  expect(scores[3]!).toBeCloseTo(second[1]!, 9);
+  expect(scores[4]!).toBeCloseTo(Math.log(6 / 12), 12);
+  expect(scores[0]!).toBeGreaterThan(scores[1]!);
+});
+
+test("native hashed n-gram features write one sorted CSR row per document", () => {
+  const bytes = new TextEncoder().encode("Good good movie|bad");
+  const out = hashNgramFeaturesBatchAsciiNative({
+    bytes,
+    docOffsets: Uint32Array.from([0, 15, 15, 19]),
+    ngramMin: 1,
+    ngramMax: 2,
+    dimension: 1 << 20,
+  });
+  // good x2, movie, good|good, good|movie; then an empty document; then bad.
+  expect([...out.docOffsets]).toEqual([0, 4, 4, 5]);
+  expect([...out.featureValues].reduce((sum, value) => sum + value, 0)).toBe(6);
+  for (let i = 1; i < 4; i += 1) expect(out.featureIds[i]!).toBeGreaterThan(out.featureIds[i - 1]!);
+  expect(out.featureValues[4]).toBe(1);
+});
+
 test("native sparse linear scorer returns expected logits", () => {
   const out = linearScoresSparseIdsNative({
     docOffsets: Uint32Array.from([0, 2, 3]),
@@ -383,6 +497,59 @@ test("native sparse linear scorer returns expected logits", () => {
   expect(out[3]!).toBeCloseTo(5.5, 12);
 });
 
+test("native feature-major linear scorer matches the class-major layout", () => {
+  const classCount = 130;
+  const featureCount = 17;
+  const docOffsets = Uint32Array.from([0, 4, 4, 9]);
+  const featureIds = Uint32Array.from([3, 16, 0, 40, 5, 5, 12, 1, 9]);
+  const featureValues = Float64Array.from([1, 0.5, -2, 7, 1.25, 3, 0.75, -1, 2]);
+  const weights = Float64Array.from({ length: classCount * featureCount }, (_, i) => ((i * 37) % 101) / 50 - 1);
+  const transposed = new Float64Array(weights.length);
+  for (let c = 0; c < classCount; c += 1) {
+    for (let f = 0; f < featureCount; f += 1) transposed[f * classCount + c] = weights[c * featureCount + f]!;
+  }
+  const bias = Float64Array.from({ length: classCount }, (_, c) => c / 10);
+  const expected = linearScoresSparseIdsNative({ docOffsets, featureIds, featureValues, classCount, featureCount, weights, bias });
+  const out = linearScoresSparseIdsFeatureMajorNative({ docOffsets, featureIds, featureValues, classCount, featureCount, weights: transposed, bias });
+  expect(out.length).toBe(3 * classCount);
+  for (let i = 0; i < out.length; i += 1) expect(out[i]!).toBeCloseTo(expected[i]!, 12);
+});
+
+test("native sparse sgd trainer separates classes and stops early", () => {
+  // Label 0 documents use features 0..1, label 1 documents use features 2..3.
+  const docOffsets = Uint32Array.from({ length: 41 }, (_, d) => d * 2);
+  const featureIds = Uint32Array.from({ length: 80 }, (_, i) => (Math.floor(i / 2) % 2) * 2 + (i % 2));
+  const featureValues = new Float64Array(80).fill(1);
+  const labels = Uint32Array.from({ length: 40 }, (_, d) => d % 2);
+  const weights = new Float64Array(8);
+  const bias = new Float64Array(2);
+  const epochs = linearTrainSgdSparseNative({
+    docOffsets,
+    featureIds,
+    featureValues,
+    labels,
+    classCount: 2,
+    featureCount: 4,
+    weights,
+    bias,
+    loss: "hinge",
+    epochs: 200,
+    batchSize: 4,
+    learningRate: 0.2,
+    l2: 0,
+    seed: 42,
+    validationCount: 8,
+    patience: 2,
+  });
+  expect(epochs).toBeLessThan(200);
+
+  const scores = linearScoresSparseIdsNative({ docOffsets, featureIds, featureValues, classCount: 2, featureCount: 4, weights, bias });
+  for (let d = 0; d < 40; d += 1) {
+    expect(scores[d * 2 + 1]! > scores[d * 2]! ? 1 : 0).toBe(labels[d]!);
+  }
+  expect(() => linearTrainSgdSparseNative({ docOffsets, featureIds, featureValues, labels: labels.subarray(1), classCount: 2, featureCount: 4, weights, bias, loss: "hinge", epochs: 1, batchSize: 4, learningRate: 0.1, l2: 0 })).toThrow();
+});
+
 test("native streaming freqdist builder matches reference counts and json export", () => {
   const text = "This this is a test. This runs quickly.";
   const stream = new NativeFreqDistStream();
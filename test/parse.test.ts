@@ -2,15 +2,21 @@ import { expect, test } from "bun:test";
 import { resolve } from "node:path";
 import {
   chartParse,
+  chartParseBatch,
+  chartParseForest,
+  compileCfg,
   earleyParse,
+  earleyParseBatch,
   earleyRecognize,
   leftCornerParse,
+  leftCornerParseBatch,
   parseCfgGrammar,
   parseTextWithCfg,
   parseTextWithEarley,
   parseTextWithLeftCorner,
   parseTextWithRecursiveDescent,
   recursiveDescentParse,
+  recursiveDescentParseBatch,
   type ParseTree,
 } from "../index";
 
@@ -70,12 +76,105 @@ test("chart parser parity with python nltk CFG chart parser", () => {
   expect(jsTrees[0]).toBe(py.trees[0]);
 });
 
+test("compiled grammar batch parsing matches per-sentence chart and earley parses", () => {
+  const grammar = parseCfgGrammar(grammarText);
+  const compiled = compileCfg(grammar);
+  expect(compileCfg(grammar)).toBe(compiled);
+  expect(compileCfg(compiled)).toBe(compiled);
+
+  const sentences = [
+    ["alice", "sees", "the", "dog"],
+    ["the", "cat", "likes", "alice"],
+    ["alice", "sees"],
+    ["a", "dog", "sees", "the", "cat"],
+    [],
+  ];
+  expect(chartParseBatch(sentences, compiled)).toEqual(sentences.map((tokens) => chartParse(tokens, grammar)));
+  expect(earleyParseBatch(sentences, grammar)).toEqual(sentences.map((tokens) => earleyParse(tokens, grammar)));
+});
+
+test("chart parser handles grammars with more than 63 nonterminals", () => {
+  const chain = Array.from({ length: 80 }, (_, i) => `X${i} -> X${i + 1}`).join("\n");
+  const grammar = parseCfgGrammar(`${grammarText}\nNP -> X0\n${chain}\nX80 -> 'bob'`);
+  const trees = chartParse(["bob", "sees", "the", "dog"], grammar);
+  expect(trees.length).toBe(1);
+  expect(toBracket(trees[0]!)).toContain("(S (NP (X0 (X1");
+  expect(chartParse(["bob", "sees"], grammar)).toEqual([]);
+  expect(chartParse(["the", "dog", "sees", "bob"], grammar).length).toBe(1);
+});
+
+test("chart parse forest packs ambiguous attachments into shared nodes", () => {
+  const grammar = parseCfgGrammar(`
+S -> NP VP
+NP -> Det N | NP PP | 'i'
+VP -> V NP | VP PP
+PP -> P NP
+Det -> 'the'
+N -> 'man' | 'park' | 'hill' | 'telescope'
+V -> 'saw'
+P -> 'in' | 'on' | 'with'
+`);
+  const tokens = "i saw the man in the park on the hill with the telescope".split(" ");
+  const forest = chartParseForest(tokens, grammar)!;
+  expect(forest).not.toBeNull();
+  expect(forest.nodeCount).toBe(37);
+  const root = forest.node(forest.root);
+  expect(root.label).toBe("S");
+  expect([root.start, root.end]).toEqual([0, tokens.length]);
+
+  const trees = forest.trees(50);
+  expect(trees.length).toBe(14);
+  expect(new Set(trees.map(toBracket)).size).toBe(trees.length);
+  expect(chartParse(tokens, grammar, { maxTrees: 5 }).length).toBe(5);
+  expect(chartParseForest(["saw", "i"], grammar)).toBeNull();
+});
+
+test("chart parser terminates on unary cycles", () => {
+  const grammar = parseCfgGrammar(`
+S -> A
+A -> B | 'x'
+B -> A
+`);
+  const trees = chartParse(["x"], grammar);
+  expect(trees.map(toBracket)).toEqual(["(S (A x))"]);
+});
+
 test("earley recognizer accepts valid tokens and rejects invalid tokens", () => {
   const grammar = parseCfgGrammar(grammarText);
   expect(earleyRecognize(["alice", "sees", "the", "dog"], grammar)).toBeTrue();
   expect(earleyRecognize(["alice", "the", "sees", "dog"], grammar)).toBeFalse();
 });
 
+test("native and JS earley engines agree on left-recursive grammars", () => {
+  const grammar = parseCfgGrammar(`
+S -> NP VP | S Conj S
+NP -> Det N | NP PP | 'i'
+VP -> V NP | VP PP | V
+PP -> P NP
+Conj -> 'and'
+Det -> 'the' | 'a'
+N -> 'man' | 'park' | 'dog'
+V -> 'saw' | 'ran'
+P -> 'in' | 'with'
+`);
+  const cases = [
+    "i saw the man in the park",
+    "i ran and the dog saw a man with the dog",
+    "i saw the",
+    "the man in the park ran",
+    "saw i",
+    "i saw the cat",
+  ].map((row) => row.split(" "));
+  for (const tokens of cases) {
+    const expected = chartParse(tokens, grammar).length > 0;
+    expect(earleyRecognize(tokens, grammar)).toBe(expected);
+    expect(earleyRecognize(tokens, grammar, { useNative: false })).toBe(expected);
+  }
+  expect(earleyRecognize(["i", "ran"], grammar, { startSymbol: "VP" })).toBeFalse();
+  expect(earleyRecognize(["saw", "i"], grammar, { startSymbol: "VP" })).toBeTrue();
+  expect(earleyRecognize(["i"], grammar, { startSymbol: "Missing" })).toBeFalse();
+});
+
 test("earley parse returns same top parse as chart parser on simple grammar", () => {
   const grammar = parseCfgGrammar(grammarText);
   const chart = chartParse(["alice", "sees", "the", "dog"], grammar);
@@ -126,6 +225,33 @@ test("left-corner parser parity with chart parser top tree", () => {
   expect(toBracket(left[0]!)).toBe(toBracket(chart[0]!));
 });
 
+test("top-down batch parsing matches per-sentence parsing across sentence lengths", () => {
+  const compiled = compileCfg(parseCfgGrammar(grammarText));
+  const sentences = [
+    ["alice", "sees", "the", "dog"],
+    ["alice", "sees"],
+    ["the", "cat", "likes", "alice"],
+    ["alice", "sees", "bob"],
+    ["alice", "likes", "a", "cat"],
+  ];
+  const left = leftCornerParseBatch(sentences, compiled);
+  const recursive = recursiveDescentParseBatch(sentences, compiled);
+  expect(left).toEqual(sentences.map((tokens) => leftCornerParse(tokens, compiled)));
+  expect(recursive).toEqual(sentences.map((tokens) => recursiveDescentParse(tokens, compiled)));
+  expect(left.map((trees) => trees.length)).toEqual([1, 0, 1, 0, 1]);
+  expect(toBracket(recursive[2]![0]!)).toBe("(S (NP (Det the) (N cat)) (VP (V likes) (NP (Name alice))))");
+});
+
+test("top-down parsers drop duplicate productions instead of duplicate trees", () => {
+  const grammar = parseCfgGrammar(`
+S -> NP VP | NP VP
+NP -> 'alice' | 'alice'
+VP -> 'runs'
+`);
+  expect(leftCornerParse(["alice", "runs"], grammar).map(toBracket)).toEqual(["(S (NP alice) (VP runs))"]);
+  expect(recursiveDescentParse(["alice", "runs"], grammar).map(toBracket)).toEqual(["(S (NP alice) (VP runs))"]);
+});
+
 test("parseTextWithLeftCorner tokenizes and parses text", () => {
   const trees = parseTextWithLeftCorner("Alice sees a cat.", grammarText);
   expect(trees.length).toBeGreaterThan(0);
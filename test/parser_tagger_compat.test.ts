@@ -62,6 +62,14 @@ test("Chart-family parser wrappers match existing parser functions", () => {
   expect(new RecursiveDescentParser(grammar).parse(tokens)).toEqual(recursiveDescentParse(tokens, grammar));
   expect(new LeftCornerChartParser(grammar).parse(tokens)).toEqual(leftCornerParse(tokens, grammar));
   expect(new ChartParser(grammar).parseOne(tokens)).toEqual(chartParse(tokens, grammar)[0]!);
+
+  const sentences = [tokens, ["mary", "likes", "john"], ["likes", "mary"]];
+  expect(new ChartParser(grammar).parseBatch(sentences)).toEqual(sentences.map((row) => chartParse(row, grammar)));
+  expect(new EarleyChartParser(grammar).parseBatch(sentences)).toEqual(sentences.map((row) => earleyParse(row, grammar)));
+  expect(new RecursiveDescentParser(grammar).parseBatch(sentences)).toEqual(
+    sentences.map((row) => recursiveDescentParse(row, grammar)),
+  );
+  expect(new LeftCornerChartParser(grammar).parseBatch(sentences)).toEqual(sentences.map((row) => leftCornerParse(row, grammar)));
 });
 
 test("ViterbiParser wrapper matches probabilistic chart parser", () => {
@@ -69,6 +77,7 @@ test("ViterbiParser wrapper matches probabilistic chart parser", () => {
   const grammar = parsePcfgGrammar(PCFG_TEXT);
   const wrapper = new ViterbiParser(grammar);
   expect(wrapper.parseOne(tokens)).toEqual(probabilisticChartParse(tokens, grammar));
+  expect(wrapper.parseBatch([tokens, ["likes", "john"]])).toEqual([wrapper.parse(tokens), []]);
 });
 
 test("Feature parser wrappers match existing feature parser functions", () => {
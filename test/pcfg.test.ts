@@ -1,6 +1,6 @@
 import { expect, test } from "bun:test";
 import { resolve } from "node:path";
-import { parsePcfgGrammar, probabilisticChartParse, type ParseTree } from "../index";
+import { parsePcfgGrammar, probabilisticChartParse, probabilisticChartParseBatch, type ParseTree } from "../index";
 
 const grammarText = `
 S -> NP VP [1.0]
@@ -46,3 +46,46 @@ test("pcfg parser parity with python nltk viterbi parser", () => {
   expect(Math.abs(js!.prob - py.prob)).toBeLessThanOrEqual(1e-6);
 });
 
+
+test("native viterbi pcfg parser matches the JS chart", () => {
+  const ambiguous = parsePcfgGrammar(`
+S -> NP VP [0.9] | VP [0.1]
+NP -> Det N [0.4] | NP PP [0.2] | 'i' [0.2] | N [0.2]
+VP -> V NP [0.5] | VP PP [0.3] | V NP PP [0.2]
+PP -> P NP [1.0]
+Det -> 'the' [0.6] | 'a' [0.4]
+N -> 'man' [0.4] | 'telescope' [0.3] | 'park' [0.3]
+V -> 'saw' [1.0]
+P -> 'with' [0.6] | 'in' [0.4]
+`);
+  const cases = [
+    ["i", "saw", "the", "man", "with", "a", "telescope"],
+    ["i", "saw", "the", "man", "in", "the", "park"],
+    ["saw", "man"],
+    ["the", "man", "saw"],
+    ["i", "saw", "unknown"],
+  ];
+  for (const grammar of [parsePcfgGrammar(grammarText), ambiguous]) {
+    for (const tokens of [...cases, ["alice", "sees", "the", "dog"]]) {
+      const native = probabilisticChartParse(tokens, grammar);
+      const js = probabilisticChartParse(tokens, grammar, { useNative: false });
+      if (!js) {
+        expect(native).toBeNull();
+        continue;
+      }
+      expect(native).not.toBeNull();
+      expect(toBracket(native!.tree)).toBe(toBracket(js.tree));
+      expect(native!.logProb).toBeCloseTo(js.logProb, 10);
+    }
+  }
+});
+
+test("probabilisticChartParseBatch reuses chart buffers across sentences", () => {
+  const grammar = parsePcfgGrammar(grammarText);
+  const sentences = [["alice", "sees", "the", "dog"], ["alice"], ["the", "cat", "likes", "alice"]];
+  for (const useNative of [true, false]) {
+    expect(probabilisticChartParseBatch(sentences, grammar, { useNative })).toEqual(
+      sentences.map((tokens) => probabilisticChartParse(tokens, grammar, { useNative })),
+    );
+  }
+});
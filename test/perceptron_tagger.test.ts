@@ -1,7 +1,17 @@
 import { expect, test } from "bun:test";
-import { readFileSync } from "node:fs";
-import { resolve } from "node:path";
-import { loadPerceptronTaggerModel, posTagPerceptronAscii, WasmNltk } from "../index";
+import { mkdtempSync, readFileSync, rmSync, writeFileSync } from "node:fs";
+import { tmpdir } from "node:os";
+import { join, resolve } from "node:path";
+import {
+  loadPerceptronTaggerModel,
+  loadPerceptronTaggerModelPacked,
+  packPerceptronTaggerModel,
+  posTagBatch,
+  posTagPerceptronAscii,
+  quantizePerceptronTaggerModel,
+  trainPerceptronTagger,
+  WasmNltk,
+} from "../index";
 
 const fixture = JSON.parse(
   readFileSync(resolve(import.meta.dir, "fixtures", "pos_tagger_cases.json"), "utf8"),
@@ -37,6 +47,172 @@ test("perceptron model loads", () => {
   expect(model.weights.length).toBe(model.featureCount * model.tagCount);
 });
 
+test("default perceptron model is cached per process", () => {
+  expect(loadPerceptronTaggerModel()).toBe(loadPerceptronTaggerModel());
+});
+
+test("packed perceptron model round-trips and tags identically", () => {
+  const model = loadPerceptronTaggerModel(resolve(import.meta.dir, "..", "models", "perceptron_tagger_ascii.json"));
+  const packed = loadPerceptronTaggerModelPacked(packPerceptronTaggerModel(model));
+  expect(packed.tags).toEqual(model.tags);
+  expect(packed.featureCount).toBe(model.featureCount);
+  expect(packed.metadata).toEqual(model.metadata);
+  expect(Array.from(packed.weights)).toEqual(Array.from(model.weights));
+  expect(packed.featureId!("bias")).toBe(model.featureIndex.bias);
+  expect(packed.featureId!("w=not-a-feature")).toBeUndefined();
+  expect(packed.featureIndex).toEqual(model.featureIndex);
+  expect(packPerceptronTaggerModel(packed)).toEqual(packPerceptronTaggerModel(model));
+
+  const dir = mkdtempSync(join(tmpdir(), "bun-nltk-tagger-pack-"));
+  try {
+    const packedPath = join(dir, "tagger.bin");
+    writeFileSync(packedPath, packPerceptronTaggerModel(model));
+    const fromFile = loadPerceptronTaggerModel(packedPath);
+    for (const item of fixture.cases) {
+      const expected = posTagPerceptronAscii(item.input, { model, useNative: false });
+      expect(posTagPerceptronAscii(item.input, { model: fromFile, useNative: false })).toEqual(expected);
+      expect(posTagPerceptronAscii(item.input, { model: fromFile })).toEqual(expected);
+    }
+  } finally {
+    rmSync(dir, { recursive: true, force: true });
+  }
+});
+
+test("quantized perceptron weights agree with f32 and match across native/JS", () => {
+  const model = loadPerceptronTaggerModel();
+  expect(quantizePerceptronTaggerModel(model, "f32")).toBe(model);
+  expect(loadPerceptronTaggerModel(undefined, { precision: "int8" })).toBe(loadPerceptronTaggerModel(undefined, { precision: "int8" }));
+
+  for (const precision of ["f16", "int8"] as const) {
+    const quantized = quantizePerceptronTaggerModel(model, precision);
+    expect(quantized.quantized?.precision).toBe(precision);
+    expect(quantized.quantized!.values.byteLength).toBeLessThan(model.weights.byteLength);
+
+    let total = 0;
+    let same = 0;
+    for (const item of fixture.cases) {
+      const expected = posTagPerceptronAscii(item.input, { model });
+      const js = posTagPerceptronAscii(item.input, { model: quantized, useNative: false });
+      expect(posTagPerceptronAscii(item.input, { model: quantized })).toEqual(js);
+      for (let i = 0; i < expected.length; i += 1) {
+        total += 1;
+        if (expected[i]!.tag === js[i]!.tag) same += 1;
+      }
+    }
+    expect(same / Math.max(1, total)).toBeGreaterThanOrEqual(0.95);
+  }
+});
+
+test("quantized perceptron batch tagging scores quantized weights across native/JS/WASM", async () => {
+  const base = loadPerceptronTaggerModel();
+  const texts = [...fixture.cases.map((item) => item.input), "", "Bun 2026 ships"];
+  const packed = loadPerceptronTaggerModelPacked(packPerceptronTaggerModel(base));
+  const wasm = await WasmNltk.init();
+  try {
+    for (const source of [base, packed]) {
+      for (const precision of ["f16", "int8"] as const) {
+        const model = quantizePerceptronTaggerModel(source, precision);
+        let dequantized = false;
+        const probe = Object.create(model, {
+          weights: {
+            get() {
+              dequantized = true;
+              return model.weights;
+            },
+          },
+        }) as typeof model;
+
+        const rows = (batch: ReturnType<typeof posTagBatch>) => ({
+          docOffsets: Array.from(batch.docOffsets),
+          tokenStarts: Array.from(batch.tokenStarts),
+          tokenLengths: Array.from(batch.tokenLengths),
+          tagIds: Array.from(batch.tagIds),
+        });
+        const expected = rows(posTagBatch(texts, { model: probe, useNative: false }));
+        expect(rows(posTagBatch(texts, { model: probe }))).toEqual(expected);
+        expect(rows(posTagBatch(texts, { model: probe, wasm, useWasm: true }))).toEqual(expected);
+        for (const item of fixture.cases) {
+          expect(posTagPerceptronAscii(item.input, { model: probe, wasm, useWasm: true })).toEqual(
+            posTagPerceptronAscii(item.input, { model: probe, useNative: false }),
+          );
+        }
+        expect(dequantized).toBe(false);
+      }
+    }
+  } finally {
+    wasm.dispose();
+  }
+});
+
+test("trainPerceptronTagger is deterministic and matches native/JS", () => {
+  const sentences: Array<Array<[string, string]>> = [];
+  const nouns = ["model", "parser", "token", "signal"];
+  const verbs = ["ran", "tested", "shipped", "built"];
+  for (let i = 0; i < 40; i += 1) {
+    sentences.push([
+      ["The", "DT"],
+      [nouns[i % nouns.length]!, "NN"],
+      [verbs[(i * 3) % verbs.length]!, "VBD"],
+      ["in", "IN"],
+      [String(1990 + i), "CD"],
+    ]);
+  }
+
+  const native = trainPerceptronTagger(sentences, { epochs: 4, seed: 7 });
+  const js = trainPerceptronTagger(sentences, { epochs: 4, seed: 7, useNative: false });
+  expect(native.tags).toEqual(["DT", "NN", "VBD", "IN", "CD"]);
+  expect(native.featureIndex).toEqual(js.featureIndex);
+  expect(Array.from(native.weights)).toEqual(Array.from(js.weights));
+  expect(Array.from(trainPerceptronTagger(sentences, { epochs: 4, seed: 7 }).weights)).toEqual(Array.from(native.weights));
+
+  const tagged = posTagPerceptronAscii("The parser built in 2001", { model: native }).map((row) => row.tag);
+  expect(tagged).toEqual(["DT", "NN", "VBD", "IN", "CD"]);
+});
+
+test("posTagBatch matches per-document tagging across native/JS/WASM", async () => {
+  const model = loadPerceptronTaggerModel();
+  const texts = [...fixture.cases.map((item) => item.input), "", "   ", "Ünïcode — Bun 2026"];
+  const expected = texts.map((text) =>
+    posTagPerceptronAscii(text, { model, useNative: false }).map((row) => ({ tagId: row.tagId, length: row.length })),
+  );
+  const wasm = await WasmNltk.init();
+  try {
+    for (const options of [{ model }, { model, useNative: false }, { model, wasm, useWasm: true }]) {
+      const batch = posTagBatch(texts, options);
+      expect(batch.docOffsets.length).toBe(texts.length + 1);
+      expect(batch.tags).toEqual(model.tags);
+      const actual = texts.map((_, doc) => {
+        const rows: Array<{ tagId: number; length: number }> = [];
+        for (let i = batch.docOffsets[doc]!; i < batch.docOffsets[doc + 1]!; i += 1) {
+          rows.push({ tagId: batch.tagIds[i]!, length: batch.tokenLengths[i]! });
+        }
+        return rows;
+      });
+      expect(actual).toEqual(expected);
+    }
+  } finally {
+    wasm.dispose();
+  }
+});
+
+test("perceptron JSON model loads weights from an f32 sidecar", () => {
+  const jsonPath = resolve(import.meta.dir, "..", "models", "perceptron_tagger_ascii.json");
+  const model = loadPerceptronTaggerModel(jsonPath);
+  const payload = JSON.parse(readFileSync(jsonPath, "utf8"));
+  const dir = mkdtempSync(join(tmpdir(), "bun-nltk-tagger-sidecar-"));
+  try {
+    writeFileSync(join(dir, "tagger.f32"), new Uint8Array(Float32Array.from(model.weights).buffer));
+    writeFileSync(join(dir, "tagger.json"), JSON.stringify({ ...payload, weights: [], weights_file: "tagger.f32" }));
+    const sidecar = loadPerceptronTaggerModel(join(dir, "tagger.json"));
+    expect(Array.from(sidecar.weights)).toEqual(Array.from(model.weights));
+    expect(posTagPerceptronAscii(fixture.cases[0]!.input, { model: sidecar })).toEqual(
+      posTagPerceptronAscii(fixture.cases[0]!.input, { model }),
+    );
+  } finally {
+    rmSync(dir, { recursive: true, force: true });
+  }
+});
+
 test("perceptron Native/JS/WASM/Python parity on fixture cases", async () => {
   const model = loadPerceptronTaggerModel();
   const wasm = await WasmNltk.init();
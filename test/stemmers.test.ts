@@ -1,5 +1,5 @@
 import { expect, test } from "bun:test";
-import { LancasterStemmer, RegexpStemmer, SnowballStemmer, WordNetLemmatizer } from "../index";
+import { LancasterStemmer, loadWordNet, RegexpStemmer, SnowballStemmer, type WordNet, WordNetLemmatizer } from "../index";
 
 test("RegexpStemmer strips matching suffix", () => {
   const stemmer = new RegexpStemmer("ing$", 3);
@@ -25,3 +25,29 @@ test("WordNetLemmatizer uses morphy behavior", () => {
   expect(l.lemmatize("running", "v")).toBe("run");
 });
 
+
+test("WordNetLemmatizer.lemmatizeBatch matches per-token lemmatize natively and in JS", () => {
+  const tokens = ["Dogs", "running", "sprinted", "faster", "parties", "dogs", "cats", "", "naïve", "quickest"];
+  const tags = ["NNS", "VBG", "VBD", "JJR", "n", "NNS", "DT", "NN", "JJ", "a"];
+  const expected = tokens.map((token, i) => new WordNetLemmatizer({ cacheSize: 0 }).lemmatize(token, tags[i]));
+
+  const lemmatizer = new WordNetLemmatizer({ cacheSize: 4 });
+  expect(lemmatizer.lemmatizeBatch(tokens, tags)).toEqual(expected);
+  expect(lemmatizer.lemmatizeBatch(tokens, tags)).toEqual(expected);
+  expect(new WordNetLemmatizer().lemmatizeBatch(tokens, tags, { useNative: false })).toEqual(expected);
+  expect(lemmatizer.lemmatizeBatch(["dogs"])).toEqual(["dog"]);
+});
+
+test("WordNetLemmatizer.lemmatizeBatch falls back to JS morphy when the native lemma set fails", () => {
+  const wordnet = Object.create(loadWordNet(), {
+    lemmas: {
+      value() {
+        throw new Error("lemma listing unavailable");
+      },
+    },
+  }) as WordNet;
+  const tokens = ["Dogs", "running", "parties"];
+  const tags = ["NNS", "VBG", "n"];
+  const expected = tokens.map((token, i) => new WordNetLemmatizer({ cacheSize: 0 }).lemmatize(token, tags[i]));
+  expect(new WordNetLemmatizer({ wordnet }).lemmatizeBatch(tokens, tags)).toEqual(expected);
+});
@@ -1,7 +1,14 @@
 import { expect, test } from "bun:test";
 import { existsSync } from "node:fs";
 import { resolve } from "node:path";
-import { computeAsciiMetrics, normalizeTokensAsciiNative, tokenizeAsciiNative, WasmNltk } from "../index";
+import {
+  chunkIobIdsBatchNative,
+  computeAsciiMetrics,
+  hashNgramFeaturesBatchAsciiNative,
+  normalizeTokensAsciiNative,
+  tokenizeAsciiNative,
+  WasmNltk,
+} from "../index";
 
 function ensureWasmBuilt(): void {
   const wasmPath = resolve(import.meta.dir, "..", "native", "bun_nltk.wasm");
@@ -63,6 +70,22 @@ test("wasm wrapper metrics and token APIs match native", async () => {
     expect(chunkEval.labelIds[0]!).toBe(0);
     expect(chunkEval.labelIds[3]!).toBe(0);
 
+    const chunkBatchInput = {
+      tokenTagIds: Uint16Array.from([1, 2, 3, 3, 2, 3]),
+      sentenceOffsets: Uint32Array.from([0, 3, 6]),
+      atomAllowedOffsets: Uint32Array.from([0, 1, 2]),
+      atomAllowedLengths: Uint32Array.from([1, 1, 1]),
+      atomAllowedFlat: Uint16Array.from([1, 2, 3]),
+      atomMins: Uint8Array.from([0, 0, 1]),
+      atomMaxs: Uint8Array.from([1, 255, 255]),
+      ruleAtomOffsets: Uint32Array.from([0]),
+      ruleAtomCounts: Uint32Array.from([3]),
+      ruleLabelIds: Uint16Array.from([0]),
+    };
+    const chunkBatch = wasm.chunkIobIdsBatch(chunkBatchInput);
+    expect(chunkBatch).toEqual(chunkIobIdsBatchNative(chunkBatchInput));
+    expect(Array.from(chunkBatch.begins)).toEqual([1, 0, 0, 1, 1, 0]);
+
     const cyk = wasm.cykRecognizeIds({
       tokenBits: new BigUint64Array([1n << 4n, 1n << 3n, 1n << 4n]),
       binaryLeft: Uint16Array.from([1, 3]),
@@ -74,6 +97,22 @@ test("wasm wrapper metrics and token APIs match native", async () => {
     });
     expect(cyk).toBeTrue();
 
+    const wideTokenBits = new BigUint64Array(6);
+    wideTokenBits[1] = 1n << 6n; // Name = 70
+    wideTokenBits[3] = 1n << 3n; // V = 3
+    wideTokenBits[5] = 1n << 6n;
+    const wideCyk = wasm.cykRecognizeIds({
+      tokenBits: wideTokenBits,
+      wordsPerToken: 2,
+      binaryLeft: Uint16Array.from([1, 3]),
+      binaryRight: Uint16Array.from([2, 1]),
+      binaryParent: Uint16Array.from([0, 2]),
+      unaryChild: Uint16Array.from([70]),
+      unaryParent: Uint16Array.from([1]),
+      startSymbol: 0,
+    });
+    expect(wideCyk).toBeTrue();
+
     const nbScores = wasm.naiveBayesLogScoresIds({
       docTokenIds: Uint32Array.from([0, 2]),
       vocabSize: 3,
@@ -92,6 +131,44 @@ test("wasm wrapper metrics and token APIs match native", async () => {
     });
     expect(nbScores.length).toBe(2);
     expect(nbScores[0]!).toBeGreaterThan(nbScores[1]!);
+
+    const sparseScores = wasm.naiveBayesSparseLogScoresBatch({
+      docOffsets: Uint32Array.from([0, 2, 2]),
+      docTokenIds: Uint32Array.from([0, 2]),
+      tokenStarts: Uint32Array.from([0, 2, 4]),
+      tokenLengths: Uint32Array.from([2, 2, 2]),
+      entryLabelIds: Uint32Array.from([0, 1, 0, 1, 0, 1]),
+      entryLogDeltas: Float64Array.from([10, 1, 1, 10, 8, 1].map((count) => Math.log(count + 1))),
+      labelPriorLogs: Float64Array.from([Math.log(6 / 12), Math.log(6 / 12)]),
+      labelDefaultLogs: Float64Array.from([Math.log(1 / 22), Math.log(1 / 15)]),
+    });
+    expect(sparseScores.length).toBe(4);
+    expect(sparseScores[0]!).toBeCloseTo(nbScores[0]!, 9);
+    expect(sparseScores[1]!).toBeCloseTo(nbScores[1]!, 9);
+    expect(sparseScores[2]!).toBeCloseTo(Math.log(6 / 12), 12);
+  } finally {
+    wasm.dispose();
+  }
+});
+
+test("wasm hashed n-gram features match native", async () => {
+  ensureWasmBuilt();
+  const wasm = await WasmNltk.init();
+  try {
+    const bytes = new TextEncoder().encode("Good good movie|bad plot bad acting");
+    const input = {
+      bytes,
+      docOffsets: Uint32Array.from([0, 15, bytes.length]),
+      ngramMin: 1,
+      ngramMax: 2,
+      dimension: 1024,
+      signed: true,
+    };
+    const out = wasm.hashNgramFeaturesBatchAscii(input);
+    const native = hashNgramFeaturesBatchAsciiNative(input);
+    expect([...out.docOffsets]).toEqual([...native.docOffsets]);
+    expect([...out.featureIds]).toEqual([...native.featureIds]);
+    expect([...out.featureValues]).toEqual([...native.featureValues]);
   } finally {
     wasm.dispose();
   }
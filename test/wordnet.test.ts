@@ -1,8 +1,17 @@
 import { expect, test } from "bun:test";
-import { mkdtempSync, rmSync, writeFileSync } from "node:fs";
-import { join } from "node:path";
+import { mkdtempSync, readFileSync, rmSync, writeFileSync } from "node:fs";
+import { join, resolve } from "node:path";
 import { tmpdir } from "node:os";
-import { loadWordNet, loadWordNetExtended, loadWordNetMini, loadWordNetPacked } from "../index";
+import {
+  FreqDist,
+  loadWordNet,
+  loadWordNetExtended,
+  loadWordNetMini,
+  loadWordNetPacked,
+  packWordNetIndexed,
+  validateWordNetPack,
+  WordNet,
+} from "../index";
 
 test("wordnet mini returns noun synsets and relation links", () => {
   const wn = loadWordNetMini();
@@ -53,6 +62,60 @@ test("wordnet lowest common hypernyms returns nearest shared ancestor", () => {
   expect(lch).toEqual(["animal.n.01"]);
 });
 
+test("wordnet indexed hypernym queries match ancestor traversal and fill similarity matrices", () => {
+  const wn = loadWordNetMini();
+  const nouns = wn.allSynsets("n");
+  nouns.forEach((a) =>
+    nouns.forEach((b) => {
+      expect(wn.lowestCommonHypernymsIndexed(a, b).map((row) => row.id)).toEqual(wn.lowestCommonHypernyms(a, b).map((row) => row.id));
+      const distance = wn.hypernymDistance(a, b);
+      expect(distance === null).toBe(wn.lowestCommonHypernyms(a, b).length === 0);
+      if (distance !== null) expect(distance).toBeGreaterThanOrEqual(wn.shortestPathDistance(a, b)!);
+    }),
+  );
+  expect(wn.hasHypernymIndex()).toBe(true);
+
+  const matrix = wn.similarityMatrix(nouns, [...nouns, "missing.n.01"]);
+  expect(matrix.length).toBe(nouns.length * (nouns.length + 1));
+  expect(matrix[0]).toBe(1);
+  expect(matrix[nouns.length]).toBe(0);
+  expect(matrix[1]).toBeCloseTo(wn.hypernymPathSimilarity(nouns[0]!, nouns[1]!) ?? 0, 12);
+  expect(wn.minDepth("dog.n.01")).toBe(wn.minDepth("animal.n.01")! + 1);
+  expect(wn.maxDepth("missing.n.01")).toBeNull();
+});
+
+test("wordnet path queries do not change once the hypernym index is built", () => {
+  const wn = new WordNet(JSON.parse(readFileSync(resolve(import.meta.dir, "..", "models", "wordnet_mini.json"), "utf8")));
+  const nouns = wn.allSynsets("n");
+  const before = nouns.map((a) => nouns.map((b) => [wn.pathSimilarity(a, b), wn.lowestCommonHypernyms(a, b).map((row) => row.id)]));
+  expect(wn.hasHypernymIndex()).toBe(false);
+  wn.minDepth("dog.n.01");
+  expect(wn.hasHypernymIndex()).toBe(true);
+  const after = nouns.map((a) => nouns.map((b) => [wn.pathSimilarity(a, b), wn.lowestCommonHypernyms(a, b).map((row) => row.id)]));
+  expect(after).toEqual(before);
+});
+
+test("wordnet information-content similarities use propagated counts", () => {
+  const wn = loadWordNetMini();
+  const ic = wn.informationContent(new FreqDist(["dog", "dog", "cat", "animal"]));
+  const icOf = (id: string) => wn.informationContentOf(id, ic)!;
+  expect(icOf("dog.n.01")).toBeGreaterThan(icOf("animal.n.01"));
+  expect(icOf("entity.n.01")).toBeCloseTo(0, 12);
+
+  const res = wn.resSimilarity("dog.n.01", "cat.n.01", ic)!;
+  expect(res).toBeCloseTo(icOf("animal.n.01"), 12);
+  expect(wn.linSimilarity("dog.n.01", "cat.n.01", ic)).toBeCloseTo((2 * res) / (icOf("dog.n.01") + icOf("cat.n.01")), 12);
+  expect(wn.jcnSimilarity("dog.n.01", "cat.n.01", ic)).toBeCloseTo(1 / (icOf("dog.n.01") + icOf("cat.n.01") - 2 * res), 12);
+
+  const ids = ["dog.n.01", "cat.n.01", "animal.n.01"];
+  const matrix = wn.icSimilarityMatrix(ids, ids, ic, "lin");
+  ids.forEach((a, i) => ids.forEach((b, j) => expect(matrix[i * 3 + j]).toBeCloseTo(wn.linSimilarity(a, b, ic)!, 12)));
+
+  const fromCounts = wn.informationContentFromCounts("wnver::mini\nentity.n.01 10 ROOT\nanimal.n.01 5\ndog.n.01 2\n");
+  expect(wn.informationContentOf("animal.n.01", fromCounts)).toBeCloseTo(-Math.log(5 / 10), 12);
+  expect(wn.informationContentOf("cat.n.01", fromCounts)).toBe(Infinity);
+});
+
 test("wordnet extended exposes larger vocabulary", () => {
   const wn = loadWordNetExtended();
   expect(wn.synsets("computer", "n").map((row) => row.id)).toContain("computer.n.01");
@@ -100,3 +163,36 @@ test("wordnet packed loader parses packed binary payload", () => {
     rmSync(dir, { recursive: true, force: true });
   }
 });
+
+test("wordnet indexed pack decodes lazily and matches the JSON loader", () => {
+  const payload = JSON.parse(
+    readFileSync(resolve(import.meta.dir, "..", "models", "wordnet_extended.json"), "utf8"),
+  );
+  const json = loadWordNetExtended();
+  const bytes = packWordNetIndexed(payload);
+  expect(validateWordNetPack(bytes).synsetCount).toBe(payload.synsets.length);
+
+  const dir = mkdtempSync(join(tmpdir(), "bun-nltk-wordnet-indexed-"));
+  try {
+    const packedPath = join(dir, "wordnet.bin");
+    writeFileSync(packedPath, bytes);
+    const packed = loadWordNetPacked(packedPath);
+
+    expect(packed.allSynsets().map((row) => row.id)).toEqual(json.allSynsets().map((row) => row.id));
+    expect(packed.lemmas("v")).toEqual(json.lemmas("v"));
+    for (const row of json.allSynsets()) {
+      expect(packed.synset(row.id)).toEqual(row);
+      expect(packed.hypernyms(row.id).map((item) => item.id)).toEqual(json.hypernyms(row.id).map((item) => item.id));
+    }
+    for (const word of ["dogs", "computer", "optimized", "running", "quick"]) {
+      expect(packed.synsets(word).map((row) => row.id)).toEqual(json.synsets(word).map((row) => row.id));
+      expect(packed.morphy(word, "v")).toBe(json.morphy(word, "v"));
+      for (const key of json.senseKeys(word)) {
+        expect(packed.synsetFromSenseKey(key)?.id).toBe(json.synsetFromSenseKey(key)?.id);
+      }
+    }
+    expect(packed.synset("not-a-synset")).toBeNull();
+  } finally {
+    rmSync(dir, { recursive: true, force: true });
+  }
+});
@@ -1,76 +1,241 @@
 const std = @import("std");
 
 const UNCHUNKED_LABEL: u16 = std.math.maxInt(u16);
+const UNBOUNDED: u8 = std.math.maxInt(u8);
 
-fn tagAllowed(tag_id: u16, allowed: []const u16) bool {
-    for (allowed) |item| {
-        if (item == tag_id) return true;
+const Op = enum(u8) { char, split, jmp, match };
+
+/// One instruction of a rule's Thompson NFA. `char` consumes a token whose tag is
+/// allowed by `atom`; `split` prefers `x` over `y`, which gives the greedy quantifier
+/// order of a backtracking matcher.
+const Inst = struct {
+    op: Op,
+    atom: u32 = 0,
+    x: u32 = 0,
+    y: u32 = 0,
+};
+
+const Thread = struct {
+    pc: u32,
+    start: u32,
+};
+
+/// All chunk rules compiled to NFA programs, matched with a Pike VM: one left-to-right
+/// pass per rule keeps every live thread in priority order, so the result equals the
+/// first match a greedy backtracking matcher would find at the leftmost start, without
+/// re-scanning quantified runs from every position.
+pub const ChunkMatcher = struct {
+    insts: []Inst,
+    rule_pcs: []u32,
+    rule_label_ids: []const u16,
+    allowed_bits: []u64,
+    tag_words: usize,
+    clist: []Thread,
+    nlist: []Thread,
+    marks: []u32,
+    stack: []u32,
+    generation: u32 = 0,
+
+    pub fn init(
+        allocator: std.mem.Allocator,
+        max_tag_id: usize,
+        atom_allowed_offsets: []const u32,
+        atom_allowed_lengths: []const u32,
+        atom_allowed_flat: []const u16,
+        atom_mins: []const u8,
+        atom_maxs: []const u8,
+        rule_atom_offsets: []const u32,
+        rule_atom_counts: []const u32,
+        rule_label_ids: []const u16,
+    ) !ChunkMatcher {
+        const atom_count = atom_mins.len;
+        if (atom_allowed_offsets.len != atom_count or atom_allowed_lengths.len != atom_count or atom_maxs.len != atom_count) {
+            return error.InvalidN;
+        }
+        if (rule_atom_offsets.len != rule_atom_counts.len or rule_atom_offsets.len != rule_label_ids.len) return error.InvalidN;
+
+        const tag_words = max_tag_id / 64 + 1;
+        const allowed_bits = try allocator.alloc(u64, atom_count * tag_words);
+        errdefer allocator.free(allowed_bits);
+        @memset(allowed_bits, 0);
+        for (0..atom_count) |atom| {
+            const from = @as(usize, atom_allowed_offsets[atom]);
+            const len = @as(usize, atom_allowed_lengths[atom]);
+            if (from + len > atom_allowed_flat.len) return error.InvalidN;
+            for (atom_allowed_flat[from .. from + len]) |tag| {
+                if (tag > max_tag_id) continue;
+                allowed_bits[atom * tag_words + tag / 64] |= @as(u64, 1) << @as(u6, @intCast(tag % 64));
+            }
+        }
+
+        var insts = std.ArrayListUnmanaged(Inst).empty;
+        errdefer insts.deinit(allocator);
+        const rule_pcs = try allocator.alloc(u32, rule_atom_offsets.len);
+        errdefer allocator.free(rule_pcs);
+        for (rule_atom_offsets, rule_atom_counts, 0..) |offset, count, rule| {
+            if (@as(usize, offset) + count > atom_count) return error.InvalidN;
+            rule_pcs[rule] = @intCast(insts.items.len);
+            for (offset..offset + count) |a| {
+                const atom: u32 = @intCast(a);
+                const min = atom_mins[a];
+                const max = atom_maxs[a];
+                if (max != UNBOUNDED and max < min) return error.InvalidN;
+                for (0..min) |_| try insts.append(allocator, .{ .op = .char, .atom = atom });
+                if (max == UNBOUNDED) {
+                    const loop: u32 = @intCast(insts.items.len);
+                    try insts.append(allocator, .{ .op = .split, .x = loop + 1 });
+                    try insts.append(allocator, .{ .op = .char, .atom = atom });
+                    try insts.append(allocator, .{ .op = .jmp, .x = loop });
+                    insts.items[loop].y = @intCast(insts.items.len);
+                } else if (max > min) {
+                    for (min..max) |_| {
+                        const at: u32 = @intCast(insts.items.len);
+                        try insts.append(allocator, .{ .op = .split, .x = at + 1, .y = at + 2 });
+                        try insts.append(allocator, .{ .op = .char, .atom = atom });
+                    }
+                }
+            }
+            try insts.append(allocator, .{ .op = .match });
+        }
+
+        const program = try insts.toOwnedSlice(allocator);
+        errdefer allocator.free(program);
+        const clist = try allocator.alloc(Thread, program.len);
+        errdefer allocator.free(clist);
+        const nlist = try allocator.alloc(Thread, program.len);
+        errdefer allocator.free(nlist);
+        const marks = try allocator.alloc(u32, program.len);
+        errdefer allocator.free(marks);
+        @memset(marks, 0);
+        const stack = try allocator.alloc(u32, 2 * program.len + 1);
+
+        return .{
+            .insts = program,
+            .rule_pcs = rule_pcs,
+            .rule_label_ids = rule_label_ids,
+            .allowed_bits = allowed_bits,
+            .tag_words = tag_words,
+            .clist = clist,
+            .nlist = nlist,
+            .marks = marks,
+            .stack = stack,
+        };
     }
-    return false;
-}
 
-fn matchPatternRecursive(
-    token_tag_ids: []const u16,
-    token_labels: []const u16,
-    rule_atom_offset: usize,
-    rule_atom_count: usize,
-    atom_idx: usize,
-    token_idx: usize,
-    atom_allowed_offsets: []const u32,
-    atom_allowed_lengths: []const u32,
-    atom_allowed_flat: []const u16,
-    atom_mins: []const u8,
-    atom_maxs: []const u8,
-) ?usize {
-    if (atom_idx >= rule_atom_count) return token_idx;
+    pub fn deinit(self: *ChunkMatcher, allocator: std.mem.Allocator) void {
+        allocator.free(self.insts);
+        allocator.free(self.rule_pcs);
+        allocator.free(self.allowed_bits);
+        allocator.free(self.clist);
+        allocator.free(self.nlist);
+        allocator.free(self.marks);
+        allocator.free(self.stack);
+    }
 
-    const atom = rule_atom_offset + atom_idx;
-    if (atom >= atom_allowed_offsets.len or atom >= atom_allowed_lengths.len or atom >= atom_mins.len or atom >= atom_maxs.len) {
-        return null;
+    fn allowed(self: *const ChunkMatcher, atom: u32, tag: u16) bool {
+        const word = @as(usize, tag) / 64;
+        if (word >= self.tag_words) return false;
+        return (self.allowed_bits[@as(usize, atom) * self.tag_words + word] & (@as(u64, 1) << @as(u6, @intCast(tag % 64)))) != 0;
     }
 
-    const allowed_start = @as(usize, atom_allowed_offsets[atom]);
-    const allowed_len = @as(usize, atom_allowed_lengths[atom]);
-    if (allowed_start + allowed_len > atom_allowed_flat.len) return null;
-    const allowed = atom_allowed_flat[allowed_start .. allowed_start + allowed_len];
-
-    const min_repeat = @as(usize, atom_mins[atom]);
-    const max_raw = @as(usize, atom_maxs[atom]);
-    const unbounded = atom_maxs[atom] == std.math.maxInt(u8);
-    const max_limit = if (unbounded) token_tag_ids.len - token_idx else max_raw;
-
-    var max_repeat: usize = 0;
-    while (max_repeat < max_limit and token_idx + max_repeat < token_tag_ids.len) : (max_repeat += 1) {
-        const pos = token_idx + max_repeat;
-        if (token_labels[pos] != UNCHUNKED_LABEL) break;
-        if (!tagAllowed(token_tag_ids[pos], allowed)) break;
+    fn nextGeneration(self: *ChunkMatcher) u32 {
+        if (self.generation == std.math.maxInt(u32)) {
+            @memset(self.marks, 0);
+            self.generation = 0;
+        }
+        self.generation += 1;
+        return self.generation;
     }
 
-    if (max_repeat < min_repeat) return null;
-
-    var used = max_repeat;
-    while (true) {
-        if (used >= min_repeat) {
-            const end = matchPatternRecursive(
-                token_tag_ids,
-                token_labels,
-                rule_atom_offset,
-                rule_atom_count,
-                atom_idx + 1,
-                token_idx + used,
-                atom_allowed_offsets,
-                atom_allowed_lengths,
-                atom_allowed_flat,
-                atom_mins,
-                atom_maxs,
-            );
-            if (end != null) return end;
+    /// Follows split/jmp edges from `pc` depth-first, preferred branch first, appending
+    /// the reached char/match instructions to `list` in priority order.
+    fn addThread(self: *ChunkMatcher, list: []Thread, len: *usize, generation: u32, pc0: u32, start: u32) void {
+        var top: usize = 0;
+        self.stack[top] = pc0;
+        top += 1;
+        while (top > 0) {
+            top -= 1;
+            const pc = self.stack[top];
+            if (self.marks[pc] == generation) continue;
+            self.marks[pc] = generation;
+            const inst = self.insts[pc];
+            switch (inst.op) {
+                .jmp => {
+                    self.stack[top] = inst.x;
+                    top += 1;
+                },
+                .split => {
+                    self.stack[top] = inst.y;
+                    self.stack[top + 1] = inst.x;
+                    top += 2;
+                },
+                .char, .match => {
+                    list[len.*] = .{ .pc = pc, .start = start };
+                    len.* += 1;
+                },
+            }
         }
-        if (used == 0) break;
-        used -= 1;
-        if (used < min_repeat) break;
     }
-    return null;
+
+    /// Leftmost non-empty match of rule `rule` at or after `pos`, over tokens not yet chunked.
+    fn search(self: *ChunkMatcher, rule: usize, tags: []const u16, labels: []const u16, pos: usize) ?[2]usize {
+        const n = tags.len;
+        const entry = self.rule_pcs[rule];
+        var clen: usize = 0;
+        var cgen = self.nextGeneration();
+        var best: ?[2]usize = null;
+
+        var i = pos;
+        while (true) : (i += 1) {
+            if (best == null and i < n and labels[i] == UNCHUNKED_LABEL) {
+                self.addThread(self.clist, &clen, cgen, entry, @intCast(i));
+            }
+            if (clen == 0 and (best != null or i >= n)) break;
+
+            const ngen = self.nextGeneration();
+            var nlen: usize = 0;
+            const open = i < n and labels[i] == UNCHUNKED_LABEL;
+            for (self.clist[0..clen]) |thread| {
+                const inst = self.insts[thread.pc];
+                if (inst.op == .match) {
+                    if (i == thread.start) continue;
+                    // Lower-priority threads (later starts, shorter repeats) are cut.
+                    best = .{ thread.start, i };
+                    break;
+                }
+                if (open and self.allowed(inst.atom, tags[i])) {
+                    self.addThread(self.nlist, &nlen, ngen, thread.pc + 1, thread.start);
+                }
+            }
+            std.mem.swap([]Thread, &self.clist, &self.nlist);
+            clen = nlen;
+            cgen = ngen;
+            if (i >= n) break;
+        }
+        return best;
+    }
+
+    pub fn fill(self: *ChunkMatcher, tags: []const u16, out_label_ids: []u16, out_begins: []u8) void {
+        const labels = out_label_ids[0..tags.len];
+        @memset(labels, UNCHUNKED_LABEL);
+        @memset(out_begins[0..tags.len], 0);
+        for (self.rule_label_ids, 0..) |label_id, rule| {
+            var pos: usize = 0;
+            while (self.search(rule, tags, labels, pos)) |span| {
+                for (span[0]..span[1]) |j| {
+                    labels[j] = label_id;
+                    out_begins[j] = if (j == span[0]) 1 else 0;
+                }
+                pos = span[1];
+            }
+        }
+    }
+};
+
+fn maxTagId(token_tag_ids: []const u16) usize {
+    var max: usize = 0;
+    for (token_tag_ids) |tag| max = @max(max, tag);
+    return max;
 }
 
 pub fn fillChunkIobIds(
@@ -85,57 +250,71 @@ pub fn fillChunkIobIds(
     rule_label_ids: []const u16,
     out_label_ids: []u16,
     out_begins: []u8,
-) u64 {
+    allocator: std.mem.Allocator,
+) !u64 {
     const token_count = token_tag_ids.len;
-    if (out_label_ids.len < token_count or out_begins.len < token_count) return 0;
-    if (rule_atom_offsets.len != rule_atom_counts.len or rule_atom_offsets.len != rule_label_ids.len) return 0;
+    if (out_label_ids.len < token_count or out_begins.len < token_count) return error.InsufficientCapacity;
 
-    for (0..token_count) |i| {
-        out_label_ids[i] = UNCHUNKED_LABEL;
-        out_begins[i] = 0;
-    }
+    var matcher = try ChunkMatcher.init(
+        allocator,
+        maxTagId(token_tag_ids),
+        atom_allowed_offsets,
+        atom_allowed_lengths,
+        atom_allowed_flat,
+        atom_mins,
+        atom_maxs,
+        rule_atom_offsets,
+        rule_atom_counts,
+        rule_label_ids,
+    );
+    defer matcher.deinit(allocator);
+    matcher.fill(token_tag_ids, out_label_ids, out_begins);
+    return @intCast(token_count);
+}
 
-    var rule_idx: usize = 0;
-    while (rule_idx < rule_atom_offsets.len) : (rule_idx += 1) {
-        const atom_offset = @as(usize, rule_atom_offsets[rule_idx]);
-        const atom_count = @as(usize, rule_atom_counts[rule_idx]);
-        const label_id = rule_label_ids[rule_idx];
-
-        var i: usize = 0;
-        while (i < token_count) {
-            if (out_label_ids[i] != UNCHUNKED_LABEL) {
-                i += 1;
-                continue;
-            }
-            const end = matchPatternRecursive(
-                token_tag_ids,
-                out_label_ids[0..token_count],
-                atom_offset,
-                atom_count,
-                0,
-                i,
-                atom_allowed_offsets,
-                atom_allowed_lengths,
-                atom_allowed_flat,
-                atom_mins,
-                atom_maxs,
-            ) orelse {
-                i += 1;
-                continue;
-            };
-            if (end <= i) {
-                i += 1;
-                continue;
-            }
-            var j = i;
-            while (j < end) : (j += 1) {
-                out_label_ids[j] = label_id;
-                out_begins[j] = if (j == i) 1 else 0;
-            }
-            i = end;
-        }
+/// Chunks every sentence `sentence_offsets[s]..sentence_offsets[s + 1]` of one packed
+/// tag-ID array with a single compiled matcher; matches never cross a sentence boundary.
+pub fn fillChunkIobIdsBatch(
+    token_tag_ids: []const u16,
+    sentence_offsets: []const u32,
+    atom_allowed_offsets: []const u32,
+    atom_allowed_lengths: []const u32,
+    atom_allowed_flat: []const u16,
+    atom_mins: []const u8,
+    atom_maxs: []const u8,
+    rule_atom_offsets: []const u32,
+    rule_atom_counts: []const u32,
+    rule_label_ids: []const u16,
+    out_label_ids: []u16,
+    out_begins: []u8,
+    allocator: std.mem.Allocator,
+) !u64 {
+    const token_count = token_tag_ids.len;
+    if (sentence_offsets.len == 0 or sentence_offsets[0] != 0) return error.InvalidN;
+    if (sentence_offsets[sentence_offsets.len - 1] != token_count) return error.InvalidN;
+    for (1..sentence_offsets.len) |s| {
+        if (sentence_offsets[s] < sentence_offsets[s - 1]) return error.InvalidN;
     }
+    if (out_label_ids.len < token_count or out_begins.len < token_count) return error.InsufficientCapacity;
 
+    var matcher = try ChunkMatcher.init(
+        allocator,
+        maxTagId(token_tag_ids),
+        atom_allowed_offsets,
+        atom_allowed_lengths,
+        atom_allowed_flat,
+        atom_mins,
+        atom_maxs,
+        rule_atom_offsets,
+        rule_atom_counts,
+        rule_label_ids,
+    );
+    defer matcher.deinit(allocator);
+    for (1..sentence_offsets.len) |s| {
+        const start = @as(usize, sentence_offsets[s - 1]);
+        const end = @as(usize, sentence_offsets[s]);
+        matcher.fill(token_tag_ids[start..end], out_label_ids[start..end], out_begins[start..end]);
+    }
     return @intCast(token_count);
 }
 
@@ -158,7 +337,7 @@ test "chunk iob ids basic NP/VP pattern" {
 
     var out_labels = [_]u16{0} ** tags.len;
     var out_begins = [_]u8{0} ** tags.len;
-    const written = fillChunkIobIds(
+    const written = try fillChunkIobIds(
         &tags,
         &allowed_offsets,
         &allowed_lens,
@@ -170,6 +349,7 @@ test "chunk iob ids basic NP/VP pattern" {
         &rule_labels,
         &out_labels,
         &out_begins,
+        std.testing.allocator,
     );
     try std.testing.expectEqual(@as(u64, tags.len), written);
     try std.testing.expectEqual(@as(u16, 0), out_labels[0]);
@@ -178,3 +358,88 @@ test "chunk iob ids basic NP/VP pattern" {
     try std.testing.expectEqual(@as(u16, 1), out_labels[5]);
 }
 
+
+test "chunk iob ids batch keeps chunks inside sentences" {
+    // Tags: 1=DT, 3=NN. Rule NP: {<DT>?<NN>+}; two sentences "NN NN" and "NN".
+    const tags = [_]u16{ 3, 3, 3 };
+    const offsets = [_]u32{ 0, 2, 3 };
+    const allowed_offsets = [_]u32{ 0, 1 };
+    const allowed_lens = [_]u32{ 1, 1 };
+    const allowed_flat = [_]u16{ 1, 3 };
+    const mins = [_]u8{ 0, 1 };
+    const maxs = [_]u8{ 1, std.math.maxInt(u8) };
+    const rule_offsets = [_]u32{0};
+    const rule_counts = [_]u32{2};
+    const rule_labels = [_]u16{0};
+
+    var out_labels = [_]u16{0} ** tags.len;
+    var out_begins = [_]u8{0} ** tags.len;
+    const written = try fillChunkIobIdsBatch(
+        &tags,
+        &offsets,
+        &allowed_offsets,
+        &allowed_lens,
+        &allowed_flat,
+        &mins,
+        &maxs,
+        &rule_offsets,
+        &rule_counts,
+        &rule_labels,
+        &out_labels,
+        &out_begins,
+        std.testing.allocator,
+    );
+    try std.testing.expectEqual(@as(u64, tags.len), written);
+    try std.testing.expectEqualSlices(u16, &[_]u16{ 0, 0, 0 }, &out_labels);
+    try std.testing.expectEqualSlices(u8, &[_]u8{ 1, 0, 1 }, &out_begins);
+
+    const bad_offsets = [_]u32{ 0, 2 };
+    try std.testing.expectError(error.InvalidN, fillChunkIobIdsBatch(&tags, &bad_offsets, &allowed_offsets, &allowed_lens, &allowed_flat, &mins, &maxs, &rule_offsets, &rule_counts, &rule_labels, &out_labels, &out_begins, std.testing.allocator));
+}
+
+test "chunk automaton matches greedy backtracking order" {
+    // Tags: 1=A, 2=B, 3=C. Rule X: {<A|B>*<B><C>?}; greedy backtracking gives A B B | C.
+    const tags = [_]u16{ 1, 2, 2, 3, 1 };
+    const allowed_offsets = [_]u32{ 0, 2, 3 };
+    const allowed_lens = [_]u32{ 2, 1, 1 };
+    const allowed_flat = [_]u16{ 1, 2, 2, 3 };
+    const mins = [_]u8{ 0, 1, 0 };
+    const maxs = [_]u8{ std.math.maxInt(u8), 1, 1 };
+    const rule_offsets = [_]u32{0};
+    const rule_counts = [_]u32{3};
+    const rule_labels = [_]u16{0};
+
+    var out_labels = [_]u16{0} ** tags.len;
+    var out_begins = [_]u8{0} ** tags.len;
+    _ = try fillChunkIobIds(&tags, &allowed_offsets, &allowed_lens, &allowed_flat, &mins, &maxs, &rule_offsets, &rule_counts, &rule_labels, &out_labels, &out_begins, std.testing.allocator);
+    try std.testing.expectEqualSlices(u16, &[_]u16{ 0, 0, 0, 0, UNCHUNKED_LABEL }, &out_labels);
+    try std.testing.expectEqualSlices(u8, &[_]u8{ 1, 0, 0, 0, 0 }, &out_begins);
+}
+
+test "chunk automaton scans a long unmatched run once per rule" {
+    // Rule NP: {<JJ>*<NN>} over 4096 JJ tokens followed by one NN.
+    const allocator = std.testing.allocator;
+    const n = 4097;
+    const tags = try allocator.alloc(u16, n);
+    defer allocator.free(tags);
+    @memset(tags, 1);
+    tags[n - 1] = 2;
+    const allowed_offsets = [_]u32{ 0, 1 };
+    const allowed_lens = [_]u32{ 1, 1 };
+    const allowed_flat = [_]u16{ 1, 2 };
+    const mins = [_]u8{ 0, 1 };
+    const maxs = [_]u8{ std.math.maxInt(u8), 1 };
+    const rule_offsets = [_]u32{0};
+    const rule_counts = [_]u32{2};
+    const rule_labels = [_]u16{7};
+
+    const out_labels = try allocator.alloc(u16, n);
+    defer allocator.free(out_labels);
+    const out_begins = try allocator.alloc(u8, n);
+    defer allocator.free(out_begins);
+    _ = try fillChunkIobIds(tags, &allowed_offsets, &allowed_lens, &allowed_flat, &mins, &maxs, &rule_offsets, &rule_counts, &rule_labels, out_labels, out_begins, allocator);
+    try std.testing.expectEqual(@as(u16, 7), out_labels[0]);
+    try std.testing.expectEqual(@as(u16, 7), out_labels[n - 1]);
+    try std.testing.expectEqual(@as(u8, 1), out_begins[0]);
+    try std.testing.expectEqual(@as(u8, 0), out_begins[n - 1]);
+}
@@ -1,37 +1,131 @@
 const std = @import("std");
 
-fn bitSet(bits: *u64, id: u16) void {
-    if (id >= 64) return;
-    bits.* |= (@as(u64, 1) << @as(u6, @intCast(id)));
+/// Symbol IDs are u16, so a cell never needs more than 1024 words.
+pub const max_words: usize = (@as(usize, std.math.maxInt(u16)) + 1) / 64;
+
+fn bitSet(bits: []u64, id: usize) void {
+    const word = id >> 6;
+    if (word >= bits.len) return;
+    bits[word] |= (@as(u64, 1) << @as(u6, @intCast(id & 63)));
 }
 
-fn bitHas(bits: u64, id: u16) bool {
-    if (id >= 64) return false;
-    return (bits & (@as(u64, 1) << @as(u6, @intCast(id)))) != 0;
+fn bitHas(bits: []const u64, id: usize) bool {
+    const word = id >> 6;
+    if (word >= bits.len) return false;
+    return (bits[word] & (@as(u64, 1) << @as(u6, @intCast(id & 63)))) != 0;
 }
 
-fn applyUnaryClosure(bits: *u64, unary_child: []const u16, unary_parent: []const u16) void {
-    var changed = true;
-    while (changed) {
-        changed = false;
-        var i: usize = 0;
-        while (i < unary_child.len and i < unary_parent.len) : (i += 1) {
-            const child = unary_child[i];
-            const parent = unary_parent[i];
-            if (bitHas(bits.*, child) and !bitHas(bits.*, parent)) {
-                bitSet(bits, parent);
-                changed = true;
-            }
+fn isEmpty(bits: []const u64) bool {
+    for (bits) |word| {
+        if (word != 0) return false;
+    }
+    return true;
+}
+
+/// Rules grouped by their first symbol (left child or unary child) in CSR form,
+/// so span combination only visits rules whose first symbol is present in a cell.
+const RuleIndex = struct {
+    offsets: []u32,
+    right: []u16,
+    parent: []u16,
+
+    fn init(
+        allocator: std.mem.Allocator,
+        symbol_count: usize,
+        keys: []const u16,
+        right: ?[]const u16,
+        parent: []const u16,
+    ) !RuleIndex {
+        const offsets = try allocator.alloc(u32, symbol_count + 1);
+        errdefer allocator.free(offsets);
+        @memset(offsets, 0);
+
+        var kept: usize = 0;
+        for (keys, 0..) |key, r| {
+            if (!inRange(symbol_count, key, right, parent, r)) continue;
+            offsets[@as(usize, key) + 1] += 1;
+            kept += 1;
+        }
+        for (1..symbol_count + 1) |s| offsets[s] += offsets[s - 1];
+
+        const out_right = try allocator.alloc(u16, if (right != null) kept else 0);
+        errdefer allocator.free(out_right);
+        const out_parent = try allocator.alloc(u16, kept);
+        errdefer allocator.free(out_parent);
+
+        const cursor = try allocator.alloc(u32, symbol_count);
+        defer allocator.free(cursor);
+        @memcpy(cursor, offsets[0..symbol_count]);
+        for (keys, 0..) |key, r| {
+            if (!inRange(symbol_count, key, right, parent, r)) continue;
+            const at = cursor[key];
+            cursor[key] += 1;
+            if (right) |rs| out_right[at] = rs[r];
+            out_parent[at] = parent[r];
+        }
+
+        return .{ .offsets = offsets, .right = out_right, .parent = out_parent };
+    }
+
+    fn inRange(symbol_count: usize, key: u16, right: ?[]const u16, parent: []const u16, r: usize) bool {
+        if (key >= symbol_count or parent[r] >= symbol_count) return false;
+        if (right) |rs| {
+            if (rs[r] >= symbol_count) return false;
+        }
+        return true;
+    }
+
+    fn deinit(self: RuleIndex, allocator: std.mem.Allocator) void {
+        allocator.free(self.offsets);
+        allocator.free(self.right);
+        allocator.free(self.parent);
+    }
+};
+
+fn applyUnaryClosure(bits: []u64, unary: *const RuleIndex, stack: []u16) void {
+    var top: usize = 0;
+    for (bits, 0..) |word0, w| {
+        var word = word0;
+        while (word != 0) : (word &= word - 1) {
+            stack[top] = @intCast(w * 64 + @ctz(word));
+            top += 1;
+        }
+    }
+    while (top > 0) {
+        top -= 1;
+        const child = stack[top];
+        for (unary.offsets[child]..unary.offsets[@as(usize, child) + 1]) |r| {
+            const parent = unary.parent[r];
+            if (bitHas(bits, parent)) continue;
+            bitSet(bits, parent);
+            stack[top] = parent;
+            top += 1;
         }
     }
 }
 
-fn cellIdx(n: usize, i: usize, j: usize) usize {
-    return i * n + j;
+fn cellAt(table: []u64, word_count: usize, n: usize, i: usize, j: usize) []u64 {
+    const base = (i * n + j) * word_count;
+    return table[base .. base + word_count];
 }
 
+fn combine(out: []u64, left_bits: []const u64, right_bits: []const u64, binary: *const RuleIndex) void {
+    for (left_bits, 0..) |word0, w| {
+        var word = word0;
+        while (word != 0) : (word &= word - 1) {
+            const left = w * 64 + @ctz(word);
+            for (binary.offsets[left]..binary.offsets[left + 1]) |r| {
+                if (bitHas(right_bits, binary.right[r])) bitSet(out, binary.parent[r]);
+            }
+        }
+    }
+}
+
+/// `token_bits` holds `word_count` u64 words per token (symbol `id` is bit `id % 64`
+/// of word `id / 64`), so grammars are not limited to 64 symbols.
 pub fn cykRecognize(
     token_bits: []const u64,
+    word_count: usize,
     binary_left: []const u16,
     binary_right: []const u16,
     binary_parent: []const u16,
@@ -40,21 +134,29 @@ pub fn cykRecognize(
     start_symbol: u16,
     allocator: std.mem.Allocator,
 ) !bool {
-    if (token_bits.len == 0) return false;
-    if (start_symbol >= 64) return false;
+    if (word_count == 0 or word_count > max_words or token_bits.len < word_count) return false;
+    const symbol_count = word_count * 64;
+    if (start_symbol >= symbol_count) return false;
     if (binary_left.len != binary_right.len or binary_left.len != binary_parent.len) return false;
     if (unary_child.len != unary_parent.len) return false;
 
-    const n = token_bits.len;
-    var table = try allocator.alloc(u64, n * n);
+    const binary = try RuleIndex.init(allocator, symbol_count, binary_left, binary_right, binary_parent);
+    defer binary.deinit(allocator);
+    const unary = try RuleIndex.init(allocator, symbol_count, unary_child, null, unary_parent);
+    defer unary.deinit(allocator);
+    const stack = try allocator.alloc(u16, symbol_count);
+    defer allocator.free(stack);
+
+    const n = token_bits.len / word_count;
+    const table = try allocator.alloc(u64, n * n * word_count);
     defer allocator.free(table);
     @memset(table, 0);
 
     var i: usize = 0;
     while (i < n) : (i += 1) {
-        var bits = token_bits[i];
-        applyUnaryClosure(&bits, unary_child, unary_parent);
-        table[cellIdx(n, i, i)] = bits;
+        const cell = cellAt(table, word_count, n, i, i);
+        @memcpy(cell, token_bits[i * word_count .. (i + 1) * word_count]);
+        applyUnaryClosure(cell, &unary, stack);
     }
 
     var span: usize = 2;
@@ -62,25 +164,19 @@ pub fn cykRecognize(
         var start: usize = 0;
         while (start + span <= n) : (start += 1) {
             const end = start + span - 1;
-            var bits: u64 = 0;
+            const cell = cellAt(table, word_count, n, start, end);
             var split = start;
             while (split < end) : (split += 1) {
-                const left_bits = table[cellIdx(n, start, split)];
-                const right_bits = table[cellIdx(n, split + 1, end)];
-                if (left_bits == 0 or right_bits == 0) continue;
-                var r: usize = 0;
-                while (r < binary_left.len) : (r += 1) {
-                    if (bitHas(left_bits, binary_left[r]) and bitHas(right_bits, binary_right[r])) {
-                        bitSet(&bits, binary_parent[r]);
-                    }
-                }
+                const left_bits = cellAt(table, word_count, n, start, split);
+                const right_bits = cellAt(table, word_count, n, split + 1, end);
+                if (isEmpty(left_bits) or isEmpty(right_bits)) continue;
+                combine(cell, left_bits, right_bits, &binary);
             }
-            applyUnaryClosure(&bits, unary_child, unary_parent);
-            table[cellIdx(n, start, end)] = bits;
+            applyUnaryClosure(cell, &unary, stack);
         }
     }
 
-    return bitHas(table[cellIdx(n, 0, n - 1)], start_symbol);
+    return bitHas(cellAt(table, word_count, n, 0, n - 1), start_symbol);
 }
 
 test "cyk recognize simple grammar with unary closure" {
@@ -99,6 +195,7 @@ test "cyk recognize simple grammar with unary closure" {
 
     const ok = try cykRecognize(
         &token_bits,
+        1,
         &binary_left,
         &binary_right,
         &binary_parent,
@@ -109,3 +206,20 @@ test "cyk recognize simple grammar with unary closure" {
     );
     try std.testing.expect(ok);
 }
+
+test "cyk recognize grammar with symbols beyond the first bitset word" {
+    const allocator = std.testing.allocator;
+    // Symbols: 0=S, 70=NP, 130=VP, 131=V, 140=Name; three words per cell.
+    var token_bits = [_]u64{0} ** 9;
+    token_bits[0 * 3 + 2] = @as(u64, 1) << (140 - 128); // Name -> "alice"
+    token_bits[1 * 3 + 2] = @as(u64, 1) << (131 - 128); // V -> "sees"
+    token_bits[2 * 3 + 2] = @as(u64, 1) << (140 - 128); // Name -> "alice"
+    const binary_left = [_]u16{ 70, 131 };
+    const binary_right = [_]u16{ 130, 70 };
+    const binary_parent = [_]u16{ 0, 130 };
+    const unary_child = [_]u16{140};
+    const unary_parent = [_]u16{70};
+
+    try std.testing.expect(try cykRecognize(&token_bits, 3, &binary_left, &binary_right, &binary_parent, &unary_child, &unary_parent, 0, allocator));
+    try std.testing.expect(!try cykRecognize(token_bits[0..6], 3, &binary_left, &binary_right, &binary_parent, &unary_child, &unary_parent, 0, allocator));
+}
@@ -0,0 +1,185 @@
+const std = @import("std");
+
+/// `item_next` value for a dotted rule whose dot is at the end of the rhs.
+pub const item_complete: u32 = std.math.maxInt(u32);
+/// Token symbol for a word the grammar has no terminal for.
+pub const token_unknown: u32 = std.math.maxInt(u32);
+
+/// Dotted rules are dense u32 item IDs: rule `r` with dot `d` is `rule_base[r] + d`,
+/// so advancing the dot is `item + 1`. Symbols below `nonterminal_count` are
+/// nonterminals; larger values are terminals.
+pub const EarleyGrammar = struct {
+    nonterminal_count: usize,
+    item_next: []const u32,
+    item_lhs: []const u32,
+    predict_offsets: []const u32,
+    predict_items: []const u32,
+
+    fn validate(self: EarleyGrammar) bool {
+        if (self.item_next.len != self.item_lhs.len) return false;
+        if (self.predict_offsets.len != self.nonterminal_count + 1) return false;
+        if (self.predict_offsets[self.nonterminal_count] > self.predict_items.len) return false;
+        for (self.item_next, self.item_lhs, 0..) |next, lhs, item| {
+            if (lhs >= self.nonterminal_count) return false;
+            if (next != item_complete and item + 1 >= self.item_next.len) return false;
+        }
+        for (self.predict_items) |item| {
+            if (item >= self.item_next.len) return false;
+        }
+        return true;
+    }
+};
+
+const State = struct {
+    item: u32,
+    origin: u32,
+};
+
+const Seen = struct {
+    bits: []u64,
+    item_count: usize,
+
+    /// Returns true when (origin, item) was not yet present.
+    fn insert(self: *Seen, origin: usize, item: usize) bool {
+        const key = origin * self.item_count + item;
+        const mask = @as(u64, 1) << @as(u6, @intCast(key & 63));
+        const word = &self.bits[key >> 6];
+        if (word.* & mask != 0) return false;
+        word.* |= mask;
+        return true;
+    }
+};
+
+pub fn earleyRecognize(
+    token_symbols: []const u32,
+    grammar: EarleyGrammar,
+    start_symbol: u32,
+    allocator: std.mem.Allocator,
+) !bool {
+    if (token_symbols.len == 0) return false;
+    if (start_symbol >= grammar.nonterminal_count or !grammar.validate()) return error.InvalidN;
+
+    const n = token_symbols.len;
+    const nt = grammar.nonterminal_count;
+    const item_count = grammar.item_next.len;
+    const seen_words = ((n + 1) * item_count + 63) / 64;
+
+    var states = std.ArrayListUnmanaged(State).empty;
+    defer states.deinit(allocator);
+    var next_states = std.ArrayListUnmanaged(State).empty;
+    defer next_states.deinit(allocator);
+
+    // Column boundaries into `all`, plus a CSR index of waiting states by next nonterminal.
+    var all = std.ArrayListUnmanaged(State).empty;
+    defer all.deinit(allocator);
+    const waiting_offsets = try allocator.alloc(u32, (n + 1) * (nt + 1));
+    defer allocator.free(waiting_offsets);
+    var waiting = std.ArrayListUnmanaged(u32).empty;
+    defer waiting.deinit(allocator);
+
+    var seen = Seen{ .bits = try allocator.alloc(u64, seen_words), .item_count = item_count };
+    defer allocator.free(seen.bits);
+    var seen_next = Seen{ .bits = try allocator.alloc(u64, seen_words), .item_count = item_count };
+    defer allocator.free(seen_next.bits);
+    @memset(seen.bits, 0);
+    @memset(seen_next.bits, 0);
+    const predicted = try allocator.alloc(bool, nt);
+    defer allocator.free(predicted);
+
+    @memset(predicted, false);
+    predicted[start_symbol] = true;
+    for (grammar.predict_items[grammar.predict_offsets[start_symbol]..grammar.predict_offsets[start_symbol + 1]]) |item| {
+        if (seen.insert(0, item)) try states.append(allocator, .{ .item = item, .origin = 0 });
+    }
+
+    const column_starts = try allocator.alloc(usize, n + 2);
+    defer allocator.free(column_starts);
+
+    var i: usize = 0;
+    while (i <= n) : (i += 1) {
+        var head: usize = 0;
+        while (head < states.items.len) : (head += 1) {
+            const state = states.items[head];
+            const next = grammar.item_next[state.item];
+            if (next == item_complete) {
+                // No empty rules, so the origin column is already finished and indexed.
+                const lhs = grammar.item_lhs[state.item];
+                const col = state.origin;
+                if (col >= i) continue;
+                const base = @as(usize, col) * (nt + 1);
+                for (waiting.items[waiting_offsets[base + lhs]..waiting_offsets[base + lhs + 1]]) |idx| {
+                    const prev = all.items[column_starts[col] + idx];
+                    if (seen.insert(prev.origin, prev.item + 1)) try states.append(allocator, .{ .item = prev.item + 1, .origin = prev.origin });
+                }
+            } else if (next < nt) {
+                if (predicted[next]) continue;
+                predicted[next] = true;
+                for (grammar.predict_items[grammar.predict_offsets[next]..grammar.predict_offsets[next + 1]]) |item| {
+                    if (seen.insert(i, item)) try states.append(allocator, .{ .item = item, .origin = @intCast(i) });
+                }
+            } else if (i < n and token_symbols[i] == next) {
+                if (seen_next.insert(state.origin, state.item + 1)) try next_states.append(allocator, .{ .item = state.item + 1, .origin = state.origin });
+            }
+        }
+
+        column_starts[i] = all.items.len;
+        try all.appendSlice(allocator, states.items);
+        column_starts[i + 1] = all.items.len;
+
+        const offsets = waiting_offsets[i * (nt + 1) .. (i + 1) * (nt + 1)];
+        @memset(offsets, 0);
+        for (states.items) |state| {
+            const next = grammar.item_next[state.item];
+            if (next != item_complete and next < nt) offsets[next + 1] += 1;
+        }
+        const waiting_base: u32 = @intCast(waiting.items.len);
+        offsets[0] = waiting_base;
+        for (1..nt + 1) |s| offsets[s] += offsets[s - 1];
+        try waiting.resize(allocator, waiting.items.len + (offsets[nt] - waiting_base));
+        const cursor = try allocator.dupe(u32, offsets[0..nt]);
+        defer allocator.free(cursor);
+        for (states.items, 0..) |state, idx| {
+            const next = grammar.item_next[state.item];
+            if (next == item_complete or next >= nt) continue;
+            waiting.items[cursor[next]] = @intCast(idx);
+            cursor[next] += 1;
+        }
+
+        if (i == n) break;
+        std.mem.swap(std.ArrayListUnmanaged(State), &states, &next_states);
+        next_states.clearRetainingCapacity();
+        std.mem.swap(Seen, &seen, &seen_next);
+        @memset(seen_next.bits, 0);
+        @memset(predicted, false);
+        if (states.items.len == 0) return false;
+    }
+
+    for (states.items) |state| {
+        if (state.origin == 0 and grammar.item_next[state.item] == item_complete and grammar.item_lhs[state.item] == start_symbol) {
+            return true;
+        }
+    }
+    return false;
+}
+
+test "earley recognizer over integer dotted rules" {
+    const allocator = std.testing.allocator;
+    // Nonterminals: 0=S, 1=NP, 2=VP; terminals: 3='alice', 4='sees'.
+    // Rules: S -> NP VP (items 0..2), NP -> 'alice' (3..4), VP -> 'sees' NP (5..7).
+    const item_next = [_]u32{ 1, 2, item_complete, 3, item_complete, 4, 1, item_complete };
+    const item_lhs = [_]u32{ 0, 0, 0, 1, 1, 2, 2, 2 };
+    // Prediction closure: S predicts S and NP rules; NP and VP predict their own.
+    const predict_offsets = [_]u32{ 0, 2, 3, 4 };
+    const predict_items = [_]u32{ 0, 3, 3, 5 };
+    const grammar = EarleyGrammar{
+        .nonterminal_count = 3,
+        .item_next = &item_next,
+        .item_lhs = &item_lhs,
+        .predict_offsets = &predict_offsets,
+        .predict_items = &predict_items,
+    };
+
+    try std.testing.expect(try earleyRecognize(&[_]u32{ 3, 4, 3 }, grammar, 0, allocator));
+    try std.testing.expect(!try earleyRecognize(&[_]u32{ 3, 4 }, grammar, 0, allocator));
+    try std.testing.expect(!try earleyRecognize(&[_]u32{ 3, token_unknown, 3 }, grammar, 0, allocator));
+}
@@ -0,0 +1,146 @@
+const std = @import("std");
+const ascii = @import("ascii.zig");
+
+pub const FNV_OFFSET_32: u32 = 0x811c9dc5;
+pub const FNV_PRIME_32: u32 = 0x01000193;
+
+/// Largest hashing dimension: indices come from the low 31 bits of the mixed hash.
+pub const max_dimension: u32 = 1 << 31;
+
+pub const HashingOptions = struct {
+    ngram_min: u32,
+    ngram_max: u32,
+    dimension: u32,
+    signed: bool,
+    binary: bool,
+};
+
+const Entry = struct {
+    index: u32,
+    sign: i8,
+
+    fn lessThan(_: void, a: Entry, b: Entry) bool {
+        return a.index < b.index;
+    }
+};
+
+/// FNV-1a over the token's lowercased bytes, then over `n` and the token hashes
+/// of the window, finished with the murmur3 avalanche so `% dimension` spreads well.
+pub fn ngramHash(token_hashes: []const u32) u32 {
+    var hash = (FNV_OFFSET_32 ^ @as(u32, @intCast(token_hashes.len))) *% FNV_PRIME_32;
+    for (token_hashes) |token_hash| hash = (hash ^ token_hash) *% FNV_PRIME_32;
+    hash ^= hash >> 16;
+    hash *%= 0x85ebca6b;
+    hash ^= hash >> 13;
+    hash *%= 0xc2b2ae35;
+    hash ^= hash >> 16;
+    return hash;
+}
+
+fn collectTokenHashes(input: []const u8, out: *std.ArrayListUnmanaged(u32), allocator: std.mem.Allocator) !void {
+    out.clearRetainingCapacity();
+    var in_token = false;
+    var hash: u32 = FNV_OFFSET_32;
+    for (input) |ch| {
+        if (ascii.isTokenChar(ch)) {
+            if (!in_token) {
+                in_token = true;
+                hash = FNV_OFFSET_32;
+            }
+            hash = (hash ^ ascii.asciiLower(ch)) *% FNV_PRIME_32;
+        } else if (in_token) {
+            try out.append(allocator, hash);
+            in_token = false;
+        }
+    }
+    if (in_token) try out.append(allocator, hash);
+}
+
+/// Hashes every n-gram of every document into `dimension` buckets and writes one CSR row per
+/// document (`out_doc_offsets`, sorted `out_ids`, summed `out_values`). With `signed`, bit 31 of
+/// the hash picks the sign of each occurrence, so colliding n-grams tend to cancel; buckets that
+/// sum to zero are dropped. `binary` clamps each value to its sign. Returns the number of entries.
+pub fn hashNgramFeaturesBatchAscii(
+    input: []const u8,
+    doc_offsets: []const u32,
+    options: HashingOptions,
+    out_doc_offsets: []u32,
+    out_ids: []u32,
+    out_values: []f64,
+    allocator: std.mem.Allocator,
+) !u64 {
+    if (options.ngram_min == 0 or options.ngram_max < options.ngram_min) return error.InvalidN;
+    if (options.dimension == 0 or options.dimension > max_dimension) return error.InvalidN;
+    if (doc_offsets.len == 0) return error.InvalidN;
+    const doc_count = doc_offsets.len - 1;
+    if (out_doc_offsets.len < doc_count + 1) return error.InsufficientCapacity;
+    const capacity = @min(out_ids.len, out_values.len);
+
+    var token_hashes = std.ArrayListUnmanaged(u32).empty;
+    defer token_hashes.deinit(allocator);
+    var entries = std.ArrayListUnmanaged(Entry).empty;
+    defer entries.deinit(allocator);
+
+    var written: usize = 0;
+    out_doc_offsets[0] = 0;
+    for (0..doc_count) |d| {
+        const start = doc_offsets[d];
+        const end = doc_offsets[d + 1];
+        if (start > end or end > input.len) return error.InvalidN;
+        try collectTokenHashes(input[start..end], &token_hashes, allocator);
+
+        entries.clearRetainingCapacity();
+        const tokens = token_hashes.items;
+        var n: usize = options.ngram_min;
+        while (n <= options.ngram_max and n <= tokens.len) : (n += 1) {
+            for (0..tokens.len - n + 1) |i| {
+                const hash = ngramHash(tokens[i .. i + n]);
+                const sign: i8 = if (options.signed and hash >> 31 != 0) -1 else 1;
+                try entries.append(allocator, .{ .index = (hash & 0x7fffffff) % options.dimension, .sign = sign });
+            }
+        }
+        std.sort.pdq(Entry, entries.items, {}, Entry.lessThan);
+
+        var i: usize = 0;
+        while (i < entries.items.len) {
+            const index = entries.items[i].index;
+            var value: f64 = 0;
+            while (i < entries.items.len and entries.items[i].index == index) : (i += 1) {
+                value += @as(f64, @floatFromInt(entries.items[i].sign));
+            }
+            if (value == 0) continue;
+            if (written >= capacity) return error.InsufficientCapacity;
+            out_ids[written] = index;
+            out_values[written] = if (options.binary) std.math.sign(value) else value;
+            written += 1;
+        }
+        out_doc_offsets[d + 1] = @intCast(written);
+    }
+    return @intCast(written);
+}
+
+test "hashed n-gram features merge repeats and respect document bounds" {
+    const allocator = std.testing.allocator;
+    const input = "Good good movie|bad";
+    const doc_offsets = [_]u32{ 0, 15, 19 };
+    var out_doc_offsets = [_]u32{0} ** 3;
+    var ids = [_]u32{0} ** 16;
+    var values = [_]f64{0} ** 16;
+    const options = HashingOptions{ .ngram_min = 1, .ngram_max = 2, .dimension = 1 << 20, .signed = false, .binary = false };
+    const total = try hashNgramFeaturesBatchAscii(input, &doc_offsets, options, &out_doc_offsets, &ids, &values, allocator);
+
+    // Doc 0: unigrams good x2, movie; bigrams good|good, good|movie. Doc 1: bad.
+    try std.testing.expectEqual(@as(u64, 5), total);
+    try std.testing.expectEqualSlices(u32, &[_]u32{ 0, 4, 5 }, &out_doc_offsets);
+    var sum: f64 = 0;
+    for (values[0..4]) |v| sum += v;
+    try std.testing.expectEqual(@as(f64, 5), sum);
+    for (1..4) |k| try std.testing.expect(ids[k - 1] < ids[k]);
+
+    const binary = HashingOptions{ .ngram_min = 1, .ngram_max = 1, .dimension = 1, .signed = false, .binary = true };
+    const one = try hashNgramFeaturesBatchAscii(input, &doc_offsets, binary, &out_doc_offsets, &ids, &values, allocator);
+    try std.testing.expectEqual(@as(u64, 2), one);
+    try std.testing.expectEqual(@as(f64, 1), values[0]);
+
+    try std.testing.expectError(error.InsufficientCapacity, hashNgramFeaturesBatchAscii(input, &doc_offsets, options, &out_doc_offsets, ids[0..3], values[0..3], allocator));
+}
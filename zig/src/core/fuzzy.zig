@@ -0,0 +1,66 @@
+const std = @import("std");
+
+fn osaDistanceBounded(a: []const u8, b: []const u8, max_distance: u32, rows: []u32) u32 {
+    const over = max_distance + 1;
+    const len_gap = if (a.len > b.len) a.len - b.len else b.len - a.len;
+    if (len_gap > max_distance) return over;
+
+    const width = b.len + 1;
+    var prev2 = rows[0..width];
+    var prev = rows[width .. 2 * width];
+    var cur = rows[2 * width .. 3 * width];
+    for (prev, 0..) |*cell, j| cell.* = @intCast(j);
+
+    for (1..a.len + 1) |i| {
+        cur[0] = @intCast(i);
+        var row_min = cur[0];
+        for (1..width) |j| {
+            const cost: u32 = if (a[i - 1] == b[j - 1]) 0 else 1;
+            var best = @min(prev[j - 1] + cost, @min(prev[j] + 1, cur[j - 1] + 1));
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]) {
+                best = @min(best, prev2[j - 2] + 1);
+            }
+            cur[j] = best;
+            row_min = @min(row_min, best);
+        }
+        if (row_min > max_distance) return over;
+        const spare = prev2;
+        prev2 = prev;
+        prev = cur;
+        cur = spare;
+    }
+    return @min(prev[b.len], over);
+}
+
+pub fn osaDistanceIds(
+    query: []const u8,
+    term_bytes: []const u8,
+    term_offsets: []const u32,
+    ids: []const u32,
+    max_distance: u32,
+    out: []u32,
+    allocator: std.mem.Allocator,
+) !void {
+    var longest: usize = 0;
+    for (ids) |id| longest = @max(longest, term_offsets[id + 1] - term_offsets[id]);
+    const rows = try allocator.alloc(u32, (longest + 1) * 3);
+    defer allocator.free(rows);
+
+    for (ids, 0..) |id, idx| {
+        const term = term_bytes[term_offsets[id]..term_offsets[id + 1]];
+        out[idx] = osaDistanceBounded(query, term, max_distance, rows);
+    }
+}
+
+test "bounded osa distance counts transpositions and stops early" {
+    const allocator = std.testing.allocator;
+    const terms = "dogcatgodkitten";
+    const offsets = [_]u32{ 0, 3, 6, 9, 15 };
+    const ids = [_]u32{ 0, 1, 2, 3 };
+    var out: [4]u32 = undefined;
+    try osaDistanceIds("dgo", terms, &offsets, &ids, 2, &out, allocator);
+    try std.testing.expectEqual(@as(u32, 1), out[0]);
+    try std.testing.expectEqual(@as(u32, 3), out[1]);
+    try std.testing.expectEqual(@as(u32, 2), out[2]);
+    try std.testing.expectEqual(@as(u32, 3), out[3]);
+}
@@ -50,6 +50,320 @@ pub fn scoresSparseIds(
     }
 }
 
+const lanes = std.simd.suggestVectorLength(f64) orelse 4;
+const LaneVec = @Vector(lanes, f64);
+
+/// `out += row * value`, `lanes` classes at a time.
+fn addScaledRow(out: []f64, row: []const f64, value: f64) void {
+    const scale: LaneVec = @splat(value);
+    var idx: usize = 0;
+    while (idx + lanes <= out.len) : (idx += lanes) {
+        const acc: LaneVec = out[idx..][0..lanes].*;
+        const weight: LaneVec = row[idx..][0..lanes].*;
+        out[idx..][0..lanes].* = acc + weight * scale;
+    }
+    while (idx < out.len) : (idx += 1) out[idx] += row[idx] * value;
+}
+
+/// Same scores as `scoresSparseIds`, but `weights` is feature-major
+/// (`weights[fid * class_count + class]`), so each non-zero reads one contiguous
+/// row of class weights and accumulates it with SIMD instead of striding
+/// `feature_count` apart per class.
+pub fn scoresSparseIdsFeatureMajor(
+    doc_offsets: []const u32,
+    feature_ids: []const u32,
+    feature_values: []const f64,
+    class_count: u32,
+    feature_count: u32,
+    weights: []const f64, // feature-major [feature_count * class_count]
+    bias: []const f64, // [class_count]
+    out_scores: []f64, // row-major [doc_count * class_count]
+) LinearError!void {
+    if (class_count == 0) return error.InvalidDimensions;
+    if (doc_offsets.len == 0) return error.InvalidDimensions;
+    if (feature_ids.len != feature_values.len) return error.InsufficientCapacity;
+
+    const docs = doc_offsets.len - 1;
+    const classes = @as(usize, class_count);
+    const features = @as(usize, feature_count);
+    if (weights.len < classes * features or bias.len < classes) return error.InsufficientCapacity;
+    if (out_scores.len < docs * classes) return error.InsufficientCapacity;
+
+    var doc_idx: usize = 0;
+    while (doc_idx < docs) : (doc_idx += 1) {
+        const start = @as(usize, doc_offsets[doc_idx]);
+        const end = @as(usize, doc_offsets[doc_idx + 1]);
+        if (start > end or end > feature_ids.len) return error.InsufficientCapacity;
+
+        const out = out_scores[doc_idx * classes .. (doc_idx + 1) * classes];
+        @memcpy(out, bias[0..classes]);
+        for (feature_ids[start..end], feature_values[start..end]) |fid32, value| {
+            const fid = @as(usize, fid32);
+            if (fid >= features) continue;
+            addScaledRow(out, weights[fid * classes .. (fid + 1) * classes], value);
+        }
+    }
+}
+
+pub const SgdLoss = enum(u32) {
+    /// One-vs-rest logistic loss; the step direction is `y - sigmoid(score)` with `y` in {0, 1}.
+    logistic = 0,
+    /// One-vs-rest hinge loss; the step direction is `y` when `y * score < margin`, `y` in {-1, 1}.
+    hinge = 1,
+};
+
+pub const SgdOptions = struct {
+    loss: SgdLoss,
+    epochs: u32,
+    batch_size: u32,
+    learning_rate: f64,
+    l2: f64,
+    margin: f64,
+    seed: u32,
+    /// Documents held out (after the initial seeded shuffle) to pick the best epoch; 0 disables.
+    validation_count: u32,
+    /// Epochs without a held-out loss improvement before stopping; 0 runs every epoch.
+    patience: u32,
+};
+
+/// Same generator as the JS fallback in `linear_models.ts`, so both shuffle identically.
+const XorShift32 = struct {
+    state: u32,
+
+    fn init(seed: u32) XorShift32 {
+        return .{ .state = if (seed == 0) 0x9e3779b9 else seed };
+    }
+
+    fn next(self: *XorShift32) u32 {
+        var x = self.state;
+        x ^= x << 13;
+        x ^= x >> 17;
+        x ^= x << 5;
+        self.state = x;
+        return x;
+    }
+
+    fn shuffle(self: *XorShift32, items: []u32) void {
+        var i = items.len;
+        while (i > 1) {
+            i -= 1;
+            const j = self.next() % @as(u32, @intCast(i + 1));
+            std.mem.swap(u32, &items[i], &items[j]);
+        }
+    }
+};
+
+/// L2 decay applied lazily: the weights of feature `f` include every per-step decay factor
+/// for steps before `last_step[f]`, so a step only touches the features of its documents.
+const LazyL2 = struct {
+    decay: f64,
+    last_step: []u64,
+    classes: usize,
+    features: usize,
+
+    fn catchUp(self: *LazyL2, weights: []f64, fid: usize, step: u64) void {
+        const last = self.last_step[fid];
+        if (last >= step) return;
+        if (self.decay != 1.0) {
+            const scale = std.math.pow(f64, self.decay, @floatFromInt(step - last));
+            var class_idx: usize = 0;
+            while (class_idx < self.classes) : (class_idx += 1) weights[class_idx * self.features + fid] *= scale;
+        }
+        self.last_step[fid] = step;
+    }
+
+    fn flush(self: *LazyL2, weights: []f64, step: u64) void {
+        for (0..self.features) |fid| self.catchUp(weights, fid, step);
+    }
+};
+
+fn sigmoid(x: f64) f64 {
+    if (x >= 0) return 1.0 / (1.0 + @exp(-x));
+    const z = @exp(x);
+    return z / (1.0 + z);
+}
+
+fn softplus(x: f64) f64 {
+    if (x > 0) return x + std.math.log1p(@exp(-x));
+    return std.math.log1p(@exp(x));
+}
+
+fn stepDirection(loss: SgdLoss, score: f64, is_gold: bool, margin: f64) f64 {
+    return switch (loss) {
+        .logistic => (if (is_gold) @as(f64, 1.0) else 0.0) - sigmoid(score),
+        .hinge => blk: {
+            const y: f64 = if (is_gold) 1.0 else -1.0;
+            break :blk if (y * score < margin) y else 0.0;
+        },
+    };
+}
+
+fn exampleLoss(loss: SgdLoss, score: f64, is_gold: bool, margin: f64) f64 {
+    return switch (loss) {
+        .logistic => softplus(if (is_gold) -score else score),
+        .hinge => @max(0.0, margin - (if (is_gold) score else -score)),
+    };
+}
+
+fn scoreDoc(
+    doc: usize,
+    doc_offsets: []const u32,
+    feature_ids: []const u32,
+    feature_values: []const f64,
+    weights: []f64,
+    bias: []const f64,
+    lazy: *LazyL2,
+    step: u64,
+    out: []f64,
+) void {
+    @memcpy(out, bias[0..lazy.classes]);
+    for (doc_offsets[doc]..doc_offsets[doc + 1]) |nnz_idx| {
+        const fid = @as(usize, feature_ids[nnz_idx]);
+        if (fid >= lazy.features) continue;
+        lazy.catchUp(weights, fid, step);
+        const value = feature_values[nnz_idx];
+        for (out, 0..) |*score, class_idx| score.* += weights[class_idx * lazy.features + fid] * value;
+    }
+}
+
+/// Mini-batch SGD over a CSR batch for one-vs-rest linear models, updating `weights`
+/// (class-major, as in `scoresSparseIds`) and `bias` in place so callers can warm start.
+/// Each step costs O(batch non-zeros * classes): L2 decay is deferred per feature (`LazyL2`)
+/// and only materialized for features a batch reads, and once for all features at the end.
+/// With `validation_count > 0` the model from the epoch with the lowest held-out loss is kept.
+/// Returns the number of epochs run.
+pub fn trainSgdSparse(
+    doc_offsets: []const u32,
+    feature_ids: []const u32,
+    feature_values: []const f64,
+    labels: []const u32,
+    class_count: u32,
+    feature_count: u32,
+    options: SgdOptions,
+    weights: []f64,
+    bias: []f64,
+    allocator: std.mem.Allocator,
+) !u32 {
+    if (class_count == 0 or doc_offsets.len < 2) return error.InvalidDimensions;
+    if (options.epochs == 0 or options.batch_size == 0) return error.InvalidDimensions;
+    if (feature_ids.len != feature_values.len) return error.InsufficientCapacity;
+
+    const docs = doc_offsets.len - 1;
+    const classes = @as(usize, class_count);
+    const features = @as(usize, feature_count);
+    if (labels.len != docs or options.validation_count >= docs) return error.InvalidDimensions;
+    if (weights.len < classes * features or bias.len < classes) return error.InsufficientCapacity;
+    for (labels) |label| {
+        if (label >= class_count) return error.InvalidDimensions;
+    }
+    for (0..docs) |doc| {
+        if (doc_offsets[doc] > doc_offsets[doc + 1] or doc_offsets[doc + 1] > feature_ids.len) return error.InsufficientCapacity;
+    }
+
+    var rng = XorShift32.init(options.seed);
+    const order = try allocator.alloc(u32, docs);
+    defer allocator.free(order);
+    for (order, 0..) |*doc, idx| doc.* = @intCast(idx);
+    rng.shuffle(order);
+    const train_docs = order[0 .. docs - options.validation_count];
+    const holdout_docs = order[docs - options.validation_count ..];
+
+    var lazy = LazyL2{
+        .decay = @max(0.0, 1.0 - options.learning_rate * options.l2),
+        .last_step = try allocator.alloc(u64, features),
+        .classes = classes,
+        .features = features,
+    };
+    defer allocator.free(lazy.last_step);
+    @memset(lazy.last_step, 0);
+
+    const batch_scores = try allocator.alloc(f64, @as(usize, options.batch_size) * classes);
+    defer allocator.free(batch_scores);
+
+    // Snapshot of the full lazy state (weights, bias, timestamps, step) at the best epoch. It
+    // starts as the initial state so a run whose held-out loss is never finite restores that.
+    const validate = holdout_docs.len > 0;
+    const best_weights = try allocator.alloc(f64, if (validate) classes * features else 0);
+    defer allocator.free(best_weights);
+    const best_bias = try allocator.alloc(f64, if (validate) classes else 0);
+    defer allocator.free(best_bias);
+    const best_last_step = try allocator.alloc(u64, if (validate) features else 0);
+    defer allocator.free(best_last_step);
+    if (validate) {
+        @memcpy(best_weights, weights[0 .. classes * features]);
+        @memcpy(best_bias, bias[0..classes]);
+        @memcpy(best_last_step, lazy.last_step);
+    }
+    var best_step: u64 = 0;
+    var best_loss = std.math.inf(f64);
+    var stale: u32 = 0;
+
+    var step: u64 = 0;
+    var epochs_run: u32 = 0;
+    while (epochs_run < options.epochs) {
+        rng.shuffle(train_docs);
+        var batch_start: usize = 0;
+        while (batch_start < train_docs.len) : (batch_start += options.batch_size) {
+            const members = train_docs[batch_start..@min(batch_start + options.batch_size, train_docs.len)];
+            for (members, 0..) |doc, k| {
+                scoreDoc(doc, doc_offsets, feature_ids, feature_values, weights, bias, &lazy, step, batch_scores[k * classes .. (k + 1) * classes]);
+            }
+            // Apply this step's decay to the features being updated before adding gradients.
+            for (members) |doc| {
+                for (doc_offsets[doc]..doc_offsets[doc + 1]) |nnz_idx| {
+                    const fid = @as(usize, feature_ids[nnz_idx]);
+                    if (fid < features) lazy.catchUp(weights, fid, step + 1);
+                }
+            }
+            const rate = options.learning_rate / @as(f64, @floatFromInt(members.len));
+            for (members, 0..) |doc, k| {
+                const gold = labels[doc];
+                for (batch_scores[k * classes .. (k + 1) * classes], 0..) |score, class_idx| {
+                    const direction = stepDirection(options.loss, score, class_idx == gold, options.margin);
+                    if (direction == 0) continue;
+                    const delta = rate * direction;
+                    bias[class_idx] += delta;
+                    const base = class_idx * features;
+                    for (doc_offsets[doc]..doc_offsets[doc + 1]) |nnz_idx| {
+                        const fid = @as(usize, feature_ids[nnz_idx]);
+                        if (fid < features) weights[base + fid] += delta * feature_values[nnz_idx];
+                    }
+                }
+            }
+            step += 1;
+        }
+        epochs_run += 1;
+
+        if (!validate) continue;
+        var holdout_loss: f64 = 0;
+        for (holdout_docs) |doc| {
+            const scores = batch_scores[0..classes];
+            scoreDoc(doc, doc_offsets, feature_ids, feature_values, weights, bias, &lazy, step, scores);
+            for (scores, 0..) |score, class_idx| holdout_loss += exampleLoss(options.loss, score, class_idx == labels[doc], options.margin);
+        }
+        if (holdout_loss < best_loss) {
+            best_loss = holdout_loss;
+            stale = 0;
+            @memcpy(best_weights, weights[0 .. classes * features]);
+            @memcpy(best_bias, bias[0..classes]);
+            @memcpy(best_last_step, lazy.last_step);
+            best_step = step;
+        } else {
+            stale += 1;
+            if (options.patience > 0 and stale >= options.patience) break;
+        }
+    }
+
+    if (validate) {
+        @memcpy(weights[0 .. classes * features], best_weights);
+        @memcpy(bias[0..classes], best_bias);
+        @memcpy(lazy.last_step, best_last_step);
+        step = best_step;
+    }
+    lazy.flush(weights, step);
+    return epochs_run;
+}
+
 test "scores sparse ids computes expected class logits" {
     const doc_offsets = [_]u32{ 0, 2, 3 };
     const feature_ids = [_]u32{ 0, 2, 1 };
@@ -67,3 +381,157 @@ test "scores sparse ids computes expected class logits" {
     try std.testing.expectApproxEqAbs(@as(f64, 0.5), out[2], 1e-12);
     try std.testing.expectApproxEqAbs(@as(f64, 5.5), out[3], 1e-12);
 }
+
+test "sgd sparse lazy l2 matches eager per-step decay" {
+    const allocator = std.testing.allocator;
+    // Four documents over five features; feature 4 only appears in document 3.
+    const doc_offsets = [_]u32{ 0, 2, 4, 5, 7 };
+    const feature_ids = [_]u32{ 0, 1, 2, 3, 0, 3, 4 };
+    const feature_values = [_]f64{ 1.0, 0.5, 1.0, 2.0, 1.5, 1.0, 1.0 };
+    const labels = [_]u32{ 0, 1, 0, 1 };
+    const options = SgdOptions{
+        .loss = .logistic,
+        .epochs = 3,
+        .batch_size = 2,
+        .learning_rate = 0.3,
+        .l2 = 0.1,
+        .margin = 1.0,
+        .seed = 7,
+        .validation_count = 0,
+        .patience = 0,
+    };
+    var weights = [_]f64{0} ** 10;
+    var bias = [_]f64{0} ** 2;
+    const epochs = try trainSgdSparse(&doc_offsets, &feature_ids, &feature_values, &labels, 2, 5, options, &weights, &bias, allocator);
+    try std.testing.expectEqual(@as(u32, 3), epochs);
+
+    // Reference: same shuffles, but every weight decays on every step.
+    var ref_weights = [_]f64{0} ** 10;
+    var ref_bias = [_]f64{0} ** 2;
+    var rng = XorShift32.init(options.seed);
+    var order = [_]u32{ 0, 1, 2, 3 };
+    rng.shuffle(&order);
+    var scores: [4]f64 = undefined;
+    for (0..options.epochs) |_| {
+        rng.shuffle(&order);
+        var start: usize = 0;
+        while (start < order.len) : (start += 2) {
+            const members = order[start..@min(start + 2, order.len)];
+            for (members, 0..) |doc, k| {
+                for (0..2) |c| {
+                    var s = ref_bias[c];
+                    for (doc_offsets[doc]..doc_offsets[doc + 1]) |i| s += ref_weights[c * 5 + feature_ids[i]] * feature_values[i];
+                    scores[k * 2 + c] = s;
+                }
+            }
+            for (&ref_weights) |*w| w.* *= 1.0 - options.learning_rate * options.l2;
+            const rate = options.learning_rate / @as(f64, @floatFromInt(members.len));
+            for (members, 0..) |doc, k| {
+                for (0..2) |c| {
+                    const direction = stepDirection(.logistic, scores[k * 2 + c], c == labels[doc], 1.0);
+                    ref_bias[c] += rate * direction;
+                    for (doc_offsets[doc]..doc_offsets[doc + 1]) |i| ref_weights[c * 5 + feature_ids[i]] += rate * direction * feature_values[i];
+                }
+            }
+        }
+    }
+    for (weights, ref_weights) |got, want| try std.testing.expectApproxEqAbs(want, got, 1e-12);
+    for (bias, ref_bias) |got, want| try std.testing.expectApproxEqAbs(want, got, 1e-12);
+}
+
+test "sgd sparse separates classes and stops early on held-out loss" {
+    const allocator = std.testing.allocator;
+    // Label 0 documents use features 0..1, label 1 documents use features 2..3.
+    var doc_offsets: [41]u32 = undefined;
+    var feature_ids: [80]u32 = undefined;
+    var feature_values: [80]f64 = undefined;
+    var labels: [40]u32 = undefined;
+    for (0..40) |doc| {
+        const label: u32 = @intCast(doc % 2);
+        labels[doc] = label;
+        doc_offsets[doc] = @intCast(doc * 2);
+        feature_ids[doc * 2] = label * 2;
+        feature_ids[doc * 2 + 1] = label * 2 + 1;
+        feature_values[doc * 2] = 1.0;
+        feature_values[doc * 2 + 1] = 1.0;
+    }
+    doc_offsets[40] = 80;
+
+    var weights = [_]f64{0} ** 8;
+    var bias = [_]f64{0} ** 2;
+    const options = SgdOptions{
+        .loss = .hinge,
+        .epochs = 200,
+        .batch_size = 4,
+        .learning_rate = 0.2,
+        .l2 = 1e-3,
+        .margin = 1.0,
+        .seed = 42,
+        .validation_count = 8,
+        .patience = 2,
+    };
+    const epochs = try trainSgdSparse(&doc_offsets, &feature_ids, &feature_values, &labels, 2, 4, options, &weights, &bias, allocator);
+    try std.testing.expect(epochs < options.epochs);
+
+    var scores = [_]f64{0} ** 80;
+    try scoresSparseIds(&doc_offsets, &feature_ids, &feature_values, 2, 4, &weights, &bias, &scores);
+    for (labels, 0..) |label, doc| {
+        const predicted: u32 = if (scores[doc * 2 + 1] > scores[doc * 2]) 1 else 0;
+        try std.testing.expectEqual(label, predicted);
+    }
+
+    try std.testing.expectError(error.InvalidDimensions, trainSgdSparse(&doc_offsets, &feature_ids, &feature_values, labels[0..39], 2, 4, options, &weights, &bias, allocator));
+}
+
+test "sgd sparse restores the initial state when held-out loss never becomes finite" {
+    const allocator = std.testing.allocator;
+    const doc_offsets = [_]u32{ 0, 1, 2, 3, 4 };
+    const feature_ids = [_]u32{ 0, 1, 0, 1 };
+    // NaN inputs make every epoch's held-out loss NaN, the same as a diverged run.
+    const nan = std.math.nan(f64);
+    const feature_values = [_]f64{ nan, nan, nan, nan };
+    const labels = [_]u32{ 0, 1, 0, 1 };
+    var weights = [_]f64{ 0.25, -0.5, 1.0, 2.0 };
+    var bias = [_]f64{ 0.5, -1.0 };
+    const options = SgdOptions{
+        .loss = .logistic,
+        .epochs = 3,
+        .batch_size = 1,
+        .learning_rate = 0.5,
+        .l2 = 0.1,
+        .margin = 1.0,
+        .seed = 3,
+        .validation_count = 2,
+        .patience = 0,
+    };
+    _ = try trainSgdSparse(&doc_offsets, &feature_ids, &feature_values, &labels, 2, 2, options, &weights, &bias, allocator);
+    try std.testing.expectEqualSlices(f64, &[_]f64{ 0.25, -0.5, 1.0, 2.0 }, &weights);
+    try std.testing.expectEqualSlices(f64, &[_]f64{ 0.5, -1.0 }, &bias);
+}
+
+test "feature-major scores match class-major scores" {
+    // 11 classes so the SIMD loop and its scalar tail both run.
+    const classes = 11;
+    const features = 5;
+    const doc_offsets = [_]u32{ 0, 3, 3, 6 };
+    const feature_ids = [_]u32{ 4, 0, 2, 1, 7, 4 };
+    const feature_values = [_]f64{ 0.5, 2.0, -1.0, 3.0, 9.0, 1.5 };
+    var class_major: [classes * features]f64 = undefined;
+    var feature_major: [classes * features]f64 = undefined;
+    for (0..classes) |c| {
+        for (0..features) |f| {
+            const w = @as(f64, @floatFromInt(c * 7 + f * 3)) / 10.0 - 2.0;
+            class_major[c * features + f] = w;
+            feature_major[f * classes + c] = w;
+        }
+    }
+    var bias: [classes]f64 = undefined;
+    for (&bias, 0..) |*b, c| b.* = @as(f64, @floatFromInt(c)) * 0.25;
+
+    var want = [_]f64{0} ** (3 * classes);
+    var got = [_]f64{0} ** (3 * classes);
+    try scoresSparseIds(&doc_offsets, &feature_ids, &feature_values, classes, features, &class_major, &bias, &want);
+    try scoresSparseIdsFeatureMajor(&doc_offsets, &feature_ids, &feature_values, classes, features, &feature_major, &bias, &got);
+    for (want, got) |w, g| try std.testing.expectApproxEqAbs(w, g, 1e-12);
+    try std.testing.expectError(error.InsufficientCapacity, scoresSparseIdsFeatureMajor(&doc_offsets, &feature_ids, &feature_values, classes, features, feature_major[0..10], &bias, &got));
+}
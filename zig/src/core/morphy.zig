@@ -80,6 +80,225 @@ pub fn morphyAscii(input: []const u8, pos: WordNetPos, out: []u8) usize {
     };
 }
 
+pub const max_lemma_bytes: usize = 128;
+
+pub const pos_mask_any: u8 = 0x0f;
+
+pub fn posMask(pos: WordNetPos) u8 {
+    return switch (pos) {
+        .noun => 1,
+        .verb => 2,
+        .adjective => 4,
+        .adverb => 8,
+        .any => pos_mask_any,
+    };
+}
+
+fn fnv1a(bytes: []const u8) u32 {
+    var hash: u32 = 2166136261;
+    for (bytes) |ch| {
+        hash ^= ch;
+        hash *%= 16777619;
+    }
+    return hash;
+}
+
+pub const LemmaSet = struct {
+    allocator: std.mem.Allocator,
+    bytes: []u8,
+    offsets: []u32,
+    pos_masks: []u8,
+    slots: []u32,
+
+    pub fn create(
+        allocator: std.mem.Allocator,
+        bytes: []const u8,
+        offsets: []const u32,
+        pos_masks: []const u8,
+    ) !*LemmaSet {
+        const count = pos_masks.len;
+        const self = try allocator.create(LemmaSet);
+        errdefer allocator.destroy(self);
+        const owned_bytes = try allocator.dupe(u8, bytes);
+        errdefer allocator.free(owned_bytes);
+        const owned_offsets = try allocator.dupe(u32, offsets[0 .. count + 1]);
+        errdefer allocator.free(owned_offsets);
+        const owned_masks = try allocator.dupe(u8, pos_masks);
+        errdefer allocator.free(owned_masks);
+
+        var slot_count: usize = 16;
+        while (slot_count < count * 2) slot_count *= 2;
+        const slots = try allocator.alloc(u32, slot_count);
+        @memset(slots, 0);
+
+        self.* = .{
+            .allocator = allocator,
+            .bytes = owned_bytes,
+            .offsets = owned_offsets,
+            .pos_masks = owned_masks,
+            .slots = slots,
+        };
+        for (0..count) |idx| {
+            var slot = @as(usize, fnv1a(self.lemmaAt(idx))) & (slot_count - 1);
+            while (slots[slot] != 0) slot = (slot + 1) & (slot_count - 1);
+            slots[slot] = @intCast(idx + 1);
+        }
+        return self;
+    }
+
+    pub fn destroy(self: *LemmaSet) void {
+        const allocator = self.allocator;
+        allocator.free(self.bytes);
+        allocator.free(self.offsets);
+        allocator.free(self.pos_masks);
+        allocator.free(self.slots);
+        allocator.destroy(self);
+    }
+
+    fn lemmaAt(self: *const LemmaSet, idx: usize) []const u8 {
+        return self.bytes[self.offsets[idx]..self.offsets[idx + 1]];
+    }
+
+    pub fn contains(self: *const LemmaSet, lemma: []const u8, mask: u8) bool {
+        const slot_mask = self.slots.len - 1;
+        var slot = @as(usize, fnv1a(lemma)) & slot_mask;
+        while (self.slots[slot] != 0) : (slot = (slot + 1) & slot_mask) {
+            const idx = self.slots[slot] - 1;
+            if (std.mem.eql(u8, self.lemmaAt(idx), lemma)) return (self.pos_masks[idx] & mask) != 0;
+        }
+        return false;
+    }
+};
+
+const Probe = struct {
+    set: *const LemmaSet,
+    word: []const u8,
+    mask: u8,
+    buf: []u8,
+
+    fn check(self: Probe, trim: usize, add: []const u8) ?[]const u8 {
+        const len = writeCandidate(self.word, trim, add, self.buf);
+        if (len == 0) return null;
+        const candidate = self.buf[0..len];
+        return if (self.set.contains(candidate, self.mask)) candidate else null;
+    }
+};
+
+fn doubledEnding(stem: []const u8) bool {
+    return stem.len >= 2 and stem[stem.len - 1] == stem[stem.len - 2];
+}
+
+fn nounLemma(p: Probe) ?[]const u8 {
+    const w = p.word;
+    if (p.check(0, "")) |c| return c;
+    if (endsWith(w, "ies") and w.len > 3) {
+        if (p.check(3, "y")) |c| return c;
+    }
+    if (endsWith(w, "ves") and w.len > 3) {
+        if (p.check(3, "f")) |c| return c;
+    }
+    if (endsWith(w, "es") and w.len > 2) {
+        if (p.check(2, "")) |c| return c;
+    }
+    if (endsWith(w, "s") and w.len > 1) {
+        if (p.check(1, "")) |c| return c;
+    }
+    return null;
+}
+
+fn verbLemma(p: Probe) ?[]const u8 {
+    const w = p.word;
+    if (p.check(0, "")) |c| return c;
+    if (endsWith(w, "ies") and w.len > 3) {
+        if (p.check(3, "y")) |c| return c;
+    }
+    if (endsWith(w, "ing") and w.len > 4) {
+        if (p.check(3, "")) |c| return c;
+        if (p.check(3, "e")) |c| return c;
+        if (doubledEnding(w[0 .. w.len - 3])) {
+            if (p.check(4, "")) |c| return c;
+        }
+    }
+    if (endsWith(w, "ed") and w.len > 3) {
+        if (p.check(2, "")) |c| return c;
+        if (p.check(1, "")) |c| return c;
+        if (doubledEnding(w[0 .. w.len - 2])) {
+            if (p.check(3, "")) |c| return c;
+        }
+    }
+    if (endsWith(w, "s") and w.len > 1) {
+        if (p.check(1, "")) |c| return c;
+    }
+    return null;
+}
+
+fn adjectiveLemma(p: Probe) ?[]const u8 {
+    const w = p.word;
+    if (p.check(0, "")) |c| return c;
+    if (endsWith(w, "er") and w.len > 2) {
+        if (p.check(2, "")) |c| return c;
+    }
+    if (endsWith(w, "est") and w.len > 3) {
+        if (p.check(3, "")) |c| return c;
+    }
+    return null;
+}
+
+// Mirrors WordNet.morphy: the single-rule candidate first, then every candidate in rule order.
+pub fn lemmaAscii(set: *const LemmaSet, input: []const u8, pos: WordNetPos, out: []u8) usize {
+    if (input.len == 0 or input.len > max_lemma_bytes) return 0;
+    var normalized_buf: [max_lemma_bytes]u8 = undefined;
+    const word = normalized_buf[0..normalizeWord(input, &normalized_buf)];
+    var scratch: [max_lemma_bytes + 1]u8 = undefined;
+    const probe = Probe{ .set = set, .word = word, .mask = posMask(pos), .buf = &scratch };
+
+    const first_len = morphyAscii(word, pos, &scratch);
+    const found: ?[]const u8 = if (first_len > 0 and set.contains(scratch[0..first_len], probe.mask))
+        scratch[0..first_len]
+    else switch (pos) {
+        .noun => nounLemma(probe),
+        .verb => verbLemma(probe),
+        .adjective => adjectiveLemma(probe),
+        .adverb => probe.check(0, ""),
+        .any => nounLemma(probe) orelse verbLemma(probe) orelse adjectiveLemma(probe),
+    };
+    const lemma = found orelse return 0;
+    if (lemma.len > out.len) return 0;
+    @memcpy(out[0..lemma.len], lemma);
+    return lemma.len;
+}
+
+pub fn lemmaBatchAscii(
+    set: *const LemmaSet,
+    input: []const u8,
+    offsets: []const u32,
+    pos_codes: []const u32,
+    out: []u8,
+    out_offsets: []u32,
+) error{InsufficientCapacity}!usize {
+    const count = pos_codes.len;
+    if (offsets.len < count + 1 or out_offsets.len < count + 1) return error.InsufficientCapacity;
+    var written: usize = 0;
+    out_offsets[0] = 0;
+    for (0..count) |idx| {
+        const word = input[offsets[idx]..offsets[idx + 1]];
+        if (out.len - written < word.len + 1) return error.InsufficientCapacity;
+        written += lemmaAscii(set, word, posFromCode(pos_codes[idx]), out[written..]);
+        out_offsets[idx + 1] = @intCast(written);
+    }
+    return written;
+}
+
+pub fn posFromCode(code: u32) WordNetPos {
+    return switch (code) {
+        1 => .noun,
+        2 => .verb,
+        3 => .adjective,
+        4 => .adverb,
+        else => .any,
+    };
+}
+
 test "morphy ascii noun rules" {
     var out: [64]u8 = undefined;
     const len1 = morphyAscii("dogs", .noun, &out);
@@ -96,3 +315,26 @@ test "morphy ascii verb and adjective rules" {
     try std.testing.expectEqualStrings("fast", out[0..len2]);
 }
 
+
+test "lemma set batch mirrors morphy candidate order" {
+    const allocator = std.testing.allocator;
+    const bytes = "dogpartyrunrunningfast";
+    const offsets = [_]u32{ 0, 3, 8, 11, 18, 22 };
+    const masks = [_]u8{ 1, 1, 2, 1, 4 };
+    const set = try LemmaSet.create(allocator, bytes, &offsets, &masks);
+    defer set.destroy();
+
+    const input = "dogspartiesrunningrunningfasterxyz";
+    const token_offsets = [_]u32{ 0, 4, 11, 18, 25, 31, 34 };
+    const pos_codes = [_]u32{ 1, 1, 2, 1, 3, 0 };
+    var out: [64]u8 = undefined;
+    var out_offsets: [7]u32 = undefined;
+    const written = try lemmaBatchAscii(set, input, &token_offsets, &pos_codes, &out, &out_offsets);
+    try std.testing.expectEqualStrings("dog", out[out_offsets[0]..out_offsets[1]]);
+    try std.testing.expectEqualStrings("party", out[out_offsets[1]..out_offsets[2]]);
+    try std.testing.expectEqualStrings("run", out[out_offsets[2]..out_offsets[3]]);
+    try std.testing.expectEqualStrings("running", out[out_offsets[3]..out_offsets[4]]);
+    try std.testing.expectEqualStrings("fast", out[out_offsets[4]..out_offsets[5]]);
+    try std.testing.expectEqual(out_offsets[5], out_offsets[6]);
+    try std.testing.expectEqual(@as(usize, out_offsets[6]), written);
+}
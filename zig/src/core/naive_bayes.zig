@@ -50,6 +50,73 @@ pub fn logScores(
     }
 }
 
+/// Sparse Naive Bayes model: token `t` stores the labels it was seen with in
+/// `entry_*[token_starts[t]..token_starts[t] + token_lengths[t]]`. Ranges need not be
+/// contiguous or ordered, so an updated token can move its range to the end of the
+/// entry arrays without re-packing the others. Each entry holds
+/// `log(count + a) - log(a)`, the gain over the label's default log-likelihood
+/// `log(a / denom)` used for every token/label pair with a zero count.
+pub const SparseModel = struct {
+    token_starts: []const u32,
+    token_lengths: []const u32,
+    entry_label_ids: []const u32,
+    entry_log_deltas: []const f64,
+    label_prior_logs: []const f64,
+    label_default_logs: []const f64,
+
+    fn labelCount(self: SparseModel) usize {
+        return self.label_prior_logs.len;
+    }
+
+    fn validate(self: SparseModel) bool {
+        if (self.label_prior_logs.len == 0 or self.label_default_logs.len != self.label_prior_logs.len) return false;
+        if (self.token_lengths.len != self.token_starts.len) return false;
+        return self.entry_label_ids.len == self.entry_log_deltas.len;
+    }
+};
+
+/// Scores every document `d` (token IDs in `doc_token_ids[doc_offsets[d]..doc_offsets[d + 1]]`)
+/// into row `d` of `out_scores` (`label_count` scores per document). Token IDs outside the
+/// vocabulary are ignored, so the cost is O(tokens + stored entries) instead of O(tokens * labels).
+pub fn sparseLogScoresBatch(
+    doc_offsets: []const u32,
+    doc_token_ids: []const u32,
+    model: SparseModel,
+    out_scores: []f64,
+) !void {
+    if (doc_offsets.len == 0 or !model.validate()) return error.InvalidN;
+    const doc_count = doc_offsets.len - 1;
+    const label_count = model.labelCount();
+    if (out_scores.len < doc_count * label_count) return error.InsufficientCapacity;
+    const vocab_size = model.token_starts.len;
+
+    var d: usize = 0;
+    while (d < doc_count) : (d += 1) {
+        const start = doc_offsets[d];
+        const end = doc_offsets[d + 1];
+        if (start > end or end > doc_token_ids.len) return error.InvalidN;
+
+        const row = out_scores[d * label_count .. (d + 1) * label_count];
+        @memcpy(row, model.label_prior_logs);
+        var known: usize = 0;
+        for (doc_token_ids[start..end]) |tok| {
+            if (tok >= vocab_size) continue;
+            const lo: usize = model.token_starts[tok];
+            const hi = lo + model.token_lengths[tok];
+            if (hi > model.entry_label_ids.len) return error.InvalidN;
+            known += 1;
+            for (model.entry_label_ids[lo..hi], model.entry_log_deltas[lo..hi]) |label, delta| {
+                if (label >= label_count) return error.InvalidN;
+                row[label] += delta;
+            }
+        }
+        const known_f = @as(f64, @floatFromInt(known));
+        for (row, model.label_default_logs) |*score, default_log| {
+            score.* += known_f * default_log;
+        }
+    }
+}
+
 test "naive bayes log scores prefers positive label" {
     // labels: pos=0, neg=1
     // vocab: good=0, bad=1, fast=2
@@ -66,3 +133,72 @@ test "naive bayes log scores prefers positive label" {
     logScores(&doc, 3, &matrix, &label_docs, &label_totals, 10, 1.0, &scores);
     try std.testing.expect(scores[0] > scores[1]);
 }
+
+test "sparse naive bayes scores match dense log scores" {
+    // Same model as above: good=0, bad=1, fast=2; pos=0, neg=1; smoothing 1.
+    const token_starts = [_]u32{ 0, 2, 4 };
+    const token_lengths = [_]u32{ 2, 2, 2 };
+    const entry_label_ids = [_]u32{ 0, 1, 0, 1, 0, 1 };
+    const counts = [_]f64{ 10, 1, 1, 10, 8, 1 };
+    var entry_log_deltas: [6]f64 = undefined;
+    for (counts, 0..) |count, i| entry_log_deltas[i] = @log(count + 1.0);
+    const label_prior_logs = [_]f64{ @log(6.0 / 12.0), @log(6.0 / 12.0) };
+    const label_default_logs = [_]f64{ @log(1.0 / 22.0), @log(1.0 / 15.0) };
+    const model = SparseModel{
+        .token_starts = &token_starts,
+        .token_lengths = &token_lengths,
+        .entry_label_ids = &entry_label_ids,
+        .entry_log_deltas = &entry_log_deltas,
+        .label_prior_logs = &label_prior_logs,
+        .label_default_logs = &label_default_logs,
+    };
+
+    // Doc 0: good fast; doc 1: bad <unknown>; doc 2: empty.
+    const doc_offsets = [_]u32{ 0, 2, 4, 4 };
+    const doc_tokens = [_]u32{ 0, 2, 1, 99 };
+    var sparse: [6]f64 = undefined;
+    try sparseLogScoresBatch(&doc_offsets, &doc_tokens, model, &sparse);
+
+    const matrix = [_]u32{ 10, 1, 8, 1, 10, 1 };
+    const label_docs = [_]u32{ 5, 5 };
+    const label_totals = [_]u32{ 19, 12 };
+    var dense: [2]f64 = undefined;
+    logScores(doc_tokens[0..2], 3, &matrix, &label_docs, &label_totals, 10, 1.0, &dense);
+    try std.testing.expectApproxEqAbs(dense[0], sparse[0], 1e-9);
+    try std.testing.expectApproxEqAbs(dense[1], sparse[1], 1e-9);
+    logScores(doc_tokens[2..3], 3, &matrix, &label_docs, &label_totals, 10, 1.0, &dense);
+    try std.testing.expectApproxEqAbs(dense[0], sparse[2], 1e-9);
+    try std.testing.expectApproxEqAbs(dense[1], sparse[3], 1e-9);
+    try std.testing.expectApproxEqAbs(label_prior_logs[0], sparse[4], 1e-12);
+
+    try std.testing.expectError(error.InsufficientCapacity, sparseLogScoresBatch(&doc_offsets, &doc_tokens, model, sparse[0..5]));
+}
+
+test "sparse naive bayes follows relocated token ranges" {
+    // Token 0 moved its range to the end; entries 0..2 are stale.
+    const token_starts = [_]u32{ 4, 2 };
+    const token_lengths = [_]u32{ 2, 1 };
+    const entry_label_ids = [_]u32{ 0, 1, 1, 0, 0, 1 };
+    const entry_log_deltas = [_]f64{ 100, 100, 0.5, 0, 1.0, 2.0 };
+    const label_prior_logs = [_]f64{ -1.0, -2.0 };
+    const label_default_logs = [_]f64{ -3.0, -4.0 };
+    const model = SparseModel{
+        .token_starts = &token_starts,
+        .token_lengths = &token_lengths,
+        .entry_label_ids = &entry_label_ids,
+        .entry_log_deltas = &entry_log_deltas,
+        .label_prior_logs = &label_prior_logs,
+        .label_default_logs = &label_default_logs,
+    };
+    const doc_offsets = [_]u32{ 0, 2 };
+    const doc_tokens = [_]u32{ 0, 1 };
+    var scores: [2]f64 = undefined;
+    try sparseLogScoresBatch(&doc_offsets, &doc_tokens, model, &scores);
+    try std.testing.expectApproxEqAbs(@as(f64, -1.0 - 6.0 + 1.0), scores[0], 1e-12);
+    try std.testing.expectApproxEqAbs(@as(f64, -2.0 - 8.0 + 2.0 + 0.5), scores[1], 1e-12);
+
+    const bad_lengths = [_]u32{ 3, 1 };
+    var bad = model;
+    bad.token_lengths = &bad_lengths;
+    try std.testing.expectError(error.InvalidN, sparseLogScoresBatch(&doc_offsets, &doc_tokens, bad, &scores));
+}
@@ -0,0 +1,205 @@
+const std = @import("std");
+
+pub const kind_lexical: u8 = 1;
+pub const kind_unary: u8 = 2;
+pub const kind_binary: u8 = 3;
+
+const tie_margin: f64 = 1e-12;
+
+pub const ViterbiGrammar = struct {
+    symbol_count: usize,
+    unary_child: []const u32,
+    unary_parent: []const u32,
+    unary_logprob: []const f64,
+    binary_left: []const u32,
+    binary_right: []const u32,
+    binary_parent: []const u32,
+    binary_logprob: []const f64,
+
+    fn validate(self: ViterbiGrammar) bool {
+        if (self.unary_child.len != self.unary_parent.len or self.unary_child.len != self.unary_logprob.len) return false;
+        if (self.binary_left.len != self.binary_right.len or self.binary_left.len != self.binary_parent.len) return false;
+        if (self.binary_left.len != self.binary_logprob.len) return false;
+        for (self.unary_child, self.unary_parent) |child, parent| {
+            if (child >= self.symbol_count or parent >= self.symbol_count) return false;
+        }
+        for (self.binary_left, self.binary_right, self.binary_parent) |left, right, parent| {
+            if (left >= self.symbol_count or right >= self.symbol_count or parent >= self.symbol_count) return false;
+        }
+        return true;
+    }
+};
+
+pub const ViterbiTree = struct {
+    node_count: usize,
+    log_prob: f64,
+};
+
+const Chart = struct {
+    n: usize,
+    symbol_count: usize,
+    scores: []f64,
+    kinds: []u8,
+    rules: []u32,
+    splits: []u32,
+
+    fn slot(self: *const Chart, start: usize, end: usize, symbol: usize) usize {
+        return (start * (self.n + 1) + end) * self.symbol_count + symbol;
+    }
+
+    fn improve(self: *Chart, at: usize, candidate: f64, kind: u8, rule: usize, split: usize) bool {
+        if (!(candidate > self.scores[at] + tie_margin)) return false;
+        self.scores[at] = candidate;
+        self.kinds[at] = kind;
+        self.rules[at] = @intCast(rule);
+        self.splits[at] = @intCast(split);
+        return true;
+    }
+
+    fn unaryClosure(self: *Chart, grammar: ViterbiGrammar, start: usize, end: usize) void {
+        const base = self.slot(start, end, 0);
+        var rounds: usize = 0;
+        var changed = true;
+        while (changed and rounds <= self.symbol_count) : (rounds += 1) {
+            changed = false;
+            for (grammar.unary_child, grammar.unary_parent, grammar.unary_logprob, 0..) |child, parent, logprob, rule| {
+                const child_score = self.scores[base + child];
+                if (child_score == -std.math.inf(f64)) continue;
+                if (self.improve(base + parent, child_score + logprob, kind_unary, rule, 0)) changed = true;
+            }
+        }
+    }
+};
+
+pub fn viterbiParse(
+    token_count: usize,
+    lex_offsets: []const u32,
+    lex_symbols: []const u32,
+    lex_logprobs: []const f64,
+    grammar: ViterbiGrammar,
+    start_symbol: u32,
+    out_labels: []u32,
+    out_kinds: []u8,
+    out_starts: []u32,
+    allocator: std.mem.Allocator,
+) !ViterbiTree {
+    if (token_count == 0) return .{ .node_count = 0, .log_prob = -std.math.inf(f64) };
+    if (start_symbol >= grammar.symbol_count or !grammar.validate()) return error.InvalidN;
+    if (lex_offsets.len < token_count + 1 or lex_symbols.len != lex_logprobs.len) return error.InvalidN;
+    if (lex_offsets[token_count] > lex_symbols.len) return error.InvalidN;
+    for (lex_symbols) |symbol| {
+        if (symbol >= grammar.symbol_count) return error.InvalidN;
+    }
+
+    const n = token_count;
+    const cells = (n + 1) * (n + 1) * grammar.symbol_count;
+    var chart = Chart{
+        .n = n,
+        .symbol_count = grammar.symbol_count,
+        .scores = try allocator.alloc(f64, cells),
+        .kinds = undefined,
+        .rules = undefined,
+        .splits = undefined,
+    };
+    defer allocator.free(chart.scores);
+    chart.kinds = try allocator.alloc(u8, cells);
+    defer allocator.free(chart.kinds);
+    chart.rules = try allocator.alloc(u32, cells);
+    defer allocator.free(chart.rules);
+    chart.splits = try allocator.alloc(u32, cells);
+    defer allocator.free(chart.splits);
+    @memset(chart.scores, -std.math.inf(f64));
+    @memset(chart.kinds, 0);
+
+    for (0..n) |i| {
+        const base = chart.slot(i, i + 1, 0);
+        for (@as(usize, lex_offsets[i])..@as(usize, lex_offsets[i + 1])) |entry| {
+            _ = chart.improve(base + lex_symbols[entry], lex_logprobs[entry], kind_lexical, entry, i);
+        }
+        chart.unaryClosure(grammar, i, i + 1);
+    }
+
+    var span: usize = 2;
+    while (span <= n) : (span += 1) {
+        var i: usize = 0;
+        while (i + span <= n) : (i += 1) {
+            const j = i + span;
+            const base = chart.slot(i, j, 0);
+            var filled = false;
+            for (i + 1..j) |k| {
+                const left_base = chart.slot(i, k, 0);
+                const right_base = chart.slot(k, j, 0);
+                for (grammar.binary_left, grammar.binary_right, grammar.binary_parent, grammar.binary_logprob, 0..) |left, right, parent, logprob, rule| {
+                    const left_score = chart.scores[left_base + left];
+                    if (left_score == -std.math.inf(f64)) continue;
+                    const right_score = chart.scores[right_base + right];
+                    if (right_score == -std.math.inf(f64)) continue;
+                    if (chart.improve(base + parent, left_score + right_score + logprob, kind_binary, rule, k)) filled = true;
+                }
+            }
+            if (filled) chart.unaryClosure(grammar, i, j);
+        }
+    }
+
+    const root = chart.slot(0, n, start_symbol);
+    if (chart.kinds[root] == 0) return .{ .node_count = 0, .log_prob = -std.math.inf(f64) };
+
+    const Pending = struct { start: u32, end: u32, symbol: u32 };
+    var stack: std.ArrayListUnmanaged(Pending) = .empty;
+    defer stack.deinit(allocator);
+    try stack.append(allocator, .{ .start = 0, .end = @intCast(n), .symbol = start_symbol });
+    var count: usize = 0;
+    while (stack.pop()) |node| {
+        if (count >= out_labels.len or count >= out_kinds.len or count >= out_starts.len) return error.InsufficientCapacity;
+        const at = chart.slot(node.start, node.end, node.symbol);
+        const kind = chart.kinds[at];
+        out_labels[count] = node.symbol;
+        out_kinds[count] = kind;
+        out_starts[count] = node.start;
+        count += 1;
+        const rule = chart.rules[at];
+        switch (kind) {
+            kind_unary => try stack.append(allocator, .{ .start = node.start, .end = node.end, .symbol = grammar.unary_child[rule] }),
+            kind_binary => {
+                const split = chart.splits[at];
+                try stack.append(allocator, .{ .start = split, .end = node.end, .symbol = grammar.binary_right[rule] });
+                try stack.append(allocator, .{ .start = node.start, .end = split, .symbol = grammar.binary_left[rule] });
+            },
+            else => {},
+        }
+    }
+    return .{ .node_count = count, .log_prob = chart.scores[root] };
+}
+
+test "viterbi parse picks the higher scoring attachment" {
+    const allocator = std.testing.allocator;
+    // symbols: 0 S, 1 NP, 2 VP, 3 V, 4 N
+    const lex_offsets = [_]u32{ 0, 2, 3, 5 };
+    const lex_symbols = [_]u32{ 1, 4, 3, 1, 4 };
+    const lex_logprobs = [_]f64{ @log(0.5), 0, 0, @log(0.5), 0 };
+    const unary_child = [_]u32{4};
+    const unary_parent = [_]u32{1};
+    const unary_logprob = [_]f64{@log(0.25)};
+    const binary_left = [_]u32{ 1, 3 };
+    const binary_right = [_]u32{ 2, 1 };
+    const binary_parent = [_]u32{ 0, 2 };
+    const binary_logprob = [_]f64{ 0, 0 };
+    const grammar = ViterbiGrammar{
+        .symbol_count = 5,
+        .unary_child = &unary_child,
+        .unary_parent = &unary_parent,
+        .unary_logprob = &unary_logprob,
+        .binary_left = &binary_left,
+        .binary_right = &binary_right,
+        .binary_parent = &binary_parent,
+        .binary_logprob = &binary_logprob,
+    };
+    var labels: [16]u32 = undefined;
+    var kinds: [16]u8 = undefined;
+    var starts: [16]u32 = undefined;
+    const tree = try viterbiParse(3, &lex_offsets, &lex_symbols, &lex_logprobs, grammar, 0, &labels, &kinds, &starts, allocator);
+    try std.testing.expectEqual(@as(usize, 5), tree.node_count);
+    try std.testing.expectApproxEqAbs(@as(f64, @log(0.25)), tree.log_prob, 1e-12);
+    try std.testing.expectEqualSlices(u32, &[_]u32{ 0, 1, 2, 3, 1 }, labels[0..5]);
+    try std.testing.expectEqualSlices(u8, &[_]u8{ kind_binary, kind_lexical, kind_binary, kind_lexical, kind_lexical }, kinds[0..5]);
+}
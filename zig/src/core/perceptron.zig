@@ -1,4 +1,5 @@
 const std = @import("std");
+const ascii = @import("ascii.zig");
 
 pub const PerceptronError = error{
     InvalidDimensions,
@@ -6,6 +7,13 @@ pub const PerceptronError = error{
     InsufficientCapacity,
 };
 
+const score_lanes = std.simd.suggestVectorLength(f32) orelse 4;
+const ScoreVec = @Vector(score_lanes, f32);
+
+pub fn paddedTagCount(tag_count: usize) usize {
+    return std.mem.alignForward(usize, tag_count, score_lanes);
+}
+
 pub fn predictBatch(
     feature_ids: []const u32,
     token_offsets: []const u32,
@@ -14,6 +22,20 @@ pub fn predictBatch(
     tag_count: u32,
     out_tag_ids: []u16,
     allocator: std.mem.Allocator,
+) PerceptronError!void {
+    return predictBatchWeights(f32, feature_ids, token_offsets, weights, &.{}, model_feature_count, tag_count, out_tag_ids, allocator);
+}
+
+pub fn predictBatchWeights(
+    comptime T: type,
+    feature_ids: []const u32,
+    token_offsets: []const u32,
+    weights: []const T,
+    scales: []const f32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_tag_ids: []u16,
+    allocator: std.mem.Allocator,
 ) PerceptronError!void {
     if (tag_count == 0) return error.InvalidDimensions;
     if (token_offsets.len == 0) return;
@@ -23,37 +45,410 @@ pub fn predictBatch(
 
     const expected_weights = @as(usize, model_feature_count) * @as(usize, tag_count);
     if (weights.len < expected_weights) return error.InsufficientCapacity;
+    if (T == i8 and scales.len < model_feature_count) return error.InsufficientCapacity;
 
-    const scores = allocator.alloc(f32, @as(usize, tag_count)) catch return error.OutOfMemory;
+    const scores = allocator.alloc(f32, paddedTagCount(tag_count)) catch return error.OutOfMemory;
     defer allocator.free(scores);
 
     for (0..token_count) |token_idx| {
-        @memset(scores, 0);
         const start = token_offsets[token_idx];
         const end = token_offsets[token_idx + 1];
 
         if (start > end or end > feature_ids.len) return error.InsufficientCapacity;
 
-        for (@as(usize, start)..@as(usize, end)) |feature_idx| {
-            const feature_id = feature_ids[feature_idx];
-            if (feature_id >= model_feature_count) continue;
+        out_tag_ids[token_idx] = predictTagId(T, feature_ids[start..end], weights, scales, model_feature_count, tag_count, scores);
+    }
+}
 
-            const base = @as(usize, feature_id) * @as(usize, tag_count);
-            for (0..@as(usize, tag_count)) |tag_idx| {
-                scores[tag_idx] += weights[base + tag_idx];
-            }
+fn widenRow(comptime T: type, chunk: @Vector(score_lanes, T), scale: f32) ScoreVec {
+    return switch (T) {
+        f32 => chunk,
+        f16 => @floatCast(chunk),
+        i8 => @as(ScoreVec, @floatFromInt(chunk)) * @as(ScoreVec, @splat(scale)),
+        else => @compileError("unsupported perceptron weight type"),
+    };
+}
+
+// Tag rows are accumulated a vector at a time; the last partial row chunk is
+// zero-padded so `scores` (sized by paddedTagCount) never needs a scalar tail.
+fn accumulateRow(comptime T: type, scores: []f32, row: []const T, scale: f32) void {
+    var idx: usize = 0;
+    while (idx + score_lanes <= row.len) : (idx += score_lanes) {
+        const acc: ScoreVec = scores[idx..][0..score_lanes].*;
+        const chunk: @Vector(score_lanes, T) = row[idx..][0..score_lanes].*;
+        scores[idx..][0..score_lanes].* = acc + widenRow(T, chunk, scale);
+    }
+    if (idx < row.len) {
+        var tail = [_]T{0} ** score_lanes;
+        @memcpy(tail[0 .. row.len - idx], row[idx..]);
+        const acc: ScoreVec = scores[idx..][0..score_lanes].*;
+        scores[idx..][0..score_lanes].* = acc + widenRow(T, tail, scale);
+    }
+}
+
+fn predictTagId(
+    comptime T: type,
+    feature_ids: []const u32,
+    weights: []const T,
+    scales: []const f32,
+    model_feature_count: u32,
+    tag_count: usize,
+    scores: []f32,
+) u16 {
+    @memset(scores, 0);
+    for (feature_ids) |feature_id| {
+        if (feature_id >= model_feature_count) continue;
+
+        const base = @as(usize, feature_id) * tag_count;
+        const scale: f32 = if (T == i8) scales[feature_id] else 1.0;
+        accumulateRow(T, scores, weights[base .. base + tag_count], scale);
+    }
+
+    var best_id: u16 = 0;
+    var best_score: f32 = scores[0];
+    for (1..tag_count) |tag_idx| {
+        if (scores[tag_idx] > best_score) {
+            best_score = scores[tag_idx];
+            best_id = @as(u16, @intCast(tag_idx));
+        }
+    }
+    return best_id;
+}
+
+const FNV32_OFFSET: u32 = 0x811c9dc5;
+const FNV32_PRIME: u32 = 0x01000193;
+
+fn fnv32Update(hash: u32, ch: u8) u32 {
+    return (hash ^ @as(u32, ch)) *% FNV32_PRIME;
+}
+
+pub fn hashFeatureKey(key: []const u8) u32 {
+    var hash = FNV32_OFFSET;
+    for (key) |ch| hash = fnv32Update(hash, ch);
+    return hash;
+}
+
+pub const FeatureTable = struct {
+    strings: []const u8,
+    offsets: []const u32,
+    slots: []const u32,
+
+    fn keyEquals(self: FeatureTable, feature_id: u32, prefix: []const u8, body: []const u8, lower_body: bool) bool {
+        const idx = @as(usize, feature_id);
+        if (idx + 1 >= self.offsets.len) return false;
+        const start = @as(usize, self.offsets[idx]);
+        const end = @as(usize, self.offsets[idx + 1]);
+        if (start > end or end > self.strings.len) return false;
+        const key = self.strings[start..end];
+        if (key.len != prefix.len + body.len) return false;
+        if (!std.mem.eql(u8, key[0..prefix.len], prefix)) return false;
+        for (body, 0..) |ch, i| {
+            const expected = if (lower_body) ascii.asciiLower(ch) else ch;
+            if (key[prefix.len + i] != expected) return false;
         }
+        return true;
+    }
+
+    pub fn lookup(self: FeatureTable, prefix: []const u8, body: []const u8, lower_body: bool) ?u32 {
+        if (self.slots.len == 0) return null;
+        var hash = FNV32_OFFSET;
+        for (prefix) |ch| hash = fnv32Update(hash, ch);
+        for (body) |ch| hash = fnv32Update(hash, if (lower_body) ascii.asciiLower(ch) else ch);
+
+        const mask = self.slots.len - 1;
+        var slot = @as(usize, hash) & mask;
+        var probes: usize = 0;
+        while (probes < self.slots.len) : (probes += 1) {
+            const entry = self.slots[slot];
+            if (entry == 0) return null;
+            if (self.keyEquals(entry - 1, prefix, body, lower_body)) return entry - 1;
+            slot = (slot + 1) & mask;
+        }
+        return null;
+    }
+};
+
+pub const MAX_TOKEN_FEATURES = 14;
+
+fn boolText(value: bool) []const u8 {
+    return if (value) "True" else "False";
+}
+
+// Same templates, in the same order, as `featureKeys` in src/perceptron_tagger.ts.
+fn tokenFeatureIds(
+    doc: []const u8,
+    starts: []const u32,
+    lengths: []const u32,
+    token_idx: usize,
+    table: FeatureTable,
+    out: *[MAX_TOKEN_FEATURES]u32,
+) usize {
+    const start = @as(usize, starts[token_idx]);
+    const token = doc[start .. start + @as(usize, lengths[token_idx])];
+
+    var has_lower = false;
+    var has_digit = false;
+    var has_hyphen = false;
+    for (token) |ch| {
+        if (ch >= 'a' and ch <= 'z') has_lower = true;
+        if (std.ascii.isDigit(ch)) has_digit = true;
+        if (ch == '-') has_hyphen = true;
+    }
+    const is_title = token.len > 0 and token[0] >= 'A' and token[0] <= 'Z';
+
+    var prev: []const u8 = "<BOS>";
+    var prev_is_token = false;
+    if (token_idx > 0) {
+        const prev_start = @as(usize, starts[token_idx - 1]);
+        prev = doc[prev_start .. prev_start + @as(usize, lengths[token_idx - 1])];
+        prev_is_token = true;
+    }
+    var next: []const u8 = "<EOS>";
+    var next_is_token = false;
+    if (token_idx + 1 < starts.len) {
+        const next_start = @as(usize, starts[token_idx + 1]);
+        next = doc[next_start .. next_start + @as(usize, lengths[token_idx + 1])];
+        next_is_token = true;
+    }
+
+    const p1 = token[0..@min(token.len, 1)];
+    const p2 = token[0..@min(token.len, 2)];
+    const p3 = token[0..@min(token.len, 3)];
+    const s1 = token[token.len - @min(token.len, 1) ..];
+    const s2 = token[token.len - @min(token.len, 2) ..];
+    const s3 = token[token.len - @min(token.len, 3) ..];
+
+    const Part = struct { prefix: []const u8, body: []const u8, lower: bool };
+    const parts = [MAX_TOKEN_FEATURES]Part{
+        .{ .prefix = "bias", .body = "", .lower = false },
+        .{ .prefix = "w=", .body = token, .lower = true },
+        .{ .prefix = "p1=", .body = p1, .lower = true },
+        .{ .prefix = "p2=", .body = p2, .lower = true },
+        .{ .prefix = "p3=", .body = p3, .lower = true },
+        .{ .prefix = "s1=", .body = s1, .lower = true },
+        .{ .prefix = "s2=", .body = s2, .lower = true },
+        .{ .prefix = "s3=", .body = s3, .lower = true },
+        .{ .prefix = "prev=", .body = prev, .lower = prev_is_token },
+        .{ .prefix = "next=", .body = next, .lower = next_is_token },
+        .{ .prefix = "is_upper=", .body = boolText(!has_lower), .lower = false },
+        .{ .prefix = "is_title=", .body = boolText(is_title), .lower = false },
+        .{ .prefix = "has_digit=", .body = boolText(has_digit), .lower = false },
+        .{ .prefix = "has_hyphen=", .body = boolText(has_hyphen), .lower = false },
+    };
+
+    var written: usize = 0;
+    for (parts) |part| {
+        if (table.lookup(part.prefix, part.body, part.lower)) |feature_id| {
+            out[written] = feature_id;
+            written += 1;
+        }
+    }
+    return written;
+}
+
+fn validateDocOffsets(input: []const u8, doc_offsets: []const u32) PerceptronError!void {
+    for (0..doc_offsets.len - 1) |doc_idx| {
+        if (doc_offsets[doc_idx] > doc_offsets[doc_idx + 1]) return error.InvalidDimensions;
+    }
+    if (doc_offsets[doc_offsets.len - 1] > input.len) return error.InsufficientCapacity;
+}
+
+pub fn countTokensBatchAscii(input: []const u8, doc_offsets: []const u32) PerceptronError!u64 {
+    if (doc_offsets.len < 2) return 0;
+    try validateDocOffsets(input, doc_offsets);
+
+    var total: u64 = 0;
+    for (0..doc_offsets.len - 1) |doc_idx| {
+        total += ascii.tokenCountAscii(input[doc_offsets[doc_idx]..doc_offsets[doc_idx + 1]]);
+    }
+    return total;
+}
+
+pub fn tagBatchAscii(
+    input: []const u8,
+    doc_offsets: []const u32,
+    table: FeatureTable,
+    weights: []const f32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets: []u32,
+    out_token_starts: []u32,
+    out_token_lengths: []u32,
+    out_tag_ids: []u16,
+    allocator: std.mem.Allocator,
+) PerceptronError!u64 {
+    return tagBatchAsciiWeights(
+        f32,
+        input,
+        doc_offsets,
+        table,
+        weights,
+        &.{},
+        model_feature_count,
+        tag_count,
+        out_token_doc_offsets,
+        out_token_starts,
+        out_token_lengths,
+        out_tag_ids,
+        allocator,
+    );
+}
 
-        var best_id: u16 = 0;
-        var best_score: f32 = scores[0];
-        for (1..@as(usize, tag_count)) |tag_idx| {
-            if (scores[tag_idx] > best_score) {
-                best_score = scores[tag_idx];
-                best_id = @as(u16, @intCast(tag_idx));
+pub fn tagBatchAsciiWeights(
+    comptime T: type,
+    input: []const u8,
+    doc_offsets: []const u32,
+    table: FeatureTable,
+    weights: []const T,
+    scales: []const f32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets: []u32,
+    out_token_starts: []u32,
+    out_token_lengths: []u32,
+    out_tag_ids: []u16,
+    allocator: std.mem.Allocator,
+) PerceptronError!u64 {
+    if (tag_count == 0 or model_feature_count == 0) return error.InvalidDimensions;
+    if (table.slots.len == 0 or !std.math.isPowerOfTwo(table.slots.len)) return error.InvalidDimensions;
+    if (doc_offsets.len < 2) return 0;
+    try validateDocOffsets(input, doc_offsets);
+
+    const doc_count = doc_offsets.len - 1;
+    if (out_token_doc_offsets.len < doc_count + 1) return error.InsufficientCapacity;
+    if (out_token_starts.len != out_token_lengths.len or out_token_starts.len > out_tag_ids.len) {
+        return error.InsufficientCapacity;
+    }
+
+    const expected_weights = @as(usize, model_feature_count) * @as(usize, tag_count);
+    if (weights.len < expected_weights) return error.InsufficientCapacity;
+    if (T == i8 and scales.len < model_feature_count) return error.InsufficientCapacity;
+
+    const scores = allocator.alloc(f32, paddedTagCount(tag_count)) catch return error.OutOfMemory;
+    defer allocator.free(scores);
+
+    var fids: [MAX_TOKEN_FEATURES]u32 = undefined;
+    var cursor: usize = 0;
+    for (0..doc_count) |doc_idx| {
+        out_token_doc_offsets[doc_idx] = @as(u32, @intCast(cursor));
+        const doc = input[doc_offsets[doc_idx]..doc_offsets[doc_idx + 1]];
+        const total = ascii.fillTokenOffsetsAscii(doc, out_token_starts[cursor..], out_token_lengths[cursor..]);
+        const doc_token_count = @as(usize, @intCast(total));
+        if (cursor + doc_token_count > out_token_starts.len) return error.InsufficientCapacity;
+
+        const starts = out_token_starts[cursor .. cursor + doc_token_count];
+        const lengths = out_token_lengths[cursor .. cursor + doc_token_count];
+        for (0..doc_token_count) |token_idx| {
+            const feature_count = tokenFeatureIds(doc, starts, lengths, token_idx, table, &fids);
+            out_tag_ids[cursor + token_idx] = predictTagId(T, fids[0..feature_count], weights, scales, model_feature_count, tag_count, scores);
+        }
+        cursor += doc_token_count;
+    }
+    out_token_doc_offsets[doc_count] = @as(u32, @intCast(cursor));
+    return @as(u64, cursor);
+}
+
+pub fn nextShuffleState(state: u32) u32 {
+    var x = state;
+    x ^= x << 13;
+    x ^= x >> 17;
+    x ^= x << 5;
+    return x;
+}
+
+fn updateAveragedCell(weights: []f64, totals: []f64, stamps: []u32, cell: usize, instances: u32, delta: f64) void {
+    totals[cell] += @as(f64, @floatFromInt(instances - stamps[cell])) * weights[cell];
+    stamps[cell] = instances;
+    weights[cell] += delta;
+}
+
+pub fn trainAveraged(
+    feature_ids: []const u32,
+    token_offsets: []const u32,
+    gold_tag_ids: []const u16,
+    sentence_offsets: []const u32,
+    feature_count: u32,
+    tag_count: u32,
+    epochs: u32,
+    seed: u32,
+    out_weights: []f32,
+    allocator: std.mem.Allocator,
+) PerceptronError!void {
+    if (feature_count == 0 or tag_count == 0 or sentence_offsets.len == 0) return error.InvalidDimensions;
+    const token_count = gold_tag_ids.len;
+    if (token_offsets.len != token_count + 1) return error.InvalidDimensions;
+    if (token_offsets[token_count] > feature_ids.len) return error.InsufficientCapacity;
+    if (sentence_offsets[sentence_offsets.len - 1] > token_count) return error.InsufficientCapacity;
+
+    const cell_count = @as(usize, feature_count) * @as(usize, tag_count);
+    if (out_weights.len < cell_count) return error.InsufficientCapacity;
+    for (feature_ids[0..token_offsets[token_count]]) |feature_id| {
+        if (feature_id >= feature_count) return error.InvalidDimensions;
+    }
+    for (gold_tag_ids) |tag_id| {
+        if (tag_id >= tag_count) return error.InvalidDimensions;
+    }
+
+    const weights = allocator.alloc(f64, cell_count) catch return error.OutOfMemory;
+    defer allocator.free(weights);
+    const totals = allocator.alloc(f64, cell_count) catch return error.OutOfMemory;
+    defer allocator.free(totals);
+    const stamps = allocator.alloc(u32, cell_count) catch return error.OutOfMemory;
+    defer allocator.free(stamps);
+    const scores = allocator.alloc(f64, @as(usize, tag_count)) catch return error.OutOfMemory;
+    defer allocator.free(scores);
+    const sentence_count = sentence_offsets.len - 1;
+    const order = allocator.alloc(u32, sentence_count) catch return error.OutOfMemory;
+    defer allocator.free(order);
+
+    @memset(weights, 0);
+    @memset(totals, 0);
+    @memset(stamps, 0);
+    for (order, 0..) |*slot, idx| slot.* = @as(u32, @intCast(idx));
+
+    var state: u32 = if (seed == 0) 0x9e3779b9 else seed;
+    var instances: u32 = 0;
+    for (0..epochs) |_| {
+        var remaining = sentence_count;
+        while (remaining > 1) : (remaining -= 1) {
+            state = nextShuffleState(state);
+            const pick = state % @as(u32, @intCast(remaining));
+            std.mem.swap(u32, &order[remaining - 1], &order[pick]);
+        }
+
+        for (order) |sentence_idx| {
+            const first = sentence_offsets[sentence_idx];
+            const last = sentence_offsets[sentence_idx + 1];
+            if (first > last) return error.InvalidDimensions;
+            for (@as(usize, first)..@as(usize, last)) |token_idx| {
+                const feats = feature_ids[token_offsets[token_idx]..token_offsets[token_idx + 1]];
+                @memset(scores, 0);
+                for (feats) |feature_id| {
+                    const base = @as(usize, feature_id) * tag_count;
+                    for (0..tag_count) |tag_idx| scores[tag_idx] += weights[base + tag_idx];
+                }
+                var guess: usize = 0;
+                for (1..tag_count) |tag_idx| {
+                    if (scores[tag_idx] > scores[guess]) guess = tag_idx;
+                }
+
+                instances += 1;
+                const truth = @as(usize, gold_tag_ids[token_idx]);
+                if (truth == guess) continue;
+                for (feats) |feature_id| {
+                    const base = @as(usize, feature_id) * tag_count;
+                    updateAveragedCell(weights, totals, stamps, base + truth, instances, 1.0);
+                    updateAveragedCell(weights, totals, stamps, base + guess, instances, -1.0);
+                }
             }
         }
+    }
 
-        out_tag_ids[token_idx] = best_id;
+    const divisor = @as(f64, @floatFromInt(@max(instances, 1)));
+    for (0..cell_count) |cell| {
+        const total = totals[cell] + @as(f64, @floatFromInt(instances - stamps[cell])) * weights[cell];
+        const avg = total / divisor;
+        out_weights[cell] = if (@abs(avg) > 1e-6) @as(f32, @floatCast(avg)) else 0;
     }
 }
 
@@ -71,3 +466,137 @@ test "predict batch basic case" {
     try std.testing.expectEqual(@as(u16, 0), out[0]);
     try std.testing.expectEqual(@as(u16, 1), out[1]);
 }
+
+test "predict batch quantized weights match f32 on exact values" {
+    const allocator = std.testing.allocator;
+    const feature_ids = [_]u32{ 0, 1, 1, 2 };
+    const token_offsets = [_]u32{ 0, 1, 3, 4 };
+    const weights = [_]f32{
+        1.0, 0.0, 0.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.25,
+        0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+        0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 2.0,
+    };
+    const weights_f16 = [_]f16{
+        1.0, 0.0, 0.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.25,
+        0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+        0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 2.0,
+    };
+    const weights_i8 = [_]i8{
+        127, 0,   64, 0, 0, 0, 0, 0, 0, 32,
+        0,   127, 0,  0, 0, 0, 0, 0, 0, 0,
+        0,   0,   0,  0, 0, 0, 0, 0, 0, 127,
+    };
+    const scales = [_]f32{ 1.0 / 127.0, 1.0 / 127.0, 2.0 / 127.0 };
+
+    var expected = [_]u16{ 0, 0, 0 };
+    var out_f16 = [_]u16{ 0, 0, 0 };
+    var out_i8 = [_]u16{ 0, 0, 0 };
+    try predictBatch(&feature_ids, &token_offsets, &weights, 3, 10, &expected, allocator);
+    try predictBatchWeights(f16, &feature_ids, &token_offsets, &weights_f16, &.{}, 3, 10, &out_f16, allocator);
+    try predictBatchWeights(i8, &feature_ids, &token_offsets, &weights_i8, &scales, 3, 10, &out_i8, allocator);
+    try std.testing.expectEqualSlices(u16, &[_]u16{ 0, 1, 9 }, &expected);
+    try std.testing.expectEqualSlices(u16, &expected, &out_f16);
+    try std.testing.expectEqualSlices(u16, &expected, &out_i8);
+}
+
+test "train averaged learns separable tags deterministically" {
+    const allocator = std.testing.allocator;
+    const feature_ids = [_]u32{ 0, 1, 0, 2, 0, 1 };
+    const token_offsets = [_]u32{ 0, 2, 4, 6 };
+    const gold = [_]u16{ 0, 1, 0 };
+    const sentence_offsets = [_]u32{ 0, 2, 3 };
+
+    var first = [_]f32{0} ** 6;
+    var second = [_]f32{0} ** 6;
+    try trainAveraged(&feature_ids, &token_offsets, &gold, &sentence_offsets, 3, 2, 4, 7, &first, allocator);
+    try trainAveraged(&feature_ids, &token_offsets, &gold, &sentence_offsets, 3, 2, 4, 7, &second, allocator);
+    try std.testing.expectEqualSlices(f32, &first, &second);
+
+    var out = [_]u16{ 0, 0, 0 };
+    try predictBatch(&feature_ids, &token_offsets, &first, 3, 2, &out, allocator);
+    try std.testing.expectEqualSlices(u16, &gold, &out);
+}
+
+test "tag batch extracts features and predicts across documents" {
+    const allocator = std.testing.allocator;
+    const strings = "w=thew=dog";
+    const offsets = [_]u32{ 0, 5, 10 };
+    var slots = [_]u32{0} ** 16;
+    for ([_][]const u8{ "w=the", "w=dog" }, 0..) |key, fid| {
+        var slot = @as(usize, hashFeatureKey(key)) & (slots.len - 1);
+        while (slots[slot] != 0) slot = (slot + 1) & (slots.len - 1);
+        slots[slot] = @as(u32, @intCast(fid)) + 1;
+    }
+    const table = FeatureTable{ .strings = strings, .offsets = &offsets, .slots = &slots };
+    const weights = [_]f32{
+        1.0, 0.0,
+        0.0, 1.0,
+    };
+
+    const input = "The dog.dog the";
+    const doc_offsets = [_]u32{ 0, 8, 15 };
+    try std.testing.expectEqual(@as(u64, 4), try countTokensBatchAscii(input, &doc_offsets));
+
+    var token_doc_offsets = [_]u32{0} ** 3;
+    var starts = [_]u32{0} ** 4;
+    var lengths = [_]u32{0} ** 4;
+    var tag_ids = [_]u16{0} ** 4;
+    const total = try tagBatchAscii(
+        input,
+        &doc_offsets,
+        table,
+        &weights,
+        2,
+        2,
+        &token_doc_offsets,
+        &starts,
+        &lengths,
+        &tag_ids,
+        allocator,
+    );
+    try std.testing.expectEqual(@as(u64, 4), total);
+    try std.testing.expectEqualSlices(u32, &[_]u32{ 0, 2, 4 }, &token_doc_offsets);
+    try std.testing.expectEqualSlices(u32, &[_]u32{ 0, 4, 0, 4 }, &starts);
+    try std.testing.expectEqualSlices(u16, &[_]u16{ 0, 1, 1, 0 }, &tag_ids);
+}
+
+test "tag batch quantized weights match f32 tags" {
+    const allocator = std.testing.allocator;
+    const strings = "w=thew=dog";
+    const offsets = [_]u32{ 0, 5, 10 };
+    var slots = [_]u32{0} ** 16;
+    for ([_][]const u8{ "w=the", "w=dog" }, 0..) |key, fid| {
+        var slot = @as(usize, hashFeatureKey(key)) & (slots.len - 1);
+        while (slots[slot] != 0) slot = (slot + 1) & (slots.len - 1);
+        slots[slot] = @as(u32, @intCast(fid)) + 1;
+    }
+    const table = FeatureTable{ .strings = strings, .offsets = &offsets, .slots = &slots };
+    const weights_f16 = [_]f16{
+        1.0, 0.0,
+        0.0, 1.0,
+    };
+    const weights_i8 = [_]i8{
+        127, 0,
+        0,   127,
+    };
+    const scales = [_]f32{ 1.0 / 127.0, 1.0 / 127.0 };
+
+    const input = "The dog.dog the";
+    const doc_offsets = [_]u32{ 0, 8, 15 };
+    var token_doc_offsets = [_]u32{0} ** 3;
+    var starts = [_]u32{0} ** 4;
+    var lengths = [_]u32{0} ** 4;
+    var tag_ids = [_]u16{0} ** 4;
+
+    _ = try tagBatchAsciiWeights(f16, input, &doc_offsets, table, &weights_f16, &.{}, 2, 2, &token_doc_offsets, &starts, &lengths, &tag_ids, allocator);
+    try std.testing.expectEqualSlices(u16, &[_]u16{ 0, 1, 1, 0 }, &tag_ids);
+
+    @memset(&tag_ids, 0);
+    _ = try tagBatchAsciiWeights(i8, input, &doc_offsets, table, &weights_i8, &scales, 2, 2, &token_doc_offsets, &starts, &lengths, &tag_ids, allocator);
+    try std.testing.expectEqualSlices(u16, &[_]u16{ 0, 1, 1, 0 }, &tag_ids);
+
+    try std.testing.expectError(
+        error.InsufficientCapacity,
+        tagBatchAsciiWeights(i8, input, &doc_offsets, table, &weights_i8, scales[0..1], 2, 2, &token_doc_offsets, &starts, &lengths, &tag_ids, allocator),
+    );
+}
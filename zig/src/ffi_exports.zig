@@ -11,11 +11,15 @@ const tagger = @import("core/tagger.zig");
 const stream_freqdist = @import("core/stream_freqdist.zig");
 const punkt = @import("core/punkt.zig");
 const morphy = @import("core/morphy.zig");
+const fuzzy = @import("core/fuzzy.zig");
+const pcfg = @import("core/pcfg.zig");
 const lm = @import("core/lm.zig");
 const chunk = @import("core/chunk.zig");
 const cyk = @import("core/cyk.zig");
+const earley = @import("core/earley.zig");
 const naive_bayes = @import("core/naive_bayes.zig");
 const linear = @import("core/linear.zig");
+const features = @import("core/features.zig");
 const types = @import("core/types.zig");
 const error_state = @import("core/error_state.zig");
 
@@ -755,6 +759,315 @@ pub export fn bunnltk_perceptron_predict_batch(
     };
 }
 
+pub export fn bunnltk_perceptron_predict_batch_f16(
+    feature_ids_ptr: [*]const u32,
+    feature_ids_len: usize,
+    token_offsets_ptr: [*]const u32,
+    token_offsets_len: usize,
+    weights_ptr: [*]const f16,
+    weights_len: usize,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_tag_ids_ptr: [*]u16,
+    out_tag_ids_len: usize,
+) void {
+    error_state.resetError();
+    if (token_offsets_len == 0) return;
+    if (feature_ids_len == 0 or weights_len == 0 or out_tag_ids_len == 0) {
+        error_state.setError(.insufficient_capacity);
+        return;
+    }
+
+    perceptron.predictBatchWeights(
+        f16,
+        feature_ids_ptr[0..feature_ids_len],
+        token_offsets_ptr[0..token_offsets_len],
+        weights_ptr[0..weights_len],
+        &.{},
+        model_feature_count,
+        tag_count,
+        out_tag_ids_ptr[0..out_tag_ids_len],
+        std.heap.c_allocator,
+    ) catch |err| setPerceptronError(err);
+}
+
+pub export fn bunnltk_perceptron_predict_batch_i8(
+    feature_ids_ptr: [*]const u32,
+    feature_ids_len: usize,
+    token_offsets_ptr: [*]const u32,
+    token_offsets_len: usize,
+    weights_ptr: [*]const i8,
+    weights_len: usize,
+    scales_ptr: [*]const f32,
+    scales_len: usize,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_tag_ids_ptr: [*]u16,
+    out_tag_ids_len: usize,
+) void {
+    error_state.resetError();
+    if (token_offsets_len == 0) return;
+    if (feature_ids_len == 0 or weights_len == 0 or scales_len == 0 or out_tag_ids_len == 0) {
+        error_state.setError(.insufficient_capacity);
+        return;
+    }
+
+    perceptron.predictBatchWeights(
+        i8,
+        feature_ids_ptr[0..feature_ids_len],
+        token_offsets_ptr[0..token_offsets_len],
+        weights_ptr[0..weights_len],
+        scales_ptr[0..scales_len],
+        model_feature_count,
+        tag_count,
+        out_tag_ids_ptr[0..out_tag_ids_len],
+        std.heap.c_allocator,
+    ) catch |err| setPerceptronError(err);
+}
+
+pub export fn bunnltk_perceptron_train_averaged(
+    feature_ids_ptr: [*]const u32,
+    feature_ids_len: usize,
+    token_offsets_ptr: [*]const u32,
+    token_offsets_len: usize,
+    gold_tag_ids_ptr: [*]const u16,
+    gold_tag_ids_len: usize,
+    sentence_offsets_ptr: [*]const u32,
+    sentence_offsets_len: usize,
+    feature_count: u32,
+    tag_count: u32,
+    epochs: u32,
+    seed: u32,
+    out_weights_ptr: [*]f32,
+    out_weights_len: usize,
+) void {
+    error_state.resetError();
+    if (feature_ids_len == 0 or token_offsets_len == 0 or gold_tag_ids_len == 0 or sentence_offsets_len == 0 or out_weights_len == 0) {
+        error_state.setError(.insufficient_capacity);
+        return;
+    }
+
+    perceptron.trainAveraged(
+        feature_ids_ptr[0..feature_ids_len],
+        token_offsets_ptr[0..token_offsets_len],
+        gold_tag_ids_ptr[0..gold_tag_ids_len],
+        sentence_offsets_ptr[0..sentence_offsets_len],
+        feature_count,
+        tag_count,
+        epochs,
+        seed,
+        out_weights_ptr[0..out_weights_len],
+        std.heap.c_allocator,
+    ) catch |err| setPerceptronError(err);
+}
+
+fn setPerceptronError(err: perceptron.PerceptronError) void {
+    switch (err) {
+        error.InvalidDimensions => error_state.setError(.invalid_n),
+        error.OutOfMemory => error_state.setError(.out_of_memory),
+        error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+    }
+}
+
+pub export fn bunnltk_count_tokens_batch_ascii(
+    input_ptr: [*]const u8,
+    input_len: usize,
+    doc_offsets_ptr: [*]const u32,
+    doc_offsets_len: usize,
+) u64 {
+    error_state.resetError();
+    if (doc_offsets_len < 2) return 0;
+    return perceptron.countTokensBatchAscii(input_ptr[0..input_len], doc_offsets_ptr[0..doc_offsets_len]) catch |err| {
+        setPerceptronError(err);
+        return 0;
+    };
+}
+
+pub export fn bunnltk_perceptron_tag_batch_ascii(
+    input_ptr: [*]const u8,
+    input_len: usize,
+    doc_offsets_ptr: [*]const u32,
+    doc_offsets_len: usize,
+    feature_strings_ptr: [*]const u8,
+    feature_strings_len: usize,
+    feature_string_offsets_ptr: [*]const u32,
+    feature_string_offsets_len: usize,
+    feature_slots_ptr: [*]const u32,
+    feature_slots_len: usize,
+    weights_ptr: [*]const f32,
+    weights_len: usize,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets_ptr: [*]u32,
+    out_token_doc_offsets_len: usize,
+    out_token_starts_ptr: [*]u32,
+    out_token_lengths_ptr: [*]u32,
+    out_tag_ids_ptr: [*]u16,
+    capacity: usize,
+) u64 {
+    error_state.resetError();
+    if (doc_offsets_len < 2) return 0;
+
+    return perceptron.tagBatchAscii(
+        input_ptr[0..input_len],
+        doc_offsets_ptr[0..doc_offsets_len],
+        .{
+            .strings = feature_strings_ptr[0..feature_strings_len],
+            .offsets = feature_string_offsets_ptr[0..feature_string_offsets_len],
+            .slots = feature_slots_ptr[0..feature_slots_len],
+        },
+        weights_ptr[0..weights_len],
+        model_feature_count,
+        tag_count,
+        out_token_doc_offsets_ptr[0..out_token_doc_offsets_len],
+        out_token_starts_ptr[0..capacity],
+        out_token_lengths_ptr[0..capacity],
+        out_tag_ids_ptr[0..capacity],
+        std.heap.c_allocator,
+    ) catch |err| {
+        setPerceptronError(err);
+        return 0;
+    };
+}
+
+pub export fn bunnltk_perceptron_tag_batch_ascii_f16(
+    input_ptr: [*]const u8,
+    input_len: usize,
+    doc_offsets_ptr: [*]const u32,
+    doc_offsets_len: usize,
+    feature_strings_ptr: [*]const u8,
+    feature_strings_len: usize,
+    feature_string_offsets_ptr: [*]const u32,
+    feature_string_offsets_len: usize,
+    feature_slots_ptr: [*]const u32,
+    feature_slots_len: usize,
+    weights_ptr: [*]const f16,
+    weights_len: usize,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets_ptr: [*]u32,
+    out_token_doc_offsets_len: usize,
+    out_token_starts_ptr: [*]u32,
+    out_token_lengths_ptr: [*]u32,
+    out_tag_ids_ptr: [*]u16,
+    capacity: usize,
+) u64 {
+    error_state.resetError();
+    if (doc_offsets_len < 2) return 0;
+
+    return perceptron.tagBatchAsciiWeights(
+        f16,
+        input_ptr[0..input_len],
+        doc_offsets_ptr[0..doc_offsets_len],
+        .{
+            .strings = feature_strings_ptr[0..feature_strings_len],
+            .offsets = feature_string_offsets_ptr[0..feature_string_offsets_len],
+            .slots = feature_slots_ptr[0..feature_slots_len],
+        },
+        weights_ptr[0..weights_len],
+        &.{},
+        model_feature_count,
+        tag_count,
+        out_token_doc_offsets_ptr[0..out_token_doc_offsets_len],
+        out_token_starts_ptr[0..capacity],
+        out_token_lengths_ptr[0..capacity],
+        out_tag_ids_ptr[0..capacity],
+        std.heap.c_allocator,
+    ) catch |err| {
+        setPerceptronError(err);
+        return 0;
+    };
+}
+
+pub export fn bunnltk_perceptron_tag_batch_ascii_i8(
+    input_ptr: [*]const u8,
+    input_len: usize,
+    doc_offsets_ptr: [*]const u32,
+    doc_offsets_len: usize,
+    feature_strings_ptr: [*]const u8,
+    feature_strings_len: usize,
+    feature_string_offsets_ptr: [*]const u32,
+    feature_string_offsets_len: usize,
+    feature_slots_ptr: [*]const u32,
+    feature_slots_len: usize,
+    weights_ptr: [*]const i8,
+    weights_len: usize,
+    scales_ptr: [*]const f32,
+    scales_len: usize,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets_ptr: [*]u32,
+    out_token_doc_offsets_len: usize,
+    out_token_starts_ptr: [*]u32,
+    out_token_lengths_ptr: [*]u32,
+    out_tag_ids_ptr: [*]u16,
+    capacity: usize,
+) u64 {
+    error_state.resetError();
+    if (doc_offsets_len < 2) return 0;
+
+    return perceptron.tagBatchAsciiWeights(
+        i8,
+        input_ptr[0..input_len],
+        doc_offsets_ptr[0..doc_offsets_len],
+        .{
+            .strings = feature_strings_ptr[0..feature_strings_len],
+            .offsets = feature_string_offsets_ptr[0..feature_string_offsets_len],
+            .slots = feature_slots_ptr[0..feature_slots_len],
+        },
+        weights_ptr[0..weights_len],
+        scales_ptr[0..scales_len],
+        model_feature_count,
+        tag_count,
+        out_token_doc_offsets_ptr[0..out_token_doc_offsets_len],
+        out_token_starts_ptr[0..capacity],
+        out_token_lengths_ptr[0..capacity],
+        out_tag_ids_ptr[0..capacity],
+        std.heap.c_allocator,
+    ) catch |err| {
+        setPerceptronError(err);
+        return 0;
+    };
+}
+
+pub export fn bunnltk_hash_ngram_features_batch_ascii(
+    input_ptr: [*]const u8,
+    input_len: usize,
+    doc_offsets_ptr: [*]const u32,
+    doc_offsets_len: usize,
+    ngram_min: u32,
+    ngram_max: u32,
+    dimension: u32,
+    signed: u32,
+    binary: u32,
+    out_doc_offsets_ptr: [*]u32,
+    out_ids_ptr: [*]u32,
+    out_values_ptr: [*]f64,
+    capacity: usize,
+) u64 {
+    error_state.resetError();
+    if (doc_offsets_len == 0) {
+        error_state.setError(.invalid_n);
+        return 0;
+    }
+    return features.hashNgramFeaturesBatchAscii(
+        input_ptr[0..input_len],
+        doc_offsets_ptr[0..doc_offsets_len],
+        .{ .ngram_min = ngram_min, .ngram_max = ngram_max, .dimension = dimension, .signed = signed != 0, .binary = binary != 0 },
+        out_doc_offsets_ptr[0..doc_offsets_len],
+        out_ids_ptr[0..capacity],
+        out_values_ptr[0..capacity],
+        std.heap.c_allocator,
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
+        }
+        return 0;
+    };
+}
+
 pub export fn bunnltk_freqdist_stream_new() u64 {
     error_state.resetError();
     const stream = stream_freqdist.StreamFreqDistBuilder.create(std.heap.c_allocator) catch |err| {
@@ -987,6 +1300,114 @@ pub export fn bunnltk_wordnet_morphy_ascii(
     return @intCast(written);
 }
 
+fn lemmaSetPtrFromHandle(handle: u64) ?*morphy.LemmaSet {
+    if (handle == 0) return null;
+    return @as(*morphy.LemmaSet, @ptrFromInt(@as(usize, @intCast(handle))));
+}
+
+pub export fn bunnltk_wordnet_lemma_set_new(
+    bytes_ptr: [*]const u8,
+    bytes_len: usize,
+    offsets_ptr: [*]const u32,
+    pos_masks_ptr: [*]const u8,
+    count: usize,
+) u64 {
+    error_state.resetError();
+    const offsets = offsets_ptr[0 .. count + 1];
+    if (offsets[count] > bytes_len) {
+        error_state.setError(.invalid_n);
+        return 0;
+    }
+    const set = morphy.LemmaSet.create(std.heap.c_allocator, bytes_ptr[0..bytes_len], offsets, pos_masks_ptr[0..count]) catch {
+        error_state.setError(.out_of_memory);
+        return 0;
+    };
+    return @as(u64, @intCast(@intFromPtr(set)));
+}
+
+pub export fn bunnltk_wordnet_lemma_set_free(handle: u64) void {
+    error_state.resetError();
+    const set = lemmaSetPtrFromHandle(handle) orelse {
+        error_state.setError(.insufficient_capacity);
+        return;
+    };
+    set.destroy();
+}
+
+pub export fn bunnltk_wordnet_morphy_batch_ascii(
+    handle: u64,
+    input_ptr: [*]const u8,
+    input_len: usize,
+    offsets_ptr: [*]const u32,
+    pos_ptr: [*]const u32,
+    count: usize,
+    out_ptr: [*]u8,
+    out_capacity: usize,
+    out_offsets_ptr: [*]u32,
+) u64 {
+    error_state.resetError();
+    const set = lemmaSetPtrFromHandle(handle) orelse {
+        error_state.setError(.insufficient_capacity);
+        return 0;
+    };
+    const offsets = offsets_ptr[0 .. count + 1];
+    if (offsets[count] > input_len) {
+        error_state.setError(.invalid_n);
+        return 0;
+    }
+    const written = morphy.lemmaBatchAscii(
+        set,
+        input_ptr[0..input_len],
+        offsets,
+        pos_ptr[0..count],
+        out_ptr[0..out_capacity],
+        out_offsets_ptr[0 .. count + 1],
+    ) catch {
+        error_state.setError(.insufficient_capacity);
+        return 0;
+    };
+    return @intCast(written);
+}
+
+pub export fn bunnltk_osa_distance_ids_ascii(
+    query_ptr: [*]const u8,
+    query_len: usize,
+    term_bytes_ptr: [*]const u8,
+    term_bytes_len: usize,
+    term_offsets_ptr: [*]const u32,
+    term_count: usize,
+    ids_ptr: [*]const u32,
+    id_count: usize,
+    max_distance: u32,
+    out_ptr: [*]u32,
+) void {
+    error_state.resetError();
+    if (id_count == 0) return;
+    const term_offsets = term_offsets_ptr[0 .. term_count + 1];
+    if (term_offsets[term_count] > term_bytes_len) {
+        error_state.setError(.invalid_n);
+        return;
+    }
+    const ids = ids_ptr[0..id_count];
+    for (ids) |id| {
+        if (id >= term_count) {
+            error_state.setError(.invalid_n);
+            return;
+        }
+    }
+    fuzzy.osaDistanceIds(
+        query_ptr[0..query_len],
+        term_bytes_ptr[0..term_bytes_len],
+        term_offsets,
+        ids,
+        max_distance,
+        out_ptr[0..id_count],
+        std.heap.c_allocator,
+    ) catch {
+        error_state.setError(.out_of_memory);
+    };
+}
+
 fn lmModelTypeFromU32(value: u32) lm.ModelType {
     return switch (value) {
         0 => .mle,
@@ -1096,16 +1517,82 @@ pub export fn bunnltk_chunk_iob_ids(
         rule_label_ids_ptr[0..rule_count],
         out_label_ids_ptr[0..out_capacity],
         out_begin_ptr[0..out_capacity],
-    );
-    if (written == 0 and token_count > 0) {
-        error_state.setError(.invalid_n);
+        std.heap.c_allocator,
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
+        }
+        return 0;
+    };
+    return written;
+}
+
+pub export fn bunnltk_chunk_iob_ids_batch(
+    token_tag_ids_ptr: [*]const u16,
+    token_count: usize,
+    sentence_offsets_ptr: [*]const u32,
+    sentence_count: usize,
+    atom_allowed_offsets_ptr: [*]const u32,
+    atom_allowed_lengths_ptr: [*]const u32,
+    atom_allowed_flat_ptr: [*]const u16,
+    atom_allowed_flat_len: usize,
+    atom_mins_ptr: [*]const u8,
+    atom_maxs_ptr: [*]const u8,
+    atom_count: usize,
+    rule_atom_offsets_ptr: [*]const u32,
+    rule_atom_counts_ptr: [*]const u32,
+    rule_label_ids_ptr: [*]const u16,
+    rule_count: usize,
+    out_label_ids_ptr: [*]u16,
+    out_begin_ptr: [*]u8,
+    out_capacity: usize,
+) u64 {
+    error_state.resetError();
+    if (token_count == 0) return 0;
+    if (out_capacity < token_count) {
+        error_state.setError(.insufficient_capacity);
+        return 0;
+    }
+    if (rule_count == 0 or atom_count == 0) {
+        var i: usize = 0;
+        while (i < token_count) : (i += 1) {
+            out_label_ids_ptr[i] = std.math.maxInt(u16);
+            out_begin_ptr[i] = 0;
+        }
+        return @intCast(token_count);
     }
+
+    const written = chunk.fillChunkIobIdsBatch(
+        token_tag_ids_ptr[0..token_count],
+        sentence_offsets_ptr[0 .. sentence_count + 1],
+        atom_allowed_offsets_ptr[0..atom_count],
+        atom_allowed_lengths_ptr[0..atom_count],
+        atom_allowed_flat_ptr[0..atom_allowed_flat_len],
+        atom_mins_ptr[0..atom_count],
+        atom_maxs_ptr[0..atom_count],
+        rule_atom_offsets_ptr[0..rule_count],
+        rule_atom_counts_ptr[0..rule_count],
+        rule_label_ids_ptr[0..rule_count],
+        out_label_ids_ptr[0..out_capacity],
+        out_begin_ptr[0..out_capacity],
+        std.heap.c_allocator,
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
+        }
+        return 0;
+    };
     return written;
 }
 
 pub export fn bunnltk_cyk_recognize_ids(
     token_bits_ptr: [*]const u64,
     token_count: usize,
+    word_count: usize,
     binary_left_ptr: [*]const u16,
     binary_right_ptr: [*]const u16,
     binary_parent_ptr: [*]const u16,
@@ -1117,12 +1604,13 @@ pub export fn bunnltk_cyk_recognize_ids(
 ) u32 {
     error_state.resetError();
     if (token_count == 0) return 0;
-    if (start_symbol >= 64) {
+    if (word_count == 0 or word_count > cyk.max_words or start_symbol >= word_count * 64) {
         error_state.setError(.invalid_n);
         return 0;
     }
     const ok = cyk.cykRecognize(
-        token_bits_ptr[0..token_count],
+        token_bits_ptr[0 .. token_count * word_count],
+        word_count,
         binary_left_ptr[0..binary_count],
         binary_right_ptr[0..binary_count],
         binary_parent_ptr[0..binary_count],
@@ -1139,6 +1627,100 @@ pub export fn bunnltk_cyk_recognize_ids(
     return if (ok) 1 else 0;
 }
 
+pub export fn bunnltk_earley_recognize_ids(
+    token_symbols_ptr: [*]const u32,
+    token_count: usize,
+    nonterminal_count: usize,
+    item_next_ptr: [*]const u32,
+    item_lhs_ptr: [*]const u32,
+    item_count: usize,
+    predict_offsets_ptr: [*]const u32,
+    predict_items_ptr: [*]const u32,
+    predict_count: usize,
+    start_symbol: u32,
+) u32 {
+    error_state.resetError();
+    if (token_count == 0) return 0;
+    const grammar = earley.EarleyGrammar{
+        .nonterminal_count = nonterminal_count,
+        .item_next = item_next_ptr[0..item_count],
+        .item_lhs = item_lhs_ptr[0..item_count],
+        .predict_offsets = predict_offsets_ptr[0 .. nonterminal_count + 1],
+        .predict_items = predict_items_ptr[0..predict_count],
+    };
+    const ok = earley.earleyRecognize(
+        token_symbols_ptr[0..token_count],
+        grammar,
+        start_symbol,
+        std.heap.c_allocator,
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
+        }
+        return 0;
+    };
+    return if (ok) 1 else 0;
+}
+
+pub export fn bunnltk_pcfg_viterbi_parse(
+    token_count: usize,
+    symbol_count: usize,
+    lex_offsets_ptr: [*]const u32,
+    lex_symbols_ptr: [*]const u32,
+    lex_logprobs_ptr: [*]const f64,
+    lex_count: usize,
+    unary_child_ptr: [*]const u32,
+    unary_parent_ptr: [*]const u32,
+    unary_logprobs_ptr: [*]const f64,
+    unary_count: usize,
+    binary_left_ptr: [*]const u32,
+    binary_right_ptr: [*]const u32,
+    binary_parent_ptr: [*]const u32,
+    binary_logprobs_ptr: [*]const f64,
+    binary_count: usize,
+    start_symbol: u32,
+    out_labels_ptr: [*]u32,
+    out_kinds_ptr: [*]u8,
+    out_starts_ptr: [*]u32,
+    out_capacity: usize,
+    out_logprob_ptr: [*]f64,
+) u64 {
+    error_state.resetError();
+    if (token_count == 0) return 0;
+    const grammar = pcfg.ViterbiGrammar{
+        .symbol_count = symbol_count,
+        .unary_child = unary_child_ptr[0..unary_count],
+        .unary_parent = unary_parent_ptr[0..unary_count],
+        .unary_logprob = unary_logprobs_ptr[0..unary_count],
+        .binary_left = binary_left_ptr[0..binary_count],
+        .binary_right = binary_right_ptr[0..binary_count],
+        .binary_parent = binary_parent_ptr[0..binary_count],
+        .binary_logprob = binary_logprobs_ptr[0..binary_count],
+    };
+    const tree = pcfg.viterbiParse(
+        token_count,
+        lex_offsets_ptr[0 .. token_count + 1],
+        lex_symbols_ptr[0..lex_count],
+        lex_logprobs_ptr[0..lex_count],
+        grammar,
+        start_symbol,
+        out_labels_ptr[0..out_capacity],
+        out_kinds_ptr[0..out_capacity],
+        out_starts_ptr[0..out_capacity],
+        std.heap.c_allocator,
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
+        }
+        return 0;
+    };
+    out_logprob_ptr[0] = tree.log_prob;
+    return @intCast(tree.node_count);
+}
+
 pub export fn bunnltk_naive_bayes_log_scores_ids(
     doc_token_ids_ptr: [*]const u32,
     doc_token_count: usize,
@@ -1170,6 +1752,44 @@ pub export fn bunnltk_naive_bayes_log_scores_ids(
     );
 }
 
+pub export fn bunnltk_naive_bayes_sparse_log_scores_batch(
+    doc_offsets_ptr: [*]const u32,
+    doc_count: usize,
+    doc_token_ids_ptr: [*]const u32,
+    doc_token_count: usize,
+    token_starts_ptr: [*]const u32,
+    token_lengths_ptr: [*]const u32,
+    vocab_size: usize,
+    entry_label_ids_ptr: [*]const u32,
+    entry_log_deltas_ptr: [*]const f64,
+    entry_count: usize,
+    label_prior_logs_ptr: [*]const f64,
+    label_default_logs_ptr: [*]const f64,
+    label_count: usize,
+    out_scores_ptr: [*]f64,
+    out_scores_len: usize,
+) void {
+    error_state.resetError();
+    naive_bayes.sparseLogScoresBatch(
+        doc_offsets_ptr[0 .. doc_count + 1],
+        doc_token_ids_ptr[0..doc_token_count],
+        .{
+            .token_starts = token_starts_ptr[0..vocab_size],
+            .token_lengths = token_lengths_ptr[0..vocab_size],
+            .entry_label_ids = entry_label_ids_ptr[0..entry_count],
+            .entry_log_deltas = entry_log_deltas_ptr[0..entry_count],
+            .label_prior_logs = label_prior_logs_ptr[0..label_count],
+            .label_default_logs = label_default_logs_ptr[0..label_count],
+        },
+        out_scores_ptr[0..out_scores_len],
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+        }
+    };
+}
+
 pub export fn bunnltk_linear_scores_sparse_ids(
     doc_offsets_ptr: [*]const u32,
     doc_offsets_len: usize,
@@ -1209,6 +1829,106 @@ pub export fn bunnltk_linear_scores_sparse_ids(
     };
 }
 
+pub export fn bunnltk_linear_scores_sparse_ids_feature_major(
+    doc_offsets_ptr: [*]const u32,
+    doc_offsets_len: usize,
+    feature_ids_ptr: [*]const u32,
+    feature_ids_len: usize,
+    feature_values_ptr: [*]const f64,
+    feature_values_len: usize,
+    class_count: u32,
+    feature_count: u32,
+    weights_ptr: [*]const f64,
+    weights_len: usize,
+    bias_ptr: [*]const f64,
+    bias_len: usize,
+    out_scores_ptr: [*]f64,
+    out_scores_len: usize,
+) void {
+    error_state.resetError();
+    if (doc_offsets_len < 1 or class_count == 0) {
+        error_state.setError(.invalid_n);
+        return;
+    }
+
+    linear.scoresSparseIdsFeatureMajor(
+        doc_offsets_ptr[0..doc_offsets_len],
+        feature_ids_ptr[0..feature_ids_len],
+        feature_values_ptr[0..feature_values_len],
+        class_count,
+        feature_count,
+        weights_ptr[0..weights_len],
+        bias_ptr[0..bias_len],
+        out_scores_ptr[0..out_scores_len],
+    ) catch |err| {
+        switch (err) {
+            error.InvalidDimensions => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+        }
+    };
+}
+
+pub export fn bunnltk_linear_train_sgd_sparse(
+    doc_offsets_ptr: [*]const u32,
+    doc_offsets_len: usize,
+    feature_ids_ptr: [*]const u32,
+    feature_values_ptr: [*]const f64,
+    nnz_len: usize,
+    labels_ptr: [*]const u32,
+    labels_len: usize,
+    class_count: u32,
+    feature_count: u32,
+    loss: u32,
+    epochs: u32,
+    batch_size: u32,
+    learning_rate: f64,
+    l2: f64,
+    margin: f64,
+    seed: u32,
+    validation_count: u32,
+    patience: u32,
+    weights_ptr: [*]f64,
+    weights_len: usize,
+    bias_ptr: [*]f64,
+    bias_len: usize,
+) u32 {
+    error_state.resetError();
+    if (doc_offsets_len < 2 or class_count == 0 or loss > @intFromEnum(linear.SgdLoss.hinge)) {
+        error_state.setError(.invalid_n);
+        return 0;
+    }
+
+    return linear.trainSgdSparse(
+        doc_offsets_ptr[0..doc_offsets_len],
+        feature_ids_ptr[0..nnz_len],
+        feature_values_ptr[0..nnz_len],
+        labels_ptr[0..labels_len],
+        class_count,
+        feature_count,
+        .{
+            .loss = @enumFromInt(loss),
+            .epochs = epochs,
+            .batch_size = batch_size,
+            .learning_rate = learning_rate,
+            .l2 = l2,
+            .margin = margin,
+            .seed = seed,
+            .validation_count = validation_count,
+            .patience = patience,
+        },
+        weights_ptr[0..weights_len],
+        bias_ptr[0..bias_len],
+        std.heap.c_allocator,
+    ) catch |err| {
+        switch (err) {
+            error.InvalidDimensions => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
+        }
+        return 0;
+    };
+}
+
 test "ffi error behavior" {
     const input = "abc";
     _ = bunnltk_count_unique_ngrams_ascii(input.ptr, input.len, 0);
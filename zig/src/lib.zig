@@ -16,10 +16,14 @@ test {
     _ = @import("core/tagger.zig");
     _ = @import("core/punkt.zig");
     _ = @import("core/morphy.zig");
+    _ = @import("core/fuzzy.zig");
     _ = @import("core/lm.zig");
     _ = @import("core/chunk.zig");
     _ = @import("core/cyk.zig");
+    _ = @import("core/earley.zig");
+    _ = @import("core/pcfg.zig");
     _ = @import("core/naive_bayes.zig");
     _ = @import("core/linear.zig");
+    _ = @import("core/features.zig");
     _ = @import("ffi_exports.zig");
 }
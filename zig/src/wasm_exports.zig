@@ -9,6 +9,7 @@ const lm = @import("core/lm.zig");
 const chunk = @import("core/chunk.zig");
 const cyk = @import("core/cyk.zig");
 const naive_bayes = @import("core/naive_bayes.zig");
+const features = @import("core/features.zig");
 const error_state = @import("core/error_state.zig");
 
 var input_buffer: [128 * 1024 * 1024]u8 = undefined;
@@ -198,37 +199,329 @@ pub export fn bunnltk_wasm_fill_normalized_token_offsets_ascii(
     return total;
 }
 
-pub export fn bunnltk_wasm_perceptron_predict_batch(
+fn perceptronPredictBatchWeights(
+    comptime T: type,
     feature_ids_ptr: u32,
     feature_ids_len: u32,
     token_offsets_ptr: u32,
     token_count: u32,
     weights_ptr: u32,
+    scales_ptr: u32,
     model_feature_count: u32,
     tag_count: u32,
     out_tag_ids_ptr: u32,
 ) void {
     error_state.resetError();
     if (token_count == 0 or tag_count == 0) return;
-    if (feature_ids_ptr == 0 or token_offsets_ptr == 0 or weights_ptr == 0 or out_tag_ids_ptr == 0) {
+    if (feature_ids_ptr == 0 or token_offsets_ptr == 0 or weights_ptr == 0 or out_tag_ids_ptr == 0 or
+        (T == i8 and scales_ptr == 0))
+    {
         error_state.setError(.insufficient_capacity);
         return;
     }
 
-    perceptron.predictBatch(
+    perceptron.predictBatchWeights(
+        T,
         ptrFromOffset(u32, feature_ids_ptr)[0..@as(usize, feature_ids_len)],
         ptrFromOffset(u32, token_offsets_ptr)[0..@as(usize, token_count + 1)],
-        ptrFromOffset(f32, weights_ptr)[0..@as(usize, model_feature_count * tag_count)],
+        ptrFromOffset(T, weights_ptr)[0..@as(usize, model_feature_count * tag_count)],
+        if (T == i8) ptrFromOffset(f32, scales_ptr)[0..@as(usize, model_feature_count)] else &.{},
         model_feature_count,
         tag_count,
         ptrFromOffset(u16, out_tag_ids_ptr)[0..@as(usize, token_count)],
         std.heap.wasm_allocator,
+    ) catch |err| setPerceptronError(err);
+}
+
+pub export fn bunnltk_wasm_perceptron_predict_batch(
+    feature_ids_ptr: u32,
+    feature_ids_len: u32,
+    token_offsets_ptr: u32,
+    token_count: u32,
+    weights_ptr: u32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_tag_ids_ptr: u32,
+) void {
+    perceptronPredictBatchWeights(f32, feature_ids_ptr, feature_ids_len, token_offsets_ptr, token_count, weights_ptr, 0, model_feature_count, tag_count, out_tag_ids_ptr);
+}
+
+pub export fn bunnltk_wasm_perceptron_predict_batch_f16(
+    feature_ids_ptr: u32,
+    feature_ids_len: u32,
+    token_offsets_ptr: u32,
+    token_count: u32,
+    weights_ptr: u32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_tag_ids_ptr: u32,
+) void {
+    perceptronPredictBatchWeights(f16, feature_ids_ptr, feature_ids_len, token_offsets_ptr, token_count, weights_ptr, 0, model_feature_count, tag_count, out_tag_ids_ptr);
+}
+
+pub export fn bunnltk_wasm_perceptron_predict_batch_i8(
+    feature_ids_ptr: u32,
+    feature_ids_len: u32,
+    token_offsets_ptr: u32,
+    token_count: u32,
+    weights_ptr: u32,
+    scales_ptr: u32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_tag_ids_ptr: u32,
+) void {
+    perceptronPredictBatchWeights(i8, feature_ids_ptr, feature_ids_len, token_offsets_ptr, token_count, weights_ptr, scales_ptr, model_feature_count, tag_count, out_tag_ids_ptr);
+}
+
+fn setPerceptronError(err: perceptron.PerceptronError) void {
+    switch (err) {
+        error.InvalidDimensions => error_state.setError(.invalid_n),
+        error.OutOfMemory => error_state.setError(.out_of_memory),
+        error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+    }
+}
+
+pub export fn bunnltk_wasm_count_tokens_batch_ascii(input_len: u32, doc_offsets_ptr: u32, doc_offsets_len: u32) u64 {
+    error_state.resetError();
+    if (doc_offsets_len < 2) return 0;
+    if (doc_offsets_ptr == 0) {
+        error_state.setError(.insufficient_capacity);
+        return 0;
+    }
+    const len = @min(@as(usize, input_len), input_buffer.len);
+    return perceptron.countTokensBatchAscii(
+        input_buffer[0..len],
+        ptrFromOffset(u32, doc_offsets_ptr)[0..@as(usize, doc_offsets_len)],
+    ) catch |err| {
+        setPerceptronError(err);
+        return 0;
+    };
+}
+
+fn perceptronTagBatchAsciiWeights(
+    comptime T: type,
+    input_len: u32,
+    doc_offsets_ptr: u32,
+    doc_offsets_len: u32,
+    feature_strings_ptr: u32,
+    feature_strings_len: u32,
+    feature_string_offsets_ptr: u32,
+    feature_string_offsets_len: u32,
+    feature_slots_ptr: u32,
+    feature_slots_len: u32,
+    weights_ptr: u32,
+    scales_ptr: u32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets_ptr: u32,
+    out_token_starts_ptr: u32,
+    out_token_lengths_ptr: u32,
+    out_tag_ids_ptr: u32,
+    capacity: u32,
+) u64 {
+    error_state.resetError();
+    if (doc_offsets_len < 2) return 0;
+    if (doc_offsets_ptr == 0 or feature_strings_ptr == 0 or feature_string_offsets_ptr == 0 or feature_slots_ptr == 0 or
+        weights_ptr == 0 or out_token_doc_offsets_ptr == 0 or out_token_starts_ptr == 0 or out_token_lengths_ptr == 0 or
+        out_tag_ids_ptr == 0 or (T == i8 and scales_ptr == 0))
+    {
+        error_state.setError(.insufficient_capacity);
+        return 0;
+    }
+
+    const len = @min(@as(usize, input_len), input_buffer.len);
+    const cap = @as(usize, capacity);
+    return perceptron.tagBatchAsciiWeights(
+        T,
+        input_buffer[0..len],
+        ptrFromOffset(u32, doc_offsets_ptr)[0..@as(usize, doc_offsets_len)],
+        .{
+            .strings = ptrFromOffset(u8, feature_strings_ptr)[0..@as(usize, feature_strings_len)],
+            .offsets = ptrFromOffset(u32, feature_string_offsets_ptr)[0..@as(usize, feature_string_offsets_len)],
+            .slots = ptrFromOffset(u32, feature_slots_ptr)[0..@as(usize, feature_slots_len)],
+        },
+        ptrFromOffset(T, weights_ptr)[0..@as(usize, model_feature_count * tag_count)],
+        if (T == i8) ptrFromOffset(f32, scales_ptr)[0..@as(usize, model_feature_count)] else &.{},
+        model_feature_count,
+        tag_count,
+        ptrFromOffset(u32, out_token_doc_offsets_ptr)[0..@as(usize, doc_offsets_len)],
+        ptrFromOffset(u32, out_token_starts_ptr)[0..cap],
+        ptrFromOffset(u32, out_token_lengths_ptr)[0..cap],
+        ptrFromOffset(u16, out_tag_ids_ptr)[0..cap],
+        std.heap.wasm_allocator,
+    ) catch |err| {
+        setPerceptronError(err);
+        return 0;
+    };
+}
+
+pub export fn bunnltk_wasm_perceptron_tag_batch_ascii(
+    input_len: u32,
+    doc_offsets_ptr: u32,
+    doc_offsets_len: u32,
+    feature_strings_ptr: u32,
+    feature_strings_len: u32,
+    feature_string_offsets_ptr: u32,
+    feature_string_offsets_len: u32,
+    feature_slots_ptr: u32,
+    feature_slots_len: u32,
+    weights_ptr: u32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets_ptr: u32,
+    out_token_starts_ptr: u32,
+    out_token_lengths_ptr: u32,
+    out_tag_ids_ptr: u32,
+    capacity: u32,
+) u64 {
+    return perceptronTagBatchAsciiWeights(
+        f32,
+        input_len,
+        doc_offsets_ptr,
+        doc_offsets_len,
+        feature_strings_ptr,
+        feature_strings_len,
+        feature_string_offsets_ptr,
+        feature_string_offsets_len,
+        feature_slots_ptr,
+        feature_slots_len,
+        weights_ptr,
+        0,
+        model_feature_count,
+        tag_count,
+        out_token_doc_offsets_ptr,
+        out_token_starts_ptr,
+        out_token_lengths_ptr,
+        out_tag_ids_ptr,
+        capacity,
+    );
+}
+
+pub export fn bunnltk_wasm_perceptron_tag_batch_ascii_f16(
+    input_len: u32,
+    doc_offsets_ptr: u32,
+    doc_offsets_len: u32,
+    feature_strings_ptr: u32,
+    feature_strings_len: u32,
+    feature_string_offsets_ptr: u32,
+    feature_string_offsets_len: u32,
+    feature_slots_ptr: u32,
+    feature_slots_len: u32,
+    weights_ptr: u32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets_ptr: u32,
+    out_token_starts_ptr: u32,
+    out_token_lengths_ptr: u32,
+    out_tag_ids_ptr: u32,
+    capacity: u32,
+) u64 {
+    return perceptronTagBatchAsciiWeights(
+        f16,
+        input_len,
+        doc_offsets_ptr,
+        doc_offsets_len,
+        feature_strings_ptr,
+        feature_strings_len,
+        feature_string_offsets_ptr,
+        feature_string_offsets_len,
+        feature_slots_ptr,
+        feature_slots_len,
+        weights_ptr,
+        0,
+        model_feature_count,
+        tag_count,
+        out_token_doc_offsets_ptr,
+        out_token_starts_ptr,
+        out_token_lengths_ptr,
+        out_tag_ids_ptr,
+        capacity,
+    );
+}
+
+pub export fn bunnltk_wasm_perceptron_tag_batch_ascii_i8(
+    input_len: u32,
+    doc_offsets_ptr: u32,
+    doc_offsets_len: u32,
+    feature_strings_ptr: u32,
+    feature_strings_len: u32,
+    feature_string_offsets_ptr: u32,
+    feature_string_offsets_len: u32,
+    feature_slots_ptr: u32,
+    feature_slots_len: u32,
+    weights_ptr: u32,
+    scales_ptr: u32,
+    model_feature_count: u32,
+    tag_count: u32,
+    out_token_doc_offsets_ptr: u32,
+    out_token_starts_ptr: u32,
+    out_token_lengths_ptr: u32,
+    out_tag_ids_ptr: u32,
+    capacity: u32,
+) u64 {
+    return perceptronTagBatchAsciiWeights(
+        i8,
+        input_len,
+        doc_offsets_ptr,
+        doc_offsets_len,
+        feature_strings_ptr,
+        feature_strings_len,
+        feature_string_offsets_ptr,
+        feature_string_offsets_len,
+        feature_slots_ptr,
+        feature_slots_len,
+        weights_ptr,
+        scales_ptr,
+        model_feature_count,
+        tag_count,
+        out_token_doc_offsets_ptr,
+        out_token_starts_ptr,
+        out_token_lengths_ptr,
+        out_tag_ids_ptr,
+        capacity,
+    );
+}
+
+pub export fn bunnltk_wasm_hash_ngram_features_batch_ascii(
+    input_len: u32,
+    doc_offsets_ptr: u32,
+    doc_offsets_len: u32,
+    ngram_min: u32,
+    ngram_max: u32,
+    dimension: u32,
+    signed: u32,
+    binary: u32,
+    out_doc_offsets_ptr: u32,
+    out_ids_ptr: u32,
+    out_values_ptr: u32,
+    capacity: u32,
+) u64 {
+    error_state.resetError();
+    if (doc_offsets_len == 0) {
+        error_state.setError(.invalid_n);
+        return 0;
+    }
+    if (doc_offsets_ptr == 0 or out_doc_offsets_ptr == 0 or out_ids_ptr == 0 or out_values_ptr == 0) {
+        error_state.setError(.insufficient_capacity);
+        return 0;
+    }
+    const len = @min(@as(usize, input_len), input_buffer.len);
+    const cap = @as(usize, capacity);
+    return features.hashNgramFeaturesBatchAscii(
+        input_buffer[0..len],
+        ptrFromOffset(u32, doc_offsets_ptr)[0..@as(usize, doc_offsets_len)],
+        .{ .ngram_min = ngram_min, .ngram_max = ngram_max, .dimension = dimension, .signed = signed != 0, .binary = binary != 0 },
+        ptrFromOffset(u32, out_doc_offsets_ptr)[0..@as(usize, doc_offsets_len)],
+        ptrFromOffset(u32, out_ids_ptr)[0..cap],
+        ptrFromOffset(f64, out_values_ptr)[0..cap],
+        std.heap.wasm_allocator,
     ) catch |err| {
         switch (err) {
-            error.InvalidDimensions => error_state.setError(.invalid_n),
-            error.OutOfMemory => error_state.setError(.out_of_memory),
+            error.InvalidN => error_state.setError(.invalid_n),
             error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
         }
+        return 0;
     };
 }
 
@@ -360,12 +653,76 @@ pub export fn bunnltk_wasm_chunk_iob_ids(
         ptrFromOffset(u16, rule_label_ids_ptr)[0..@as(usize, rule_count)],
         ptrFromOffset(u16, out_label_ids_ptr)[0..@as(usize, out_capacity)],
         ptrFromOffset(u8, out_begin_ptr)[0..@as(usize, out_capacity)],
-    );
+        std.heap.wasm_allocator,
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
+        }
+        return 0;
+    };
+}
+
+pub export fn bunnltk_wasm_chunk_iob_ids_batch(
+    token_tag_ids_ptr: u32,
+    token_count: u32,
+    sentence_offsets_ptr: u32,
+    sentence_count: u32,
+    atom_allowed_offsets_ptr: u32,
+    atom_allowed_lengths_ptr: u32,
+    atom_allowed_flat_ptr: u32,
+    atom_allowed_flat_len: u32,
+    atom_mins_ptr: u32,
+    atom_maxs_ptr: u32,
+    atom_count: u32,
+    rule_atom_offsets_ptr: u32,
+    rule_atom_counts_ptr: u32,
+    rule_label_ids_ptr: u32,
+    rule_count: u32,
+    out_label_ids_ptr: u32,
+    out_begin_ptr: u32,
+    out_capacity: u32,
+) u64 {
+    error_state.resetError();
+    if (token_count == 0) return 0;
+    if (token_tag_ids_ptr == 0 or sentence_offsets_ptr == 0 or out_label_ids_ptr == 0 or out_begin_ptr == 0) {
+        error_state.setError(.insufficient_capacity);
+        return 0;
+    }
+    if (out_capacity < token_count) {
+        error_state.setError(.insufficient_capacity);
+        return 0;
+    }
+    const written = chunk.fillChunkIobIdsBatch(
+        ptrFromOffset(u16, token_tag_ids_ptr)[0..@as(usize, token_count)],
+        ptrFromOffset(u32, sentence_offsets_ptr)[0 .. @as(usize, sentence_count) + 1],
+        ptrFromOffset(u32, atom_allowed_offsets_ptr)[0..@as(usize, atom_count)],
+        ptrFromOffset(u32, atom_allowed_lengths_ptr)[0..@as(usize, atom_count)],
+        ptrFromOffset(u16, atom_allowed_flat_ptr)[0..@as(usize, atom_allowed_flat_len)],
+        ptrFromOffset(u8, atom_mins_ptr)[0..@as(usize, atom_count)],
+        ptrFromOffset(u8, atom_maxs_ptr)[0..@as(usize, atom_count)],
+        ptrFromOffset(u32, rule_atom_offsets_ptr)[0..@as(usize, rule_count)],
+        ptrFromOffset(u32, rule_atom_counts_ptr)[0..@as(usize, rule_count)],
+        ptrFromOffset(u16, rule_label_ids_ptr)[0..@as(usize, rule_count)],
+        ptrFromOffset(u16, out_label_ids_ptr)[0..@as(usize, out_capacity)],
+        ptrFromOffset(u8, out_begin_ptr)[0..@as(usize, out_capacity)],
+        std.heap.wasm_allocator,
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+            error.OutOfMemory => error_state.setError(.out_of_memory),
+        }
+        return 0;
+    };
+    return written;
 }
 
 pub export fn bunnltk_wasm_cyk_recognize_ids(
     token_bits_ptr: u32,
     token_count: u32,
+    word_count: u32,
     binary_left_ptr: u32,
     binary_right_ptr: u32,
     binary_parent_ptr: u32,
@@ -381,12 +738,13 @@ pub export fn bunnltk_wasm_cyk_recognize_ids(
         error_state.setError(.insufficient_capacity);
         return 0;
     }
-    if (start_symbol >= 64) {
+    if (word_count == 0 or word_count > cyk.max_words or start_symbol >= word_count * 64) {
         error_state.setError(.invalid_n);
         return 0;
     }
     const ok = cyk.cykRecognize(
-        ptrFromOffset(u64, token_bits_ptr)[0..@as(usize, token_count)],
+        ptrFromOffset(u64, token_bits_ptr)[0 .. @as(usize, token_count) * @as(usize, word_count)],
+        @as(usize, word_count),
         ptrFromOffset(u16, binary_left_ptr)[0..@as(usize, binary_count)],
         ptrFromOffset(u16, binary_right_ptr)[0..@as(usize, binary_count)],
         ptrFromOffset(u16, binary_parent_ptr)[0..@as(usize, binary_count)],
@@ -438,6 +796,48 @@ pub export fn bunnltk_wasm_naive_bayes_log_scores_ids(
     );
 }
 
+pub export fn bunnltk_wasm_naive_bayes_sparse_log_scores_batch(
+    doc_offsets_ptr: u32,
+    doc_count: u32,
+    doc_token_ids_ptr: u32,
+    doc_token_count: u32,
+    token_starts_ptr: u32,
+    token_lengths_ptr: u32,
+    vocab_size: u32,
+    entry_label_ids_ptr: u32,
+    entry_log_deltas_ptr: u32,
+    entry_count: u32,
+    label_prior_logs_ptr: u32,
+    label_default_logs_ptr: u32,
+    label_count: u32,
+    out_scores_ptr: u32,
+    out_scores_len: u32,
+) void {
+    error_state.resetError();
+    if (doc_offsets_ptr == 0 or doc_token_ids_ptr == 0 or token_starts_ptr == 0 or token_lengths_ptr == 0 or entry_label_ids_ptr == 0 or entry_log_deltas_ptr == 0 or label_prior_logs_ptr == 0 or label_default_logs_ptr == 0 or out_scores_ptr == 0) {
+        error_state.setError(.insufficient_capacity);
+        return;
+    }
+    naive_bayes.sparseLogScoresBatch(
+        ptrFromOffset(u32, doc_offsets_ptr)[0 .. @as(usize, doc_count) + 1],
+        ptrFromOffset(u32, doc_token_ids_ptr)[0..@as(usize, doc_token_count)],
+        .{
+            .token_starts = ptrFromOffset(u32, token_starts_ptr)[0..@as(usize, vocab_size)],
+            .token_lengths = ptrFromOffset(u32, token_lengths_ptr)[0..@as(usize, vocab_size)],
+            .entry_label_ids = ptrFromOffset(u32, entry_label_ids_ptr)[0..@as(usize, entry_count)],
+            .entry_log_deltas = ptrFromOffset(f64, entry_log_deltas_ptr)[0..@as(usize, entry_count)],
+            .label_prior_logs = ptrFromOffset(f64, label_prior_logs_ptr)[0..@as(usize, label_count)],
+            .label_default_logs = ptrFromOffset(f64, label_default_logs_ptr)[0..@as(usize, label_count)],
+        },
+        ptrFromOffset(f64, out_scores_ptr)[0..@as(usize, out_scores_len)],
+    ) catch |err| {
+        switch (err) {
+            error.InvalidN => error_state.setError(.invalid_n),
+            error.InsufficientCapacity => error_state.setError(.insufficient_capacity),
+        }
+    };
+}
+
 test "wasm exports basic counts and metrics" {
     const sample = "this this is is a a test test";
     @memcpy(input_buffer[0..sample.len], sample);